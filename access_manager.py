@@ -1,20 +1,57 @@
 import json
 import hashlib
+import functools
+import os
 import secrets
-from typing import Dict, List, Optional, Set
+import threading
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import logging
 
+from session_store import SessionStore
+from write_behind import WriteBehind
+
 logger = logging.getLogger(__name__)
 
+# Біти дозволів і ролі в масці доступу користувача
+PERMISSIONS = (
+    "can_monitor_twitter",
+    "can_monitor_discord",
+    "can_manage_users",
+    "can_view_logs",
+    "can_manage_all_projects",
+    "can_create_projects_for_others",
+)
+PERMISSION_BITS = {permission: 1 << bit for bit, permission in enumerate(PERMISSIONS)}
+ROLE_ADMIN_BIT = 1 << len(PERMISSIONS)
+
+
+def _locked(method):
+    """Виконати метод під блокуванням даних AccessManager"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class AccessManager:
     """Менеджер доступу для управління користувачами та авторизацією"""
     
-    def __init__(self, data_file: str = "access_data.json"):
+    def __init__(self, data_file: str = "access_data.json", flush_delay: float = 1.0, backup_dir: str = "backups"):
         self.data_file = data_file
+        self.backup_dir = backup_dir  # каталог резервних копій (backup_data, reset_system)
+        self.version = 0  # збільшується при кожній зміні записів (для кешів UI)
+        self._lock = threading.RLock()
+        # Запис у файл - у фоновому потоці, серія змін (наприклад, спроб входу) дає один запис
+        self.writer = WriteBehind(self._flush, max_delay=flush_delay, name="access-data-writer")
+        self._by_telegram_id: Dict[int, str] = {}  # Telegram ID -> ID запису користувача
+        self._access_bits: Dict[int, int] = {}  # Telegram ID -> маска дозволів і ролі
         self.data = self._load_data()
-        self.authorized_users: Set[int] = set()  # Telegram ID авторизованих користувачів
-        self.user_sessions: Dict[int, datetime] = {}  # Сесії користувачів з часом авторизації
+        self._reindex()
+        # Сесії авторизованих користувачів (Telegram ID), спільні з SecurityManager
+        self.sessions = SessionStore(self.data["settings"]["session_timeout_minutes"] * 60)
+        self.writer.start()
         
     def _load_data(self) -> Dict:
         """Завантажити дані з файлу"""
@@ -38,15 +75,67 @@ class AccessManager:
             return {"users": {}, "settings": {"default_password": "admin123", "session_timeout_minutes": 30, "max_login_attempts": 3}}
     
     def _save_data(self, data: Dict = None) -> None:
-        """Зберегти дані в файл"""
+        """Зберегти дані в файл (data - одразу, інакше відкладено фоновим потоком)"""
         try:
-            if data is None:
-                data = self.data
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            if data is not None:
+                self._write_file(json.dumps(data, ensure_ascii=False, indent=2))
+                return
+            self.version += 1
+            self.writer.mark_dirty()
         except Exception as e:
             logger.error(f"Помилка збереження даних доступу: {e}")
     
+    def _flush(self) -> None:
+        """Записати поточні дані (викликається з потоку запису)"""
+        with self._lock:
+            payload = json.dumps(self.data, ensure_ascii=False, indent=2)
+        self._write_file(payload)
+    
+    def _write_file(self, payload: str) -> None:
+        """Атомарний запис: тимчасовий файл + rename"""
+        tmp_file = f"{self.data_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.data_file)
+    
+    def flush(self) -> bool:
+        """Записати незбережені зміни зараз"""
+        return self.writer.flush()
+    
+    def close(self) -> None:
+        """Зупинити потік запису, записавши незбережені зміни"""
+        self.writer.stop()
+    
+    def _reindex(self) -> None:
+        """Перебудувати індекси всіх користувачів"""
+        self._by_telegram_id = {}
+        self._access_bits = {}
+        for user_id, user_data in self.data["users"].items():
+            self._index_user(user_id, user_data)
+    
+    def _index_user(self, user_id: str, user_data: Dict) -> None:
+        """Оновити індекс і маску доступу одного користувача"""
+        telegram_id = user_data.get("telegram_id")
+        if telegram_id is None:
+            return
+        # При дублікатах Telegram ID перемагає перший запис (як у лінійному пошуку)
+        if self._by_telegram_id.setdefault(telegram_id, user_id) != user_id:
+            return
+        bits = ROLE_ADMIN_BIT if user_data.get("role") == "admin" else 0
+        for permission, value in user_data.get("permissions", {}).items():
+            if value and permission in PERMISSION_BITS:
+                bits |= PERMISSION_BITS[permission]
+        self._access_bits[telegram_id] = bits
+    
+    def _reindex_user(self, telegram_id: int) -> None:
+        """Оновити маску доступу після зміни ролі або дозволів"""
+        user_id = self._by_telegram_id.get(telegram_id)
+        if user_id is not None:
+            self._by_telegram_id.pop(telegram_id)
+            self._index_user(user_id, self.data["users"][user_id])
+    
     def _hash_password(self, password: str) -> str:
         """Хешувати пароль"""
         return hashlib.sha256(password.encode()).hexdigest()
@@ -55,14 +144,15 @@ class AccessManager:
         """Згенерувати унікальний ID користувача"""
         return secrets.token_hex(8)
     
+    @_locked
     def add_user(self, telegram_id: int, username: str = "", password: str = None) -> str:
         """Додати нового користувача"""
         try:
             # Перевіряємо чи користувач вже існує
-            for user_id, user_data in self.data["users"].items():
-                if user_data.get("telegram_id") == telegram_id:
-                    logger.warning(f"Користувач з Telegram ID {telegram_id} вже існує")
-                    return user_id
+            existing_user_id = self._by_telegram_id.get(telegram_id)
+            if existing_user_id is not None:
+                logger.warning(f"Користувач з Telegram ID {telegram_id} вже існує")
+                return existing_user_id
             
             # Генеруємо новий ID користувача
             user_id = self._generate_user_id()
@@ -92,6 +182,7 @@ class AccessManager:
             }
             
             self.data["users"][user_id] = user_data
+            self._index_user(user_id, user_data)
             self._save_data()
             
             logger.info(f"Додано нового користувача: {username} (Telegram ID: {telegram_id})")
@@ -101,6 +192,7 @@ class AccessManager:
             logger.error(f"Помилка додавання користувача: {e}")
             return ""
     
+    @_locked
     def authenticate_user(self, telegram_id: int, password: str) -> bool:
         """Авторизувати користувача"""
         try:
@@ -127,8 +219,7 @@ class AccessManager:
                 # Успішна авторизація
                 user_data["last_login"] = datetime.now().isoformat()
                 user_data["login_attempts"] = 0
-                self.authorized_users.add(telegram_id)
-                self.user_sessions[telegram_id] = datetime.now()
+                self.sessions.start(telegram_id)
                 
                 # Оновлюємо дані
                 self._save_data()
@@ -148,42 +239,31 @@ class AccessManager:
             return False
     
     def is_authorized(self, telegram_id: int) -> bool:
-        """Перевірити чи авторизований користувач"""
-        if telegram_id not in self.authorized_users:
-            return False
-        
-        # Перевіряємо чи не закінчилася сесія
-        if telegram_id in self.user_sessions:
-            session_timeout = timedelta(minutes=self.data["settings"]["session_timeout_minutes"])
-            if datetime.now() - self.user_sessions[telegram_id] > session_timeout:
-                self.logout_user(telegram_id)
-                return False
-        
-        return True
+        """Перевірити чи авторизований користувач (прострочені сесії прибирає cleanup_expired_sessions)"""
+        return self.sessions.is_active(telegram_id)
     
     def update_session_activity(self, telegram_id: int) -> None:
         """Оновити час активності сесії користувача"""
-        if telegram_id in self.authorized_users:
-            self.user_sessions[telegram_id] = datetime.now()
+        if self.sessions.touch(telegram_id):
             logger.debug(f"Оновлено активність сесії користувача {telegram_id}")
     
     def logout_user(self, telegram_id: int) -> None:
         """Вийти з системи"""
-        self.authorized_users.discard(telegram_id)
-        self.user_sessions.pop(telegram_id, None)
+        self.sessions.end(telegram_id)
         logger.info(f"Користувач {telegram_id} вийшов з системи")
     
     def get_user_by_telegram_id(self, telegram_id: int) -> Optional[Dict]:
         """Отримати дані користувача за Telegram ID"""
-        for user_id, user_data in self.data["users"].items():
-            if user_data.get("telegram_id") == telegram_id:
-                return user_data
-        return None
+        user_id = self._by_telegram_id.get(telegram_id)
+        if user_id is None:
+            return None
+        return self.data["users"].get(user_id)
     
     def get_user_by_id(self, user_id: str) -> Optional[Dict]:
         """Отримати дані користувача за ID"""
         return self.data["users"].get(user_id)
     
+    @_locked
     def update_user_password(self, telegram_id: int, new_password: str) -> bool:
         """Оновити пароль користувача"""
         try:
@@ -201,6 +281,7 @@ class AccessManager:
             logger.error(f"Помилка оновлення паролю: {e}")
             return False
     
+    @_locked
     def deactivate_user(self, telegram_id: int) -> bool:
         """Деактивувати користувача"""
         try:
@@ -219,6 +300,7 @@ class AccessManager:
             logger.error(f"Помилка деактивації користувача: {e}")
             return False
     
+    @_locked
     def activate_user(self, telegram_id: int) -> bool:
         """Активувати користувача"""
         try:
@@ -257,12 +339,18 @@ class AccessManager:
         if not self.is_authorized(telegram_id):
             return False
         
-        user_data = self.get_user_by_telegram_id(telegram_id)
-        if not user_data:
+        bits = self._access_bits.get(telegram_id)
+        if bits is None:
             return False
         
-        return user_data.get("permissions", {}).get(permission, False)
+        permission_bit = PERMISSION_BITS.get(permission)
+        if permission_bit is None:
+            # Нестандартний дозвіл - перевіряємо запис
+            user_data = self.get_user_by_telegram_id(telegram_id)
+            return bool(user_data and user_data.get("permissions", {}).get(permission, False))
+        return bool(bits & permission_bit)
     
+    @_locked
     def set_permission(self, telegram_id: int, permission: str, value: bool) -> bool:
         """Встановити дозвіл користувача"""
         try:
@@ -274,6 +362,7 @@ class AccessManager:
                 user_data["permissions"] = {}
             
             user_data["permissions"][permission] = value
+            self._reindex_user(telegram_id)
             self._save_data()
             
             logger.info(f"Дозвіл {permission} для користувача {telegram_id} встановлено: {value}")
@@ -285,17 +374,7 @@ class AccessManager:
     
     def cleanup_expired_sessions(self) -> None:
         """Очистити закінчені сесії"""
-        current_time = datetime.now()
-        session_timeout = timedelta(minutes=self.data["settings"]["session_timeout_minutes"])
-        
-        expired_users = []
-        for telegram_id, login_time in self.user_sessions.items():
-            if current_time - login_time > session_timeout:
-                expired_users.append(telegram_id)
-        
-        for telegram_id in expired_users:
-            self.logout_user(telegram_id)
-        
+        expired_users = self.sessions.expire()
         if expired_users:
             logger.info(f"Очищено {len(expired_users)} закінчених сесій")
     
@@ -308,8 +387,9 @@ class AccessManager:
     
     def is_admin(self, telegram_id: int) -> bool:
         """Перевірити чи користувач є адміністратором"""
-        return self.get_user_role(telegram_id) == "admin"
+        return bool(self._access_bits.get(telegram_id, 0) & ROLE_ADMIN_BIT)
     
+    @_locked
     def set_user_role(self, telegram_id: int, role: str) -> bool:
         """Встановити роль користувача"""
         try:
@@ -343,6 +423,7 @@ class AccessManager:
                     "can_create_projects_for_others": False
                 }
             
+            self._reindex_user(telegram_id)
             self._save_data()
             logger.info(f"Роль користувача {telegram_id} встановлено: {role}")
             return True
@@ -400,29 +481,23 @@ class AccessManager:
                 users.append(user_info)
         return users
     
+    @_locked
     def delete_user(self, telegram_id: int) -> bool:
         """Видалити користувача повністю"""
         try:
             # Знаходимо користувача
-            user_to_delete = None
-            user_id_to_delete = None
-            
-            for user_id, user_data in self.data["users"].items():
-                if user_data.get("telegram_id") == telegram_id:
-                    user_to_delete = user_data
-                    user_id_to_delete = user_id
-                    break
-            
-            if not user_to_delete:
+            user_id_to_delete = self._by_telegram_id.get(telegram_id)
+            if user_id_to_delete is None:
                 logger.warning(f"Спроба видалення неіснуючого користувача: {telegram_id}")
                 return False
             
             # Видаляємо користувача
             del self.data["users"][user_id_to_delete]
+            # Повна перебудова: запис-дублікат з тим самим Telegram ID (якщо є) стає видимим
+            self._reindex()
             
             # Видаляємо з активних сесій
-            self.authorized_users.discard(telegram_id)
-            self.user_sessions.pop(telegram_id, None)
+            self.sessions.end(telegram_id)
             
             self._save_data()
             logger.info(f"Користувач {telegram_id} повністю видалений")
@@ -473,6 +548,7 @@ class AccessManager:
             logger.error(f"Помилка пошуку користувачів: {e}")
             return []
     
+    @_locked
     def change_user_role(self, telegram_id: int, new_role: str) -> bool:
         """Змінити роль користувача"""
         try:
@@ -508,6 +584,7 @@ class AccessManager:
                     "can_create_projects_for_others": False
                 }
             
+            self._reindex_user(telegram_id)
             self._save_data()
             logger.info(f"Роль користувача {telegram_id} змінено з {old_role} на {new_role}")
             return True
@@ -516,6 +593,7 @@ class AccessManager:
             logger.error(f"Помилка зміни ролі користувача: {e}")
             return False
     
+    @_locked
     def reset_user_password(self, telegram_id: int, new_password: str = None) -> bool:
         """Скинути пароль користувача"""
         try:
@@ -531,8 +609,7 @@ class AccessManager:
             user_data["login_attempts"] = 0  # Скидаємо спроби входу
             
             # Видаляємо з активних сесій
-            self.authorized_users.discard(telegram_id)
-            self.user_sessions.pop(telegram_id, None)
+            self.sessions.end(telegram_id)
             
             self._save_data()
             logger.info(f"Пароль користувача {telegram_id} скинуто")
@@ -573,7 +650,7 @@ class AccessManager:
                 
                 # Перевіряємо чи користувач онлайн (має активну сесію)
                 telegram_id = user_data.get("telegram_id")
-                if telegram_id in self.authorized_users:
+                if self.sessions.is_active(telegram_id):
                     stats["online_users"] += 1
                 
                 # Перевіряємо останній вхід
@@ -597,7 +674,7 @@ class AccessManager:
         try:
             stats = {
                 "total_users": len(self.data["users"]),
-                "active_sessions": len(self.authorized_users),
+                "active_sessions": len(self.sessions),
                 "total_projects": 0,
                 "active_monitors": 0,
                 "system_uptime": "",
@@ -636,23 +713,10 @@ class AccessManager:
     def cleanup_inactive_sessions(self) -> int:
         """Очистити неактивні сесії"""
         try:
-            current_time = datetime.now()
-            cleaned_count = 0
-            
-            inactive_users = []
-            for telegram_id, last_activity_time in self.user_sessions.items():
-                # user_sessions містить datetime об'єкти, не словники
-                if current_time - last_activity_time > timedelta(hours=24):  # 24 години неактивності
-                    inactive_users.append(telegram_id)
-            
-            # Видаляємо неактивні сесії
-            for telegram_id in inactive_users:
-                self.authorized_users.discard(telegram_id)
-                self.user_sessions.pop(telegram_id, None)
-                cleaned_count += 1
+            # Сесія неактивна довше за тайм-аут - вже прострочена
+            cleaned_count = len(self.sessions.expire())
             
             if cleaned_count > 0:
-                self._save_data()
                 logger.info(f"Очищено {cleaned_count} неактивних сесій")
             
             return cleaned_count
@@ -668,7 +732,10 @@ class AccessManager:
             import os
             from datetime import datetime
             
-            backup_dir = "backups"
+            # Спершу записуємо відкладені зміни
+            self.flush()
+            
+            backup_dir = self.backup_dir
             if not os.path.exists(backup_dir):
                 os.makedirs(backup_dir)
             
@@ -691,7 +758,7 @@ class AccessManager:
             
             # Додаємо інформацію про користувачів
             logs.append(f"[INFO] Загальна кількість користувачів: {len(self.data['users'])}")
-            logs.append(f"[INFO] Активних сесій: {len(self.authorized_users)}")
+            logs.append(f"[INFO] Активних сесій: {len(self.sessions)}")
             
             # Додаємо інформацію про останні дії
             for user_data in list(self.data["users"].values())[-5:]:  # Останні 5 користувачів
@@ -706,6 +773,7 @@ class AccessManager:
             logger.error(f"Помилка отримання логів: {e}")
             return [f"[ERROR] Помилка отримання логів: {str(e)}"]
     
+    @_locked
     def reset_system(self) -> bool:
         """Скинути систему (видалити всіх користувачів крім адміністраторів)"""
         try:
@@ -720,8 +788,8 @@ class AccessManager:
             
             # Очищаємо всіх користувачів
             self.data["users"] = admin_users
-            self.authorized_users.clear()
-            self.user_sessions.clear()
+            self._reindex()
+            self.sessions.clear()
             
             self._save_data()
             logger.info("Система скинута, збережено тільки адміністраторів")
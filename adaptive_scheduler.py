@@ -0,0 +1,219 @@
+import logging
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# Фіксовані пріоритети, які адміністратор може закріпити за джерелом
+PRIORITIES = ('high', 'normal', 'low')
+
+
+@lru_cache(maxsize=4096)
+def parse_datetime(value: str) -> Optional[datetime]:
+    """Розібрати ISO або Twitter дату (з кешем: одна подія - один розбір); дата без поясу - UTC"""
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        try:
+            # Формат Twitter: Wed Oct 10 20:19:24 +0000 2018
+            dt = datetime.strptime(value, '%a %b %d %H:%M:%S %z %Y')
+        except (ValueError, TypeError):
+            return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def parse_timestamp(value) -> Optional[float]:
+    """Перетворити ISO або Twitter дату в unix час"""
+    if not value:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    dt = parse_datetime(str(value))
+    return dt.timestamp() if dt else None
+
+
+class AdaptivePollScheduler:
+    """Планувальник опитування джерел з адаптивними інтервалами та глобальним бюджетом"""
+
+    def __init__(self, base_interval: float = 15, min_interval: float = 5, max_interval: float = 300,
+                 requests_per_minute: int = 120, backoff_factor: float = 1.5, ewma_alpha: float = 0.3):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.requests_per_minute = requests_per_minute
+        self.backoff_factor = backoff_factor
+        self.ewma_alpha = ewma_alpha
+        self.logger = logging.getLogger(__name__)
+        self.sources: Dict[str, Dict] = {}  # key -> стан джерела
+        self.pins: Dict[str, str] = {}  # key -> закріплений пріоритет
+        # Token bucket для глобального бюджету запитів
+        self._capacity = max(1.0, requests_per_minute / 4)
+        self._tokens = self._capacity
+        self._refilled_at = time.monotonic()
+        self.stats = {'polls': 0, 'deferred': 0}
+
+    def register(self, key: str, base_interval: Optional[float] = None, now: Optional[float] = None) -> Dict:
+        """Зареєструвати джерело (ідемпотентно)"""
+        state = self.sources.get(key)
+        if state is None:
+            base = base_interval or self.base_interval
+            state = {
+                'base_interval': base,
+                'interval': base,
+                'next_due': now if now is not None else time.monotonic(),
+                'ewma_gap': None,
+                'last_item_at': None,
+                'idle_streak': 0,
+            }
+            self.sources[key] = state
+            self._apply_pin(key)
+        elif base_interval and base_interval != state['base_interval']:
+            state['base_interval'] = base_interval
+        return state
+
+    def forget(self, key: str) -> None:
+        """Прибрати джерело з планувальника"""
+        self.sources.pop(key, None)
+
+    def _refill(self, now: float) -> None:
+        """Поповнити токени бюджету"""
+        if self.requests_per_minute <= 0:
+            return
+        elapsed = max(0.0, now - self._refilled_at)
+        self._tokens = min(self._capacity, self._tokens + elapsed * self.requests_per_minute / 60)
+        self._refilled_at = now
+
+    def _rank(self, key: str) -> int:
+        """Порядок обслуговування: закріплені high першими, low останніми"""
+        return {'high': 0, 'normal': 1, 'low': 2}.get(self.pins.get(key), 1)
+
+    def due_sources(self, keys: Iterable[str], base_interval: Optional[float] = None,
+                    now: Optional[float] = None) -> List[str]:
+        """Джерела, які пора опитати, в межах бюджету"""
+        now = now if now is not None else time.monotonic()
+        keys = list(keys)
+        for key in keys:
+            self.register(key, base_interval, now)
+
+        due = [key for key in keys if self.sources[key]['next_due'] <= now]
+        due.sort(key=lambda k: (self._rank(k), self.sources[k]['next_due']))
+
+        if self.requests_per_minute <= 0:
+            self.stats['polls'] += len(due)
+            return due
+
+        self._refill(now)
+        allowed = []
+        for key in due:
+            if self._tokens < 1:
+                break
+            self._tokens -= 1
+            allowed.append(key)
+
+        deferred = len(due) - len(allowed)
+        if deferred:
+            self.stats['deferred'] += deferred
+            self.logger.info(f"⏳ Бюджет запитів вичерпано, відкладено {deferred} джерел")
+        self.stats['polls'] += len(allowed)
+        return allowed
+
+    def record_activity(self, key: str, timestamps: Iterable = (), now: Optional[float] = None) -> float:
+        """Врахувати результат опитування; повертає новий інтервал"""
+        now = now if now is not None else time.monotonic()
+        state = self.register(key, now=now)
+        timestamps = list(timestamps)
+        items = sorted(t for t in (parse_timestamp(v) for v in timestamps) if t is not None)
+        had_items = bool(timestamps)
+
+        if had_items:
+            state['idle_streak'] = 0
+            previous = state['last_item_at']
+            for item_at in items:
+                if previous is not None and item_at > previous:
+                    gap = item_at - previous
+                    ewma = state['ewma_gap']
+                    state['ewma_gap'] = gap if ewma is None else self.ewma_alpha * gap + (1 - self.ewma_alpha) * ewma
+                previous = item_at
+            if items:
+                state['last_item_at'] = max(items[-1], state['last_item_at'] or items[-1])
+        else:
+            state['idle_streak'] += 1
+
+        if key not in self.pins:
+            if had_items:
+                # Активне джерело: опитуємо вдвічі частіше ніж очікуваний проміжок
+                target = state['ewma_gap'] / 2 if state['ewma_gap'] else state['interval'] / 2
+                state['interval'] = min(state['base_interval'], max(self.min_interval, target))
+            else:
+                # Тихе джерело: експоненційний backoff
+                state['interval'] = min(self.max_interval, max(state['base_interval'], state['interval'] * self.backoff_factor))
+
+        state['next_due'] = now + state['interval']
+        return state['interval']
+
+    def seconds_until_next(self, keys: Iterable[str], now: Optional[float] = None) -> float:
+        """Скільки чекати до наступного опитування"""
+        now = now if now is not None else time.monotonic()
+        due_times = [self.sources[k]['next_due'] for k in keys if k in self.sources]
+        if not due_times:
+            return 0.0
+        wait = max(0.0, min(due_times) - now)
+        if self.requests_per_minute > 0:
+            self._refill(now)
+            if self._tokens < 1:
+                wait = max(wait, (1 - self._tokens) * 60 / self.requests_per_minute)
+        return wait
+
+    def _apply_pin(self, key: str) -> None:
+        """Застосувати закріплений пріоритет до інтервалу джерела"""
+        state = self.sources.get(key)
+        priority = self.pins.get(key)
+        if not state or not priority:
+            return
+        state['interval'] = {
+            'high': self.min_interval,
+            'normal': state['base_interval'],
+            'low': self.max_interval,
+        }[priority]
+        state['next_due'] = min(state['next_due'], time.monotonic() + state['interval'])
+
+    def pin(self, key: str, priority: str) -> bool:
+        """Закріпити пріоритет за джерелом"""
+        if priority not in PRIORITIES:
+            return False
+        self.pins[key] = priority
+        self._apply_pin(key)
+        self.logger.info(f"📌 Джерело {key} закріплено з пріоритетом {priority}")
+        return True
+
+    def unpin(self, key: str) -> bool:
+        """Повернути джерело до адаптивного режиму"""
+        if self.pins.pop(key, None) is None:
+            return False
+        state = self.sources.get(key)
+        if state:
+            state['interval'] = state['base_interval']
+        self.logger.info(f"📌 Джерело {key} повернуто до адаптивного режиму")
+        return True
+
+    def load_pins(self, pins: Dict[str, str]) -> None:
+        """Завантажити збережені пріоритети"""
+        for key, priority in (pins or {}).items():
+            if priority in PRIORITIES:
+                self.pins[key] = priority
+                self._apply_pin(key)
+
+    def get_pins(self) -> Dict[str, str]:
+        """Отримати закріплені пріоритети"""
+        return dict(self.pins)
+
+    def get_stats(self) -> Dict:
+        """Отримати статистику планувальника"""
+        intervals = [s['interval'] for s in self.sources.values()]
+        return {
+            **self.stats,
+            'sources': len(self.sources),
+            'pinned': len(self.pins),
+            'min_interval': min(intervals) if intervals else None,
+            'max_interval': max(intervals) if intervals else None,
+        }
@@ -1,20 +1,32 @@
 import logging
 import asyncio
-import threading
-import requests
-import tempfile
 import os
 from datetime import datetime
 from typing import List, Dict, Optional, Any, Set
+import aiohttp
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, CallbackQuery
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters, ContextTypes, JobQueue
 from security_manager import SecurityManager
 from project_manager import ProjectManager
+from project_storage import create_storage
 from discord_monitor import DiscordMonitor
+from discord_history import DiscordHistory
 from twitter_monitor import TwitterMonitor
 from selenium_twitter_monitor import SeleniumTwitterMonitor
 from access_manager import access_manager
-from config import BOT_TOKEN, ADMIN_PASSWORD, SECURITY_TIMEOUT, MESSAGES, DISCORD_AUTHORIZATION, MONITORING_INTERVAL, TWITTER_AUTH_TOKEN, TWITTER_CSRF_TOKEN, TWITTER_MONITORING_INTERVAL
+import http_client
+from telegram_delivery import TelegramDeliveryEngine, MAX_CAPTION_LENGTH, caption_length
+from media_cache import MediaCache
+from delivery_outbox import DeliveryOutbox
+from webhook_server import run_webhook
+from notification_templates import escape, ESCAPE_BASIC, render_discord_forward, render_twitter_forward
+from url_utils import extract_discord_channel_id, extract_twitter_username
+from monitor_supervisor import MonitorSupervisor
+from callback_router import CallbackRouter
+from keyboard_cache import KeyboardCache
+from adaptive_scheduler import AdaptivePollScheduler
+from cursor_store import CursorStore
+from config import BOT_TOKEN, ADMIN_PASSWORD, MESSAGES, DISCORD_AUTHORIZATION, MONITORING_INTERVAL, DISCORD_MAX_CONCURRENT_REQUESTS, DISCORD_GLOBAL_RATE_LIMIT, DISCORD_FETCH_PAGE_SIZE, DISCORD_MAX_PAGES_PER_CYCLE, DISCORD_HISTORY_CACHE_TTL, DISCORD_GATEWAY_ENABLED, DISCORD_GATEWAY_URL, TWITTER_AUTH_TOKEN, TWITTER_CSRF_TOKEN, TWITTER_MONITORING_INTERVAL, ADAPTIVE_POLLING_ENABLED, POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, POLL_REQUEST_BUDGET_PER_MINUTE, CURSOR_STORE_FILE, BACKFILL_MAX_ITEMS, BACKFILL_MAX_AGE_HOURS, TELEGRAM_DELIVERY_WORKERS, TELEGRAM_GLOBAL_RATE_LIMIT, TELEGRAM_GROUP_INTERVAL, TELEGRAM_PRIVATE_INTERVAL, MEDIA_CACHE_DIR, MEDIA_CACHE_MAX_MB, MEDIA_CACHE_MAX_AGE_HOURS, MEDIA_CACHE_HOT_MAX_MB, DELIVERY_OUTBOX_FILE, DELIVERY_OUTBOX_RETENTION_HOURS, TELEGRAM_WEBHOOK_URL, TELEGRAM_WEBHOOK_LISTEN, TELEGRAM_WEBHOOK_PORT, TELEGRAM_WEBHOOK_SECRET, PROJECT_STORAGE_BACKEND, PROJECT_STORAGE_FILE, PROJECT_SAVE_MAX_DELAY
 
 # Налаштування логування - тільки критичні помилки для швидкості
 logging.basicConfig(
@@ -23,13 +35,50 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Ініціалізація менеджерів
-security_manager = SecurityManager(SECURITY_TIMEOUT)
-project_manager = ProjectManager()
-discord_monitor = DiscordMonitor(DISCORD_AUTHORIZATION) if DISCORD_AUTHORIZATION else None
+# Ініціалізація менеджерів (сесії спільні з access_manager)
+security_manager = SecurityManager(sessions=access_manager.sessions)
+project_manager = ProjectManager(
+    storage=create_storage(PROJECT_STORAGE_BACKEND, "data.json", PROJECT_STORAGE_FILE),
+    flush_delay=PROJECT_SAVE_MAX_DELAY
+)
+discord_monitor = DiscordMonitor(
+    DISCORD_AUTHORIZATION,
+    max_concurrent_requests=DISCORD_MAX_CONCURRENT_REQUESTS,
+    global_rate_limit=DISCORD_GLOBAL_RATE_LIMIT,
+    page_size=DISCORD_FETCH_PAGE_SIZE,
+    max_pages_per_cycle=DISCORD_MAX_PAGES_PER_CYCLE
+) if DISCORD_AUTHORIZATION else None
+# Перегляд історії каналів: спільний з монітором бюджет запитів, кеш сторінок
+discord_history = DiscordHistory(
+    DISCORD_AUTHORIZATION,
+    page_size=DISCORD_FETCH_PAGE_SIZE,
+    cache_ttl=DISCORD_HISTORY_CACHE_TTL,
+    rate_limiter=discord_monitor.rate_limiter if discord_monitor else None
+)
 twitter_monitor = TwitterMonitor(TWITTER_AUTH_TOKEN, TWITTER_CSRF_TOKEN) if TWITTER_AUTH_TOKEN and TWITTER_CSRF_TOKEN else None
 selenium_twitter_monitor = None  # Ініціалізується при потребі
 
+# Адаптивний планувальник опитування (спільний бюджет для Discord і Twitter)
+poll_scheduler = AdaptivePollScheduler(
+    base_interval=MONITORING_INTERVAL,
+    min_interval=POLL_MIN_INTERVAL,
+    max_interval=POLL_MAX_INTERVAL,
+    requests_per_minute=POLL_REQUEST_BUDGET_PER_MINUTE
+) if ADAPTIVE_POLLING_ENABLED else None
+if poll_scheduler:
+    poll_scheduler.load_pins(project_manager.get_setting('poll_priorities', {}))
+    if discord_monitor:
+        discord_monitor.scheduler = poll_scheduler
+    if twitter_monitor:
+        twitter_monitor.scheduler = poll_scheduler
+
+# Сховище курсорів моніторів (відновлення після перезапуску)
+cursor_store = CursorStore(CURSOR_STORE_FILE)
+if discord_monitor:
+    discord_monitor.attach_cursor_store(cursor_store, BACKFILL_MAX_ITEMS, BACKFILL_MAX_AGE_HOURS)
+if twitter_monitor:
+    twitter_monitor.attach_cursor_store(cursor_store, BACKFILL_MAX_ITEMS, BACKFILL_MAX_AGE_HOURS)
+
 # Словник для зберігання стану користувачів (очікують пароль)
 waiting_for_password = {}
 
@@ -42,6 +91,34 @@ bot_instance = None
 # Глобальна система відстеження відправлених твітів
 global_sent_tweets: Dict[str, Set[str]] = {}  # account -> set of sent tweet_ids
 
+# Асинхронна доставка сповіщень у Telegram (запускається в post_init)
+delivery_engine = TelegramDeliveryEngine(
+    BOT_TOKEN,
+    workers=TELEGRAM_DELIVERY_WORKERS,
+    global_rate=TELEGRAM_GLOBAL_RATE_LIMIT,
+    group_interval=TELEGRAM_GROUP_INTERVAL,
+    private_interval=TELEGRAM_PRIVATE_INTERVAL,
+    media_cache=MediaCache(
+        MEDIA_CACHE_DIR,
+        max_bytes=MEDIA_CACHE_MAX_MB * 1024 * 1024,
+        max_age_hours=MEDIA_CACHE_MAX_AGE_HOURS,
+        hot_max_bytes=MEDIA_CACHE_HOT_MAX_MB * 1024 * 1024
+    )
+)
+# Outbox: подія записується до відправки, тому переживає перезапуск; також захищає від дублів
+delivery_outbox = DeliveryOutbox(DELIVERY_OUTBOX_FILE)
+# Журнал відправлених (перевірка дублікатів після очищення outbox) оновлюється пакетами підтверджень
+delivery_outbox.add_ack_listener(project_manager.record_sent_messages)
+
+# Монітори працюють як задачі на event loop бота (запуск після post_init)
+monitor_supervisor = MonitorSupervisor()
+
+# Маршрутизація inline-кнопок (обробники реєструються біля handle_callback_query)
+callback_router = CallbackRouter()
+
+# Кеш inline-клавіатур: перебудова лише після зміни даних ProjectManager/AccessManager
+keyboard_cache = KeyboardCache()
+
 # Глобальні змінні для UI
 user_states = {}  # Зберігаємо стани користувачів для форм
 waiting_for_password = {}  # Користувачі, які очікують введення паролю
@@ -79,7 +156,7 @@ def sync_monitors_with_projects() -> None:
         discord_channels = {}  # channel_id -> original_url
         
         logger.info("🔍 Аналізуємо всі проекти...")
-        for user_id, projects in project_manager.data.get('projects', {}).items():
+        for user_id, projects in project_manager.snapshot().projects.items():
             logger.info(f"👤 Користувач {user_id}: {len(projects)} проектів")
             for p in projects:
                 if p.get('platform') == 'twitter':
@@ -182,7 +259,6 @@ def auto_start_monitoring() -> None:
     """Автоматично запустити всі доступні монітори"""
     try:
         global twitter_monitor, selenium_twitter_monitor, discord_monitor
-        import threading
         
         # Запускаємо Twitter API моніторинг
         if twitter_monitor and hasattr(twitter_monitor, 'monitoring_accounts'):
@@ -190,12 +266,8 @@ def auto_start_monitoring() -> None:
             if accounts and TWITTER_AUTH_TOKEN:
                 logger.info(f"🐦 Автоматично запускаємо Twitter API моніторинг для {len(accounts)} акаунтів")
                 try:
-                    # Запускаємо в окремому потоці якщо ще не запущено
-                    if not hasattr(auto_start_monitoring, '_twitter_started'):
-                        twitter_thread = threading.Thread(target=lambda: asyncio.run(start_twitter_monitoring()))
-                        twitter_thread.daemon = True
-                        twitter_thread.start()
-                        auto_start_monitoring._twitter_started = True
+                    # Задача на loop бота; супервізор перезапустить її після збою
+                    if monitor_supervisor.start('twitter', start_twitter_monitoring):
                         logger.info("✅ Twitter API моніторинг автоматично запущено")
                 except Exception as e:
                     logger.error(f"Помилка запуску Twitter моніторингу: {e}")
@@ -206,12 +278,7 @@ def auto_start_monitoring() -> None:
             if accounts:
                 logger.info(f"🚀 Автоматично запускаємо Selenium Twitter моніторинг для {len(accounts)} акаунтів")
                 try:
-                    # Запускаємо в окремому потоці якщо ще не запущено
-                    if not hasattr(auto_start_monitoring, '_selenium_started'):
-                        selenium_thread = threading.Thread(target=lambda: asyncio.run(start_selenium_twitter_monitoring()))
-                        selenium_thread.daemon = True
-                        selenium_thread.start()
-                        auto_start_monitoring._selenium_started = True
+                    if monitor_supervisor.start('selenium', start_selenium_twitter_monitoring):
                         logger.info("✅ Selenium Twitter моніторинг автоматично запущено")
                 except Exception as e:
                     logger.error(f"Помилка запуску Selenium моніторингу: {e}")
@@ -228,12 +295,7 @@ def auto_start_monitoring() -> None:
                 if channels and DISCORD_AUTHORIZATION:
                     logger.info(f"💬 Автоматично запускаємо Discord моніторинг для {len(channels)} каналів")
                     try:
-                        # Запускаємо в окремому потоці якщо ще не запущено
-                        if not hasattr(auto_start_monitoring, '_discord_started'):
-                            discord_thread = threading.Thread(target=lambda: asyncio.run(start_discord_monitoring()))
-                            discord_thread.daemon = True
-                            discord_thread.start()
-                            auto_start_monitoring._discord_started = True
+                        if monitor_supervisor.start('discord', start_discord_monitoring):
                             logger.info("✅ Discord моніторинг автоматично запущено")
                     except Exception as e:
                         logger.error(f"Помилка запуску Discord моніторингу: {e}")
@@ -273,37 +335,20 @@ def normalize_chat_id(chat_id_value: str) -> str:
 def get_users_tracking_discord_channel(channel_id: str) -> List[int]:
     """Повертає список telegram_id користувачів, що мають проект з цим Discord channel_id."""
     try:
-        tracked_users: List[int] = []
-        target = (channel_id or '').strip()
-        for user_id_str, projects in project_manager.data.get('projects', {}).items():
-            for p in projects:
-                if p.get('platform') == 'discord':
-                    cid = extract_discord_channel_id(p.get('url', ''))
-                    if cid == target:
-                        try:
-                            tracked_users.append(int(user_id_str))
-                        except:
-                            pass
-        return tracked_users
+        return project_manager.subscriptions.discord_subscribers(channel_id)
     except Exception:
         return []
 
 def get_discord_server_name(channel_id: str, guild_id: str) -> str:
     """Отримати назву Discord сервера з проекту користувача"""
     try:
-        # Шукаємо проект з цим channel_id
-        for user_id_str, projects in project_manager.data.get('projects', {}).items():
-            for project in projects:
-                if project.get('platform') == 'discord':
-                    project_channel_id = extract_discord_channel_id(project.get('url', ''))
-                    if project_channel_id == channel_id:
-                        # Повертаємо назву проекту як назву сервера
-                        project_name = project.get('name', 'Discord')
-                        # Якщо назва проекту вже містить "Discord", не дублюємо
-                        if 'Discord' in project_name:
-                            return project_name
-                        else:
-                            return f"Discord Server ({project_name})"
+        # Назва проекту з цим channel_id як назва сервера
+        project_name = project_manager.subscriptions.discord_project_name(channel_id)
+        if project_name:
+            # Якщо назва проекту вже містить "Discord", не дублюємо
+            if 'Discord' in project_name:
+                return project_name
+            return f"Discord Server ({project_name})"
         
         # Якщо не знайшли, повертаємо з guild_id
         return f"Discord Server ({guild_id})"
@@ -311,20 +356,10 @@ def get_discord_server_name(channel_id: str, guild_id: str) -> str:
         logger.error(f"Помилка отримання назви Discord сервера: {e}")
         return f"Discord Server ({guild_id})"
 
-# ===================== Визначення отримувачів за проектами =====================
 def get_users_tracking_twitter(username: str) -> List[int]:
     """Повертає список telegram_id користувачів, що мають проект з цим Twitter username."""
     try:
-        tracked_users: List[int] = []
-        target = (username or '').replace('@', '').strip().lower()
-        for user_id_str, projects in project_manager.data.get('projects', {}).items():
-            for p in projects:
-                if p.get('platform') == 'twitter':
-                    u = extract_twitter_username(p.get('url', '') or '')
-                    if u and u.replace('@', '').strip().lower() == target:
-                        tracked_users.append(int(user_id_str))
-                        break
-        return tracked_users
+        return project_manager.subscriptions.twitter_subscribers(username)
     except Exception:
         return []
 
@@ -438,11 +473,11 @@ async def forward_test_command(update: Update, context: ContextTypes.DEFAULT_TYP
         )
         url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
         data = {'chat_id': normalize_chat_id(channel_id), 'text': text}
-        r = requests.post(url, data=data, timeout=5)
-        if r.status_code == 200:
+        r = await http_client.request('POST', url, data=data, retries=0, timeout=aiohttp.ClientTimeout(total=5))
+        if r.status == 200:
             await update.message.reply_text("✅ Тест відправлено у ваш канал пересилання.")
         else:
-            await update.message.reply_text(f"❌ Помилка відправки у канал: {r.status_code}")
+            await update.message.reply_text(f"❌ Помилка відправки у канал: {r.status}")
     except Exception as e:
         await update.message.reply_text(f"❌ Виняток: {e}")
 
@@ -512,80 +547,69 @@ async def safe_delete_message(context: ContextTypes.DEFAULT_TYPE, chat_id: int,
         logger.warning(f"Не вдалося видалити повідомлення {message_id}: {e}")
         return False
 
-def download_and_send_image(image_url: str, chat_id: str, caption: str = "") -> bool:
-    """Завантажити та відправити зображення в Telegram"""
-    try:
-        # Додаємо параметри для Twitter зображень якщо потрібно
-        if 'pbs.twimg.com/media/' in image_url and '?' not in image_url:
-            image_url += '?format=jpg&name=medium'
-        
-        # Завантажуємо зображення
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Referer': 'https://x.com/'
-        }
-        
-        logger.info(f"📥 Завантажуємо зображення: {image_url}")
-        response = requests.get(image_url, headers=headers, timeout=15)
-        response.raise_for_status()
-        logger.info(f"✅ Зображення завантажено успішно, розмір: {len(response.content)} байт")
-        
-        # Перевіряємо розмір файлу (максимум 20MB для Telegram)
-        if len(response.content) > 20 * 1024 * 1024:
-            logger.warning(f"Зображення занадто велике: {len(response.content)} байт")
-            return False
-        
-        # Визначаємо розширення файлу
-        content_type = response.headers.get('content-type', '')
-        if 'jpeg' in content_type or 'jpg' in content_type:
-            suffix = '.jpg'
-        elif 'png' in content_type:
-            suffix = '.png'
-        elif 'webp' in content_type:
-            suffix = '.webp'
-        else:
-            suffix = '.jpg'  # За замовчуванням
-        
-        # Створюємо тимчасовий файл
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-            temp_file.write(response.content)
-            temp_file_path = temp_file.name
-        
-        try:
-            # Відправляємо фото через Telegram API
-            url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendPhoto"
-            
-            with open(temp_file_path, 'rb') as photo_file:
-                files = {'photo': photo_file}
-                data = {
-                    'chat_id': normalize_chat_id(chat_id),
-                    'caption': caption[:1024] if caption else '',  # Telegram обмежує caption до 1024 символів
-                }
-                
-                response = requests.post(url, files=files, data=data, timeout=30)
-                
-                if response.status_code == 200:
-                    logger.info(f"✅ Зображення відправлено в канал {chat_id}")
-                    return True
-                else:
-                    logger.error(f"❌ Помилка відправки зображення: {response.status_code}")
-                    logger.error(f"Відповідь сервера: {response.text}")
-                    return False
-                    
-        finally:
-            # Видаляємо тимчасовий файл
-            try:
-                os.unlink(temp_file_path)
-            except:
-                pass
-                
-    except Exception as e:
-        logger.error(f"Помилка завантаження/відправки зображення: {e}")
-        return False
+def queue_forward_fanout(targets: List[tuple], forward_text: str, images: List[str], source: str,
+                         forward_key: str) -> int:
+    """Записати подію (текст + зображення) в outbox і поставити в чергу доставки для всіх цільових каналів.
+
+    targets - список (канал, user_id). Канали, куди ця подія вже доставляється
+    або доставлена, пропускаються.
+    """
+    deliveries = delivery_outbox.append(forward_key, source, forward_text, images, targets)
+    if not deliveries:
+        return 0
+    return fanout_deliveries(deliveries, forward_text, images, source)
+
+def fanout_deliveries(deliveries: List[tuple], forward_text: str, images: List[str], source: str) -> int:
+    """Відправити записані в outbox доставки (id, канал, user_id).
+
+    Перший канал отримує повну відправку, решта - copyMessage / file_id
+    без повторного завантаження зображень. Доставки, канали яких ведуть
+    в один чат (наприклад '123' і '-100123'), відправляються один раз.
+    """
+    by_chat: Dict[str, List[tuple]] = {}
+    for delivery in deliveries:
+        by_chat.setdefault(normalize_chat_id(delivery[1]), []).append(delivery)
+
+    def build_steps(target_chat: str) -> List[Dict]:
+        text_step = delivery_engine.message_step(target_chat, forward_text)
+        if images and caption_length(forward_text) <= MAX_CAPTION_LENGTH:
+            # Текст стає підписом альбому - один sendMediaGroup замість тексту і фото окремо
+            steps = delivery_engine.media_steps(target_chat, images, caption=forward_text)
+            steps[0]['fallback'] = text_step
+            return steps
+        image_caption = f"📷 {source} зображення" if images else ""
+        return [text_step] + delivery_engine.media_steps(target_chat, images, caption=image_caption)
+    
+    def on_delivered(target_chat: str, result) -> None:
+        for delivery_id, channel, user_id in by_chat[target_chat]:
+            delivery_outbox.ack(delivery_id)
+            logger.info(f"✅ Переслано {source} в канал {channel} (користувач {user_id})")
+    
+    def on_done(chat_deliveries: List[tuple], future) -> None:
+        # Скасована доставка (зупинка бота) лишається в outbox і буде відновлена
+        if future.cancelled():
+            return
+        if future.exception():
+            for delivery_id, channel, _ in chat_deliveries:
+                delivery_outbox.fail(delivery_id, str(future.exception()))
+                logger.error(f"❌ Помилка відправки {source} в канал {channel}: {future.exception()}")
+    
+    futures = delivery_engine.fan_out(list(by_chat), build_steps, on_delivered)
+    for chat_deliveries, future in zip(by_chat.values(), futures):
+        future.add_done_callback(lambda f, chat_deliveries=chat_deliveries: on_done(chat_deliveries, f))
+    return len(futures)
+
+def resume_outbox_deliveries() -> int:
+    """Повторно поставити в чергу доставки, які не завершилися до перезапуску"""
+    resumed = 0
+    for event in delivery_outbox.pending():
+        resumed += fanout_deliveries(event['deliveries'], event['text'], event['images'], event['source'])
+    if resumed:
+        logger.info(f"📬 Відновлено {resumed} недоставлених пересилань з outbox")
+    return resumed
 
+
+@keyboard_cache.cached("main_menu", lambda user_id: access_manager.version)
 def get_main_menu_keyboard(user_id: Optional[int] = None) -> InlineKeyboardMarkup:
     """Створити головне меню з урахуванням ролі користувача"""
     keyboard = [
@@ -616,6 +640,7 @@ def get_main_menu_keyboard(user_id: Optional[int] = None) -> InlineKeyboardMarku
     
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("platform")
 def get_platform_keyboard() -> InlineKeyboardMarkup:
     """Створити клавіатуру вибору платформи"""
     keyboard = [
@@ -625,6 +650,7 @@ def get_platform_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("projects_menu", project_manager.data_version)
 def get_projects_menu_keyboard(user_id: int) -> InlineKeyboardMarkup:
     """Створити меню управління проектами"""
     projects = project_manager.get_user_projects(user_id)
@@ -656,6 +682,7 @@ def get_projects_menu_keyboard(user_id: int) -> InlineKeyboardMarkup:
     
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("twitter_projects", project_manager.data_version)
 def get_twitter_projects_keyboard(user_id: int) -> InlineKeyboardMarkup:
     """Створити клавіатуру Twitter проектів"""
     projects = project_manager.get_user_projects(user_id)
@@ -676,6 +703,7 @@ def get_twitter_projects_keyboard(user_id: int) -> InlineKeyboardMarkup:
     
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("discord_projects", project_manager.data_version)
 def get_discord_projects_keyboard(user_id: int) -> InlineKeyboardMarkup:
     """Створити клавіатуру Discord проектів"""
     projects = project_manager.get_user_projects(user_id)
@@ -696,6 +724,7 @@ def get_discord_projects_keyboard(user_id: int) -> InlineKeyboardMarkup:
     
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("selenium_accounts", lambda user_id: project_manager.data_version())
 def get_selenium_accounts_keyboard() -> InlineKeyboardMarkup:
     """Створити клавіатуру Selenium акаунтів"""
     selenium_accounts = project_manager.get_selenium_accounts()
@@ -713,6 +742,7 @@ def get_selenium_accounts_keyboard() -> InlineKeyboardMarkup:
     
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("history_count")
 def get_history_count_keyboard() -> InlineKeyboardMarkup:
     """Створити клавіатуру вибору кількості повідомлень"""
     keyboard = [
@@ -724,6 +754,7 @@ def get_history_count_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("discord_channels", project_manager.data_version)
 def get_discord_channels_keyboard(user_id: int) -> InlineKeyboardMarkup:
     """Створити клавіатуру з Discord каналами користувача"""
     projects = project_manager.get_user_projects(user_id)
@@ -739,6 +770,7 @@ def get_discord_channels_keyboard(user_id: int) -> InlineKeyboardMarkup:
     keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data="main_menu")])
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("forward_settings", project_manager.data_version)
 def get_forward_settings_keyboard(user_id: int) -> InlineKeyboardMarkup:
     """Створити клавіатуру налаштувань пересилання"""
     forward_status = project_manager.get_forward_status(user_id)
@@ -758,6 +790,7 @@ def get_forward_settings_keyboard(user_id: int) -> InlineKeyboardMarkup:
     
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("quick_actions")
 def get_quick_actions_keyboard(user_id: int) -> InlineKeyboardMarkup:
     """Створити клавіатуру швидких дій"""
     keyboard = [
@@ -771,6 +804,7 @@ def get_quick_actions_keyboard(user_id: int) -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("help")
 def get_help_keyboard() -> InlineKeyboardMarkup:
     """Створити клавіатуру допомоги"""
     keyboard = [
@@ -785,6 +819,7 @@ def get_help_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("settings")
 def get_settings_keyboard(user_id: int) -> InlineKeyboardMarkup:
     """Створити клавіатуру налаштувань"""
     keyboard = [
@@ -798,6 +833,7 @@ def get_settings_keyboard(user_id: int) -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("diagnostics")
 def get_diagnostics_keyboard() -> InlineKeyboardMarkup:
     """Створити клавіатуру діагностики"""
     keyboard = [
@@ -810,6 +846,7 @@ def get_diagnostics_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("admin_panel")
 def get_admin_panel_keyboard() -> InlineKeyboardMarkup:
     """Створити клавіатуру адміністративної панелі"""
     keyboard = [
@@ -825,6 +862,7 @@ def get_admin_panel_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("admin_users")
 def get_admin_users_keyboard() -> InlineKeyboardMarkup:
     """Створити клавіатуру управління користувачами"""
     keyboard = [
@@ -842,6 +880,7 @@ def get_admin_users_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("admin_forward", project_manager.data_version)
 def get_admin_forward_keyboard(target_user_id: int) -> InlineKeyboardMarkup:
     """Клавіатура керування пересиланням для конкретного користувача"""
     status = project_manager.get_forward_status(target_user_id)
@@ -860,6 +899,7 @@ def get_admin_forward_keyboard(target_user_id: int) -> InlineKeyboardMarkup:
     keyboard.append([InlineKeyboardButton("⬅️ Назад", callback_data="admin_users")])
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("admin_system")
 def get_admin_system_keyboard() -> InlineKeyboardMarkup:
     """Створити клавіатуру системного управління"""
     keyboard = [
@@ -874,6 +914,7 @@ def get_admin_system_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("admin_search")
 def get_admin_search_keyboard() -> InlineKeyboardMarkup:
     """Створити клавіатуру пошуку та фільтрів"""
     keyboard = [
@@ -887,6 +928,7 @@ def get_admin_search_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("admin_monitoring")
 def get_admin_monitoring_keyboard() -> InlineKeyboardMarkup:
     """Створити клавіатуру моніторингу"""
     keyboard = [
@@ -900,6 +942,7 @@ def get_admin_monitoring_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("admin_settings")
 def get_admin_settings_keyboard() -> InlineKeyboardMarkup:
     """Створити клавіатуру налаштувань"""
     keyboard = [
@@ -913,6 +956,7 @@ def get_admin_settings_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
+@keyboard_cache.cached("admin_stats")
 def get_admin_stats_keyboard() -> InlineKeyboardMarkup:
     """Створити клавіатуру статистики"""
     keyboard = [
@@ -929,52 +973,7 @@ def get_admin_stats_keyboard() -> InlineKeyboardMarkup:
 
 def escape_markdown(text: str) -> str:
     """Екранувати спеціальні символи для Markdown"""
-    if not text:
-        return ""
-    return str(text).replace('*', '\\*').replace('_', '\\_').replace('`', '\\`').replace('[', '\\[').replace(']', '\\]')
-
-def extract_twitter_username(url: str) -> Optional[str]:
-    """Витягти username з Twitter URL або просто username"""
-    try:
-        if not url:
-            return None
-            
-        url = url.strip()
-        
-        # Якщо це повний URL з twitter.com або x.com
-        if 'twitter.com' in url or 'x.com' in url:
-            # Видаляємо протокол
-            url = url.replace('https://', '').replace('http://', '')
-            
-            # Видаляємо www
-            if url.startswith('www.'):
-                url = url[4:]
-                
-            # Витягуємо username
-            if url.startswith('twitter.com/'):
-                username = url.split('/')[1]
-            elif url.startswith('x.com/'):
-                username = url.split('/')[1]
-            else:
-                return None
-                
-            # Очищаємо від зайвих символів
-            username = username.split('?')[0].split('#')[0]
-            
-            return username if username else None
-            
-        # Якщо це просто username (без URL)
-        elif url and not url.startswith('http') and not '/' in url:
-            # Видаляємо @ якщо є
-            username = url.replace('@', '').strip()
-            # Перевіряємо що це валідний username (тільки букви, цифри, підкреслення)
-            if username and username.replace('_', '').replace('-', '').isalnum():
-                return username
-            
-        return None
-    except Exception as e:
-        logger.error(f"Помилка витягування Twitter username з '{url}': {e}")
-        return None
+    return escape(text, ESCAPE_BASIC)
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Обробник команди /start"""
@@ -1334,29 +1333,21 @@ async def handle_command(update: Update, context: ContextTypes.DEFAULT_TYPE, com
     else:
         await update.message.reply_text("Невідома команда. Використайте /help для довідки.")
 
-async def handle_callback_query(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Обробник callback запитів"""
-    if not update.callback_query or not update.effective_user:
-        return
-    
-    query = update.callback_query
-    await query.answer()
-    
-    user_id = update.effective_user.id
-    
-    # Перевіряємо авторизацію
-    if not access_manager.is_authorized(user_id):
-        await query.edit_message_text(
-            "🔐 **Доступ обмежено!**\n\n"
-            "Ваша сесія закінчилася. Для використання бота необхідна повторна авторизація.\n"
-            "Використовуйте команду /login для входу в систему.",
-        )
-        return
-    
-    # Оновлюємо активність користувача
+async def _require_authorization(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int) -> bool:
+    """Middleware: перевірка авторизації перед обробкою кнопки"""
+    if access_manager.is_authorized(user_id):
+        return True
+    await query.edit_message_text(
+        "🔐 **Доступ обмежено!**\n\n"
+        "Ваша сесія закінчилася. Для використання бота необхідна повторна авторизація.\n"
+        "Використовуйте команду /login для входу в систему.",
+    )
+    return False
+
+
+async def _track_activity(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int) -> bool:
+    """Middleware: оновлення активності сесії і даних користувача"""
     access_manager.update_session_activity(user_id)
-    
-    # Додаємо/оновлюємо користувача в базі даних
     if not project_manager.get_user_data(user_id):
         project_manager.add_user(user_id, {
             'first_name': update.effective_user.first_name,
@@ -1364,2232 +1355,2492 @@ async def handle_callback_query(update: Update, context: ContextTypes.DEFAULT_TY
         })
     else:
         project_manager.update_user_last_seen(user_id)
-    
-    callback_data = query.data
-    
-    # Перевіряємо, чи callback_data не є None
+    return True
+
+
+callback_router.use(_require_authorization)
+callback_router.use(_track_activity)
+
+
+@callback_router.fallback
+async def cb_unknown(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: Optional[str]) -> None:
+    """Невідомі або порожні дані callback"""
     if callback_data is None:
         await query.edit_message_text(
             "❌ Помилка: некоректні дані callback",
             reply_markup=get_main_menu_keyboard(user_id)
         )
-        return
-    
-    if callback_data == "main_menu":
-        # Оновлюємо ID головного меню
-        main_menu_messages[user_id] = query.message.message_id
-        
-        welcome_text = format_success_message(
-            "Головне меню",
-            "Оберіть дію з меню нижче:",
-            "Всі функції бота доступні через це меню."
-        )
+
+
+@callback_router.route("main_menu")
+async def cb_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    # Оновлюємо ID головного меню
+    main_menu_messages[user_id] = query.message.message_id
+    
+    welcome_text = format_success_message(
+        "Головне меню",
+        "Оберіть дію з меню нижче:",
+        "Всі функції бота доступні через це меню."
+    )
+    await query.edit_message_text(
+        welcome_text,
+        reply_markup=get_main_menu_keyboard(user_id),
+    )
+
+
+@callback_router.route("add_project")
+async def cb_add_project(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    await query.edit_message_text(
+        "➕ Додавання нового проекту\n\nОберіть платформу для моніторингу:",
+        reply_markup=get_platform_keyboard()
+    )
+
+
+@callback_router.route("my_projects")
+async def cb_my_projects(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    projects_text = format_info_message(
+        "Мої проекти",
+        "Управління вашими проектами моніторингу",
+        "Тут ви можете переглядати, додавати та видаляти свої проекти для моніторингу Twitter та Discord."
+    )
+    await query.edit_message_text(
+        projects_text,
+        reply_markup=get_projects_menu_keyboard(user_id),
+    )
+
+
+@callback_router.route("projects_menu")
+async def cb_projects_menu(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    await query.edit_message_text(
+        "📋 Управління проектами\n\nОберіть категорію:",
+        reply_markup=get_projects_menu_keyboard(user_id)
+    )
+
+
+@callback_router.route("twitter_projects")
+async def cb_twitter_projects(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    await query.edit_message_text(
+        "🐦 Twitter проекти\n\nОберіть проект для управління:",
+        reply_markup=get_twitter_projects_keyboard(user_id)
+    )
+
+
+@callback_router.route("discord_projects")
+async def cb_discord_projects(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    await query.edit_message_text(
+        "💬 Discord проекти\n\nОберіть проект для управління:",
+        reply_markup=get_discord_projects_keyboard(user_id)
+    )
+
+
+@callback_router.route("selenium_accounts")
+async def cb_selenium_accounts(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    await query.edit_message_text(
+        "🚀 Selenium Twitter акаунти\n\nОберіть акаунт для управління:",
+        reply_markup=get_selenium_accounts_keyboard()
+    )
+
+
+@callback_router.route("add_twitter")
+async def cb_add_twitter(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    user_states[user_id] = {
+        'state': 'adding_twitter',
+        'data': {}
+    }
+    await query.edit_message_text(
+        "🐦 Додавання Twitter акаунта\n\nВведіть username акаунта (без @):"
+    )
+
+
+@callback_router.route("add_discord")
+async def cb_add_discord(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    user_states[user_id] = {
+        'state': 'adding_discord',
+        'data': {}
+    }
+    await query.edit_message_text(
+        "💬 Додавання Discord каналу\n\nВведіть ID каналу:"
+    )
+
+
+@callback_router.route("add_selenium")
+async def cb_add_selenium(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    user_states[user_id] = {
+        'state': 'adding_selenium',
+        'data': {}
+    }
+    await query.edit_message_text(
+        "🚀 Додавання Selenium Twitter акаунта\n\nВведіть username акаунта (без @):"
+    )
+
+
+@callback_router.route("platform_twitter")
+async def cb_platform_twitter(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    user_states[user_id] = {
+        'state': 'adding_project',
+        'data': {'platform': 'twitter'}
+    }
+    await query.edit_message_text(
+        "🐦 Додавання проекту Twitter/X\n\nВведіть назву проекту:"
+    )
+
+
+@callback_router.route("platform_discord")
+async def cb_platform_discord(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    user_states[user_id] = {
+        'state': 'adding_project',
+        'data': {'platform': 'discord'}
+    }
+    await query.edit_message_text(
+        "💬 Додавання проекту Discord\n\nВведіть назву проекту:"
+    )
+
+
+@callback_router.route("help")
+async def cb_help(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    await query.edit_message_text(
+        "❓ **Система допомоги**\n\n"
+        "Оберіть розділ для отримання детальної інформації:",
+        reply_markup=get_help_keyboard()
+    )
+
+
+@callback_router.route("selenium_twitter")
+async def cb_selenium_twitter(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    # Перевіряємо статус Selenium моніторингу
+    selenium_status = "🚀 Активний" if selenium_twitter_monitor and selenium_twitter_monitor.monitoring_active else "⏸️ Неактивний"
+    selenium_count = len(selenium_twitter_monitor.monitoring_accounts) if selenium_twitter_monitor else 0
+    
+    selenium_text = (
+        "🐦 **Selenium Twitter Моніторинг**\n\n"
+        f"📊 **Статус:** {selenium_status}\n"
+        f"👥 **Акаунтів:** {selenium_count}\n"
+        f"🔄 **Автозапуск:** ✅ Увімкнено\n\n"
+        "🔧 **Доступні команди:**\n"
+        "• `/selenium_auth` - Авторизація в Twitter\n"
+        "• `/selenium_add username` - Додати акаунт\n"
+        "• `/selenium_test username` - Тестувати моніторинг\n"
+        "• `/selenium_start` - Запустити моніторинг\n"
+        "• `/selenium_stop` - Зупинити моніторинг\n\n"
+        "📝 **Приклад використання:**\n"
+        "1. `/selenium_auth` - увійдіть в Twitter\n"
+        "2. `/selenium_add pilk_xz` - додайте акаунт\n"
+        "3. `/selenium_test pilk_xz` - протестуйте\n"
+        "4. Моніторинг запуститься автоматично!\n\n"
+        "💡 **Переваги Selenium:**\n"
+        "• Реальний браузер\n"
+        "• Авторизований доступ\n"
+        "• Надійний парсинг\n"
+        "• Обхід обмежень API\n"
+        "• Автоматичний запуск з ботом"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="main_menu")]]
+    await query.edit_message_text(
+        selenium_text,
+        reply_markup=InlineKeyboardMarkup(keyboard),
+    )
+
+
+@callback_router.prefix("delete_selenium_")
+async def cb_delete_selenium(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    username = callback_data.replace("delete_selenium_", "")
+    try:
+        project_manager.remove_selenium_account(username)
+        if selenium_twitter_monitor:
+            selenium_twitter_monitor.remove_account(username)
+        # Синхронізація після змін
+        sync_monitors_with_projects()
         await query.edit_message_text(
-            welcome_text,
-            reply_markup=get_main_menu_keyboard(user_id),
+            f"✅ Selenium акаунт @{username} успішно видалено!",
+            reply_markup=get_selenium_accounts_keyboard()
         )
-    elif callback_data == "add_project":
+    except Exception as e:
         await query.edit_message_text(
-            "➕ Додавання нового проекту\n\nОберіть платформу для моніторингу:",
-            reply_markup=get_platform_keyboard()
-        )
-    elif callback_data == "my_projects":
-        projects_text = format_info_message(
-            "Мої проекти",
-            "Управління вашими проектами моніторингу",
-            "Тут ви можете переглядати, додавати та видаляти свої проекти для моніторингу Twitter та Discord."
+            f"❌ Помилка видалення акаунта: {e}",
+            reply_markup=get_selenium_accounts_keyboard()
         )
+
+
+@callback_router.prefix("view_twitter_")
+async def cb_view_twitter(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    project_id = int(callback_data.replace("view_twitter_", ""))
+    project = project_manager.get_project_by_id(user_id, project_id)
+    if project:
+        text = f"🐦 **Twitter проект: {project['name']}**\n\n"
+        text += f"📝 **Опис:** {project.get('description', 'Немає опису')}\n"
+        text += f"🔗 **URL:** {project.get('url', 'Немає URL')}\n"
+        text += f"📅 **Створено:** {project.get('created_at', 'Невідомо')}\n"
+        text += f"🔄 **Статус:** {'Активний' if project.get('is_active', True) else 'Неактивний'}"
+        
+        keyboard = [
+            [InlineKeyboardButton("❌ Видалити", callback_data=f"delete_twitter_{project_id}")],
+            [InlineKeyboardButton("⬅️ Назад", callback_data="twitter_projects")]
+        ]
         await query.edit_message_text(
-            projects_text,
-            reply_markup=get_projects_menu_keyboard(user_id),
+            text,
+            reply_markup=InlineKeyboardMarkup(keyboard),
         )
-    elif callback_data == "projects_menu":
+
+
+@callback_router.prefix("view_discord_")
+async def cb_view_discord(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    project_id = int(callback_data.replace("view_discord_", ""))
+    project = project_manager.get_project_by_id(user_id, project_id)
+    if project:
+        text = f"💬 **Discord проект: {project['name']}**\n\n"
+        text += f"📝 **Опис:** {project.get('description', 'Немає опису')}\n"
+        text += f"🔗 **URL:** {project.get('url', 'Немає URL')}\n"
+        text += f"📅 **Створено:** {project.get('created_at', 'Невідомо')}\n"
+        text += f"🔄 **Статус:** {'Активний' if project.get('is_active', True) else 'Неактивний'}"
+        
+        keyboard = [
+            [InlineKeyboardButton("❌ Видалити", callback_data=f"delete_discord_{project_id}")],
+            [InlineKeyboardButton("⬅️ Назад", callback_data="discord_projects")]
+        ]
         await query.edit_message_text(
-            "📋 Управління проектами\n\nОберіть категорію:",
-            reply_markup=get_projects_menu_keyboard(user_id)
+            text,
+            reply_markup=InlineKeyboardMarkup(keyboard),
         )
-    elif callback_data == "twitter_projects":
+
+
+@callback_router.prefix("view_selenium_")
+async def cb_view_selenium(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    username = callback_data.replace("view_selenium_", "")
+    selenium_accounts = project_manager.get_selenium_accounts()
+    if username in selenium_accounts:
+        account_data = project_manager.get_selenium_account_info(username) or {}
+        text = f"🚀 **Selenium Twitter: @{username}**\n\n"
+        text += f"📅 **Додано:** {account_data.get('added_at', 'Невідомо')}\n"
+        text += f"👤 **Додав:** {account_data.get('added_by', 'Невідомо')}\n"
+        text += f"🔄 **Статус:** {'Активний' if account_data.get('is_active', True) else 'Неактивний'}\n"
+        text += f"⏰ **Остання перевірка:** {account_data.get('last_checked', 'Ніколи')}"
+        
+        keyboard = [
+            [InlineKeyboardButton("❌ Видалити", callback_data=f"delete_selenium_{username}")],
+            [InlineKeyboardButton("⬅️ Назад", callback_data="selenium_accounts")]
+        ]
         await query.edit_message_text(
-            "🐦 Twitter проекти\n\nОберіть проект для управління:",
-            reply_markup=get_twitter_projects_keyboard(user_id)
+            text,
+            reply_markup=InlineKeyboardMarkup(keyboard),
         )
-    elif callback_data == "discord_projects":
+
+
+@callback_router.route("account_manager")
+async def cb_account_manager(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    # Показуємо менеджер акаунтів
+    projects = project_manager.get_user_projects(user_id)
+    
+    if not projects:
         await query.edit_message_text(
-            "💬 Discord проекти\n\nОберіть проект для управління:",
-            reply_markup=get_discord_projects_keyboard(user_id)
+            "🔧 **Менеджер акаунтів**\n\n❌ У вас немає проектів для моніторингу.\n\nДодайте проекти через меню бота.",
+            reply_markup=get_main_menu_keyboard(user_id)
         )
-    elif callback_data == "selenium_accounts":
+        return
+    
+    # Групуємо по платформах
+    twitter_projects = [p for p in projects if p['platform'] == 'twitter']
+    discord_projects = [p for p in projects if p['platform'] == 'discord']
+    
+    # Форматуємо список
+    text = "🔧 **Менеджер акаунтів**\n\n"
+    
+    if twitter_projects:
+        text += "🐦 **Twitter/X акаунти:**\n"
+        for i, project in enumerate(twitter_projects, 1):
+            project_username: Optional[str] = extract_twitter_username(project['url'])
+            if project_username:
+                text += f"{i}. @{project_username} ({project['name']})\n"
+        text += "\n"
+    
+    if discord_projects:
+        text += "💬 **Discord канали:**\n"
+        for i, project in enumerate(discord_projects, 1):
+            channel_id = extract_discord_channel_id(project['url'])
+            text += f"{i}. Канал {channel_id} ({project['name']})\n"
+        text += "\n"
+    
+    # Додаємо команди для видалення
+    text += "🔧 **Команди для управління:**\n"
+    text += "• /remove_twitter username - видалити Twitter акаунт\n"
+    text += "• /remove_discord channel_id - видалити Discord канал\n"
+    text += "• /accounts - показати список акаунтів"
+    
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="main_menu")]]
+    await query.edit_message_text(
+        text,
+        reply_markup=InlineKeyboardMarkup(keyboard),
+    )
+
+
+@callback_router.route("discord_history")
+async def cb_discord_history(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    # Перевіряємо чи є Discord проекти
+    projects = project_manager.get_user_projects(user_id)
+    discord_projects = [p for p in projects if p['platform'] == 'discord']
+    
+    if not discord_projects:
         await query.edit_message_text(
-            "🚀 Selenium Twitter акаунти\n\nОберіть акаунт для управління:",
-            reply_markup=get_selenium_accounts_keyboard()
+            "📜 Історія Discord\n\n❌ У вас немає Discord проектів для перегляду історії.\n\nДодайте Discord проект спочатку.",
+            reply_markup=get_main_menu_keyboard(user_id)
         )
-    elif callback_data == "add_twitter":
-        user_states[user_id] = {
-            'state': 'adding_twitter',
-            'data': {}
-        }
+    else:
         await query.edit_message_text(
-            "🐦 Додавання Twitter акаунта\n\nВведіть username акаунта (без @):"
+            "📜 Історія Discord\n\nОберіть канал для перегляду історії повідомлень:",
+            reply_markup=get_discord_channels_keyboard(user_id)
         )
-    elif callback_data == "add_discord":
+
+
+@callback_router.prefix("channel_")
+async def cb_channel(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    # Зберігаємо вибраний канал для історії
+    project_id = int(callback_data.split("_")[1])
+    project = project_manager.get_project_by_id(user_id, project_id)
+    
+    if project:
         user_states[user_id] = {
-            'state': 'adding_discord',
-            'data': {}
+            'state': 'viewing_history',
+            'data': {'project': project}
         }
         await query.edit_message_text(
-            "💬 Додавання Discord каналу\n\nВведіть ID каналу:"
+            f"📜 Історія каналу: {project['name']}\n\nОберіть кількість повідомлень для перегляду:",
+            reply_markup=get_history_count_keyboard()
         )
-    elif callback_data == "add_selenium":
-        user_states[user_id] = {
-            'state': 'adding_selenium',
-            'data': {}
-        }
+
+
+@callback_router.prefix("history_")
+async def cb_history(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    # Отримуємо історію повідомлень
+    count = int(callback_data.split("_")[1])
+    await handle_discord_history(update, context, count)
+
+
+@callback_router.route("settings")
+async def cb_settings(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    await query.edit_message_text(
+        "⚙️ **Налаштування**\n\n"
+        "Налаштуйте бота під свої потреби:",
+        reply_markup=get_settings_keyboard(user_id)
+    )
+
+
+@callback_router.route("forward_settings")
+async def cb_forward_settings(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    forward_status = project_manager.get_forward_status(user_id)
+    
+    if forward_status['enabled']:
+        status_text = f"📢 Налаштування пересилання\n\n✅ Пересилання увімкнено\n📺 Канал: {forward_status['channel_id']}\n🕒 Налаштовано: {forward_status['created_at'][:19] if forward_status['created_at'] else 'Невідомо'}\n\n💡 Сповіщення відправляються тільки в налаштований канал, не в особисті повідомлення."
+    else:
+        status_text = "📢 Налаштування пересилання\n\n❌ Пересилання вимкнено\n\nНалаштуйте канал для автоматичного пересилання сповіщень з ваших проектів.\n\n💡 Сповіщення будуть відправлятися тільки в налаштований канал."
+    
+    await query.edit_message_text(
+        status_text,
+        reply_markup=get_forward_settings_keyboard(user_id)
+    )
+
+
+@callback_router.route("enable_forward")
+async def cb_enable_forward(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if project_manager.enable_forward(user_id):
         await query.edit_message_text(
-            "🚀 Додавання Selenium Twitter акаунта\n\nВведіть username акаунта (без @):"
+            "✅ Пересилання увімкнено!\n\nТепер потрібно встановити канал для пересилання.",
+            reply_markup=get_forward_settings_keyboard(user_id)
         )
-    elif callback_data == "platform_twitter":
-        user_states[user_id] = {
-            'state': 'adding_project',
-            'data': {'platform': 'twitter'}
-        }
+    else:
         await query.edit_message_text(
-            "🐦 Додавання проекту Twitter/X\n\nВведіть назву проекту:"
+            "❌ Помилка увімкнення пересилання",
+            reply_markup=get_forward_settings_keyboard(user_id)
         )
-    elif callback_data == "platform_discord":
-        user_states[user_id] = {
-            'state': 'adding_project',
-            'data': {'platform': 'discord'}
-        }
+
+
+@callback_router.route("disable_forward")
+async def cb_disable_forward(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if project_manager.disable_forward(user_id):
         await query.edit_message_text(
-            "💬 Додавання проекту Discord\n\nВведіть назву проекту:"
+            "🔴 Пересилання вимкнено",
+            reply_markup=get_forward_settings_keyboard(user_id)
         )
-    elif callback_data == "help":
+    else:
         await query.edit_message_text(
-            "❓ **Система допомоги**\n\n"
-            "Оберіть розділ для отримання детальної інформації:",
-            reply_markup=get_help_keyboard()
+            "❌ Помилка вимкнення пересилання",
+            reply_markup=get_forward_settings_keyboard(user_id)
         )
-    elif callback_data == "selenium_twitter":
-        # Перевіряємо статус Selenium моніторингу
-        selenium_status = "🚀 Активний" if selenium_twitter_monitor and selenium_twitter_monitor.monitoring_active else "⏸️ Неактивний"
-        selenium_count = len(selenium_twitter_monitor.monitoring_accounts) if selenium_twitter_monitor else 0
+
+
+@callback_router.route("set_channel", "change_channel")
+async def cb_set_channel(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    user_states[user_id] = {
+        'state': 'setting_forward_channel',
+        'data': {}
+    }
+    await query.edit_message_text(
+        "📝 Встановлення каналу для пересилання\n\n"
+        "**Спосіб 1 - Автоматичне налаштування:**\n"
+        "1. Додайте бота в канал як адміністратора\n"
+        "2. Пінгніть бота в каналі: @parseryamatobot\n"
+        "3. Бот автоматично налаштує канал\n\n"
+        "**Спосіб 2 - Ручне налаштування:**\n"
+        "Введіть ID каналу або username каналу:\n\n"
+        "Приклади:\n"
+        "• @channel_username\n"
+        "• -1001234567890 (ID каналу)\n"
+        "• channel_username (без @)\n\n"
+        "💡 Рекомендуємо використовувати автоматичне налаштування!"
+    )
+
+
+@callback_router.route("auto_setup")
+async def cb_auto_setup(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    bot_username = context.bot.username
+    await query.edit_message_text(
+        f"🤖 **Автоматичне налаштування каналу**\n\n"
+        f"Для автоматичного налаштування каналу:\n\n"
+        f"1️⃣ **Додайте бота в канал**\n"
+        f"   • Додайте @{bot_username} в канал як адміністратора\n"
+        f"   • Надайте права на відправку повідомлень\n\n"
+        f"2️⃣ **Пінгніть бота в каналі**\n"
+        f"   • Напишіть в каналі: @{bot_username}\n"
+        f"   • Бот автоматично налаштує канал\n\n"
+        f"3️⃣ **Готово!**\n"
+        f"   • Канал буде налаштовано для пересилання\n"
+        f"   • Ви отримаєте підтвердження\n\n"
+        f"💡 **Переваги:**\n"
+        f"• Не потрібно знати ID каналу\n"
+        f"• Автоматичне налаштування\n"
+        f"• Миттєве підтвердження",
+        reply_markup=get_forward_settings_keyboard(user_id)
+    )
+
+
+@callback_router.route("forward_status")
+async def cb_forward_status(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    forward_status = project_manager.get_forward_status(user_id)
+    user_projects = project_manager.get_user_projects(user_id)
+    discord_projects = [p for p in user_projects if p['platform'] == 'discord']
+    
+    status_text = (
+        f"📊 Статус пересилання\n\n"
+        f"🔄 Статус: {'✅ Увімкнено' if forward_status['enabled'] else '❌ Вимкнено'}\n"
+        f"📺 Канал: {forward_status['channel_id'] or 'Не встановлено'}\n"
+        f"📋 Discord проектів: {len(discord_projects)}\n"
+        f"🕒 Налаштовано: {forward_status['created_at'][:19] if forward_status['created_at'] else 'Невідомо'}\n\n"
+        f"💡 Сповіщення відправляються тільки в налаштований канал, не в особисті повідомлення.\n\n"
+    )
+    
+    if forward_status['enabled'] and discord_projects:
+        status_text += "📢 Сповіщення будуть пересилатися з:\n"
+        for project in discord_projects:
+            status_text += f"• {project['name']}\n"
+    elif not discord_projects:
+        status_text += "⚠️ У вас немає Discord проектів для моніторингу."
+    
+    await query.edit_message_text(
+        status_text,
+        reply_markup=get_forward_settings_keyboard(user_id)
+    )
+
+
+@callback_router.route("diagnostics")
+async def cb_diagnostics(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    diagnostics_text = (
+        "🔧 **Діагностика системи**\n\n"
+        "Оберіть тип перевірки:\n\n"
+        "🔍 **Перевірити бота** - статус бота та підключення\n"
+        "📺 **Тест каналів** - перевірка доступу до каналів\n"
+        "🔗 **Discord API** - тест підключення до Discord\n"
+        "📊 **Статистика** - детальна статистика системи\n"
+        "🔄 **Перезавантажити** - оновити дані"
+    )
+    await query.edit_message_text(
+        diagnostics_text,
+        reply_markup=get_diagnostics_keyboard()
+    )
+
+
+@callback_router.route("check_bot_status")
+async def cb_check_bot_status(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    try:
+        # Перевіряємо статус бота
+        bot_info = await context.bot.get_me()
+        bot_status = "✅ Активний"
+        
+        # Перевіряємо кількість авторизованих користувачів
+        auth_users = len(security_manager.sessions)
+        
+        # Перевіряємо Discord моніторинг
+        discord_status = "✅ Активний" if discord_monitor else "❌ Вимкнено"
+        
+        # Стан задач моніторів і затримка event loop
+        supervisor_stats = monitor_supervisor.get_stats()
+        monitors_text = "".join(
+            f"   • {name}: {'✅' if stats['running'] else '⏹️'} перезапусків: {stats['restarts']}\n"
+            for name, stats in supervisor_stats['monitors'].items()
+        ) or "   • немає запущених\n"
+        loop_lag = supervisor_stats['loop_lag_ms']
+        slow_buttons = "".join(
+            f"   • {row['route']}: {row['avg_ms']} мс (макс {row['max_ms']} мс, {row['calls']}×)\n"
+            for row in callback_router.get_stats(top=3)
+        ) or "   • немає даних\n"
         
-        selenium_text = (
-            "🐦 **Selenium Twitter Моніторинг**\n\n"
-            f"📊 **Статус:** {selenium_status}\n"
-            f"👥 **Акаунтів:** {selenium_count}\n"
-            f"🔄 **Автозапуск:** ✅ Увімкнено\n\n"
-            "🔧 **Доступні команди:**\n"
-            "• `/selenium_auth` - Авторизація в Twitter\n"
-            "• `/selenium_add username` - Додати акаунт\n"
-            "• `/selenium_test username` - Тестувати моніторинг\n"
-            "• `/selenium_start` - Запустити моніторинг\n"
-            "• `/selenium_stop` - Зупинити моніторинг\n\n"
-            "📝 **Приклад використання:**\n"
-            "1. `/selenium_auth` - увійдіть в Twitter\n"
-            "2. `/selenium_add pilk_xz` - додайте акаунт\n"
-            "3. `/selenium_test pilk_xz` - протестуйте\n"
-            "4. Моніторинг запуститься автоматично!\n\n"
-            "💡 **Переваги Selenium:**\n"
-            "• Реальний браузер\n"
-            "• Авторизований доступ\n"
-            "• Надійний парсинг\n"
-            "• Обхід обмежень API\n"
-            "• Автоматичний запуск з ботом"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="main_menu")]]
-        await query.edit_message_text(
-            selenium_text,
-            reply_markup=InlineKeyboardMarkup(keyboard),
+        status_text = (
+            f"🔍 **Статус бота**\n\n"
+            f"🤖 Бот: {bot_status}\n"
+            f"📛 Ім'я: {bot_info.first_name}\n"
+            f"🆔 ID: {bot_info.id}\n"
+            f"👤 Username: @{bot_info.username}\n\n"
+            f"👥 Авторизованих користувачів: {auth_users}\n"
+            f"🔗 Discord моніторинг: {discord_status}\n"
+            f"🧭 Монітори:\n{monitors_text}"
+            f"⏱️ Затримка event loop: {loop_lag['last']} мс (макс {loop_lag['max']} мс)\n"
+            f"🐢 Найповільніші кнопки:\n{slow_buttons}"
+            f"⌨️ Кеш клавіатур: {keyboard_cache.get_stats()['hit_rate']}% влучань\n"
+            f"📊 Проектів: {len(project_manager.get_user_projects(user_id))}\n"
+            f"🕒 Час: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         )
-    elif callback_data.startswith("delete_selenium_"):
-        username = callback_data.replace("delete_selenium_", "")
-        try:
-            project_manager.remove_selenium_account(username)
-            if selenium_twitter_monitor:
-                selenium_twitter_monitor.remove_account(username)
-            # Синхронізація після змін
-            sync_monitors_with_projects()
-            await query.edit_message_text(
-                f"✅ Selenium акаунт @{username} успішно видалено!",
-                reply_markup=get_selenium_accounts_keyboard()
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ Помилка видалення акаунта: {e}",
-                reply_markup=get_selenium_accounts_keyboard()
-            )
-    elif callback_data.startswith("view_twitter_"):
-        project_id = int(callback_data.replace("view_twitter_", ""))
-        project = project_manager.get_project_by_id(user_id, project_id)
-        if project:
-            text = f"🐦 **Twitter проект: {project['name']}**\n\n"
-            text += f"📝 **Опис:** {project.get('description', 'Немає опису')}\n"
-            text += f"🔗 **URL:** {project.get('url', 'Немає URL')}\n"
-            text += f"📅 **Створено:** {project.get('created_at', 'Невідомо')}\n"
-            text += f"🔄 **Статус:** {'Активний' if project.get('is_active', True) else 'Неактивний'}"
-            
-            keyboard = [
-                [InlineKeyboardButton("❌ Видалити", callback_data=f"delete_twitter_{project_id}")],
-                [InlineKeyboardButton("⬅️ Назад", callback_data="twitter_projects")]
-            ]
-            await query.edit_message_text(
-                text,
-                reply_markup=InlineKeyboardMarkup(keyboard),
-            )
-    elif callback_data.startswith("view_discord_"):
-        project_id = int(callback_data.replace("view_discord_", ""))
-        project = project_manager.get_project_by_id(user_id, project_id)
-        if project:
-            text = f"💬 **Discord проект: {project['name']}**\n\n"
-            text += f"📝 **Опис:** {project.get('description', 'Немає опису')}\n"
-            text += f"🔗 **URL:** {project.get('url', 'Немає URL')}\n"
-            text += f"📅 **Створено:** {project.get('created_at', 'Невідомо')}\n"
-            text += f"🔄 **Статус:** {'Активний' if project.get('is_active', True) else 'Неактивний'}"
-            
-            keyboard = [
-                [InlineKeyboardButton("❌ Видалити", callback_data=f"delete_discord_{project_id}")],
-                [InlineKeyboardButton("⬅️ Назад", callback_data="discord_projects")]
-            ]
-            await query.edit_message_text(
-                text,
-                reply_markup=InlineKeyboardMarkup(keyboard),
-            )
-    elif callback_data.startswith("view_selenium_"):
-        username = callback_data.replace("view_selenium_", "")
-        selenium_accounts = project_manager.get_selenium_accounts()
-        if username in selenium_accounts:
-            account_data = project_manager.data['selenium_accounts'][username]
-            text = f"🚀 **Selenium Twitter: @{username}**\n\n"
-            text += f"📅 **Додано:** {account_data.get('added_at', 'Невідомо')}\n"
-            text += f"👤 **Додав:** {account_data.get('added_by', 'Невідомо')}\n"
-            text += f"🔄 **Статус:** {'Активний' if account_data.get('is_active', True) else 'Неактивний'}\n"
-            text += f"⏰ **Остання перевірка:** {account_data.get('last_checked', 'Ніколи')}"
-            
-            keyboard = [
-                [InlineKeyboardButton("❌ Видалити", callback_data=f"delete_selenium_{username}")],
-                [InlineKeyboardButton("⬅️ Назад", callback_data="selenium_accounts")]
-            ]
-            await query.edit_message_text(
-                text,
-                reply_markup=InlineKeyboardMarkup(keyboard),
-            )
-    elif callback_data == "account_manager":
-        # Показуємо менеджер акаунтів
-        projects = project_manager.get_user_projects(user_id)
-        
-        if not projects:
-            await query.edit_message_text(
-                "🔧 **Менеджер акаунтів**\n\n❌ У вас немає проектів для моніторингу.\n\nДодайте проекти через меню бота.",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
         
-        # Групуємо по платформах
-        twitter_projects = [p for p in projects if p['platform'] == 'twitter']
-        discord_projects = [p for p in projects if p['platform'] == 'discord']
-        
-        # Форматуємо список
-        text = "🔧 **Менеджер акаунтів**\n\n"
-        
-        if twitter_projects:
-            text += "🐦 **Twitter/X акаунти:**\n"
-            for i, project in enumerate(twitter_projects, 1):
-                project_username: Optional[str] = extract_twitter_username(project['url'])
-                if project_username:
-                    text += f"{i}. @{project_username} ({project['name']})\n"
-            text += "\n"
-        
-        if discord_projects:
-            text += "💬 **Discord канали:**\n"
-            for i, project in enumerate(discord_projects, 1):
-                channel_id = extract_discord_channel_id(project['url'])
-                text += f"{i}. Канал {channel_id} ({project['name']})\n"
-            text += "\n"
-        
-        # Додаємо команди для видалення
-        text += "🔧 **Команди для управління:**\n"
-        text += "• /remove_twitter username - видалити Twitter акаунт\n"
-        text += "• /remove_discord channel_id - видалити Discord канал\n"
-        text += "• /accounts - показати список акаунтів"
-        
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="main_menu")]]
         await query.edit_message_text(
-            text,
-            reply_markup=InlineKeyboardMarkup(keyboard),
+            status_text,
+            reply_markup=get_diagnostics_keyboard()
         )
-    elif callback_data == "discord_history":
-        # Перевіряємо чи є Discord проекти
-        projects = project_manager.get_user_projects(user_id)
-        discord_projects = [p for p in projects if p['platform'] == 'discord']
-        
-        if not discord_projects:
-            await query.edit_message_text(
-                "📜 Історія Discord\n\n❌ У вас немає Discord проектів для перегляду історії.\n\nДодайте Discord проект спочатку.",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-        else:
-            await query.edit_message_text(
-                "📜 Історія Discord\n\nОберіть канал для перегляду історії повідомлень:",
-                reply_markup=get_discord_channels_keyboard(user_id)
-            )
-    elif callback_data.startswith("channel_"):
-        # Зберігаємо вибраний канал для історії
-        project_id = int(callback_data.split("_")[1])
-        project = project_manager.get_project_by_id(user_id, project_id)
-        
-        if project:
-            user_states[user_id] = {
-                'state': 'viewing_history',
-                'data': {'project': project}
-            }
-            await query.edit_message_text(
-                f"📜 Історія каналу: {project['name']}\n\nОберіть кількість повідомлень для перегляду:",
-                reply_markup=get_history_count_keyboard()
-            )
-    elif callback_data.startswith("history_"):
-        # Отримуємо історію повідомлень
-        count = int(callback_data.split("_")[1])
-        await handle_discord_history(update, context, count)
-    elif callback_data == "settings":
+    except Exception as e:
         await query.edit_message_text(
-            "⚙️ **Налаштування**\n\n"
-            "Налаштуйте бота під свої потреби:",
-            reply_markup=get_settings_keyboard(user_id)
+            f"❌ **Помилка перевірки бота**\n\n{str(e)}",
+            reply_markup=get_diagnostics_keyboard()
         )
-    elif callback_data == "forward_settings":
-        forward_status = project_manager.get_forward_status(user_id)
+
+
+@callback_router.route("test_channels")
+async def cb_test_channels(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    try:
+        forward_channel = project_manager.get_forward_channel(user_id)
         
-        if forward_status['enabled']:
-            status_text = f"📢 Налаштування пересилання\n\n✅ Пересилання увімкнено\n📺 Канал: {forward_status['channel_id']}\n🕒 Налаштовано: {forward_status['created_at'][:19] if forward_status['created_at'] else 'Невідомо'}\n\n💡 Сповіщення відправляються тільки в налаштований канал, не в особисті повідомлення."
+        if forward_channel:
+            # Спробуємо відправити тестове повідомлення
+            test_message = (
+                f"🧪 **Тестове повідомлення**\n\n"
+                f"📺 Канал: {forward_channel}\n"
+                f"👤 Від: {update.effective_user.first_name}\n"
+                f"🕒 Час: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+                f"✅ Якщо ви бачите це повідомлення, канал працює!"
+            )
+            
+            await context.bot.send_message(
+                chat_id=forward_channel,
+                text=test_message,
+            )
+            
+            result_text = f"✅ **Тест каналу пройшов успішно!**\n\n📺 Канал: `{forward_channel}`\n📤 Тестове повідомлення відправлено"
         else:
-            status_text = "📢 Налаштування пересилання\n\n❌ Пересилання вимкнено\n\nНалаштуйте канал для автоматичного пересилання сповіщень з ваших проектів.\n\n💡 Сповіщення будуть відправлятися тільки в налаштований канал."
+            result_text = "❌ **Канал не налаштовано**\n\nСпочатку встановіть канал для пересилання в налаштуваннях."
         
         await query.edit_message_text(
-            status_text,
-            reply_markup=get_forward_settings_keyboard(user_id)
+            result_text,
+            reply_markup=get_diagnostics_keyboard()
         )
-    elif callback_data == "enable_forward":
-        if project_manager.enable_forward(user_id):
-            await query.edit_message_text(
-                "✅ Пересилання увімкнено!\n\nТепер потрібно встановити канал для пересилання.",
-                reply_markup=get_forward_settings_keyboard(user_id)
-            )
-        else:
-            await query.edit_message_text(
-                "❌ Помилка увімкнення пересилання",
-                reply_markup=get_forward_settings_keyboard(user_id)
-            )
-    elif callback_data == "disable_forward":
-        if project_manager.disable_forward(user_id):
-            await query.edit_message_text(
-                "🔴 Пересилання вимкнено",
-                reply_markup=get_forward_settings_keyboard(user_id)
-            )
-        else:
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка тесту каналу**\n\n{str(e)}\n\n💡 Перевірте:\n• Чи додано бота в канал\n• Чи є у бота права адміністратора\n• Чи правильний ID каналу",
+            reply_markup=get_diagnostics_keyboard()
+        )
+
+
+@callback_router.route("test_discord_api")
+async def cb_test_discord_api(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    try:
+        if not DISCORD_AUTHORIZATION:
             await query.edit_message_text(
-                "❌ Помилка вимкнення пересилання",
-                reply_markup=get_forward_settings_keyboard(user_id)
+                "❌ **Discord API не налаштовано**\n\nВстановіть AUTHORIZATION токен в .env файлі",
+                reply_markup=get_diagnostics_keyboard()
             )
-    elif callback_data in ["set_channel", "change_channel"]:
-        user_states[user_id] = {
-            'state': 'setting_forward_channel',
-            'data': {}
+            return
+        
+        # Тестуємо Discord API
+        headers = {
+            'Authorization': DISCORD_AUTHORIZATION,
+            'User-Agent': 'DiscordBot (https://github.com/discord/discord-api-docs, 1.0)'
         }
+        
+        async with http_client.get_session().get('https://discord.com/api/v10/users/@me', headers=headers) as response:
+            if response.status == 200:
+                user_data = await response.json()
+                result_text = (
+                    f"✅ **Discord API працює**\n\n"
+                    f"👤 Користувач: {user_data.get('username', 'Невідомо')}\n"
+                    f"🆔 ID: {user_data.get('id', 'Невідомо')}\n"
+                    f"📧 Email: {user_data.get('email', 'Приховано')}\n"
+                    f"🔐 Верифікований: {'✅' if user_data.get('verified', False) else '❌'}\n"
+                    f"📊 Статус: {response.status}"
+                )
+            else:
+                result_text = f"❌ **Discord API помилка**\n\nСтатус: {response.status}\nВідповідь: {await response.text()}"
+        
         await query.edit_message_text(
-            "📝 Встановлення каналу для пересилання\n\n"
-            "**Спосіб 1 - Автоматичне налаштування:**\n"
-            "1. Додайте бота в канал як адміністратора\n"
-            "2. Пінгніть бота в каналі: @parseryamatobot\n"
-            "3. Бот автоматично налаштує канал\n\n"
-            "**Спосіб 2 - Ручне налаштування:**\n"
-            "Введіть ID каналу або username каналу:\n\n"
-            "Приклади:\n"
-            "• @channel_username\n"
-            "• -1001234567890 (ID каналу)\n"
-            "• channel_username (без @)\n\n"
-            "💡 Рекомендуємо використовувати автоматичне налаштування!"
-        )
-    elif callback_data == "auto_setup":
-        bot_username = context.bot.username
+            result_text,
+            reply_markup=get_diagnostics_keyboard()
+        )
+    except Exception as e:
         await query.edit_message_text(
-            f"🤖 **Автоматичне налаштування каналу**\n\n"
-            f"Для автоматичного налаштування каналу:\n\n"
-            f"1️⃣ **Додайте бота в канал**\n"
-            f"   • Додайте @{bot_username} в канал як адміністратора\n"
-            f"   • Надайте права на відправку повідомлень\n\n"
-            f"2️⃣ **Пінгніть бота в каналі**\n"
-            f"   • Напишіть в каналі: @{bot_username}\n"
-            f"   • Бот автоматично налаштує канал\n\n"
-            f"3️⃣ **Готово!**\n"
-            f"   • Канал буде налаштовано для пересилання\n"
-            f"   • Ви отримаєте підтвердження\n\n"
-            f"💡 **Переваги:**\n"
-            f"• Не потрібно знати ID каналу\n"
-            f"• Автоматичне налаштування\n"
-            f"• Миттєве підтвердження",
-            reply_markup=get_forward_settings_keyboard(user_id)
+            f"❌ **Помилка Discord API**\n\n{str(e)}",
+            reply_markup=get_diagnostics_keyboard()
         )
-    elif callback_data == "forward_status":
-        forward_status = project_manager.get_forward_status(user_id)
+
+
+@callback_router.route("show_stats")
+async def cb_show_stats(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    try:
+        stats = project_manager.get_statistics()
         user_projects = project_manager.get_user_projects(user_id)
         discord_projects = [p for p in user_projects if p['platform'] == 'discord']
+        forward_status = project_manager.get_forward_status(user_id)
         
-        status_text = (
-            f"📊 Статус пересилання\n\n"
+        # Підраховуємо відстежені повідомлення
+        total_tracked = len(project_manager.sent_ledger)
+        
+        stats_text = (
+            f"📊 **Статистика системи**\n\n"
+            f"👥 Всього користувачів: {stats['total_users']}\n"
+            f"📋 Всього проектів: {stats['total_projects']}\n"
+            f"🔗 Discord проектів: {len(discord_projects)}\n"
+            f"🐦 Twitter проектів: {len([p for p in user_projects if p['platform'] == 'twitter'])}\n\n"
+            f"📢 **Пересилання:**\n"
             f"🔄 Статус: {'✅ Увімкнено' if forward_status['enabled'] else '❌ Вимкнено'}\n"
-            f"📺 Канал: {forward_status['channel_id'] or 'Не встановлено'}\n"
-            f"📋 Discord проектів: {len(discord_projects)}\n"
-            f"🕒 Налаштовано: {forward_status['created_at'][:19] if forward_status['created_at'] else 'Невідомо'}\n\n"
-            f"💡 Сповіщення відправляються тільки в налаштований канал, не в особисті повідомлення.\n\n"
+            f"📺 Канал: {forward_status['channel_id'] or 'Не встановлено'}\n\n"
+            f"💾 **Дані:**\n"
+            f"📁 Розмір файлу: {stats.get('data_size', 'Невідомо')}\n"
+            f"📨 Відстежених повідомлень: {total_tracked}\n"
+            f"🕒 Останнє оновлення: {stats.get('last_update', 'Невідомо')}"
         )
         
-        if forward_status['enabled'] and discord_projects:
-            status_text += "📢 Сповіщення будуть пересилатися з:\n"
-            for project in discord_projects:
-                status_text += f"• {project['name']}\n"
-        elif not discord_projects:
-            status_text += "⚠️ У вас немає Discord проектів для моніторингу."
-        
         await query.edit_message_text(
-            status_text,
-            reply_markup=get_forward_settings_keyboard(user_id)
+            stats_text,
+            reply_markup=get_diagnostics_keyboard()
         )
-    elif callback_data == "diagnostics":
-        diagnostics_text = (
-            "🔧 **Діагностика системи**\n\n"
-            "Оберіть тип перевірки:\n\n"
-            "🔍 **Перевірити бота** - статус бота та підключення\n"
-            "📺 **Тест каналів** - перевірка доступу до каналів\n"
-            "🔗 **Discord API** - тест підключення до Discord\n"
-            "📊 **Статистика** - детальна статистика системи\n"
-            "🔄 **Перезавантажити** - оновити дані"
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка отримання статистики**\n\n{str(e)}",
+            reply_markup=get_diagnostics_keyboard()
         )
+
+
+@callback_router.route("reload_data")
+async def cb_reload_data(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    try:
+        # Перезавантажуємо дані
+        project_manager.load_data()
+        # Проводимо синхронізацію моніторів
+        sync_monitors_with_projects()
+        
+        # Перезапускаємо Discord моніторинг
+        if discord_monitor:
+            discord_monitor.monitoring_channels.clear()
+            for user_id_str, projects in project_manager.snapshot().projects.items():
+                for project in projects:
+                    if project['platform'] == 'discord':
+                        channel_id = project['link'].split('/')[-1]
+                        discord_monitor.add_channel(channel_id)
+        
         await query.edit_message_text(
-            diagnostics_text,
+            "🔄 **Дані перезавантажено**\n\n✅ Проекти оновлено\n✅ Discord канали оновлено\n✅ Налаштування оновлено",
             reply_markup=get_diagnostics_keyboard()
         )
-    elif callback_data == "check_bot_status":
-        try:
-            # Перевіряємо статус бота
-            bot_info = await context.bot.get_me()
-            bot_status = "✅ Активний"
-            
-            # Перевіряємо кількість авторизованих користувачів
-            auth_users = len(security_manager.authorized_users)
-            
-            # Перевіряємо Discord моніторинг
-            discord_status = "✅ Активний" if discord_monitor else "❌ Вимкнено"
-            
-            status_text = (
-                f"🔍 **Статус бота**\n\n"
-                f"🤖 Бот: {bot_status}\n"
-                f"📛 Ім'я: {bot_info.first_name}\n"
-                f"🆔 ID: {bot_info.id}\n"
-                f"👤 Username: @{bot_info.username}\n\n"
-                f"👥 Авторизованих користувачів: {auth_users}\n"
-                f"🔗 Discord моніторинг: {discord_status}\n"
-                f"📊 Проектів: {len(project_manager.get_user_projects(user_id))}\n"
-                f"🕒 Час: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            )
-            
-            await query.edit_message_text(
-                status_text,
-                reply_markup=get_diagnostics_keyboard()
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка перевірки бота**\n\n{str(e)}",
-                reply_markup=get_diagnostics_keyboard()
-            )
-    elif callback_data == "test_channels":
-        try:
-            forward_channel = project_manager.get_forward_channel(user_id)
-            
-            if forward_channel:
-                # Спробуємо відправити тестове повідомлення
-                test_message = (
-                    f"🧪 **Тестове повідомлення**\n\n"
-                    f"📺 Канал: {forward_channel}\n"
-                    f"👤 Від: {update.effective_user.first_name}\n"
-                    f"🕒 Час: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                    f"✅ Якщо ви бачите це повідомлення, канал працює!"
-                )
-                
-                await context.bot.send_message(
-                    chat_id=forward_channel,
-                    text=test_message,
-                )
-                
-                result_text = f"✅ **Тест каналу пройшов успішно!**\n\n📺 Канал: `{forward_channel}`\n📤 Тестове повідомлення відправлено"
-            else:
-                result_text = "❌ **Канал не налаштовано**\n\nСпочатку встановіть канал для пересилання в налаштуваннях."
-            
-            await query.edit_message_text(
-                result_text,
-                reply_markup=get_diagnostics_keyboard()
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка тесту каналу**\n\n{str(e)}\n\n💡 Перевірте:\n• Чи додано бота в канал\n• Чи є у бота права адміністратора\n• Чи правильний ID каналу",
-                reply_markup=get_diagnostics_keyboard()
-            )
-    elif callback_data == "test_discord_api":
-        try:
-            if not DISCORD_AUTHORIZATION:
-                await query.edit_message_text(
-                    "❌ **Discord API не налаштовано**\n\nВстановіть AUTHORIZATION токен в .env файлі",
-                    reply_markup=get_diagnostics_keyboard()
-                )
-                return
-            
-            # Тестуємо Discord API
-            import aiohttp
-            headers = {
-                'Authorization': DISCORD_AUTHORIZATION,
-                'User-Agent': 'DiscordBot (https://github.com/discord/discord-api-docs, 1.0)'
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get('https://discord.com/api/v10/users/@me', headers=headers) as response:
-                    if response.status == 200:
-                        user_data = await response.json()
-                        result_text = (
-                            f"✅ **Discord API працює**\n\n"
-                            f"👤 Користувач: {user_data.get('username', 'Невідомо')}\n"
-                            f"🆔 ID: {user_data.get('id', 'Невідомо')}\n"
-                            f"📧 Email: {user_data.get('email', 'Приховано')}\n"
-                            f"🔐 Верифікований: {'✅' if user_data.get('verified', False) else '❌'}\n"
-                            f"📊 Статус: {response.status}"
-                        )
-                    else:
-                        result_text = f"❌ **Discord API помилка**\n\nСтатус: {response.status}\nВідповідь: {await response.text()}"
-            
-            await query.edit_message_text(
-                result_text,
-                reply_markup=get_diagnostics_keyboard()
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка Discord API**\n\n{str(e)}",
-                reply_markup=get_diagnostics_keyboard()
-            )
-    elif callback_data == "show_stats":
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка перезавантаження**\n\n{str(e)}",
+            reply_markup=get_diagnostics_keyboard()
+        )
+
+
+# Видалення проектів з меню: Twitter
+@callback_router.prefix("delete_twitter_")
+async def cb_delete_twitter(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    project_id = int(callback_data.split('_')[-1])
+    project = project_manager.get_project_by_id(user_id, project_id)
+    if not project:
+        await query.edit_message_text("❌ Проект не знайдено.", reply_markup=get_twitter_projects_keyboard(user_id))
+        return
+    removed_username: Optional[str] = extract_twitter_username(project.get('url', ''))
+    if project_manager.remove_project(user_id, project_id):
+        # Синхронізуємо монітори після видалення
+        sync_monitors_with_projects()
+        
+        # Зупиняємо моніторинг цього акаунта відразу
         try:
-            stats = project_manager.get_statistics()
-            user_projects = project_manager.get_user_projects(user_id)
-            discord_projects = [p for p in user_projects if p['platform'] == 'discord']
-            forward_status = project_manager.get_forward_status(user_id)
-            
-            # Підраховуємо відстежені повідомлення
-            sent_messages = project_manager.data['settings'].get('sent_messages', {})
-            total_tracked = sum(
-                len(channel_messages) 
-                for user_messages in sent_messages.values() 
-                for channel_messages in user_messages.values()
-            )
-            
-            stats_text = (
-                f"📊 **Статистика системи**\n\n"
-                f"👥 Всього користувачів: {stats['total_users']}\n"
-                f"📋 Всього проектів: {stats['total_projects']}\n"
-                f"🔗 Discord проектів: {len(discord_projects)}\n"
-                f"🐦 Twitter проектів: {len([p for p in user_projects if p['platform'] == 'twitter'])}\n\n"
-                f"📢 **Пересилання:**\n"
-                f"🔄 Статус: {'✅ Увімкнено' if forward_status['enabled'] else '❌ Вимкнено'}\n"
-                f"📺 Канал: {forward_status['channel_id'] or 'Не встановлено'}\n\n"
-                f"💾 **Дані:**\n"
-                f"📁 Розмір файлу: {stats.get('data_size', 'Невідомо')}\n"
-                f"📨 Відстежених повідомлень: {total_tracked}\n"
-                f"🕒 Останнє оновлення: {stats.get('last_update', 'Невідомо')}"
-            )
-            
-            await query.edit_message_text(
-                stats_text,
-                reply_markup=get_diagnostics_keyboard()
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка отримання статистики**\n\n{str(e)}",
-                reply_markup=get_diagnostics_keyboard()
-            )
-    elif callback_data == "reload_data":
+            if twitter_monitor and removed_username:
+                twitter_monitor.remove_account(removed_username)
+        except Exception:
+            pass
+        if selenium_twitter_monitor and removed_username and removed_username in getattr(selenium_twitter_monitor, 'monitoring_accounts', set()):
+            selenium_twitter_monitor.monitoring_accounts.discard(removed_username)
+            if removed_username in selenium_twitter_monitor.seen_tweets:
+                del selenium_twitter_monitor.seen_tweets[removed_username]
+        # Також приберемо із збережених Selenium акаунтів, якщо це був він
         try:
-            # Перезавантажуємо дані
-            project_manager.load_data()
-            # Проводимо синхронізацію моніторів
-            sync_monitors_with_projects()
-            
-            # Перезапускаємо Discord моніторинг
-            if discord_monitor:
-                discord_monitor.monitoring_channels.clear()
-                for user_id_str, projects in project_manager.data['projects'].items():
-                    for project in projects:
-                        if project['platform'] == 'discord':
-                            channel_id = project['link'].split('/')[-1]
-                            discord_monitor.add_channel(channel_id)
-            
-            await query.edit_message_text(
-                "🔄 **Дані перезавантажено**\n\n✅ Проекти оновлено\n✅ Discord канали оновлено\n✅ Налаштування оновлено",
-                reply_markup=get_diagnostics_keyboard()
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка перезавантаження**\n\n{str(e)}",
-                reply_markup=get_diagnostics_keyboard()
-            )
-    # Видалення проектів з меню: Twitter
-    elif callback_data.startswith("delete_twitter_"):
-        project_id = int(callback_data.split('_')[-1])
-        project = project_manager.get_project_by_id(user_id, project_id)
-        if not project:
-            await query.edit_message_text("❌ Проект не знайдено.", reply_markup=get_twitter_projects_keyboard(user_id))
-            return
-        removed_username: Optional[str] = extract_twitter_username(project.get('url', ''))
-        if project_manager.remove_project(user_id, project_id):
-            # Синхронізуємо монітори після видалення
-            sync_monitors_with_projects()
-            
-            # Зупиняємо моніторинг цього акаунта відразу
-            try:
-                if twitter_monitor and removed_username:
-                    twitter_monitor.remove_account(removed_username)
-            except Exception:
-                pass
-            if selenium_twitter_monitor and removed_username and removed_username in getattr(selenium_twitter_monitor, 'monitoring_accounts', set()):
-                selenium_twitter_monitor.monitoring_accounts.discard(removed_username)
-                if removed_username in selenium_twitter_monitor.seen_tweets:
-                    del selenium_twitter_monitor.seen_tweets[removed_username]
-            # Також приберемо із збережених Selenium акаунтів, якщо це був він
-            try:
-                if removed_username:
-                    project_manager.remove_selenium_account(removed_username)
-            except Exception:
-                pass
-            # Синхронізація після змін
-            sync_monitors_with_projects()
-            await query.edit_message_text(
-                f"✅ Twitter акаунт @{removed_username or 'Unknown'} видалено та зупинено моніторинг.",
-                reply_markup=get_twitter_projects_keyboard(user_id)
-            )
-        else:
-            await query.edit_message_text(
-                "❌ Помилка видалення Twitter проекту.",
-                reply_markup=get_twitter_projects_keyboard(user_id)
-            )
-    # Видалення проектів з меню: Discord
-    elif callback_data.startswith("delete_discord_"):
-        project_id = int(callback_data.split('_')[-1])
-        project = project_manager.get_project_by_id(user_id, project_id)
-        if not project:
-            await query.edit_message_text("❌ Проект не знайдено.", reply_markup=get_discord_projects_keyboard(user_id))
-            return
-        channel_id = extract_discord_channel_id(project.get('url', ''))
-        if project_manager.remove_project(user_id, project_id):
-            # Синхронізуємо монітори після видалення
-            sync_monitors_with_projects()
-            
-            # Зупиняємо моніторинг цього каналу відразу
-            if discord_monitor and channel_id in getattr(discord_monitor, 'monitoring_channels', set()):
-                discord_monitor.monitoring_channels.discard(channel_id)
-                if channel_id in discord_monitor.last_message_ids:
-                    del discord_monitor.last_message_ids[channel_id]
-            # Синхронізація після змін
-            sync_monitors_with_projects()
-            await query.edit_message_text(
-                f"✅ Discord канал {channel_id} видалено та зупинено моніторинг.",
-                reply_markup=get_discord_projects_keyboard(user_id)
-            )
-        else:
-            await query.edit_message_text(
-                "❌ Помилка видалення Discord проекту.",
-                reply_markup=get_discord_projects_keyboard(user_id)
-            )
-    
-    # Обробники адміністративної панелі
-    elif callback_data == "admin_panel":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ **Доступ заборонено!**\n\nТільки адміністратор має доступ до цієї панелі.",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
+            if removed_username:
+                project_manager.remove_selenium_account(removed_username)
+        except Exception:
+            pass
+        # Синхронізація після змін
+        sync_monitors_with_projects()
         await query.edit_message_text(
-            "👑 **Адміністративна панель**\n\n"
-            "🎯 **Добро пожаловать в центр управления!**\n\n"
-            "📊 **Доступные разделы:**\n"
-            "• 👥 Управление пользователями\n"
-            "• 📊 Статистика и аналитика\n"
-            "• 🔧 Системное управление\n"
-            "• 📋 Просмотр всех проектов\n"
-            "• 🔍 Поиск и фильтры\n"
-            "• 📈 Мониторинг системы\n"
-            "• ⚙️ Настройки\n\n"
-            "Выберите нужный раздел для работы:",
-            reply_markup=get_admin_panel_keyboard(),
-        )
-    elif callback_data == "admin_users":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-            
+            f"✅ Twitter акаунт @{removed_username or 'Unknown'} видалено та зупинено моніторинг.",
+            reply_markup=get_twitter_projects_keyboard(user_id)
+        )
+    else:
         await query.edit_message_text(
-            "👥 **Управління користувачами**\n\n"
-            "🎯 **Центр управления пользователями**\n\n"
-            "📋 **Доступные действия:**\n"
-            "• 👥 Просмотр списка пользователей\n"
-            "• 📊 Статистика пользователей\n"
-            "• ➕ Добавление новых пользователей\n"
-            "• 👑 Создание администраторов\n"
-            "• 🔍 Поиск пользователей\n"
-            "• 🔄 Изменение ролей\n"
-            "• 🔐 Сброс паролей\n"
-            "• 🔁 Настройка пересылки\n"
-            "• 🗑️ Удаление пользователей\n"
-            "• 📈 Активность пользователей\n\n"
-            "Выберите нужное действие:",
-            reply_markup=get_admin_users_keyboard(),
+            "❌ Помилка видалення Twitter проекту.",
+            reply_markup=get_twitter_projects_keyboard(user_id)
         )
-    elif callback_data == "admin_create_for_user":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text("❌ Доступ заборонено!", reply_markup=get_main_menu_keyboard(user_id))
-            return
-        # Перший крок: ввести Telegram ID цільового користувача
-        user_states[user_id] = {
-            'state': 'admin_creating_project_for_user',
-            'data': {'step': 'telegram_id'}
-        }
+
+
+# Видалення проектів з меню: Discord
+@callback_router.prefix("delete_discord_")
+async def cb_delete_discord(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    project_id = int(callback_data.split('_')[-1])
+    project = project_manager.get_project_by_id(user_id, project_id)
+    if not project:
+        await query.edit_message_text("❌ Проект не знайдено.", reply_markup=get_discord_projects_keyboard(user_id))
+        return
+    channel_id = extract_discord_channel_id(project.get('url', ''))
+    if project_manager.remove_project(user_id, project_id):
+        # Синхронізуємо монітори після видалення
+        sync_monitors_with_projects()
+        
+        # Зупиняємо моніторинг цього каналу відразу
+        if discord_monitor and channel_id in getattr(discord_monitor, 'monitoring_channels', set()):
+            discord_monitor.monitoring_channels.discard(channel_id)
+            if channel_id in discord_monitor.last_message_ids:
+                del discord_monitor.last_message_ids[channel_id]
+        # Синхронізація після змін
+        sync_monitors_with_projects()
         await query.edit_message_text(
-            "➕ **Створення проекту для користувача**\n\nВведіть Telegram ID користувача:",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("❌ Скасувати", callback_data="admin_panel")]])
+            f"✅ Discord канал {channel_id} видалено та зупинено моніторинг.",
+            reply_markup=get_discord_projects_keyboard(user_id)
         )
-    elif callback_data == "admin_forward":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        # Запитуємо target user id
-        user_states[user_id] = {
-            'state': 'admin_forward_select_user',
-            'data': {}
-        }
+    else:
         await query.edit_message_text(
-            "🔁 **Керування пересиланням (користувач)**\n\nВведіть Telegram ID користувача:",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")]])
+            "❌ Помилка видалення Discord проекту.",
+            reply_markup=get_discord_projects_keyboard(user_id)
         )
-    elif callback_data == "admin_stats":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-            
-        try:
-            stats = project_manager.get_project_statistics(user_id)
-            users_list = project_manager.get_all_users_with_projects(user_id)
-            
-            stats_text = (
-                f"📊 **Статистика системи**\n\n"
-                f"👥 Всього користувачів: {stats['total_users']}\n"
-                f"✅ Активних користувачів: {stats['active_users']}\n"
-                f"📋 Всього проектів: {stats['total_projects']}\n"
-                f"🐦 Twitter проектів: {stats['twitter_projects']}\n"
-                f"💬 Discord проектів: {stats['discord_projects']}\n"
-                f"🚀 Selenium акаунтів: {stats['selenium_accounts']}\n\n"
-                f"👑 **Адміністраторів:** {len(access_manager.get_all_admins())}\n"
-                f"👤 **Звичайних користувачів:** {len(access_manager.get_all_users_by_role('user'))}"
-            )
-            
-            await query.edit_message_text(
-                stats_text,
-                reply_markup=get_admin_panel_keyboard()
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка отримання статистики**\n\n{str(e)}",
-                reply_markup=get_admin_panel_keyboard()
-            )
-    elif callback_data == "admin_list_users":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-            
-        try:
-            all_users = access_manager.get_all_users()
-            
-            if not all_users:
-                await query.edit_message_text(
-                    "👥 **Список користувачів**\n\n"
-                    "Користувачів не знайдено.",
-                    reply_markup=get_admin_users_keyboard()
-                )
-                return
-            
-            users_text = "👥 **Список користувачів**\n\n"
-            
-            for i, user in enumerate(all_users[:10], 1):  # Показуємо перших 10
-                role_emoji = "👑" if user.get('role', 'user') == 'admin' else "👤"
-                status_emoji = "✅" if user.get('is_active', True) else "❌"
-                
-                users_text += (
-                    f"{i}. {role_emoji} {user.get('username', 'Без імені')}\n"
-                    f"   ID: {user.get('telegram_id')}\n"
-                    f"   Статус: {status_emoji}\n"
-                    f"   Створено: {user.get('created_at', '')[:10]}\n\n"
-                )
-            
-            if len(all_users) > 10:
-                users_text += f"... та ще {len(all_users) - 10} користувачів"
-            
-            await query.edit_message_text(
-                users_text,
-                reply_markup=get_admin_users_keyboard()
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка отримання списку користувачів**\n\n{str(e)}",
-                reply_markup=get_admin_users_keyboard()
-            )
-    elif callback_data == "admin_all_projects":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-            
-        try:
-            all_projects = project_manager.get_all_projects(user_id)
-            total_projects = sum(len(projects) for projects in all_projects.values())
-            
-            if total_projects == 0:
-                await query.edit_message_text(
-                    "📋 **Всі проекти**\n\n"
-                    "Проектів не знайдено.",
-                    reply_markup=get_admin_panel_keyboard()
-                )
-                return
-            
-            projects_text = f"📋 **Всі проекти** (Всього: {total_projects})\n\n"
-            
-            shown_projects = 0
-            for user_id_str, projects in all_projects.items():
-                if shown_projects >= 5:  # Показуємо тільки перші 5 користувачів
-                    break
-                    
-                user_data = access_manager.get_user_by_telegram_id(int(user_id_str))
-                username = user_data.get('username', 'Без імені') if user_data else 'Невідомий'
-                
-                projects_text += f"👤 **{username}** ({len(projects)} проектів):\n"
-                
-                for project in projects[:3]:  # По 3 проекти на користувача
-                    platform_emoji = "🐦" if project.get('platform') == 'twitter' else "💬"
-                    projects_text += f"   {platform_emoji} {project.get('name', 'Без назви')}\n"
-                
-                if len(projects) > 3:
-                    projects_text += f"   ... та ще {len(projects) - 3} проектів\n"
-                
-                projects_text += "\n"
-                shown_projects += 1
-            
-            if len(all_projects) > 5:
-                projects_text += f"... та ще {len(all_projects) - 5} користувачів з проектами"
-            
-            await query.edit_message_text(
-                projects_text,
-                reply_markup=get_admin_panel_keyboard()
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка отримання проектів**\n\n{str(e)}",
-                reply_markup=get_admin_panel_keyboard()
-            )
-    elif callback_data == "admin_add_user":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
-        # Встановлюємо стан для створення користувача
-        user_states[user_id] = {
-            'state': 'admin_creating_user',
-            'data': {'step': 'telegram_id'}
-        }
+
+
+# Обробники адміністративної панелі
+@callback_router.route("admin_panel")
+async def cb_admin_panel(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ **Доступ заборонено!**\n\nТільки адміністратор має доступ до цієї панелі.",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    await query.edit_message_text(
+        "👑 **Адміністративна панель**\n\n"
+        "🎯 **Добро пожаловать в центр управления!**\n\n"
+        "📊 **Доступные разделы:**\n"
+        "• 👥 Управление пользователями\n"
+        "• 📊 Статистика и аналитика\n"
+        "• 🔧 Системное управление\n"
+        "• 📋 Просмотр всех проектов\n"
+        "• 🔍 Поиск и фильтры\n"
+        "• 📈 Мониторинг системы\n"
+        "• ⚙️ Настройки\n\n"
+        "Выберите нужный раздел для работы:",
+        reply_markup=get_admin_panel_keyboard(),
+    )
+
+
+@callback_router.route("admin_users")
+async def cb_admin_users(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
         
+    await query.edit_message_text(
+        "👥 **Управління користувачами**\n\n"
+        "🎯 **Центр управления пользователями**\n\n"
+        "📋 **Доступные действия:**\n"
+        "• 👥 Просмотр списка пользователей\n"
+        "• 📊 Статистика пользователей\n"
+        "• ➕ Добавление новых пользователей\n"
+        "• 👑 Создание администраторов\n"
+        "• 🔍 Поиск пользователей\n"
+        "• 🔄 Изменение ролей\n"
+        "• 🔐 Сброс паролей\n"
+        "• 🔁 Настройка пересылки\n"
+        "• 🗑️ Удаление пользователей\n"
+        "• 📈 Активность пользователей\n\n"
+        "Выберите нужное действие:",
+        reply_markup=get_admin_users_keyboard(),
+    )
+
+
+@callback_router.route("admin_create_for_user")
+async def cb_admin_create_for_user(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text("❌ Доступ заборонено!", reply_markup=get_main_menu_keyboard(user_id))
+        return
+    # Перший крок: ввести Telegram ID цільового користувача
+    user_states[user_id] = {
+        'state': 'admin_creating_project_for_user',
+        'data': {'step': 'telegram_id'}
+    }
+    await query.edit_message_text(
+        "➕ **Створення проекту для користувача**\n\nВведіть Telegram ID користувача:",
+        reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("❌ Скасувати", callback_data="admin_panel")]])
+    )
+
+
+@callback_router.route("admin_forward")
+async def cb_admin_forward(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
         await query.edit_message_text(
-            "👤 **Створення нового користувача**\n\n"
-            "Введіть Telegram ID користувача:\n\n"
-            "💡 **Приклад:** 123456789",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")
-            ]])
-        )
-    elif callback_data == "admin_add_admin":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    # Запитуємо target user id
+    user_states[user_id] = {
+        'state': 'admin_forward_select_user',
+        'data': {}
+    }
+    await query.edit_message_text(
+        "🔁 **Керування пересиланням (користувач)**\n\nВведіть Telegram ID користувача:",
+        reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")]])
+    )
+
+
+@callback_router.route("admin_stats")
+async def cb_admin_stats(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
         
-        # Встановлюємо стан для створення адміністратора
-        user_states[user_id] = {
-            'state': 'admin_creating_admin',
-            'data': {'step': 'telegram_id'}
-        }
+    try:
+        stats = project_manager.get_project_statistics(user_id)
+        users_list = project_manager.get_all_users_with_projects(user_id)
+        
+        stats_text = (
+            f"📊 **Статистика системи**\n\n"
+            f"👥 Всього користувачів: {stats['total_users']}\n"
+            f"✅ Активних користувачів: {stats['active_users']}\n"
+            f"📋 Всього проектів: {stats['total_projects']}\n"
+            f"🐦 Twitter проектів: {stats['twitter_projects']}\n"
+            f"💬 Discord проектів: {stats['discord_projects']}\n"
+            f"🚀 Selenium акаунтів: {stats['selenium_accounts']}\n\n"
+            f"👑 **Адміністраторів:** {len(access_manager.get_all_admins())}\n"
+            f"👤 **Звичайних користувачів:** {len(access_manager.get_all_users_by_role('user'))}"
+        )
         
         await query.edit_message_text(
-            "👑 **Створення нового адміністратора**\n\n"
-            "Введіть Telegram ID адміністратора:\n\n"
-            "💡 **Приклад:** 123456789",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")
-            ]])
-        )
-    elif callback_data == "admin_search_user":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+            stats_text,
+            reply_markup=get_admin_panel_keyboard()
+        )
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка отримання статистики**\n\n{str(e)}",
+            reply_markup=get_admin_panel_keyboard()
+        )
+
+
+@callback_router.route("admin_list_users")
+async def cb_admin_list_users(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
         
-        # Встановлюємо стан для пошуку
-        user_states[user_id] = {
-            'state': 'admin_searching_user',
-            'data': {}
-        }
+    try:
+        all_users = access_manager.get_all_users()
         
-        await query.edit_message_text(
-            "🔍 **Пошук користувача**\n\n"
-            "Введіть username або Telegram ID для пошуку:\n\n"
-            "💡 **Приклади:**\n"
-            "• JohnDoe (пошук за username)\n"
-            "• 123456789 (пошук за Telegram ID)",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")
-            ]])
-        )
-    elif callback_data == "admin_delete_user":
-        if not access_manager.is_admin(user_id):
+        if not all_users:
             await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
+                "👥 **Список користувачів**\n\n"
+                "Користувачів не знайдено.",
+                reply_markup=get_admin_users_keyboard()
             )
             return
         
-        # Встановлюємо стан для видалення
-        user_states[user_id] = {
-            'state': 'admin_deleting_user',
-            'data': {}
-        }
+        users_text = "👥 **Список користувачів**\n\n"
         
-        await query.edit_message_text(
-            "🗑️ **Видалення користувача**\n\n"
-            "⚠️ **УВАГА!** Ця дія видалить користувача повністю!\n\n"
-            "Введіть Telegram ID користувача для видалення:\n\n"
-            "💡 **Приклад:** 123456789",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")
-            ]])
-        )
-    elif callback_data == "admin_change_role":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
+        for i, user in enumerate(all_users[:10], 1):  # Показуємо перших 10
+            role_emoji = "👑" if user.get('role', 'user') == 'admin' else "👤"
+            status_emoji = "✅" if user.get('is_active', True) else "❌"
+            
+            users_text += (
+                f"{i}. {role_emoji} {user.get('username', 'Без імені')}\n"
+                f"   ID: {user.get('telegram_id')}\n"
+                f"   Статус: {status_emoji}\n"
+                f"   Створено: {user.get('created_at', '')[:10]}\n\n"
             )
-            return
         
-        # Встановлюємо стан для зміни ролі
-        user_states[user_id] = {
-            'state': 'admin_changing_role',
-            'data': {'step': 'telegram_id'}
-        }
+        if len(all_users) > 10:
+            users_text += f"... та ще {len(all_users) - 10} користувачів"
         
         await query.edit_message_text(
-            "🔄 **Зміна ролі користувача**\n\n"
-            "Введіть Telegram ID користувача:\n\n"
-            "💡 **Приклад:** 123456789",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")
-            ]])
-        )
-    elif callback_data == "admin_reset_password":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+            users_text,
+            reply_markup=get_admin_users_keyboard()
+        )
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка отримання списку користувачів**\n\n{str(e)}",
+            reply_markup=get_admin_users_keyboard()
+        )
+
+
+@callback_router.route("admin_all_projects")
+async def cb_admin_all_projects(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
         
-        # Встановлюємо стан для скидання паролю
-        user_states[user_id] = {
-            'state': 'admin_resetting_password',
-            'data': {'step': 'telegram_id'}
-        }
+    try:
+        all_projects = project_manager.get_all_projects(user_id)
+        total_projects = sum(len(projects) for projects in all_projects.values())
         
-        await query.edit_message_text(
-            "🔐 **Скидання паролю користувача**\n\n"
-            "Введіть Telegram ID користувача:\n\n"
-            "💡 **Приклад:** 123456789",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")
-            ]])
-        )
-    elif callback_data == "admin_user_stats":
-        if not access_manager.is_admin(user_id):
+        if total_projects == 0:
             await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
+                "📋 **Всі проекти**\n\n"
+                "Проектів не знайдено.",
+                reply_markup=get_admin_panel_keyboard()
             )
             return
         
-        try:
-            stats = access_manager.get_user_statistics()
-            
-            stats_text = (
-                f"📊 **Статистика користувачів**\n\n"
-                f"👥 **Загальна статистика:**\n"
-                f"• Всього користувачів: {stats['total_users']}\n"
-                f"• Активних: {stats['active_users']}\n"
-                f"• Неактивних: {stats['inactive_users']}\n\n"
-                f"👑 **За ролями:**\n"
-                f"• Адміністраторів: {stats['admin_users']}\n"
-                f"• Звичайних користувачів: {stats['regular_users']}\n\n"
-                f"🟢 **Активність:**\n"
-                f"• Онлайн зараз: {stats['online_users']}\n"
-                f"• Входили за останні 24 год: {stats['recent_logins']}"
-            )
-            
-            await query.edit_message_text(
-                stats_text,
-                reply_markup=get_admin_users_keyboard()
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка отримання статистики**\n\n{str(e)}",
-                reply_markup=get_admin_users_keyboard()
-            )
-    
-    # Нові обробники для статистики
-    elif callback_data == "admin_general_stats":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+        projects_text = f"📋 **Всі проекти** (Всього: {total_projects})\n\n"
         
-        try:
-            user_stats = access_manager.get_user_statistics()
-            system_stats = access_manager.get_system_statistics()
+        shown_projects = 0
+        for user_id_str, projects in all_projects.items():
+            if shown_projects >= 5:  # Показуємо тільки перші 5 користувачів
+                break
+                
+            user_data = access_manager.get_user_by_telegram_id(int(user_id_str))
+            username = user_data.get('username', 'Без імені') if user_data else 'Невідомий'
             
-            stats_text = (
-                f"📊 **Загальна статистика системи**\n\n"
-                f"👥 **Користувачі:**\n"
-                f"• Всього користувачів: {user_stats['total_users']}\n"
-                f"• Активних: {user_stats['active_users']}\n"
-                f"• Адміністраторів: {user_stats['admin_users']}\n"
-                f"• Звичайних: {user_stats['regular_users']}\n\n"
-                f"📋 **Проекти:**\n"
-                f"• Всього проектів: {system_stats.get('total_projects', 0)}\n"
-                f"• Активних: {system_stats.get('active_projects', 0)}\n\n"
-                f"🟢 **Активність:**\n"
-                f"• Онлайн зараз: {user_stats['online_users']}\n"
-                f"• Входили за 24 год: {user_stats['recent_logins']}\n"
-                f"• Активних сесій: {system_stats.get('active_sessions', 0)}\n\n"
-                f"💾 **Система:**\n"
-                f"• Время работы: {system_stats.get('uptime', 'N/A')}\n"
-                f"• Версия: 2.0 Enhanced"
-            )
+            projects_text += f"👤 **{username}** ({len(projects)} проектів):\n"
             
-            await query.edit_message_text(
-                stats_text,
-                reply_markup=get_admin_stats_keyboard(),
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка отримання статистики**\n\n{str(e)}",
-                reply_markup=get_admin_stats_keyboard()
-            )
-    
-    elif callback_data == "admin_project_stats":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
-        try:
-            all_projects = project_manager.get_all_projects(user_id)
-            twitter_projects = [p for projects in all_projects.values() for p in projects if p.get('platform') == 'twitter']
-            discord_projects = [p for projects in all_projects.values() for p in projects if p.get('platform') == 'discord']
+            for project in projects[:3]:  # По 3 проекти на користувача
+                platform_emoji = "🐦" if project.get('platform') == 'twitter' else "💬"
+                projects_text += f"   {platform_emoji} {project.get('name', 'Без назви')}\n"
             
-            stats_text = (
-                f"📋 **Статистика проектів**\n\n"
-                f"📊 **Загальна статистика:**\n"
-                f"• Всього проектів: {sum(len(projects) for projects in all_projects.values())}\n"
-                f"• Twitter проектів: {len(twitter_projects)}\n"
-                f"• Discord проектів: {len(discord_projects)}\n\n"
-                f"🐦 **Twitter проекти:**\n"
-                f"• Активних: {len([p for p in twitter_projects if p.get('active', False)])}\n"
-                f"• Неактивних: {len([p for p in twitter_projects if not p.get('active', False)])}\n\n"
-                f"💬 **Discord проекти:**\n"
-                f"• Активних: {len([p for p in discord_projects if p.get('active', False)])}\n"
-                f"• Неактивних: {len([p for p in discord_projects if not p.get('active', False)])}\n\n"
-                f"📈 **Популярні платформи:**\n"
-                f"• Twitter: {len(twitter_projects)} проектів\n"
-                f"• Discord: {len(discord_projects)} проектів"
-            )
+            if len(projects) > 3:
+                projects_text += f"   ... та ще {len(projects) - 3} проектів\n"
             
-            await query.edit_message_text(
-                stats_text,
-                reply_markup=get_admin_stats_keyboard(),
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка отримання статистики проектів**\n\n{str(e)}",
-                reply_markup=get_admin_stats_keyboard()
-            )
-    
-    elif callback_data == "admin_charts":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+            projects_text += "\n"
+            shown_projects += 1
+        
+        if len(all_projects) > 5:
+            projects_text += f"... та ще {len(all_projects) - 5} користувачів з проектами"
         
         await query.edit_message_text(
-            "📈 **Графіки та діаграми**\n\n"
-            "🎯 **Візуальна аналітика**\n\n"
-            "📊 **Доступні графіки:**\n"
-            "• 📈 Графік активності користувачів\n"
-            "• 📊 Діаграма розподілу проектів\n"
-            "• 📅 Графік створення проектів\n"
-            "• 🔄 Графік активності моніторингу\n"
-            "• 📱 Статистика платформ\n\n"
-            "⚠️ **Примітка:** Графіки будуть додані в наступних версіях\n"
-            "Поки що доступна текстова статистика.",
-            reply_markup=get_admin_stats_keyboard(),
+            projects_text,
+            reply_markup=get_admin_panel_keyboard()
+        )
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка отримання проектів**\n\n{str(e)}",
+            reply_markup=get_admin_panel_keyboard()
         )
+
+
+@callback_router.route("admin_add_user")
+async def cb_admin_add_user(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
     
-    elif callback_data == "admin_export_data":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
+    # Встановлюємо стан для створення користувача
+    user_states[user_id] = {
+        'state': 'admin_creating_user',
+        'data': {'step': 'telegram_id'}
+    }
+    
+    await query.edit_message_text(
+        "👤 **Створення нового користувача**\n\n"
+        "Введіть Telegram ID користувача:\n\n"
+        "💡 **Приклад:** 123456789",
+        reply_markup=InlineKeyboardMarkup([[
+            InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")
+        ]])
+    )
+
+
+@callback_router.route("admin_add_admin")
+async def cb_admin_add_admin(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
         await query.edit_message_text(
-            "📤 **Експорт даних**\n\n"
-            "🎯 **Експорт системних даних**\n\n"
-            "📋 **Доступні формати:**\n"
-            "• 📊 Excel файл (.xlsx)\n"
-            "• 📄 CSV файл (.csv)\n"
-            "• 📋 JSON файл (.json)\n"
-            "• 📝 Текстовий файл (.txt)\n\n"
-            "⚠️ **Примітка:** Функція експорту буде додана в наступних версіях\n"
-            "Поки що дані доступні через адмін панель.",
-            reply_markup=get_admin_stats_keyboard(),
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
         )
+        return
     
-    elif callback_data == "admin_system_stats":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
-        try:
-            stats = access_manager.get_system_statistics()
-            
-            stats_text = (
-                f"📊 **Системна статистика**\n\n"
-                f"👥 **Користувачі:**\n"
-                f"• Всього користувачів: {stats['total_users']}\n"
-                f"• Активних сесій: {stats['active_sessions']}\n\n"
-                f"📋 **Проекти:**\n"
-                f"• Всього проектів: {stats['total_projects']}\n"
-                f"• Активних моніторів: {stats['active_monitors']}\n\n"
-                f"⚙️ **Система:**\n"
-                f"• Статус: {stats['system_uptime']}\n"
-                f"• Останній бекап: {stats['last_backup']}\n"
-                f"• Використання сховища: {stats['storage_usage']} символів"
-            )
-            
-            await query.edit_message_text(
-                stats_text,
-                reply_markup=get_admin_system_keyboard()
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка отримання статистики**\n\n{str(e)}",
-                reply_markup=get_admin_system_keyboard()
-            )
-    elif callback_data == "admin_system_logs":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+    # Встановлюємо стан для створення адміністратора
+    user_states[user_id] = {
+        'state': 'admin_creating_admin',
+        'data': {'step': 'telegram_id'}
+    }
+    
+    await query.edit_message_text(
+        "👑 **Створення нового адміністратора**\n\n"
+        "Введіть Telegram ID адміністратора:\n\n"
+        "💡 **Приклад:** 123456789",
+        reply_markup=InlineKeyboardMarkup([[
+            InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")
+        ]])
+    )
+
+
+@callback_router.route("admin_search_user")
+async def cb_admin_search_user(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    # Встановлюємо стан для пошуку
+    user_states[user_id] = {
+        'state': 'admin_searching_user',
+        'data': {}
+    }
+    
+    await query.edit_message_text(
+        "🔍 **Пошук користувача**\n\n"
+        "Введіть username або Telegram ID для пошуку:\n\n"
+        "💡 **Приклади:**\n"
+        "• JohnDoe (пошук за username)\n"
+        "• 123456789 (пошук за Telegram ID)",
+        reply_markup=InlineKeyboardMarkup([[
+            InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")
+        ]])
+    )
+
+
+@callback_router.route("admin_delete_user")
+async def cb_admin_delete_user(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    # Встановлюємо стан для видалення
+    user_states[user_id] = {
+        'state': 'admin_deleting_user',
+        'data': {}
+    }
+    
+    await query.edit_message_text(
+        "🗑️ **Видалення користувача**\n\n"
+        "⚠️ **УВАГА!** Ця дія видалить користувача повністю!\n\n"
+        "Введіть Telegram ID користувача для видалення:\n\n"
+        "💡 **Приклад:** 123456789",
+        reply_markup=InlineKeyboardMarkup([[
+            InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")
+        ]])
+    )
+
+
+@callback_router.route("admin_change_role")
+async def cb_admin_change_role(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    # Встановлюємо стан для зміни ролі
+    user_states[user_id] = {
+        'state': 'admin_changing_role',
+        'data': {'step': 'telegram_id'}
+    }
+    
+    await query.edit_message_text(
+        "🔄 **Зміна ролі користувача**\n\n"
+        "Введіть Telegram ID користувача:\n\n"
+        "💡 **Приклад:** 123456789",
+        reply_markup=InlineKeyboardMarkup([[
+            InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")
+        ]])
+    )
+
+
+@callback_router.route("admin_reset_password")
+async def cb_admin_reset_password(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    # Встановлюємо стан для скидання паролю
+    user_states[user_id] = {
+        'state': 'admin_resetting_password',
+        'data': {'step': 'telegram_id'}
+    }
+    
+    await query.edit_message_text(
+        "🔐 **Скидання паролю користувача**\n\n"
+        "Введіть Telegram ID користувача:\n\n"
+        "💡 **Приклад:** 123456789",
+        reply_markup=InlineKeyboardMarkup([[
+            InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")
+        ]])
+    )
+
+
+@callback_router.route("admin_user_stats")
+async def cb_admin_user_stats(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    try:
+        stats = access_manager.get_user_statistics()
+        
+        stats_text = (
+            f"📊 **Статистика користувачів**\n\n"
+            f"👥 **Загальна статистика:**\n"
+            f"• Всього користувачів: {stats['total_users']}\n"
+            f"• Активних: {stats['active_users']}\n"
+            f"• Неактивних: {stats['inactive_users']}\n\n"
+            f"👑 **За ролями:**\n"
+            f"• Адміністраторів: {stats['admin_users']}\n"
+            f"• Звичайних користувачів: {stats['regular_users']}\n\n"
+            f"🟢 **Активність:**\n"
+            f"• Онлайн зараз: {stats['online_users']}\n"
+            f"• Входили за останні 24 год: {stats['recent_logins']}"
+        )
         
-        try:
-            logs = access_manager.get_logs(20)  # Останні 20 записів
-            
-            if not logs:
-                logs_text = "📋 **Логи системи**\n\n❌ Логи відсутні"
-            else:
-                logs_text = "📋 **Логи системи** (останні 20 записів)\n\n"
-                for log in logs:
-                    logs_text += f"• {log}\n"
-            
+        await query.edit_message_text(
+            stats_text,
+            reply_markup=get_admin_users_keyboard()
+        )
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка отримання статистики**\n\n{str(e)}",
+            reply_markup=get_admin_users_keyboard()
+        )
+
+
+# Нові обробники для статистики
+@callback_router.route("admin_general_stats")
+async def cb_admin_general_stats(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    try:
+        user_stats = access_manager.get_user_statistics()
+        system_stats = access_manager.get_system_statistics()
+        
+        stats_text = (
+            f"📊 **Загальна статистика системи**\n\n"
+            f"👥 **Користувачі:**\n"
+            f"• Всього користувачів: {user_stats['total_users']}\n"
+            f"• Активних: {user_stats['active_users']}\n"
+            f"• Адміністраторів: {user_stats['admin_users']}\n"
+            f"• Звичайних: {user_stats['regular_users']}\n\n"
+            f"📋 **Проекти:**\n"
+            f"• Всього проектів: {system_stats.get('total_projects', 0)}\n"
+            f"• Активних: {system_stats.get('active_projects', 0)}\n\n"
+            f"🟢 **Активність:**\n"
+            f"• Онлайн зараз: {user_stats['online_users']}\n"
+            f"• Входили за 24 год: {user_stats['recent_logins']}\n"
+            f"• Активних сесій: {system_stats.get('active_sessions', 0)}\n\n"
+            f"💾 **Система:**\n"
+            f"• Время работы: {system_stats.get('uptime', 'N/A')}\n"
+            f"• Версия: 2.0 Enhanced"
+        )
+        
+        await query.edit_message_text(
+            stats_text,
+            reply_markup=get_admin_stats_keyboard(),
+        )
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка отримання статистики**\n\n{str(e)}",
+            reply_markup=get_admin_stats_keyboard()
+        )
+
+
+@callback_router.route("admin_project_stats")
+async def cb_admin_project_stats(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    try:
+        all_projects = project_manager.get_all_projects(user_id)
+        twitter_projects = [p for projects in all_projects.values() for p in projects if p.get('platform') == 'twitter']
+        discord_projects = [p for projects in all_projects.values() for p in projects if p.get('platform') == 'discord']
+        
+        stats_text = (
+            f"📋 **Статистика проектів**\n\n"
+            f"📊 **Загальна статистика:**\n"
+            f"• Всього проектів: {sum(len(projects) for projects in all_projects.values())}\n"
+            f"• Twitter проектів: {len(twitter_projects)}\n"
+            f"• Discord проектів: {len(discord_projects)}\n\n"
+            f"🐦 **Twitter проекти:**\n"
+            f"• Активних: {len([p for p in twitter_projects if p.get('active', False)])}\n"
+            f"• Неактивних: {len([p for p in twitter_projects if not p.get('active', False)])}\n\n"
+            f"💬 **Discord проекти:**\n"
+            f"• Активних: {len([p for p in discord_projects if p.get('active', False)])}\n"
+            f"• Неактивних: {len([p for p in discord_projects if not p.get('active', False)])}\n\n"
+            f"📈 **Популярні платформи:**\n"
+            f"• Twitter: {len(twitter_projects)} проектів\n"
+            f"• Discord: {len(discord_projects)} проектів"
+        )
+        
+        await query.edit_message_text(
+            stats_text,
+            reply_markup=get_admin_stats_keyboard(),
+        )
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка отримання статистики проектів**\n\n{str(e)}",
+            reply_markup=get_admin_stats_keyboard()
+        )
+
+
+@callback_router.route("admin_charts")
+async def cb_admin_charts(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    await query.edit_message_text(
+        "📈 **Графіки та діаграми**\n\n"
+        "🎯 **Візуальна аналітика**\n\n"
+        "📊 **Доступні графіки:**\n"
+        "• 📈 Графік активності користувачів\n"
+        "• 📊 Діаграма розподілу проектів\n"
+        "• 📅 Графік створення проектів\n"
+        "• 🔄 Графік активності моніторингу\n"
+        "• 📱 Статистика платформ\n\n"
+        "⚠️ **Примітка:** Графіки будуть додані в наступних версіях\n"
+        "Поки що доступна текстова статистика.",
+        reply_markup=get_admin_stats_keyboard(),
+    )
+
+
+@callback_router.route("admin_export_data")
+async def cb_admin_export_data(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    await query.edit_message_text(
+        "📤 **Експорт даних**\n\n"
+        "🎯 **Експорт системних даних**\n\n"
+        "📋 **Доступні формати:**\n"
+        "• 📊 Excel файл (.xlsx)\n"
+        "• 📄 CSV файл (.csv)\n"
+        "• 📋 JSON файл (.json)\n"
+        "• 📝 Текстовий файл (.txt)\n\n"
+        "⚠️ **Примітка:** Функція експорту буде додана в наступних версіях\n"
+        "Поки що дані доступні через адмін панель.",
+        reply_markup=get_admin_stats_keyboard(),
+    )
+
+
+@callback_router.route("admin_system_stats")
+async def cb_admin_system_stats(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    try:
+        stats = access_manager.get_system_statistics()
+        
+        stats_text = (
+            f"📊 **Системна статистика**\n\n"
+            f"👥 **Користувачі:**\n"
+            f"• Всього користувачів: {stats['total_users']}\n"
+            f"• Активних сесій: {stats['active_sessions']}\n\n"
+            f"📋 **Проекти:**\n"
+            f"• Всього проектів: {stats['total_projects']}\n"
+            f"• Активних моніторів: {stats['active_monitors']}\n\n"
+            f"⚙️ **Система:**\n"
+            f"• Статус: {stats['system_uptime']}\n"
+            f"• Останній бекап: {stats['last_backup']}\n"
+            f"• Використання сховища: {stats['storage_usage']} символів"
+        )
+        
+        await query.edit_message_text(
+            stats_text,
+            reply_markup=get_admin_system_keyboard()
+        )
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка отримання статистики**\n\n{str(e)}",
+            reply_markup=get_admin_system_keyboard()
+        )
+
+
+@callback_router.route("admin_system_logs")
+async def cb_admin_system_logs(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    try:
+        logs = access_manager.get_logs(20)  # Останні 20 записів
+        
+        if not logs:
+            logs_text = "📋 **Логи системи**\n\n❌ Логи відсутні"
+        else:
+            logs_text = "📋 **Логи системи** (останні 20 записів)\n\n"
+            for log in logs:
+                logs_text += f"• {log}\n"
+        
+        await query.edit_message_text(
+            logs_text,
+            reply_markup=get_admin_system_keyboard()
+        )
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка отримання логів**\n\n{str(e)}",
+            reply_markup=get_admin_system_keyboard()
+        )
+
+
+@callback_router.route("admin_cleanup_sessions")
+async def cb_admin_cleanup_sessions(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    try:
+        cleaned_count = access_manager.cleanup_inactive_sessions()
+        
+        if cleaned_count > 0:
             await query.edit_message_text(
-                logs_text,
+                f"🔄 **Очищення сесій завершено!**\n\n"
+                f"✅ Очищено {cleaned_count} неактивних сесій\n\n"
+                f"Неактивні користувачі були розлогінені.",
                 reply_markup=get_admin_system_keyboard()
             )
-        except Exception as e:
+        else:
             await query.edit_message_text(
-                f"❌ **Помилка отримання логів**\n\n{str(e)}",
+                f"🔄 **Очищення сесій завершено!**\n\n"
+                f"ℹ️ Неактивних сесій не знайдено\n\n"
+                f"Всі сесії активні.",
                 reply_markup=get_admin_system_keyboard()
             )
-    elif callback_data == "admin_cleanup_sessions":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
-        try:
-            cleaned_count = access_manager.cleanup_inactive_sessions()
-            
-            if cleaned_count > 0:
-                await query.edit_message_text(
-                    f"🔄 **Очищення сесій завершено!**\n\n"
-                    f"✅ Очищено {cleaned_count} неактивних сесій\n\n"
-                    f"Неактивні користувачі були розлогінені.",
-                    reply_markup=get_admin_system_keyboard()
-                )
-            else:
-                await query.edit_message_text(
-                    f"🔄 **Очищення сесій завершено!**\n\n"
-                    f"ℹ️ Неактивних сесій не знайдено\n\n"
-                    f"Всі сесії активні.",
-                    reply_markup=get_admin_system_keyboard()
-                )
-        except Exception as e:
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка очищення сесій**\n\n{str(e)}",
+            reply_markup=get_admin_system_keyboard()
+        )
+
+
+@callback_router.route("admin_create_backup")
+async def cb_admin_create_backup(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    try:
+        if access_manager.backup_data():
             await query.edit_message_text(
-                f"❌ **Помилка очищення сесій**\n\n{str(e)}",
+                f"💾 **Резервна копія створена!**\n\n"
+                f"✅ Дані успішно збережено\n\n"
+                f"Резервна копія збережена в папці 'backups'.",
                 reply_markup=get_admin_system_keyboard()
             )
-    elif callback_data == "admin_create_backup":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
-        try:
-            if access_manager.backup_data():
-                await query.edit_message_text(
-                    f"💾 **Резервна копія створена!**\n\n"
-                    f"✅ Дані успішно збережено\n\n"
-                    f"Резервна копія збережена в папці 'backups'.",
-                    reply_markup=get_admin_system_keyboard()
-                )
-            else:
-                await query.edit_message_text(
-                    f"❌ **Помилка створення резервної копії!**\n\n"
-                    f"Спробуйте ще раз.",
-                    reply_markup=get_admin_system_keyboard()
-                )
-        except Exception as e:
+        else:
             await query.edit_message_text(
-                f"❌ **Помилка створення резервної копії**\n\n{str(e)}",
+                f"❌ **Помилка створення резервної копії!**\n\n"
+                f"Спробуйте ще раз.",
                 reply_markup=get_admin_system_keyboard()
             )
-    elif callback_data == "admin_reset_system":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка створення резервної копії**\n\n{str(e)}",
+            reply_markup=get_admin_system_keyboard()
+        )
+
+
+@callback_router.route("admin_reset_system")
+async def cb_admin_reset_system(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    # Встановлюємо стан для підтвердження скидання
+    user_states[user_id] = {
+        'state': 'admin_resetting_system',
+        'data': {}
+    }
+    
+    await query.edit_message_text(
+        "⚠️ **СКИДАННЯ СИСТЕМИ**\n\n"
+        "🚨 **УВАГА!** Ця дія видалить ВСІХ користувачів крім адміністраторів!\n\n"
+        "📋 **Що буде видалено:**\n"
+        "• Всіх звичайних користувачів\n"
+        "• Всі їхні проекти\n"
+        "• Всі активні сесії\n\n"
+        "✅ **Що буде збережено:**\n"
+        "• Всіх адміністраторів\n"
+        "• Резервна копія буде створена автоматично\n\n"
+        "🔐 **Для підтвердження введіть:** CONFIRM_RESET",
+        reply_markup=InlineKeyboardMarkup([[
+            InlineKeyboardButton("❌ Скасувати", callback_data="admin_system")
+        ]])
+    )
+
+
+# Обробники для моніторингу
+@callback_router.route("admin_monitoring_status")
+async def cb_admin_monitoring_status(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    try:
+        # Отримуємо статус моніторингу
+        discord_status = "🟢 Активний" if discord_monitor else "🔴 Неактивний"
+        twitter_status = "🟢 Активний" if twitter_monitor else "🔴 Неактивний"
+        selenium_status = "🟢 Активний" if selenium_twitter_monitor else "🔴 Неактивний"
         
-        # Встановлюємо стан для підтвердження скидання
-        user_states[user_id] = {
-            'state': 'admin_resetting_system',
-            'data': {}
-        }
+        status_text = (
+            f"📈 **Статус моніторингу**\n\n"
+            f"🎯 **Поточний стан системи:**\n\n"
+            f"💬 **Discord моніторинг:**\n"
+            f"• Статус: {discord_status}\n"
+            f"• Авторизація: {'✅ Налаштована' if DISCORD_AUTHORIZATION else '❌ Не налаштована'}\n\n"
+            f"🐦 **Twitter моніторинг:**\n"
+            f"• Статус: {twitter_status}\n"
+            f"• Авторизація: {'✅ Налаштована' if TWITTER_AUTH_TOKEN else '❌ Не налаштована'}\n\n"
+            f"🔧 **Selenium Twitter:**\n"
+            f"• Статус: {selenium_status}\n"
+            f"• Профіль браузера: {'✅ Налаштований' if os.path.exists('browser_profile') else '❌ Не налаштований'}\n\n"
+            f"⏰ **Остання перевірка:** {datetime.now().strftime('%H:%M:%S')}\n"
+            f"🔄 **Інтервал перевірки:** {MONITORING_INTERVAL} секунд"
+        )
         
         await query.edit_message_text(
-            "⚠️ **СКИДАННЯ СИСТЕМИ**\n\n"
-            "🚨 **УВАГА!** Ця дія видалить ВСІХ користувачів крім адміністраторів!\n\n"
-            "📋 **Що буде видалено:**\n"
-            "• Всіх звичайних користувачів\n"
-            "• Всі їхні проекти\n"
-            "• Всі активні сесії\n\n"
-            "✅ **Що буде збережено:**\n"
-            "• Всіх адміністраторів\n"
-            "• Резервна копія буде створена автоматично\n\n"
-            "🔐 **Для підтвердження введіть:** CONFIRM_RESET",
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton("❌ Скасувати", callback_data="admin_system")
-            ]])
-        )
-    
-    # Обробники для моніторингу
-    elif callback_data == "admin_monitoring_status":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
-        try:
-            # Отримуємо статус моніторингу
-            discord_status = "🟢 Активний" if discord_monitor else "🔴 Неактивний"
-            twitter_status = "🟢 Активний" if twitter_monitor else "🔴 Неактивний"
-            selenium_status = "🟢 Активний" if selenium_twitter_monitor else "🔴 Неактивний"
-            
-            status_text = (
-                f"📈 **Статус моніторингу**\n\n"
-                f"🎯 **Поточний стан системи:**\n\n"
-                f"💬 **Discord моніторинг:**\n"
-                f"• Статус: {discord_status}\n"
-                f"• Авторизація: {'✅ Налаштована' if DISCORD_AUTHORIZATION else '❌ Не налаштована'}\n\n"
-                f"🐦 **Twitter моніторинг:**\n"
-                f"• Статус: {twitter_status}\n"
-                f"• Авторизація: {'✅ Налаштована' if TWITTER_AUTH_TOKEN else '❌ Не налаштована'}\n\n"
-                f"🔧 **Selenium Twitter:**\n"
-                f"• Статус: {selenium_status}\n"
-                f"• Профіль браузера: {'✅ Налаштований' if os.path.exists('browser_profile') else '❌ Не налаштований'}\n\n"
-                f"⏰ **Остання перевірка:** {datetime.now().strftime('%H:%M:%S')}\n"
-                f"🔄 **Інтервал перевірки:** {MONITORING_INTERVAL} секунд"
-            )
-            
-            await query.edit_message_text(
-                status_text,
-                reply_markup=get_admin_monitoring_keyboard(),
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка отримання статусу**\n\n{str(e)}",
-                reply_markup=get_admin_monitoring_keyboard()
-            )
+            status_text,
+            reply_markup=get_admin_monitoring_keyboard(),
+        )
+    except Exception as e:
+        await query.edit_message_text(
+            f"❌ **Помилка отримання статусу**\n\n{str(e)}",
+            reply_markup=get_admin_monitoring_keyboard()
+        )
+
+
+@callback_router.route("admin_notifications")
+async def cb_admin_notifications(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
     
-    elif callback_data == "admin_notifications":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+    await query.edit_message_text(
+        "🔔 **Налаштування сповіщень**\n\n"
+        "🎯 **Центр уведомлений**\n\n"
+        "📋 **Доступні налаштування:**\n"
+        "• 📧 Email сповіщення\n"
+        "• 📱 Telegram сповіщення\n"
+        "• 🔔 Discord сповіщення\n"
+        "• ⚠️ Сповіщення про помилки\n"
+        "• 📊 Звіти про активність\n"
+        "• 🚨 Критичні сповіщення\n\n"
+        "⚠️ **Примітка:** Налаштування сповіщень будуть додані в наступних версіях",
+        reply_markup=get_admin_monitoring_keyboard(),
+    )
+
+
+@callback_router.route("admin_restart_monitoring")
+async def cb_admin_restart_monitoring(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    await query.edit_message_text(
+        "🔄 **Перезапуск моніторингу**\n\n"
+        "🎯 **Перезапуск системи моніторингу**\n\n"
+        "📋 **Що буде перезапущено:**\n"
+        "• Discord моніторинг\n"
+        "• Twitter моніторинг\n"
+        "• Selenium Twitter\n"
+        "• Всі активні сесії\n\n"
+        "⚠️ **Примітка:** Функція перезапуску буде додана в наступних версіях\n"
+        "Поки що перезапустіть бот вручну.",
+        reply_markup=get_admin_monitoring_keyboard(),
+    )
+
+
+# Додаткові адміністративні обробники
+@callback_router.route("admin_backup_restore")
+async def cb_admin_backup_restore(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    await query.edit_message_text(
+        format_info_message(
+            "Бекап та відновлення",
+            "Управління резервними копіями системи",
+            "⚠️ Функція бекапу буде додана в наступних версіях.\n"
+            "Поки що дані зберігаються в файлах data.json та projects.json"
+        ),
+        reply_markup=get_admin_system_keyboard()
+    )
+
+
+@callback_router.route("admin_clear_cache")
+async def cb_admin_clear_cache(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    try:
+        # Очищуємо кеш (глобальні змінні)
+        global global_sent_tweets
+        global_sent_tweets.clear()
         
         await query.edit_message_text(
-            "🔔 **Налаштування сповіщень**\n\n"
-            "🎯 **Центр уведомлений**\n\n"
-            "📋 **Доступні налаштування:**\n"
-            "• 📧 Email сповіщення\n"
-            "• 📱 Telegram сповіщення\n"
-            "• 🔔 Discord сповіщення\n"
-            "• ⚠️ Сповіщення про помилки\n"
-            "• 📊 Звіти про активність\n"
-            "• 🚨 Критичні сповіщення\n\n"
-            "⚠️ **Примітка:** Налаштування сповіщень будуть додані в наступних версіях",
-            reply_markup=get_admin_monitoring_keyboard(),
+            format_success_message(
+                "Кеш очищено",
+                "Всі тимчасові дані успішно видалено",
+                "Кеш відправлених твітів очищено. Система працюватиме швидше."
+            ),
+            reply_markup=get_admin_system_keyboard()
+        )
+    except Exception as e:
+        await query.edit_message_text(
+            format_error_message("Помилка очищення кешу", str(e)),
+            reply_markup=get_admin_system_keyboard()
+        )
+
+
+@callback_router.route("admin_system_config")
+async def cb_admin_system_config(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    config_text = format_info_message(
+        "Налаштування системи",
+        "Поточні налаштування бота",
+        f"🔧 Конфігурація:\n"
+        f"• Тайм-аут сесії: {security_manager.timeout_seconds} секунд\n"
+        f"• Інтервал Discord: {MONITORING_INTERVAL} секунд\n"
+        f"• Інтервал Twitter: {TWITTER_MONITORING_INTERVAL} секунд\n"
+        f"• Активних сесій: {len(access_manager.sessions)}\n\n"
+        f"⚠️ Зміна налаштувань буде додана в наступних версіях"
+    )
+    
+    await query.edit_message_text(
+        config_text,
+        reply_markup=get_admin_system_keyboard()
+    )
+
+
+# Обробники пошуку
+@callback_router.route("admin_search_users")
+async def cb_admin_search_users(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    await query.edit_message_text(
+        format_info_message(
+            "Пошук користувачів",
+            "Функція пошуку користувачів",
+            "⚠️ Детальний пошук буде додано в наступних версіях.\n"
+            "Поки що використовуйте 'Список користувачів' для перегляду всіх користувачів."
+        ),
+        reply_markup=get_admin_search_keyboard()
+    )
+
+
+@callback_router.route("admin_search_projects")
+async def cb_admin_search_projects(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    await query.edit_message_text(
+        format_info_message(
+            "Пошук проектів",
+            "Функція пошуку проектів",
+            "⚠️ Детальний пошук буде додано в наступних версіях.\n"
+            "Поки що використовуйте 'Всі проекти' для перегляду всіх проектів."
+        ),
+        reply_markup=get_admin_search_keyboard()
+    )
+
+
+# Обробники для налаштувань
+@callback_router.route("admin_security_settings")
+async def cb_admin_security_settings(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
+    
+    await query.edit_message_text(
+        "🔐 **Налаштування безпеки**\n\n"
+        "🎯 **Центр безпеки**\n\n"
+        "📋 **Доступні налаштування:**\n"
+        "• 🔑 Налаштування паролів\n"
+        "• ⏰ Таймаути сесій\n"
+        "• 🚫 Блокування користувачів\n"
+        "• 📝 Логи безпеки\n"
+        "• 🔒 Шифрування даних\n"
+        "• 🛡️ Захист від атак\n\n"
+        "⚠️ **Примітка:** Розширені налаштування безпеки будуть додані в наступних версіях",
+        reply_markup=get_admin_settings_keyboard(),
+    )
+
+
+@callback_router.route("admin_ui_settings")
+async def cb_admin_ui_settings(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
         )
+        return
     
-    elif callback_data == "admin_restart_monitoring":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+    await query.edit_message_text(
+        "🎨 **Налаштування інтерфейсу**\n\n"
+        "🎯 **Центр налаштувань UI**\n\n"
+        "📋 **Доступні налаштування:**\n"
+        "• 🎨 Теми інтерфейсу\n"
+        "• 📱 Розмір кнопок\n"
+        "• 🌍 Мова інтерфейсу\n"
+        "• 📊 Стиль статистики\n"
+        "• 🔔 Стиль сповіщень\n"
+        "• 📋 Макет меню\n\n"
+        "⚠️ **Примітка:** Налаштування інтерфейсу будуть додані в наступних версіях",
+        reply_markup=get_admin_settings_keyboard(),
+    )
+
+
+# Обробники нових меню
+@callback_router.route("quick_actions")
+async def cb_quick_actions(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    await query.edit_message_text(
+        "⚡ **Швидкі дії**\n\n"
+        "Оберіть дію для швидкого виконання:",
+        reply_markup=get_quick_actions_keyboard(user_id)
+    )
+
+
+@callback_router.route("about")
+async def cb_about(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    about_text = (
+        "ℹ️ **Про бота**\n\n"
+        "🤖 **Telegram Monitor Bot**\n"
+        "Версія: 2.0\n\n"
+        "📋 **Функції:**\n"
+        "• Моніторинг Twitter/X акаунтів\n"
+        "• Моніторинг Discord каналів\n"
+        "• Автоматичне пересилання повідомлень\n"
+        "• Система безпеки з авторизацією\n"
+        "• Адміністративна панель\n"
+        "• Selenium для обходу обмежень\n\n"
+        "👨‍💻 **Розробник:** megymin\n"
+        "📅 **Останнє оновлення:** 2025"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="main_menu")]]
+    await query.edit_message_text(
+        about_text,
+        reply_markup=InlineKeyboardMarkup(keyboard)
+    )
+
+
+# Обробники швидких дій
+@callback_router.route("start_all_monitors")
+async def cb_start_all_monitors(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    try:
+        # Запускаємо всі монітори через автоматичну функцію
+        auto_start_monitoring()
         
         await query.edit_message_text(
-            "🔄 **Перезапуск моніторингу**\n\n"
-            "🎯 **Перезапуск системи моніторингу**\n\n"
-            "📋 **Що буде перезапущено:**\n"
-            "• Discord моніторинг\n"
-            "• Twitter моніторинг\n"
-            "• Selenium Twitter\n"
-            "• Всі активні сесії\n\n"
-            "⚠️ **Примітка:** Функція перезапуску буде додана в наступних версіях\n"
-            "Поки що перезапустіть бот вручну.",
-            reply_markup=get_admin_monitoring_keyboard(),
+            "🚀 **Всі монітори запущено!**\n\n"
+            "✅ Twitter API моніторинг активний\n"
+            "✅ Selenium Twitter моніторинг активний\n"
+            "✅ Discord моніторинг активний\n"
+            "✅ Автоматичні сповіщення увімкнено",
+            reply_markup=get_quick_actions_keyboard(user_id)
         )
-    
-    # Додаткові адміністративні обробники
-    elif callback_data == "admin_backup_restore":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
+    except Exception as e:
         await query.edit_message_text(
-            format_info_message(
-                "Бекап та відновлення",
-                "Управління резервними копіями системи",
-                "⚠️ Функція бекапу буде додана в наступних версіях.\n"
-                "Поки що дані зберігаються в файлах data.json та projects.json"
-            ),
-            reply_markup=get_admin_system_keyboard()
+            f"❌ **Помилка запуску моніторів**\n\n{str(e)}",
+            reply_markup=get_quick_actions_keyboard(user_id)
         )
-    
-    elif callback_data == "admin_clear_cache":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+
+
+@callback_router.route("stop_all_monitors")
+async def cb_stop_all_monitors(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    try:
+        # Зупиняємо всі монітори
+        if selenium_twitter_monitor:
+            selenium_twitter_monitor.monitoring_active = False
         
-        try:
-            # Очищуємо кеш (глобальні змінні)
-            global global_sent_tweets
-            global_sent_tweets.clear()
-            
-            await query.edit_message_text(
-                format_success_message(
-                    "Кеш очищено",
-                    "Всі тимчасові дані успішно видалено",
-                    "Кеш відправлених твітів очищено. Система працюватиме швидше."
-                ),
-                reply_markup=get_admin_system_keyboard()
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                format_error_message("Помилка очищення кешу", str(e)),
-                reply_markup=get_admin_system_keyboard()
-            )
-    
-    elif callback_data == "admin_system_config":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+        # Зупиняємо Twitter API моніторинг
+        if twitter_monitor:
+            twitter_monitor.monitoring_active = False
         
-        config_text = format_info_message(
-            "Налаштування системи",
-            "Поточні налаштування бота",
-            f"🔧 Конфігурація:\n"
-            f"• Тайм-аут сесії: {SECURITY_TIMEOUT} секунд\n"
-            f"• Інтервал Discord: {MONITORING_INTERVAL} секунд\n"
-            f"• Інтервал Twitter: {TWITTER_MONITORING_INTERVAL} секунд\n"
-            f"• Активних сесій: {len(access_manager.user_sessions)}\n\n"
-            f"⚠️ Зміна налаштувань буде додана в наступних версіях"
-        )
+        # Зупиняємо Discord моніторинг
+        if discord_monitor:
+            discord_monitor.monitoring_active = False
         
         await query.edit_message_text(
-            config_text,
-            reply_markup=get_admin_system_keyboard()
+            "⏹️ **Всі монітори зупинено!**\n\n"
+            "🔴 Twitter API моніторинг зупинено\n"
+            "🔴 Selenium Twitter моніторинг зупинено\n"
+            "🔴 Discord моніторинг зупинено\n"
+            "🔴 Автоматичні сповіщення вимкнено",
+            reply_markup=get_quick_actions_keyboard(user_id)
         )
-    
-    # Обробники пошуку
-    elif callback_data == "admin_search_users":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
+    except Exception as e:
         await query.edit_message_text(
-            format_info_message(
-                "Пошук користувачів",
-                "Функція пошуку користувачів",
-                "⚠️ Детальний пошук буде додано в наступних версіях.\n"
-                "Поки що використовуйте 'Список користувачів' для перегляду всіх користувачів."
-            ),
-            reply_markup=get_admin_search_keyboard()
+            f"❌ **Помилка зупинки моніторів**\n\n{str(e)}",
+            reply_markup=get_quick_actions_keyboard(user_id)
+        )
+
+
+@callback_router.route("quick_stats")
+async def cb_quick_stats(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    try:
+        stats = project_manager.get_statistics()
+        user_projects = project_manager.get_user_projects(user_id)
+        twitter_count = len([p for p in user_projects if p['platform'] == 'twitter'])
+        discord_count = len([p for p in user_projects if p['platform'] == 'discord'])
+        selenium_count = len(project_manager.get_selenium_accounts())
+        
+        quick_stats_text = (
+            "📊 **Швидка статистика**\n\n"
+            f"👤 **Ваші проекти:**\n"
+            f"• Twitter: {twitter_count}\n"
+            f"• Discord: {discord_count}\n"
+            f"• Selenium: {selenium_count}\n\n"
+            f"🌐 **Загальна статистика:**\n"
+            f"• Всього користувачів: {stats.get('total_users', 0)}\n"
+            f"• Всього проектів: {stats.get('total_projects', 0)}\n"
+            f"• Активних сесій: {len(access_manager.sessions)}"
         )
-    
-    elif callback_data == "admin_search_projects":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
         
         await query.edit_message_text(
-            format_info_message(
-                "Пошук проектів",
-                "Функція пошуку проектів",
-                "⚠️ Детальний пошук буде додано в наступних версіях.\n"
-                "Поки що використовуйте 'Всі проекти' для перегляду всіх проектів."
-            ),
-            reply_markup=get_admin_search_keyboard()
+            quick_stats_text,
+            reply_markup=get_quick_actions_keyboard(user_id)
         )
-    
-    # Обробники для налаштувань
-    elif callback_data == "admin_security_settings":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
+    except Exception as e:
         await query.edit_message_text(
-            "🔐 **Налаштування безпеки**\n\n"
-            "🎯 **Центр безпеки**\n\n"
-            "📋 **Доступні налаштування:**\n"
-            "• 🔑 Налаштування паролів\n"
-            "• ⏰ Таймаути сесій\n"
-            "• 🚫 Блокування користувачів\n"
-            "• 📝 Логи безпеки\n"
-            "• 🔒 Шифрування даних\n"
-            "• 🛡️ Захист від атак\n\n"
-            "⚠️ **Примітка:** Розширені налаштування безпеки будуть додані в наступних версіях",
-            reply_markup=get_admin_settings_keyboard(),
-        )
-    
-    elif callback_data == "admin_ui_settings":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+            f"❌ **Помилка отримання статистики**\n\n{str(e)}",
+            reply_markup=get_quick_actions_keyboard(user_id)
+        )
+
+
+@callback_router.route("recent_messages")
+async def cb_recent_messages(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    await query.edit_message_text(
+        "📝 **Останні повідомлення**\n\nОберіть кількість повідомлень для перегляду:",
+        reply_markup=get_history_count_keyboard()
+    )
+
+
+@callback_router.route("refresh_data")
+async def cb_refresh_data(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    try:
+        project_manager.load_data()
+        sync_monitors_with_projects()
         
         await query.edit_message_text(
-            "🎨 **Налаштування інтерфейсу**\n\n"
-            "🎯 **Центр налаштувань UI**\n\n"
-            "📋 **Доступні налаштування:**\n"
-            "• 🎨 Теми інтерфейсу\n"
-            "• 📱 Розмір кнопок\n"
-            "• 🌍 Мова інтерфейсу\n"
-            "• 📊 Стиль статистики\n"
-            "• 🔔 Стиль сповіщень\n"
-            "• 📋 Макет меню\n\n"
-            "⚠️ **Примітка:** Налаштування інтерфейсу будуть додані в наступних версіях",
-            reply_markup=get_admin_settings_keyboard(),
-        )
-    
-    # Обробники нових меню
-    elif callback_data == "quick_actions":
-        await query.edit_message_text(
-            "⚡ **Швидкі дії**\n\n"
-            "Оберіть дію для швидкого виконання:",
+            "🔄 **Дані оновлено!**\n\n"
+            "✅ Проекти перезавантажено\n"
+            "✅ Монітори синхронізовано\n"
+            "✅ Налаштування оновлено",
             reply_markup=get_quick_actions_keyboard(user_id)
         )
-    elif callback_data == "about":
-        about_text = (
-            "ℹ️ **Про бота**\n\n"
-            "🤖 **Telegram Monitor Bot**\n"
-            "Версія: 2.0\n\n"
-            "📋 **Функції:**\n"
-            "• Моніторинг Twitter/X акаунтів\n"
-            "• Моніторинг Discord каналів\n"
-            "• Автоматичне пересилання повідомлень\n"
-            "• Система безпеки з авторизацією\n"
-            "• Адміністративна панель\n"
-            "• Selenium для обходу обмежень\n\n"
-            "👨‍💻 **Розробник:** megymin\n"
-            "📅 **Останнє оновлення:** 2025"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="main_menu")]]
+    except Exception as e:
         await query.edit_message_text(
-            about_text,
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            f"❌ **Помилка оновлення даних**\n\n{str(e)}",
+            reply_markup=get_quick_actions_keyboard(user_id)
+        )
+
+
+# Обробники допомоги
+@callback_router.route("help_getting_started")
+async def cb_help_getting_started(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    help_text = (
+        "🚀 **Початок роботи**\n\n"
+        "**Крок 1:** Авторизуйтеся за допомогою /login\n"
+        "**Крок 2:** Створіть новий проект через меню\n"
+        "**Крок 3:** Додайте посилання на Twitter або Discord\n"
+        "**Крок 4:** Налаштуйте пересилання повідомлень\n"
+        "**Крок 5:** Запустіть моніторинг\n\n"
+        "💡 **Поради:**\n"
+        "• Використовуйте швидкі дії для зручності\n"
+        "• Перевіряйте діагностику при проблемах\n"
+        "• Налаштуйте автоматичне пересилання"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
+    await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+@callback_router.route("help_twitter")
+async def cb_help_twitter(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    help_text = (
+        "🐦 **Twitter налаштування**\n\n"
+        "**Формат посилань:**\n"
+        "• https://twitter.com/username\n"
+        "• https://x.com/username\n\n"
+        "**Selenium моніторинг:**\n"
+        "• Обходить обмеження API\n"
+        "• Автоматичний запуск\n"
+        "• Підтримка зображень\n\n"
+        "**Команди:**\n"
+        "• /selenium_start - запустити\n"
+        "• /selenium_stop - зупинити\n"
+        "• /selenium_add username - додати акаунт"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
+    await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+@callback_router.route("help_discord")
+async def cb_help_discord(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    help_text = (
+        "💬 **Discord налаштування**\n\n"
+        "**Формат посилань:**\n"
+        "• https://discord.com/channels/server_id/channel_id\n\n"
+        "**Налаштування:**\n"
+        "• Потрібен AUTHORIZATION токен\n"
+        "• Встановіть в .env файлі\n"
+        "• Перевірте через діагностику\n\n"
+        "**Функції:**\n"
+        "• Моніторинг нових повідомлень\n"
+        "• Автоматичне пересилання\n"
+        "• Підтримка зображень та файлів"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
+    await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+@callback_router.route("help_forwarding")
+async def cb_help_forwarding(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    help_text = (
+        "📢 **Налаштування пересилання**\n\n"
+        "**Автоналаштування:**\n"
+        "• Додайте бота в канал як адміністратора\n"
+        "• Напишіть в каналі: @botusername ping\n"
+        "• Бот автоматично налаштує пересилання\n\n"
+        "**Ручне налаштування:**\n"
+        "• /forward_set_channel CHANNEL_ID\n"
+        "• /forward_on - увімкнути\n"
+        "• /forward_off - вимкнути\n\n"
+        "**Тестування:**\n"
+        "• /forward_test - відправити тестове повідомлення"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
+    await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+@callback_router.route("help_faq")
+async def cb_help_faq(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    help_text = (
+        "❓ **Часті питання**\n\n"
+        "**Q: Чому не працює Twitter моніторинг?**\n"
+        "A: Спробуйте Selenium моніторинг - він обходить обмеження API\n\n"
+        "**Q: Як налаштувати Discord?**\n"
+        "A: Потрібен AUTHORIZATION токен в .env файлі\n\n"
+        "**Q: Сесія постійно закінчується**\n"
+        "A: Сесія діє 5 хвилин. Використовуйте бота активно\n\n"
+        "**Q: Не отримую сповіщення**\n"
+        "A: Перевірте налаштування пересилання та права бота"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
+    await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+@callback_router.route("help_support")
+async def cb_help_support(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    help_text = format_info_message(
+        "Підтримка",
+        "Технічна підтримка та допомога",
+        "• Використовуйте діагностику системи для перевірки стану\n"
+        "• Перевіряйте логи через адміністративну панель\n"
+        "• Перезапускайте монітори при необхідності\n"
+        "• Зверніться до адміністратора при серйозних проблемах"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
+    await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+# Обробники налаштувань
+@callback_router.route("settings_notifications")
+async def cb_settings_notifications(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    settings_text = (
+        "🔔 **Налаштування сповіщень**\n\n"
+        "**Поточні налаштування:**\n"
+        "• Сповіщення про нові повідомлення: ✅ Увімкнено\n"
+        "• Сповіщення про помилки: ✅ Увімкнено\n"
+        "• Звукові сповіщення: ❌ Вимкнено\n\n"
+        "⚠️ **Примітка:** Детальні налаштування сповіщень будуть додані в наступних версіях"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="settings")]]
+    await query.edit_message_text(settings_text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+@callback_router.route("settings_intervals")
+async def cb_settings_intervals(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    settings_text = (
+        "⏰ **Інтервали моніторингу**\n\n"
+        f"**Поточні налаштування:**\n"
+        f"• Discord: {MONITORING_INTERVAL} секунд\n"
+        f"• Twitter: {TWITTER_MONITORING_INTERVAL} секунд\n"
+        f"• Selenium: 30 секунд\n\n"
+        "⚠️ **Примітка:** Зміна інтервалів буде додана в наступних версіях.\n"
+        "Поки що інтервали налаштовуються в config.py"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="settings")]]
+    await query.edit_message_text(settings_text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+@callback_router.route("settings_theme")
+async def cb_settings_theme(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    settings_text = (
+        "🎨 **Тема інтерфейсу**\n\n"
+        "**Поточна тема:** Стандартна\n\n"
+        "**Доступні теми:**\n"
+        "• 🌟 Стандартна (поточна)\n"
+        "• 🌙 Темна (планується)\n"
+        "• 🌈 Кольорова (планується)\n\n"
+        "⚠️ **Примітка:** Вибір теми буде додано в наступних версіях"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="settings")]]
+    await query.edit_message_text(settings_text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+@callback_router.route("settings_language")
+async def cb_settings_language(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    settings_text = (
+        "🌐 **Налаштування мови**\n\n"
+        "**Поточна мова:** 🇺🇦 Українська\n\n"
+        "**Доступні мови:**\n"
+        "• 🇺🇦 Українська (поточна)\n"
+        "• 🇬🇧 English (планується)\n"
+        "• 🇷🇺 Русский (планується)\n\n"
+        "⚠️ **Примітка:** Багатомовність буде додана в наступних версіях"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="settings")]]
+    await query.edit_message_text(settings_text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+@callback_router.route("settings_security")
+async def cb_settings_security(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    session_time_left = security_manager.get_session_time_left(user_id) if security_manager else 0
+    settings_text = (
+        "🔒 **Налаштування безпеки**\n\n"
+        "**Поточні налаштування:**\n"
+        f"• Тайм-аут сесії: {security_manager.timeout_seconds} секунд\n"
+        f"• Час до закінчення сесії: {session_time_left} секунд\n"
+        f"• Активних сесій: {len(access_manager.sessions)}\n\n"
+        "**Функції безпеки:**\n"
+        "• Автоматичне завершення сесії\n"
+        "• Авторизація за паролем\n"
+        "• Контроль доступу адміністраторів\n\n"
+        "⚠️ **Примітка:** Додаткові налаштування безпеки будуть додані пізніше"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="settings")]]
+    await query.edit_message_text(settings_text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+@callback_router.route("settings_export")
+async def cb_settings_export(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    try:
+        stats = project_manager.get_statistics()
+        user_projects = project_manager.get_user_projects(user_id)
+        
+        export_text = (
+            "📊 **Експорт даних**\n\n"
+            "**Ваші дані:**\n"
+            f"• Проекти: {len(user_projects)}\n"
+            f"• Twitter проекти: {len([p for p in user_projects if p['platform'] == 'twitter'])}\n"
+            f"• Discord проекти: {len([p for p in user_projects if p['platform'] == 'discord'])}\n\n"
+            "**Загальна статистика:**\n"
+            f"• Всього користувачів: {stats.get('total_users', 0)}\n"
+            f"• Всього проектів: {stats.get('total_projects', 0)}\n"
+            f"• Розмір файлу даних: {stats.get('data_file_size', 0)} байт\n\n"
+            "⚠️ **Примітка:** Функція експорту в файл буде додана пізніше"
         )
+    except Exception as e:
+        export_text = f"❌ **Помилка отримання даних для експорту**\n\n{str(e)}"
     
-    # Обробники швидких дій
-    elif callback_data == "start_all_monitors":
-        try:
-            # Запускаємо всі монітори через автоматичну функцію
-            auto_start_monitoring()
-            
-            await query.edit_message_text(
-                "🚀 **Всі монітори запущено!**\n\n"
-                "✅ Twitter API моніторинг активний\n"
-                "✅ Selenium Twitter моніторинг активний\n"
-                "✅ Discord моніторинг активний\n"
-                "✅ Автоматичні сповіщення увімкнено",
-                reply_markup=get_quick_actions_keyboard(user_id)
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка запуску моніторів**\n\n{str(e)}",
-                reply_markup=get_quick_actions_keyboard(user_id)
-            )
-    elif callback_data == "stop_all_monitors":
-        try:
-            # Зупиняємо всі монітори
-            if selenium_twitter_monitor:
-                selenium_twitter_monitor.monitoring_active = False
-            
-            # Зупиняємо Twitter API моніторинг
-            if twitter_monitor:
-                twitter_monitor.monitoring_active = False
-            
-            # Зупиняємо Discord моніторинг
-            if discord_monitor:
-                discord_monitor.monitoring_active = False
-            
-            await query.edit_message_text(
-                "⏹️ **Всі монітори зупинено!**\n\n"
-                "🔴 Twitter API моніторинг зупинено\n"
-                "🔴 Selenium Twitter моніторинг зупинено\n"
-                "🔴 Discord моніторинг зупинено\n"
-                "🔴 Автоматичні сповіщення вимкнено",
-                reply_markup=get_quick_actions_keyboard(user_id)
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка зупинки моніторів**\n\n{str(e)}",
-                reply_markup=get_quick_actions_keyboard(user_id)
-            )
-    elif callback_data == "quick_stats":
-        try:
-            stats = project_manager.get_statistics()
-            user_projects = project_manager.get_user_projects(user_id)
-            twitter_count = len([p for p in user_projects if p['platform'] == 'twitter'])
-            discord_count = len([p for p in user_projects if p['platform'] == 'discord'])
-            selenium_count = len(project_manager.get_selenium_accounts())
-            
-            quick_stats_text = (
-                "📊 **Швидка статистика**\n\n"
-                f"👤 **Ваші проекти:**\n"
-                f"• Twitter: {twitter_count}\n"
-                f"• Discord: {discord_count}\n"
-                f"• Selenium: {selenium_count}\n\n"
-                f"🌐 **Загальна статистика:**\n"
-                f"• Всього користувачів: {stats.get('total_users', 0)}\n"
-                f"• Всього проектів: {stats.get('total_projects', 0)}\n"
-                f"• Активних сесій: {len(access_manager.user_sessions)}"
-            )
-            
-            await query.edit_message_text(
-                quick_stats_text,
-                reply_markup=get_quick_actions_keyboard(user_id)
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка отримання статистики**\n\n{str(e)}",
-                reply_markup=get_quick_actions_keyboard(user_id)
-            )
-    elif callback_data == "recent_messages":
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="settings")]]
+    await query.edit_message_text(export_text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+# Додаткові обробники для моніторингу
+@callback_router.route("admin_monitoring_schedule")
+async def cb_admin_monitoring_schedule(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
         await query.edit_message_text(
-            "📝 **Останні повідомлення**\n\nОберіть кількість повідомлень для перегляду:",
-            reply_markup=get_history_count_keyboard()
+            format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
+            reply_markup=get_main_menu_keyboard(user_id)
         )
-    elif callback_data == "refresh_data":
-        try:
-            project_manager.load_data()
-            sync_monitors_with_projects()
-            
-            await query.edit_message_text(
-                "🔄 **Дані оновлено!**\n\n"
-                "✅ Проекти перезавантажено\n"
-                "✅ Монітори синхронізовано\n"
-                "✅ Налаштування оновлено",
-                reply_markup=get_quick_actions_keyboard(user_id)
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                f"❌ **Помилка оновлення даних**\n\n{str(e)}",
-                reply_markup=get_quick_actions_keyboard(user_id)
-            )
+        return
     
-    # Обробники допомоги
-    elif callback_data == "help_getting_started":
-        help_text = (
-            "🚀 **Початок роботи**\n\n"
-            "**Крок 1:** Авторизуйтеся за допомогою /login\n"
-            "**Крок 2:** Створіть новий проект через меню\n"
-            "**Крок 3:** Додайте посилання на Twitter або Discord\n"
-            "**Крок 4:** Налаштуйте пересилання повідомлень\n"
-            "**Крок 5:** Запустіть моніторинг\n\n"
-            "💡 **Поради:**\n"
-            "• Використовуйте швидкі дії для зручності\n"
-            "• Перевіряйте діагностику при проблемах\n"
-            "• Налаштуйте автоматичне пересилання"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
-        await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
-    elif callback_data == "help_twitter":
-        help_text = (
-            "🐦 **Twitter налаштування**\n\n"
-            "**Формат посилань:**\n"
-            "• https://twitter.com/username\n"
-            "• https://x.com/username\n\n"
-            "**Selenium моніторинг:**\n"
-            "• Обходить обмеження API\n"
-            "• Автоматичний запуск\n"
-            "• Підтримка зображень\n\n"
-            "**Команди:**\n"
-            "• /selenium_start - запустити\n"
-            "• /selenium_stop - зупинити\n"
-            "• /selenium_add username - додати акаунт"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
-        await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
-    elif callback_data == "help_discord":
-        help_text = (
-            "💬 **Discord налаштування**\n\n"
-            "**Формат посилань:**\n"
-            "• https://discord.com/channels/server_id/channel_id\n\n"
-            "**Налаштування:**\n"
-            "• Потрібен AUTHORIZATION токен\n"
-            "• Встановіть в .env файлі\n"
-            "• Перевірте через діагностику\n\n"
-            "**Функції:**\n"
-            "• Моніторинг нових повідомлень\n"
-            "• Автоматичне пересилання\n"
-            "• Підтримка зображень та файлів"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
-        await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
-    elif callback_data == "help_forwarding":
-        help_text = (
-            "📢 **Налаштування пересилання**\n\n"
-            "**Автоналаштування:**\n"
-            "• Додайте бота в канал як адміністратора\n"
-            "• Напишіть в каналі: @botusername ping\n"
-            "• Бот автоматично налаштує пересилання\n\n"
-            "**Ручне налаштування:**\n"
-            "• /forward_set_channel CHANNEL_ID\n"
-            "• /forward_on - увімкнути\n"
-            "• /forward_off - вимкнути\n\n"
-            "**Тестування:**\n"
-            "• /forward_test - відправити тестове повідомлення"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
-        await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
-    elif callback_data == "help_faq":
-        help_text = (
-            "❓ **Часті питання**\n\n"
-            "**Q: Чому не працює Twitter моніторинг?**\n"
-            "A: Спробуйте Selenium моніторинг - він обходить обмеження API\n\n"
-            "**Q: Як налаштувати Discord?**\n"
-            "A: Потрібен AUTHORIZATION токен в .env файлі\n\n"
-            "**Q: Сесія постійно закінчується**\n"
-            "A: Сесія діє 5 хвилин. Використовуйте бота активно\n\n"
-            "**Q: Не отримую сповіщення**\n"
-            "A: Перевірте налаштування пересилання та права бота"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
-        await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
-    elif callback_data == "help_support":
-        help_text = format_info_message(
-            "Підтримка",
-            "Технічна підтримка та допомога",
-            "• Використовуйте діагностику системи для перевірки стану\n"
-            "• Перевіряйте логи через адміністративну панель\n"
-            "• Перезапускайте монітори при необхідності\n"
-            "• Зверніться до адміністратора при серйозних проблемах"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
-        await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
-    
-    # Обробники налаштувань
-    elif callback_data == "settings_notifications":
-        settings_text = (
-            "🔔 **Налаштування сповіщень**\n\n"
-            "**Поточні налаштування:**\n"
-            "• Сповіщення про нові повідомлення: ✅ Увімкнено\n"
-            "• Сповіщення про помилки: ✅ Увімкнено\n"
-            "• Звукові сповіщення: ❌ Вимкнено\n\n"
-            "⚠️ **Примітка:** Детальні налаштування сповіщень будуть додані в наступних версіях"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="settings")]]
-        await query.edit_message_text(settings_text, reply_markup=InlineKeyboardMarkup(keyboard))
-    elif callback_data == "settings_intervals":
-        settings_text = (
-            "⏰ **Інтервали моніторингу**\n\n"
-            f"**Поточні налаштування:**\n"
-            f"• Discord: {MONITORING_INTERVAL} секунд\n"
-            f"• Twitter: {TWITTER_MONITORING_INTERVAL} секунд\n"
-            f"• Selenium: 30 секунд\n\n"
-            "⚠️ **Примітка:** Зміна інтервалів буде додана в наступних версіях.\n"
-            "Поки що інтервали налаштовуються в config.py"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="settings")]]
-        await query.edit_message_text(settings_text, reply_markup=InlineKeyboardMarkup(keyboard))
-    elif callback_data == "settings_theme":
-        settings_text = (
-            "🎨 **Тема інтерфейсу**\n\n"
-            "**Поточна тема:** Стандартна\n\n"
-            "**Доступні теми:**\n"
-            "• 🌟 Стандартна (поточна)\n"
-            "• 🌙 Темна (планується)\n"
-            "• 🌈 Кольорова (планується)\n\n"
-            "⚠️ **Примітка:** Вибір теми буде додано в наступних версіях"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="settings")]]
-        await query.edit_message_text(settings_text, reply_markup=InlineKeyboardMarkup(keyboard))
-    elif callback_data == "settings_language":
-        settings_text = (
-            "🌐 **Налаштування мови**\n\n"
-            "**Поточна мова:** 🇺🇦 Українська\n\n"
-            "**Доступні мови:**\n"
-            "• 🇺🇦 Українська (поточна)\n"
-            "• 🇬🇧 English (планується)\n"
-            "• 🇷🇺 Русский (планується)\n\n"
-            "⚠️ **Примітка:** Багатомовність буде додана в наступних версіях"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="settings")]]
-        await query.edit_message_text(settings_text, reply_markup=InlineKeyboardMarkup(keyboard))
-    elif callback_data == "settings_security":
-        session_time_left = security_manager.get_session_time_left(user_id) if security_manager else 0
-        settings_text = (
-            "🔒 **Налаштування безпеки**\n\n"
-            "**Поточні налаштування:**\n"
-            f"• Тайм-аут сесії: {SECURITY_TIMEOUT} секунд\n"
-            f"• Час до закінчення сесії: {session_time_left} секунд\n"
-            f"• Активних сесій: {len(access_manager.user_sessions)}\n\n"
-            "**Функції безпеки:**\n"
-            "• Автоматичне завершення сесії\n"
-            "• Авторизація за паролем\n"
-            "• Контроль доступу адміністраторів\n\n"
-            "⚠️ **Примітка:** Додаткові налаштування безпеки будуть додані пізніше"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="settings")]]
-        await query.edit_message_text(settings_text, reply_markup=InlineKeyboardMarkup(keyboard))
-    elif callback_data == "settings_export":
-        try:
-            stats = project_manager.get_statistics()
-            user_projects = project_manager.get_user_projects(user_id)
-            
-            export_text = (
-                "📊 **Експорт даних**\n\n"
-                "**Ваші дані:**\n"
-                f"• Проекти: {len(user_projects)}\n"
-                f"• Twitter проекти: {len([p for p in user_projects if p['platform'] == 'twitter'])}\n"
-                f"• Discord проекти: {len([p for p in user_projects if p['platform'] == 'discord'])}\n\n"
-                "**Загальна статистика:**\n"
-                f"• Всього користувачів: {stats.get('total_users', 0)}\n"
-                f"• Всього проектів: {stats.get('total_projects', 0)}\n"
-                f"• Розмір файлу даних: {stats.get('data_file_size', 0)} байт\n\n"
-                "⚠️ **Примітка:** Функція експорту в файл буде додана пізніше"
-            )
-        except Exception as e:
-            export_text = f"❌ **Помилка отримання даних для експорту**\n\n{str(e)}"
-        
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="settings")]]
-        await query.edit_message_text(export_text, reply_markup=InlineKeyboardMarkup(keyboard))
+    await query.edit_message_text(
+        format_info_message(
+            "Розклад моніторингу",
+            "Налаштування розкладу моніторингу",
+            "⚠️ Функція розкладу буде додана в наступних версіях.\n"
+            "Поки що моніторинг працює постійно з фіксованими інтервалами."
+        ),
+        reply_markup=get_admin_monitoring_keyboard()
+    )
+
+
+@callback_router.route("admin_monitoring_logs")
+async def cb_admin_monitoring_logs(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        await query.edit_message_text(
+            format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
+            reply_markup=get_main_menu_keyboard(user_id)
+        )
+        return
     
-    # Додаткові обробники для моніторингу
-    elif callback_data == "admin_monitoring_schedule":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
+    await query.edit_message_text(
+        format_info_message(
+            "Логи моніторингу",
+            "Журнал подій моніторингу",
+            "⚠️ Детальні логи моніторингу будуть додані в наступних версіях.\n"
+            "Поки що перевіряйте консоль для логів системи."
+        ),
+        reply_markup=get_admin_monitoring_keyboard()
+    )
+
+
+# Обробники фільтрів та аналітики
+@callback_router.route("admin_stats_filters")
+async def cb_admin_stats_filters(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
         await query.edit_message_text(
-            format_info_message(
-                "Розклад моніторингу",
-                "Налаштування розкладу моніторингу",
-                "⚠️ Функція розкладу буде додана в наступних версіях.\n"
-                "Поки що моніторинг працює постійно з фіксованими інтервалами."
-            ),
-            reply_markup=get_admin_monitoring_keyboard()
+            format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
+            reply_markup=get_main_menu_keyboard(user_id)
         )
+        return
     
-    elif callback_data == "admin_monitoring_logs":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
+    await query.edit_message_text(
+        format_info_message(
+            "Фільтри статистики",
+            "Розширені фільтри для статистики",
+            "⚠️ Функція фільтрів буде додана в наступних версіях.\n"
+            "Поки що доступна базова статистика."
+        ),
+        reply_markup=get_admin_search_keyboard()
+    )
+
+
+@callback_router.route("admin_date_filter")
+async def cb_admin_date_filter(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
         await query.edit_message_text(
-            format_info_message(
-                "Логи моніторингу",
-                "Журнал подій моніторингу",
-                "⚠️ Детальні логи моніторингу будуть додані в наступних версіях.\n"
-                "Поки що перевіряйте консоль для логів системи."
-            ),
-            reply_markup=get_admin_monitoring_keyboard()
+            format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
+            reply_markup=get_main_menu_keyboard(user_id)
         )
+        return
     
-    # Обробники фільтрів та аналітики
-    elif callback_data == "admin_stats_filters":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
+    await query.edit_message_text(
+        format_info_message(
+            "Фільтр за датою",
+            "Фільтрація даних за часовим періодом",
+            "⚠️ Функція фільтрації за датою буде додана в наступних версіях.\n"
+            "Поки що доступні всі дані без фільтрації."
+        ),
+        reply_markup=get_admin_search_keyboard()
+    )
+
+
+@callback_router.route("admin_tag_filter")
+async def cb_admin_tag_filter(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
         await query.edit_message_text(
-            format_info_message(
-                "Фільтри статистики",
-                "Розширені фільтри для статистики",
-                "⚠️ Функція фільтрів буде додана в наступних версіях.\n"
-                "Поки що доступна базова статистика."
-            ),
-            reply_markup=get_admin_search_keyboard()
+            format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
+            reply_markup=get_main_menu_keyboard(user_id)
         )
+        return
     
-    elif callback_data == "admin_date_filter":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
+    await query.edit_message_text(
+        format_info_message(
+            "Фільтр за тегами",
+            "Фільтрація даних за тегами",
+            "⚠️ Система тегів буде додана в наступних версіях.\n"
+            "Поки що використовуйте пошук за назвою проектів."
+        ),
+        reply_markup=get_admin_search_keyboard()
+    )
+
+
+@callback_router.route("admin_advanced_analytics")
+async def cb_admin_advanced_analytics(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
         await query.edit_message_text(
-            format_info_message(
-                "Фільтр за датою",
-                "Фільтрація даних за часовим періодом",
-                "⚠️ Функція фільтрації за датою буде додана в наступних версіях.\n"
-                "Поки що доступні всі дані без фільтрації."
-            ),
-            reply_markup=get_admin_search_keyboard()
+            format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
+            reply_markup=get_main_menu_keyboard(user_id)
         )
+        return
     
-    elif callback_data == "admin_tag_filter":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+    await query.edit_message_text(
+        format_info_message(
+            "Розширена аналітика",
+            "Детальний аналіз даних системи",
+            "⚠️ Розширена аналітика буде додана в наступних версіях.\n"
+            "Поки що доступна базова статистика в розділі 'Статистика та аналітика'."
+        ),
+        reply_markup=get_admin_search_keyboard()
+    )
+
+
+# Обробники відсутніх callback'ів
+@callback_router.route("user_stats")
+async def cb_user_stats(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    try:
+        stats = project_manager.get_statistics()
+        user_projects = project_manager.get_user_projects(user_id)
+        twitter_count = len([p for p in user_projects if p['platform'] == 'twitter'])
+        discord_count = len([p for p in user_projects if p['platform'] == 'discord'])
+        selenium_count = len(project_manager.get_selenium_accounts())
+        
+        stats_text = format_info_message(
+            "Ваша статистика",
+            f"📊 Ваші проекти:\n"
+            f"• Twitter: {twitter_count}\n"
+            f"• Discord: {discord_count}\n"
+            f"• Selenium: {selenium_count}\n\n"
+            f"🌐 Загальна статистика:\n"
+            f"• Всього користувачів: {stats.get('total_users', 0)}\n"
+            f"• Всього проектів: {stats.get('total_projects', 0)}\n"
+            f"• Активних сесій: {len(access_manager.sessions)}",
+            f"Час до закінчення сесії: {security_manager.get_session_time_left(user_id)} секунд"
+        )
         
         await query.edit_message_text(
-            format_info_message(
-                "Фільтр за тегами",
-                "Фільтрація даних за тегами",
-                "⚠️ Система тегів буде додана в наступних версіях.\n"
-                "Поки що використовуйте пошук за назвою проектів."
-            ),
-            reply_markup=get_admin_search_keyboard()
+            stats_text,
+            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("⬅️ Назад", callback_data="main_menu")]])
         )
-    
-    elif callback_data == "admin_advanced_analytics":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
+    except Exception as e:
         await query.edit_message_text(
-            format_info_message(
-                "Розширена аналітика",
-                "Детальний аналіз даних системи",
-                "⚠️ Розширена аналітика буде додана в наступних версіях.\n"
-                "Поки що доступна базова статистика в розділі 'Статистика та аналітика'."
-            ),
-            reply_markup=get_admin_search_keyboard()
+            format_error_message("Помилка статистики", str(e)),
+            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("⬅️ Назад", callback_data="main_menu")]])
         )
-    
-    # Обробники відсутніх callback'ів
-    elif callback_data == "user_stats":
-        try:
-            stats = project_manager.get_statistics()
-            user_projects = project_manager.get_user_projects(user_id)
-            twitter_count = len([p for p in user_projects if p['platform'] == 'twitter'])
-            discord_count = len([p for p in user_projects if p['platform'] == 'discord'])
-            selenium_count = len(project_manager.get_selenium_accounts())
-            
-            stats_text = format_info_message(
-                "Ваша статистика",
-                f"📊 Ваші проекти:\n"
-                f"• Twitter: {twitter_count}\n"
-                f"• Discord: {discord_count}\n"
-                f"• Selenium: {selenium_count}\n\n"
-                f"🌐 Загальна статистика:\n"
-                f"• Всього користувачів: {stats.get('total_users', 0)}\n"
-                f"• Всього проектів: {stats.get('total_projects', 0)}\n"
-                f"• Активних сесій: {len(access_manager.user_sessions)}",
-                f"Час до закінчення сесії: {security_manager.get_session_time_left(user_id)} секунд"
-            )
-            
-            await query.edit_message_text(
-                stats_text,
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("⬅️ Назад", callback_data="main_menu")]])
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                format_error_message("Помилка статистики", str(e)),
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("⬅️ Назад", callback_data="main_menu")]])
-            )
-    
-    elif callback_data == "change_channel":
-        user_states[user_id] = {'state': 'setting_forward_channel'}
+
+
+@callback_router.route("help_settings")
+async def cb_help_settings(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    help_text = format_info_message(
+        "Налаштування допомоги",
+        "Як налаштувати бота під свої потреби",
+        "• Використовуйте розділ 'Налаштування' в головному меню\n"
+        "• Налаштуйте інтервали моніторингу\n"
+        "• Оберіть тему інтерфейсу\n"
+        "• Налаштуйте сповіщення\n"
+        "• Експортуйте свої дані при потребі"
+    )
+    keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
+    await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+# Обробники адміністративних функцій
+@callback_router.route("admin_system")
+async def cb_admin_system(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
         await query.edit_message_text(
-            "✏️ Зміна каналу пересилання\n\n"
-            "Надішліть ID каналу або перешліть повідомлення з каналу:",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("❌ Скасувати", callback_data="forward_settings")]])
+            format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї панелі."),
+            reply_markup=get_main_menu_keyboard(user_id)
         )
+        return
     
-    elif callback_data == "set_channel":
-        user_states[user_id] = {'state': 'setting_forward_channel'}
-        await query.edit_message_text(
-            "📝 Встановлення каналу пересилання\n\n"
-            "Надішліть ID каналу або перешліть повідомлення з каналу:",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("❌ Скасувати", callback_data="forward_settings")]])
-        )
-    
-    elif callback_data.startswith("history_"):
-        # Отримуємо історію повідомлень
-        count = int(callback_data.split("_")[1])
-        await handle_discord_history(update, context, count)
-    
-    elif callback_data == "help_settings":
-        help_text = format_info_message(
-            "Налаштування допомоги",
-            "Як налаштувати бота під свої потреби",
-            "• Використовуйте розділ 'Налаштування' в головному меню\n"
-            "• Налаштуйте інтервали моніторингу\n"
-            "• Оберіть тему інтерфейсу\n"
-            "• Налаштуйте сповіщення\n"
-            "• Експортуйте свої дані при потребі"
-        )
-        keyboard = [[InlineKeyboardButton("⬅️ Назад", callback_data="help")]]
-        await query.edit_message_text(help_text, reply_markup=InlineKeyboardMarkup(keyboard))
-    
-    # Обробники адміністративних функцій
-    elif callback_data == "admin_system":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї панелі."),
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
+    await query.edit_message_text(
+        format_info_message(
+            "Системне управління",
+            "Управління системними функціями бота",
+            "Тут ви можете керувати системними налаштуваннями, переглядати логи, створювати бекапи та виконувати інші адміністративні завдання."
+        ),
+        reply_markup=get_admin_system_keyboard()
+    )
+
+
+@callback_router.route("admin_user_activity")
+async def cb_admin_user_activity(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
         await query.edit_message_text(
-            format_info_message(
-                "Системне управління",
-                "Управління системними функціями бота",
-                "Тут ви можете керувати системними налаштуваннями, переглядати логи, створювати бекапи та виконувати інші адміністративні завдання."
-            ),
-            reply_markup=get_admin_system_keyboard()
+            format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
+            reply_markup=get_main_menu_keyboard(user_id)
         )
+        return
     
-    elif callback_data == "admin_user_activity":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                format_error_message("Доступ заборонено!", "Тільки адміністратор має доступ до цієї функції."),
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
+    try:
+        # Отримуємо активність користувачів
+        active_sessions = len(access_manager.sessions)
+        total_users = len(project_manager.get_all_users())
         
-        try:
-            # Отримуємо активність користувачів
-            active_sessions = len(access_manager.user_sessions)
-            total_users = len(project_manager.data.get('users', {}))
-            
-            activity_text = format_info_message(
-                "Активність користувачів",
-                f"📊 Загальна інформація:\n"
-                f"• Всього користувачів: {total_users}\n"
-                f"• Активних сесій: {active_sessions}\n"
-                f"• Користувачів онлайн: {active_sessions}",
-                "Детальна статистика активності користувачів"
-            )
-            
-            await query.edit_message_text(
-                activity_text,
-                reply_markup=get_admin_users_keyboard()
-            )
-        except Exception as e:
-            await query.edit_message_text(
-                format_error_message("Помилка отримання активності", str(e)),
-                reply_markup=get_admin_users_keyboard()
+        activity_text = format_info_message(
+            "Активність користувачів",
+            f"📊 Загальна інформація:\n"
+            f"• Всього користувачів: {total_users}\n"
+            f"• Активних сесій: {active_sessions}\n"
+            f"• Користувачів онлайн: {active_sessions}",
+            "Детальна статистика активності користувачів"
         )
-    
-    # Нові обробники для покращеної адмін панелі
-    elif callback_data == "admin_search":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
-        await query.edit_message_text(
-            "🔍 **Пошук та фільтри**\n\n"
-            "🎯 **Центр поиска и фильтрации**\n\n"
-            "📋 **Доступные функции:**\n"
-            "• 🔍 Поиск пользователей\n"
-            "• 📋 Поиск проектов\n"
-            "• 📊 Фильтры статистики\n"
-            "• 📅 Фильтр по дате\n"
-            "• 🏷️ Фильтр по тегам\n"
-            "• 📈 Расширенная аналитика\n\n"
-            "Выберите нужную функцию:",
-            reply_markup=get_admin_search_keyboard(),
-        )
-    
-    elif callback_data == "admin_monitoring":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
         
         await query.edit_message_text(
-            "📈 **Моніторинг системи**\n\n"
-            "🎯 **Центр мониторинга**\n\n"
-            "📋 **Доступные функции:**\n"
-            "• 📈 Статус мониторинга\n"
-            "• 🔔 Настройки уведомлений\n"
-            "• ⏰ Расписание мониторинга\n"
-            "• 📊 Логи мониторинга\n"
-            "• 🔄 Перезапуск мониторинга\n"
-            "• ⚡ Скорость отклика\n\n"
-            "Выберите нужную функцию:",
-            reply_markup=get_admin_monitoring_keyboard(),
+            activity_text,
+            reply_markup=get_admin_users_keyboard()
         )
-    
-    elif callback_data == "admin_settings":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
+    except Exception as e:
         await query.edit_message_text(
-            "⚙️ **Налаштування системи**\n\n"
-            "🎯 **Центр настроек**\n\n"
-            "📋 **Доступные настройки:**\n"
-            "• 🔐 Настройки безопасности\n"
-            "• 🎨 Настройки интерфейса\n"
-            "• 📱 Настройки бота\n"
-            "• 🌐 Настройки сети\n"
-            "• 💾 Настройки хранения\n"
-            "• 🔧 Расширенные настройки\n\n"
-            "Выберите нужный раздел:",
-            reply_markup=get_admin_settings_keyboard(),
-        )
-    
-    elif callback_data == "admin_stats":
-        if not access_manager.is_admin(user_id):
-            await query.edit_message_text(
-                "❌ Доступ заборонено!",
-                reply_markup=get_main_menu_keyboard(user_id)
-            )
-            return
-        
+            format_error_message("Помилка отримання активності", str(e)),
+            reply_markup=get_admin_users_keyboard()
+    )
+
+
+# Нові обробники для покращеної адмін панелі
+@callback_router.route("admin_search")
+async def cb_admin_search(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
         await query.edit_message_text(
-            "📊 **Статистика та аналітика**\n\n"
-            "🎯 **Центр статистики**\n\n"
-            "📋 **Доступные отчеты:**\n"
-            "• 📊 Общая статистика\n"
-            "• 👥 Статистика пользователей\n"
-            "• 📋 Статистика проектов\n"
-            "• 📈 Графики и диаграммы\n"
-            "• 📅 Статистика за период\n"
-            "• 🔍 Детальная аналитика\n"
-            "• 📤 Экспорт данных\n\n"
-            "Выберите нужный отчет:",
-            reply_markup=get_admin_stats_keyboard(),
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
         )
+        return
     
-    # Адмін керування пересиланням: дії з кнопок
-    elif callback_data.startswith("admin_forward_enable_"):
-        if not access_manager.is_admin(user_id):
-            return
-        target_id = int(callback_data.split('_')[-1])
-        project_manager.enable_forward(target_id)
+    await query.edit_message_text(
+        "🔍 **Пошук та фільтри**\n\n"
+        "🎯 **Центр поиска и фильтрации**\n\n"
+        "📋 **Доступные функции:**\n"
+        "• 🔍 Поиск пользователей\n"
+        "• 📋 Поиск проектов\n"
+        "• 📊 Фильтры статистики\n"
+        "• 📅 Фильтр по дате\n"
+        "• 🏷️ Фильтр по тегам\n"
+        "• 📈 Расширенная аналитика\n\n"
+        "Выберите нужную функцию:",
+        reply_markup=get_admin_search_keyboard(),
+    )
+
+
+@callback_router.route("admin_monitoring")
+async def cb_admin_monitoring(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
         await query.edit_message_text(
-            f"🟢 Пересилання увімкнено для `{target_id}`",
-            reply_markup=get_admin_forward_keyboard(target_id),
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
         )
-    elif callback_data.startswith("admin_forward_disable_"):
-        if not access_manager.is_admin(user_id):
-            return
-        target_id = int(callback_data.split('_')[-1])
-        project_manager.disable_forward(target_id)
+        return
+    
+    await query.edit_message_text(
+        "📈 **Моніторинг системи**\n\n"
+        "🎯 **Центр мониторинга**\n\n"
+        "📋 **Доступные функции:**\n"
+        "• 📈 Статус мониторинга\n"
+        "• 🔔 Настройки уведомлений\n"
+        "• ⏰ Расписание мониторинга\n"
+        "• 📊 Логи мониторинга\n"
+        "• 🔄 Перезапуск мониторинга\n"
+        "• ⚡ Скорость отклика\n\n"
+        "Выберите нужную функцию:",
+        reply_markup=get_admin_monitoring_keyboard(),
+    )
+
+
+@callback_router.route("admin_settings")
+async def cb_admin_settings(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
         await query.edit_message_text(
-            f"🔴 Пересилання вимкнено для `{target_id}`",
-            reply_markup=get_admin_forward_keyboard(target_id),
+            "❌ Доступ заборонено!",
+            reply_markup=get_main_menu_keyboard(user_id)
         )
-    elif callback_data.startswith("admin_forward_status_"):
-        if not access_manager.is_admin(user_id):
-            return
-        target_id = int(callback_data.split('_')[-1])
-        status = project_manager.get_forward_status(target_id)
-        enabled = status.get('enabled', False)
-        channel = status.get('channel_id') or '—'
+        return
+    
+    await query.edit_message_text(
+        "⚙️ **Налаштування системи**\n\n"
+        "🎯 **Центр настроек**\n\n"
+        "📋 **Доступные настройки:**\n"
+        "• 🔐 Настройки безопасности\n"
+        "• 🎨 Настройки интерфейса\n"
+        "• 📱 Настройки бота\n"
+        "• 🌐 Настройки сети\n"
+        "• 💾 Настройки хранения\n"
+        "• 🔧 Расширенные настройки\n\n"
+        "Выберите нужный раздел:",
+        reply_markup=get_admin_settings_keyboard(),
+    )
+
+
+@callback_router.prefix("admin_forward_enable_")
+async def cb_admin_forward_enable(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        return
+    target_id = int(callback_data.split('_')[-1])
+    project_manager.enable_forward(target_id)
+    await query.edit_message_text(
+        f"🟢 Пересилання увімкнено для `{target_id}`",
+        reply_markup=get_admin_forward_keyboard(target_id),
+    )
+
+
+@callback_router.prefix("admin_forward_disable_")
+async def cb_admin_forward_disable(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        return
+    target_id = int(callback_data.split('_')[-1])
+    project_manager.disable_forward(target_id)
+    await query.edit_message_text(
+        f"🔴 Пересилання вимкнено для `{target_id}`",
+        reply_markup=get_admin_forward_keyboard(target_id),
+    )
+
+
+@callback_router.prefix("admin_forward_status_")
+async def cb_admin_forward_status(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        return
+    target_id = int(callback_data.split('_')[-1])
+    status = project_manager.get_forward_status(target_id)
+    enabled = status.get('enabled', False)
+    channel = status.get('channel_id') or '—'
+    await query.edit_message_text(
+        f"📊 Статус пересилання для `{target_id}`\n\nСтатус: {'🟢 увімкнено' if enabled else '🔴 вимкнено'}\nКанал: `{channel}`",
+        reply_markup=get_admin_forward_keyboard(target_id),
+    )
+
+
+@callback_router.prefix("admin_forward_test_")
+async def cb_admin_forward_test(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        return
+    target_id = int(callback_data.split('_')[-1])
+    forward_channel = project_manager.get_forward_channel(target_id)
+    if not forward_channel:
         await query.edit_message_text(
-            f"📊 Статус пересилання для `{target_id}`\n\nСтатус: {'🟢 увімкнено' if enabled else '🔴 вимкнено'}\nКанал: `{channel}`",
+            f"❌ У користувача `{target_id}` не налаштований канал.",
             reply_markup=get_admin_forward_keyboard(target_id),
         )
-    elif callback_data.startswith("admin_forward_test_"):
-        if not access_manager.is_admin(user_id):
-            return
-        target_id = int(callback_data.split('_')[-1])
-        forward_channel = project_manager.get_forward_channel(target_id)
-        if not forward_channel:
-            await query.edit_message_text(
-                f"❌ У користувача `{target_id}` не налаштований канал.",
-                reply_markup=get_admin_forward_keyboard(target_id),
-            )
-        else:
-            try:
-                test_text = (
-                    f"🧪 Тест пересилання\n\n"
-                    f"Це тестове повідомлення від адміністратора для користувача `{target_id}`."
+    else:
+        try:
+            test_text = (
+                f"🧪 Тест пересилання\n\n"
+                f"Це тестове повідомлення від адміністратора для користувача `{target_id}`."
+            )
+            url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
+            data = {
+                'chat_id': normalize_chat_id(forward_channel),
+                'text': test_text,
+            }
+            r = await http_client.request('POST', url, data=data, retries=0, timeout=aiohttp.ClientTimeout(total=5))
+            if r.status == 200:
+                await query.edit_message_text(
+                    f"✅ Тестове повідомлення надіслано у `{normalize_chat_id(forward_channel)}`",
+                    reply_markup=get_admin_forward_keyboard(target_id),
                 )
-                url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-                data = {
-                    'chat_id': normalize_chat_id(forward_channel),
-                    'text': test_text,
-                }
-                r = requests.post(url, data=data, timeout=5)
-                if r.status_code == 200:
-                    await query.edit_message_text(
-                        f"✅ Тестове повідомлення надіслано у `{normalize_chat_id(forward_channel)}`",
-                        reply_markup=get_admin_forward_keyboard(target_id),
-                    )
-                else:
-                    await query.edit_message_text(
-                        f"❌ Помилка надсилання ({r.status_code}). Перевірте права бота у каналі.",
-                        reply_markup=get_admin_forward_keyboard(target_id)
-                    )
-            except Exception as e:
+            else:
                 await query.edit_message_text(
-                    f"❌ Виняток при надсиланні: {e}",
+                    f"❌ Помилка надсилання ({r.status}). Перевірте права бота у каналі.",
                     reply_markup=get_admin_forward_keyboard(target_id)
                 )
-    elif callback_data.startswith("admin_forward_set_"):
-        if not access_manager.is_admin(user_id):
-            return
-        target_id = int(callback_data.split('_')[-1])
-        # Переводимо у стан очікування ID каналу
-        user_states[user_id] = {'state': 'admin_forward_set_channel', 'data': {'target_id': target_id}}
-        await query.edit_message_text(
-            f"📝 Перешліть повідомлення з потрібного каналу АБО введіть його ID для користувача `{target_id}`:",
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")]]),
-        )
+        except Exception as e:
+            await query.edit_message_text(
+                f"❌ Виняток при надсиланні: {e}",
+                reply_markup=get_admin_forward_keyboard(target_id)
+            )
+
+
+@callback_router.prefix("admin_forward_set_")
+async def cb_admin_forward_set(update: Update, context: ContextTypes.DEFAULT_TYPE, query: CallbackQuery, user_id: int, callback_data: str) -> None:
+    if not access_manager.is_admin(user_id):
+        return
+    target_id = int(callback_data.split('_')[-1])
+    # Переводимо у стан очікування ID каналу
+    user_states[user_id] = {'state': 'admin_forward_set_channel', 'data': {'target_id': target_id}}
+    await query.edit_message_text(
+        f"📝 Перешліть повідомлення з потрібного каналу АБО введіть його ID для користувача `{target_id}`:",
+        reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("❌ Скасувати", callback_data="admin_users")]]),
+    )
+
+
+async def handle_callback_query(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Обробник callback запитів (маршрутизація через callback_router)"""
+    await callback_router.dispatch(update, context)
 
 async def handle_project_creation(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Обробник створення проекту"""
@@ -4624,29 +4875,22 @@ async def handle_discord_history(update: Update, context: ContextTypes.DEFAULT_T
     await query.edit_message_text(f"📥 Завантаження останніх {count} повідомлень з каналу {project['name']}...")
     
     try:
-        # Отримуємо повідомлення з Discord
-        messages = await get_discord_messages_history(project['url'], count)
+        # Частини відправляються, щойно готові; перша замінює повідомлення "Завантаження"
+        channel_id = extract_discord_channel_id(project['url'])
+        last_message = None
+        async for chunk in discord_history.stream_chunks(channel_id, count, project['name']):
+            if last_message is None:
+                last_message = await query.edit_message_text(chunk)
+            else:
+                last_message = await context.bot.send_message(chat_id=user_id, text=chunk)
         
-        if not messages:
+        if last_message is None:
             await query.edit_message_text(
                 f"📜 Історія каналу: {project['name']}\n\n❌ Не вдалося отримати повідомлення.\nМожливо, немає доступу до каналу або канал порожній.",
                 reply_markup=get_main_menu_keyboard(user_id)
             )
-        else:
-            # Форматуємо повідомлення
-            history_text = format_discord_history(messages, project['name'], count)
-            
-            # Розбиваємо на частини якщо текст занадто довгий
-            if len(history_text) > 4000:
-                # Telegram має ліміт на довжину повідомлення
-                parts = [history_text[i:i+4000] for i in range(0, len(history_text), 4000)]
-                for i, part in enumerate(parts):
-                    if i == 0:
-                        await query.edit_message_text(part)
-                    else:
-                        await context.bot.send_message(chat_id=user_id, text=part)
-            else:
-                await query.edit_message_text(history_text, reply_markup=get_main_menu_keyboard(user_id))
+        elif hasattr(last_message, 'edit_reply_markup'):
+            await last_message.edit_reply_markup(reply_markup=get_main_menu_keyboard(user_id))
                 
     except Exception as e:
         logger.error(f"Помилка отримання історії Discord: {e}")
@@ -4659,79 +4903,6 @@ async def handle_discord_history(update: Update, context: ContextTypes.DEFAULT_T
         if user_id in user_states:
             del user_states[user_id]
 
-async def get_discord_messages_history(channel_url: str, limit: int) -> List[Dict]:
-    """Отримати історію повідомлень з Discord каналу"""
-    if not DISCORD_AUTHORIZATION:
-        return []
-    
-    try:
-        # Парсимо URL для отримання channel_id
-        import re
-        match = re.search(r'discord\.com/channels/(\d+)/(\d+)', channel_url)
-        if not match:
-            return []
-        
-        channel_id = match.group(2)
-        
-        # Створюємо новий session для цього запиту
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"https://discord.com/api/v9/channels/{channel_id}/messages?limit={limit}",
-                headers={
-                    'Authorization': DISCORD_AUTHORIZATION,
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    logger.error(f"Помилка отримання повідомлень: {response.status}")
-                    return []
-                
-    except Exception as e:
-        logger.error(f"Помилка в get_discord_messages_history: {e}")
-        return []
-
-def format_discord_history(messages: List[Dict], channel_name: str, count: int) -> str:
-    """Форматувати історію повідомлень Discord"""
-    from datetime import datetime
-    
-    header = f"📜 **Історія каналу: {channel_name}**\n"
-    header += f"📊 Останні {count} повідомлень:\n\n"
-    
-    if not messages:
-        return header + "❌ Повідомлення не знайдено."
-    
-    formatted_messages = []
-    for i, message in enumerate(messages, 1):
-        author = message.get('author', {}).get('username', 'Unknown')
-        content = message.get('content', '')
-        timestamp = message.get('timestamp', '')
-        
-        # Форматуємо час
-        try:
-            if timestamp:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                time_str = dt.strftime('%d.%m.%Y %H:%M')
-            else:
-                time_str = 'Unknown time'
-        except:
-            time_str = 'Unknown time'
-        
-        # Обмежуємо довжину повідомлення
-        if len(content) > 200:
-            content = content[:200] + "..."
-        
-        formatted_msg = f"**{i}.** 👤 {author} | 🕒 {time_str}\n"
-        if content:
-            formatted_msg += f"💬 {content}\n"
-        formatted_msg += "─" * 30 + "\n"
-        
-        formatted_messages.append(formatted_msg)
-    
-    return header + "\n".join(formatted_messages)
-
 def handle_discord_notifications_sync(new_messages: List[Dict]) -> None:
     """Обробник нових повідомлень Discord (оптимізована версія)"""
     global bot_instance
@@ -4749,28 +4920,6 @@ def handle_discord_notifications_sync(new_messages: List[Dict]) -> None:
             message_id = message.get('message_id', '')
             channel_id = message.get('channel_id', '')
             
-            # Красиве форматування
-            author = escape_markdown(message['author'])
-            content = escape_markdown(message['content'])
-            
-            # Обрізаємо текст якщо він занадто довгий
-            if len(content) > 200:
-                content = content[:200] + "..."
-            
-            # Форматуємо дату
-            timestamp = message.get('timestamp', '')
-            formatted_date = "Не відомо"
-            time_ago = ""
-            
-            if timestamp:
-                try:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    formatted_date = dt.strftime("%d %B, %H:%M UTC")
-                    time_ago = _get_time_ago(dt)
-                except:
-                    formatted_date = timestamp[:19] if len(timestamp) > 19 else timestamp
-            
             # Отримуємо інформацію про сервер з URL
             server_name = "Discord"
             try:
@@ -4788,18 +4937,8 @@ def handle_discord_notifications_sync(new_messages: List[Dict]) -> None:
             # Отримуємо зображення з повідомлення
             images = message.get('images', [])
             
-            forward_text = (
-                f"📢 **Нове повідомлення з Discord**\n"
-                f"• Сервер: {server_name}\n"
-                f"• Автор: {author}\n"
-                f"• Дата: {formatted_date} ({time_ago})\n"
-                f"• Текст: {content}\n"
-                f"🔗 [Перейти до повідомлення]({message['url']})"
-            )
-            
-            # Додаємо інформацію про зображення якщо є
-            if images:
-                forward_text += f"\n📷 Зображень: {len(images)}"
+            # Один рендер на подію незалежно від кількості підписників
+            forward_text = render_discord_forward(message, server_name)
             
             # Отримуємо всіх користувачів, які відстежують цей Discord канал
             if channel_id in channel_to_tracked_users:
@@ -4838,6 +4977,8 @@ def handle_discord_notifications_sync(new_messages: List[Dict]) -> None:
 
             # Не дублювати відправку, якщо кілька користувачів вказали той самий цільовий канал
             sent_targets: Set[str] = set()
+            forward_key = f"forward_{channel_id}_{message_id}"
+            targets: List[tuple] = []
 
             for user_id in users_with_forwarding:
                 try:
@@ -4854,41 +4995,19 @@ def handle_discord_notifications_sync(new_messages: List[Dict]) -> None:
                         continue
                     
                     # Швидка перевірка дублікатів
-                    forward_key = f"forward_{channel_id}_{message_id}"
                     if project_manager.is_message_sent(forward_key, clean_channel, user_id):
                         continue
                     
-                    logger.info(f"📤 Відправляємо Discord повідомлення в канал {clean_channel} для користувача {user_id}")
-                    
-                    # Відправляємо текст повідомлення
-                    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-                    data = {
-                        'chat_id': normalize_chat_id(clean_channel),
-                        'text': forward_text,
-                    }
-                    response = requests.post(url, data=data, timeout=3)
-                    
-                    if response.status_code == 200:
-                        # Відправляємо зображення якщо є
-                        if images:
-                            for i, image_url in enumerate(images[:5]):  # Максимум 5 зображень
-                                try:
-                                    image_caption = f"📷 Discord зображення {i+1}/{len(images)}" if len(images) > 1 else "📷 Discord зображення"
-                                    download_and_send_image(image_url, clean_channel, image_caption)
-                                    # Невелика затримка між зображеннями
-                                    import time
-                                    time.sleep(1)
-                                except Exception as e:
-                                    logger.error(f"Помилка відправки Discord зображення: {e}")
-                        
-                        project_manager.add_sent_message(forward_key, clean_channel, user_id)
-                        sent_targets.add(clean_channel)
-                        logger.info(f"✅ Переслано в канал {clean_channel} (користувач {user_id})")
-                    else:
-                        logger.error(f"❌ Помилка відправки в канал {clean_channel}: {response.status_code}")
+                    targets.append((clean_channel, user_id))
+                    sent_targets.add(clean_channel)
                     
                 except Exception as e:
                     logger.error(f"Помилка обробки користувача {user_id}: {e}")
+            
+            # Тільки ставимо в чергу - монітор не чекає на Telegram
+            if targets:
+                logger.info(f"📤 Ставимо Discord повідомлення в чергу для {len(targets)} каналів")
+                queue_forward_fanout(targets, forward_text, images, "Discord", forward_key)
                     
     except Exception as e:
         logger.error(f"Помилка обробки Discord сповіщень: {e}")
@@ -4948,92 +5067,34 @@ def handle_twitter_notifications_sync(new_tweets: List[Dict]) -> None:
             if len(global_sent_tweets[account]) % 50 == 0:  # Кожні 50 твітів
                 cleanup_old_tweets()
             
-            # Красиве форматування
-            author = escape_markdown(tweet.get('author', 'Unknown'))
-            text = escape_markdown(tweet.get('text', ''))
-            
-            # Обрізаємо текст якщо він занадто довгий
-            if len(text) > 200:
-                text = text[:200] + "..."
-            
-            # Форматуємо дату
-            timestamp = tweet.get('timestamp', '')
-            formatted_date = "Не відомо"
-            time_ago = ""
-            
-            if timestamp:
-                try:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    formatted_date = dt.strftime("%d %B, %H:%M UTC")
-                    time_ago = _get_time_ago(dt)
-                except:
-                    formatted_date = timestamp[:19] if len(timestamp) > 19 else timestamp
-            
             # Отримуємо зображення з твіта
             images = tweet.get('images', [])
+            forward_text = render_twitter_forward(tweet, account)
             
-            forward_text = (
-                f"🐦 **Новий твіт з Twitter**\n"
-                f"• Профіль: @{account}\n"
-                f"• Автор: {author}\n"
-                f"• Дата: {formatted_date} ({time_ago})\n"
-                f"• Текст: {text}\n"
-                f"🔗 [Перейти до твіта]({tweet.get('url', '')})"
-            )
-            
-            # Додаємо інформацію про зображення якщо є
-            if images:
-                forward_text += f"\n📷 Зображень: {len(images)}"
+            forward_key = f"twitter_{account}_{tweet_id}"
+            targets: List[tuple] = []
+            sent_targets: Set[str] = set()
             
             for user_id in users_with_forwarding:
                 try:
                     # Швидка перевірка каналу
                     forward_channel = project_manager.get_forward_channel(user_id)
-                    if not forward_channel:
+                    if not forward_channel or forward_channel in sent_targets:
                         continue
                     
                     # Швидка перевірка дублікатів
-                    forward_key = f"twitter_{account}_{tweet_id}"
                     if project_manager.is_message_sent(forward_key, forward_channel, user_id):
                         continue
                     
-                    # Відправляємо текст повідомлення
-                    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-                    data = {
-                        'chat_id': normalize_chat_id(forward_channel),
-                        'text': forward_text,
-                    }
-                    response = requests.post(url, data=data, timeout=3)
-                    
-                    if response.status_code == 200:
-                        # Відправляємо зображення якщо є
-                        if images:
-                            logger.info(f"📷 Знайдено {len(images)} зображень для відправки в канал {forward_channel}")
-                            for i, image_url in enumerate(images[:5]):  # Максимум 5 зображень
-                                try:
-                                    logger.info(f"📤 Відправляємо зображення {i+1}/{len(images)}: {image_url}")
-                                    image_caption = f"📷 Twitter зображення {i+1}/{len(images)}" if len(images) > 1 else "📷 Twitter зображення"
-                                    success = download_and_send_image(image_url, forward_channel, image_caption)
-                                    if success:
-                                        logger.info(f"✅ Зображення {i+1} успішно відправлено")
-                                    else:
-                                        logger.warning(f"⚠️ Не вдалося відправити зображення {i+1}")
-                                    # Невелика затримка між зображеннями
-                                    import time
-                                    time.sleep(1)
-                                except Exception as e:
-                                    logger.error(f"❌ Помилка відправки Twitter зображення {i+1}: {e}")
-                        else:
-                            logger.info(f"ℹ️ Зображень не знайдено для твіта {tweet_id}")
-                        
-                        project_manager.add_sent_message(forward_key, forward_channel, user_id)
-                        logger.info(f"✅ Переслано Twitter твіт в канал {forward_channel} (користувач {user_id})")
-                    else:
-                        logger.error(f"❌ Помилка відправки Twitter твіта в канал {forward_channel}: {response.status_code}")
+                    targets.append((forward_channel, user_id))
+                    sent_targets.add(forward_channel)
                     
                 except Exception as e:
                     logger.error(f"Помилка обробки Twitter користувача {user_id}: {e}")
+            
+            # Тільки ставимо в чергу - монітор не чекає на Telegram
+            if targets:
+                queue_forward_fanout(targets, forward_text, images, "Twitter", forward_key)
                     
     except Exception as e:
         logger.error(f"Помилка обробки Twitter сповіщень: {e}")
@@ -5053,7 +5114,7 @@ async def start_discord_monitoring():
     try:
         async with discord_monitor:
             # Додаємо всі Discord канали з проектів користувачів
-            for user_id, projects in project_manager.data['projects'].items():
+            for user_id, projects in project_manager.snapshot().projects.items():
                 for project in projects:
                     if project['platform'] == 'discord':
                         discord_monitor.add_channel(project['url'])
@@ -5061,10 +5122,16 @@ async def start_discord_monitoring():
             channels_list = list(getattr(discord_monitor, 'channels', []))
             logger.info(f"💬 Запуск Discord моніторингу для каналів: {channels_list}")
             logger.info("🔄 Discord моніторинг активний та працює в фоновому режимі...")
-            await discord_monitor.start_monitoring(handle_discord_notifications_sync, MONITORING_INTERVAL)
+            await discord_monitor.start_monitoring(
+                handle_discord_notifications_sync,
+                MONITORING_INTERVAL,
+                use_gateway=DISCORD_GATEWAY_ENABLED,
+                gateway_url=DISCORD_GATEWAY_URL
+            )
             
     except Exception as e:
         logger.error(f"Помилка моніторингу Discord: {e}")
+        raise
 
 async def start_twitter_monitoring():
     """Запустити моніторинг Twitter з покращеним HTML парсингом"""
@@ -5077,7 +5144,7 @@ async def start_twitter_monitoring():
     try:
         async with twitter_monitor:
             # Додаємо всі Twitter акаунти з проектів користувачів
-            for user_id, projects in project_manager.data['projects'].items():
+            for user_id, projects in project_manager.snapshot().projects.items():
                 for project in projects:
                     if project['platform'] == 'twitter':
                         username = extract_twitter_username(project['url'])
@@ -5085,6 +5152,7 @@ async def start_twitter_monitoring():
                             twitter_monitor.add_account(username)
                             
             accounts_list = list(twitter_monitor.monitoring_accounts)
+            twitter_monitor.poll_interval = TWITTER_MONITORING_INTERVAL
             logger.info(f"🐦 Запуск Twitter API моніторингу для акаунтів: {accounts_list}")
             logger.info("🔄 Twitter моніторинг активний та працює в фоновому режимі...")
             
@@ -5112,7 +5180,7 @@ async def start_twitter_monitoring():
                         logger.info(f"Оброблено {len(formatted_tweets)} нових твітів")
                     
                     # Чекаємо перед наступною перевіркою
-                    await asyncio.sleep(TWITTER_MONITORING_INTERVAL)
+                    await asyncio.sleep(twitter_monitor.get_next_poll_delay(TWITTER_MONITORING_INTERVAL))
                     
                 except Exception as e:
                     logger.error(f"Помилка в циклі моніторингу Twitter: {e}")
@@ -5120,6 +5188,7 @@ async def start_twitter_monitoring():
             
     except Exception as e:
         logger.error(f"Помилка моніторингу Twitter: {e}")
+        raise
 
 async def start_selenium_twitter_monitoring():
     """Запустити Selenium Twitter моніторинг"""
@@ -5132,7 +5201,7 @@ async def start_selenium_twitter_monitoring():
     # Перевіряємо чи драйвер ініціалізовано
     if not selenium_twitter_monitor.driver:
         logger.warning("Selenium драйвер не ініціалізовано, спробуємо ініціалізувати...")
-        if not selenium_twitter_monitor._setup_driver(headless=True):
+        if not await selenium_twitter_monitor.run_blocking(selenium_twitter_monitor._setup_driver, True):
             logger.error("Не вдалося ініціалізувати Selenium драйвер, пропускаємо моніторинг")
             return
         
@@ -5177,9 +5246,9 @@ async def start_selenium_twitter_monitoring():
                 logger.error(f"Помилка в циклі Selenium моніторингу Twitter: {e}")
                 # Спробуємо переініціалізувати драйвер
                 try:
-                    selenium_twitter_monitor.close_driver()
+                    await selenium_twitter_monitor.run_blocking(selenium_twitter_monitor.close_driver)
                     await asyncio.sleep(5)
-                    if selenium_twitter_monitor._setup_driver(headless=True):
+                    if await selenium_twitter_monitor.run_blocking(selenium_twitter_monitor._setup_driver, True):
                         logger.info("Selenium драйвер переініціалізовано")
                     else:
                         logger.error("Не вдалося переініціалізувати Selenium драйвер")
@@ -5192,9 +5261,10 @@ async def start_selenium_twitter_monitoring():
         logger.error(f"Помилка Selenium моніторингу Twitter: {e}")
         # Закриваємо драйвер при критичній помилці
         try:
-            selenium_twitter_monitor.close_driver()
+            await selenium_twitter_monitor.run_blocking(selenium_twitter_monitor.close_driver)
         except:
             pass
+        raise
 
 async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Обробник помилок"""
@@ -5203,7 +5273,7 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
 async def check_sessions(context: ContextTypes.DEFAULT_TYPE) -> None:
     """Перевірити закінчені сесії"""
     try:
-        security_manager.check_expired_sessions(context.bot)
+        await security_manager.check_expired_sessions(delivery_engine)
     except Exception as e:
         logger.error(f"Помилка перевірки сесій: {e}")
 
@@ -5211,9 +5281,14 @@ async def cleanup_old_messages(context: ContextTypes.DEFAULT_TYPE) -> None:
     """Очистити старі повідомлення"""
     try:
         project_manager.cleanup_old_messages(hours=24)
+        delivery_outbox.prune(DELIVERY_OUTBOX_RETENTION_HOURS)
     except Exception as e:
         logger.error(f"Помилка очищення старих повідомлень: {e}")
 
+async def flush_delivery_outbox(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Записати накопичені підтвердження доставок"""
+    delivery_outbox.flush()
+
 async def cleanup_access_sessions(context: ContextTypes.DEFAULT_TYPE) -> None:
     """Очистити закінчені сесії доступу"""
     try:
@@ -5221,37 +5296,6 @@ async def cleanup_access_sessions(context: ContextTypes.DEFAULT_TYPE) -> None:
     except Exception as e:
         logger.error(f"Помилка очищення сесій доступу: {e}")
 
-def _get_time_ago(dt: datetime) -> str:
-    """Отримати час тому"""
-    try:
-        from datetime import datetime, timezone
-        now = datetime.now(timezone.utc)
-        
-        # Переконуємося що dt має timezone
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        
-        diff = now - dt
-        
-        total_seconds = int(diff.total_seconds())
-        
-        if total_seconds < 0:
-            return "щойно"
-        elif total_seconds < 60:
-            return f"{total_seconds} секунд тому"
-        elif total_seconds < 3600:
-            minutes = total_seconds // 60
-            return f"{minutes} хвилин тому"
-        elif total_seconds < 86400:
-            hours = total_seconds // 3600
-            return f"{hours} годин тому"
-        else:
-            days = total_seconds // 86400
-            return f"{days} днів тому"
-    except Exception as e:
-        logger.error(f"Помилка обчислення часу: {e}")
-        return ""
-
 # Selenium Twitter команди
 @require_auth
 async def selenium_auth_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -5268,7 +5312,8 @@ async def selenium_auth_command(update: Update, context: ContextTypes.DEFAULT_TY
     await update.message.reply_text("🔐 Відкриваю браузер для авторизації в Twitter...")
     
     try:
-        if selenium_twitter_monitor.open_manual_auth():
+        # Очікування ручної авторизації блокує - виконуємо в потоці драйвера
+        if await selenium_twitter_monitor.run_blocking(selenium_twitter_monitor.open_manual_auth):
             selenium_twitter_monitor.save_profile()
             await update.message.reply_text("✅ Авторизація завершена! Профіль збережено.")
         else:
@@ -5367,11 +5412,10 @@ async def selenium_start_command(update: Update, context: ContextTypes.DEFAULT_T
         await update.message.reply_text("❌ Немає акаунтів для моніторингу! Додайте Twitter акаунти спочатку.")
         return
     
-    # Запускаємо Selenium моніторинг в окремому потоці
-    import threading
-    selenium_thread = threading.Thread(target=lambda: asyncio.run(start_selenium_twitter_monitoring()))
-    selenium_thread.daemon = True
-    selenium_thread.start()
+    # Запускаємо Selenium моніторинг як задачу на loop бота
+    if not monitor_supervisor.start('selenium', start_selenium_twitter_monitoring):
+        await update.message.reply_text("ℹ️ Selenium Twitter моніторинг вже працює.")
+        return
     # Старт після синхронізації — на всяк випадок
     sync_monitors_with_projects()
     
@@ -5387,6 +5431,7 @@ async def selenium_stop_command(update: Update, context: ContextTypes.DEFAULT_TY
     
     if selenium_twitter_monitor:
         selenium_twitter_monitor.monitoring_active = False
+        await monitor_supervisor.stop('selenium')
         await selenium_twitter_monitor.__aexit__(None, None, None)
         selenium_twitter_monitor = None
     
@@ -5592,28 +5637,6 @@ async def remove_discord_command(update: Update, context: ContextTypes.DEFAULT_T
         await update.message.reply_text(f"❌ Помилка видалення Discord каналу {channel_id}.")
 
 
-def extract_discord_channel_id(url: str) -> str:
-    """Витягти channel_id з Discord URL"""
-    try:
-        if not url:
-            return ""
-        
-        import re
-        # Спробуємо знайти channel_id в URL
-        match = re.search(r'discord\.com/channels/\d+/(\d+)', url)
-        if match:
-            return match.group(1)
-        
-        # Якщо це просто ID (тільки цифри)
-        if url.isdigit():
-            return url
-            
-        logger.warning(f"Не вдалося витягти Discord channel_id з: {url}")
-        return ""
-    except Exception as e:
-        logger.error(f"Помилка витягування Discord channel_id з '{url}': {e}")
-        return ""
-
 async def admin_create_user_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Команда для створення нового користувача (тільки для адміністратора)"""
     if not update.effective_user or not update.message:
@@ -5777,6 +5800,78 @@ async def admin_users_command(update: Update, context: ContextTypes.DEFAULT_TYPE
                 f"❌ **Помилка отримання списку користувачів**\n\n{str(e)}",
             )
 
+def get_poll_source_key(source: str) -> Optional[str]:
+    """Отримати ключ джерела для планувальника з URL, ID каналу або username"""
+    source = source.strip()
+    if 'discord.com' in source or source.isdigit():
+        channel_id = extract_discord_channel_id(source)
+        return f"discord:{channel_id}" if channel_id else None
+    username = extract_twitter_username(source)
+    return f"twitter:{username.lower()}" if username else None
+
+async def pin_source_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Закріпити пріоритет опитування за джерелом (тільки для адміністратора)"""
+    if not update.effective_user or not update.message:
+        return
+        
+    user_id = update.effective_user.id
+    
+    # Перевіряємо чи користувач є адміністратором
+    if not access_manager.is_admin(user_id):
+        await update.message.reply_text(
+            "❌ **Доступ заборонено!**\n\n"
+            "Тільки адміністратор може змінювати пріоритети опитування.",
+        )
+        return
+    
+    if not poll_scheduler:
+        await update.message.reply_text("ℹ️ Адаптивне опитування вимкнено в конфігурації.")
+        return
+    
+    if len(context.args) < 2:
+        pins = poll_scheduler.get_pins()
+        pins_text = "\n".join(f"• {key}: {priority}" for key, priority in sorted(pins.items())) or "немає"
+        await update.message.reply_text(
+            "📌 **Пріоритети опитування**\n\n"
+            "**Використання:** /pin_source <канал або акаунт> <high|normal|low|auto>\n"
+            "**Приклад:** /pin_source 1358806016648544326 high\n\n"
+            f"**Закріплені джерела:**\n{pins_text}",
+        )
+        return
+    
+    key = get_poll_source_key(context.args[0])
+    priority = context.args[1].strip().lower()
+    if not key:
+        await update.message.reply_text(f"❌ Не вдалося розпізнати джерело: {context.args[0]}")
+        return
+    
+    if priority == 'auto':
+        poll_scheduler.unpin(key)
+    elif not poll_scheduler.pin(key, priority):
+        await update.message.reply_text("❌ Пріоритет має бути одним з: high, normal, low, auto")
+        return
+    
+    project_manager.set_setting('poll_priorities', poll_scheduler.get_pins())
+    await update.message.reply_text(f"✅ Джерело `{key}`: пріоритет {priority}")
+
+async def on_startup(application: Application) -> None:
+    """Запустити доставку в Telegram і монітори на event loop бота"""
+    await delivery_engine.start()
+    delivery_outbox.prune(DELIVERY_OUTBOX_RETENTION_HOURS)
+    resume_outbox_deliveries()
+    await monitor_supervisor.attach()
+
+async def on_shutdown(application: Application) -> None:
+    """Зупинити монітори, дочекатися черги доставки і зупинити воркери"""
+    await monitor_supervisor.stop_all()
+    await delivery_engine.stop()
+    delivery_outbox.close()
+    # Незбережені зміни проектів і доступів записуємо до виходу (SIGINT/SIGTERM теж приходять сюди)
+    await asyncio.to_thread(project_manager.flush)
+    await asyncio.to_thread(access_manager.flush)
+    await asyncio.to_thread(cursor_store.compact)
+    await http_client.close_session()
+
 def main() -> None:
     """Головна функція"""
     global bot_instance
@@ -5789,7 +5884,13 @@ def main() -> None:
         logger.warning("AUTHORIZATION токен не встановлено! Discord моніторинг буде відключено")
     
     # Створюємо додаток
-    application = Application.builder().token(BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+        .build()
+    )
     bot_instance = application.bot
     
     # Додаємо обробники
@@ -5827,6 +5928,7 @@ def main() -> None:
     application.add_handler(CommandHandler("admin_create_user", admin_create_user_command))
     application.add_handler(CommandHandler("admin_create_admin", admin_create_admin_command))
     application.add_handler(CommandHandler("admin_users", admin_users_command))
+    application.add_handler(CommandHandler("pin_source", pin_source_command))
     
     application.add_error_handler(error_handler)
     
@@ -5838,6 +5940,9 @@ def main() -> None:
         # Додаємо періодичне очищення старих повідомлень (кожні 2 години)
         job_queue.run_repeating(cleanup_old_messages, interval=7200, first=7200)
         
+        # Підтвердження доставок пишуться пакетами - дописуємо залишок (кожні 5 секунд)
+        job_queue.run_repeating(flush_delivery_outbox, interval=5, first=5)
+        
         # Додаємо періодичне очищення сесій доступу (кожні 30 хвилин)
         job_queue.run_repeating(cleanup_access_sessions, interval=1800, first=1800)  # Кожні 30 хвилин
     
@@ -5854,12 +5959,12 @@ def main() -> None:
     
     # Показуємо статистику існуючих проектів
     try:
-        total_users = len(project_manager.data.get('users', {}))
+        total_users = len(project_manager.get_all_users())
         total_projects = 0
         twitter_projects = 0
         discord_projects = 0
         
-        for user_id, projects in project_manager.data.get('projects', {}).items():
+        for user_id, projects in project_manager.snapshot().projects.items():
             total_projects += len(projects)
             for project in projects:
                 if project.get('platform') == 'twitter':
@@ -5921,13 +6026,26 @@ def main() -> None:
     
     logger.info("✅ Синхронізація завершена, всі монітори запущені автоматично")
     
-    # Запускаємо бота
+    # Запускаємо бота: webhook, якщо налаштовано, інакше long polling (видаляє webhook)
     try:
-        application.run_polling()
+        if TELEGRAM_WEBHOOK_URL:
+            asyncio.run(run_webhook(
+                application,
+                TELEGRAM_WEBHOOK_URL,
+                listen=TELEGRAM_WEBHOOK_LISTEN,
+                port=TELEGRAM_WEBHOOK_PORT,
+                secret_token=TELEGRAM_WEBHOOK_SECRET or None
+            ))
+        else:
+            application.run_polling()
     except KeyboardInterrupt:
         # Примусово зберігаємо дані при завершенні
         project_manager.save_data(force=True)
+        cursor_store.compact()
         logger.info("Бот зупинено, дані збережено")
+    finally:
+        project_manager.close()
+        access_manager.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
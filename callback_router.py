@@ -0,0 +1,122 @@
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+# handler(update, context, query, user_id, callback_data)
+CallbackHandler = Callable[..., Awaitable[None]]
+# middleware(update, context, query, user_id) -> False, щоб зупинити обробку
+Middleware = Callable[..., Awaitable[bool]]
+TimingHook = Callable[[str, float], None]
+
+
+class CallbackRouter:
+    """Маршрутизатор callback кнопок: точний збіг через dict, параметризовані дані - за префіксом"""
+
+    def __init__(self, slow_threshold: float = 1.0):
+        self.slow_threshold = slow_threshold
+        self.logger = logging.getLogger(__name__)
+        self.exact: Dict[str, Tuple[CallbackHandler, Optional[Sequence[Middleware]]]] = {}
+        self.prefixes: List[Tuple[str, CallbackHandler, Optional[Sequence[Middleware]]]] = []  # довші префікси першими
+        self.middleware: List[Middleware] = []  # за замовчуванням для всіх маршрутів
+        self.timing_hooks: List[TimingHook] = []
+        self.fallback_handler: Optional[CallbackHandler] = None
+        self.stats: Dict[str, Dict] = {}  # route -> {'calls', 'total', 'max', 'errors'}
+
+    def route(self, *names: str, middleware: Optional[Sequence[Middleware]] = None):
+        """Декоратор: обробник для точних значень callback_data"""
+        def decorator(handler: CallbackHandler) -> CallbackHandler:
+            for name in names:
+                if name in self.exact:
+                    raise ValueError(f"Callback route already registered: {name}")
+                self.exact[name] = (handler, middleware)
+            return handler
+        return decorator
+
+    def prefix(self, prefix: str, middleware: Optional[Sequence[Middleware]] = None):
+        """Декоратор: обробник для callback_data з префіксом (наприклад, delete_twitter_<id>)"""
+        def decorator(handler: CallbackHandler) -> CallbackHandler:
+            if any(existing == prefix for existing, _, _ in self.prefixes):
+                raise ValueError(f"Callback prefix already registered: {prefix}")
+            self.prefixes.append((prefix, handler, middleware))
+            self.prefixes.sort(key=lambda item: len(item[0]), reverse=True)
+            return handler
+        return decorator
+
+    def fallback(self, handler: CallbackHandler) -> CallbackHandler:
+        """Декоратор: обробник для невідомих або порожніх callback_data"""
+        self.fallback_handler = handler
+        return handler
+
+    def use(self, middleware: Middleware) -> Middleware:
+        """Додати middleware за замовчуванням (виконуються в порядку додавання)"""
+        self.middleware.append(middleware)
+        return middleware
+
+    def add_timing_hook(self, hook: TimingHook) -> None:
+        """Викликати hook(route, seconds) після кожного обробника"""
+        self.timing_hooks.append(hook)
+
+    def resolve(self, callback_data: Optional[str]) -> Tuple[Optional[str], Optional[CallbackHandler], Optional[Sequence[Middleware]]]:
+        """Знайти маршрут: (ключ маршруту, обробник, middleware)"""
+        if callback_data is not None:
+            entry = self.exact.get(callback_data)
+            if entry:
+                return callback_data, entry[0], entry[1]
+            for prefix, handler, middleware in self.prefixes:
+                if callback_data.startswith(prefix):
+                    return prefix + '*', handler, middleware
+        return None, self.fallback_handler, None
+
+    async def dispatch(self, update, context) -> bool:
+        """Обробити callback запит; повертає True, якщо обробник знайдено і виконано"""
+        if not update.callback_query or not update.effective_user:
+            return False
+
+        query = update.callback_query
+        await query.answer()
+        user_id = update.effective_user.id
+        callback_data = query.data
+
+        route, handler, middleware = self.resolve(callback_data)
+        for step in (self.middleware if middleware is None else middleware):
+            if not await step(update, context, query, user_id):
+                return False
+        if handler is None:
+            return False
+
+        route = route or '<fallback>'
+        started = time.perf_counter()
+        failed = False
+        try:
+            await handler(update, context, query, user_id, callback_data)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._record(route, time.perf_counter() - started, failed)
+        return True
+
+    def _record(self, route: str, elapsed: float, failed: bool) -> None:
+        stats = self.stats.setdefault(route, {'calls': 0, 'total': 0.0, 'max': 0.0, 'errors': 0})
+        stats['calls'] += 1
+        stats['total'] += elapsed
+        stats['max'] = max(stats['max'], elapsed)
+        if failed:
+            stats['errors'] += 1
+        if elapsed >= self.slow_threshold:
+            self.logger.warning(f"🐢 Повільна кнопка {route}: {elapsed:.2f} с")
+        for hook in self.timing_hooks:
+            try:
+                hook(route, elapsed)
+            except Exception as e:
+                self.logger.error(f"Помилка timing hook: {e}")
+
+    def get_stats(self, top: int = 10) -> List[Dict]:
+        """Найповільніші маршрути за середнім часом"""
+        rows = [
+            {'route': route, 'calls': s['calls'], 'avg_ms': round(s['total'] / s['calls'] * 1000, 1),
+             'max_ms': round(s['max'] * 1000, 1), 'errors': s['errors']}
+            for route, s in self.stats.items() if s['calls']
+        ]
+        rows.sort(key=lambda row: row['avg_ms'], reverse=True)
+        return rows[:top]
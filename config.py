@@ -6,17 +6,70 @@ load_dotenv()
 # Конфігурація бота
 BOT_TOKEN = os.getenv('BOT_TOKEN')
 ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', '401483')  # За замовчуванням
-SECURITY_TIMEOUT = 300  # 5 хвилин в секундах
 
 # Discord моніторинг
 DISCORD_AUTHORIZATION = os.getenv('AUTHORIZATION')  # Discord authorization токен
 MONITORING_INTERVAL = 15  # Інтервал перевірки нових повідомлень (секунди) - безпечно
+DISCORD_MAX_CONCURRENT_REQUESTS = 10  # Максимум одночасних запитів до Discord API
+DISCORD_GLOBAL_RATE_LIMIT = 50  # Глобальний ліміт запитів до Discord API за секунду
+DISCORD_FETCH_PAGE_SIZE = 100  # Розмір сторінки при догрузці нових повідомлень (максимум 100)
+DISCORD_MAX_PAGES_PER_CYCLE = 5  # Максимум сторінок на канал за один цикл перевірки
+DISCORD_HISTORY_CACHE_TTL = 120  # Скільки зберігати завантажені сторінки історії каналу (секунди)
+DISCORD_GATEWAY_ENABLED = os.getenv('DISCORD_GATEWAY_ENABLED', 'false').lower() == 'true'  # Push режим через Gateway
+DISCORD_GATEWAY_URL = os.getenv('DISCORD_GATEWAY_URL', 'wss://gateway.discord.gg/?v=9&encoding=json')  # Адреса Gateway
 
 # Twitter/X моніторинг
 TWITTER_AUTH_TOKEN = os.getenv('TWITTER_AUTH_TOKEN')  # Twitter auth_token
 TWITTER_CSRF_TOKEN = os.getenv('TWITTER_CSRF_TOKEN')  # Twitter csrf_token (ct0)
 TWITTER_MONITORING_INTERVAL = 30  # Інтервал перевірки нових твітів (секунди)
 
+# Адаптивне опитування джерел
+ADAPTIVE_POLLING_ENABLED = True  # Частіше опитувати активні джерела, рідше - тихі
+POLL_MIN_INTERVAL = 5  # Мінімальний інтервал для активних джерел (секунди)
+POLL_MAX_INTERVAL = 300  # Максимальний інтервал для тихих джерел (секунди)
+POLL_REQUEST_BUDGET_PER_MINUTE = 120  # Глобальний бюджет перевірок джерел за хвилину
+
+# Збереження курсорів моніторів між перезапусками
+CURSOR_STORE_FILE = 'monitor_cursors.json'  # Файл зі знімком курсорів (журнал поруч)
+BACKFILL_MAX_ITEMS = 20  # Максимум пропущених повідомлень на джерело після перезапуску
+BACKFILL_MAX_AGE_HOURS = 6  # Не догружати повідомлення старші за цей час (години)
+
+# HTTP клієнт (спільний для всіх модулів)
+HTTP_TIMEOUT = 15  # Загальний таймаут запиту (секунди)
+HTTP_POOL_LIMIT = 100  # Максимум одночасних з'єднань
+HTTP_POOL_LIMIT_PER_HOST = 20  # Максимум з'єднань до одного хоста
+HTTP_DNS_CACHE_TTL = 300  # Час кешування DNS (секунди)
+HTTP_KEEPALIVE_TIMEOUT = 30  # Скільки тримати вільне з'єднання відкритим (секунди)
+HTTP_MAX_RETRIES = 2  # Повтори при мережевих помилках та 5xx
+HTTP_VERIFY_SSL = os.getenv('HTTP_VERIFY_SSL', 'true').lower() == 'true'  # Перевірка SSL сертифікатів
+
+# Доставка сповіщень у Telegram
+TELEGRAM_DELIVERY_WORKERS = 4  # Кількість воркерів черги доставки
+TELEGRAM_GLOBAL_RATE_LIMIT = 30  # Глобальний ліміт повідомлень за секунду
+TELEGRAM_GROUP_INTERVAL = 3.0  # Мінімальний інтервал між повідомленнями в групу/канал (секунди)
+TELEGRAM_PRIVATE_INTERVAL = 1.0  # Мінімальний інтервал між повідомленнями в особистий чат (секунди)
+
+# Кеш завантажених медіа
+MEDIA_CACHE_DIR = 'media_cache'  # Каталог кешу зображень
+MEDIA_CACHE_MAX_MB = 200  # Максимальний розмір кешу на диску (MB)
+MEDIA_CACHE_MAX_AGE_HOURS = 24  # Час життя файлу без звернень (години)
+MEDIA_CACHE_HOT_MAX_MB = 16  # Розмір гарячого кешу в пам'яті для малих файлів (MB)
+
+# Надійна черга пересилань (переживає перезапуск бота)
+DELIVERY_OUTBOX_FILE = 'delivery_outbox.db'  # SQLite база outbox
+DELIVERY_OUTBOX_RETENTION_HOURS = 72  # Скільки зберігати виконані доставки для захисту від дублів (години)
+
+# Сховище проектів, користувачів і налаштувань пересилання
+PROJECT_STORAGE_BACKEND = os.getenv('PROJECT_STORAGE_BACKEND', 'json')  # 'json' - весь data.json, 'sqlite' - запис змінених рядків (за бажанням)
+PROJECT_STORAGE_FILE = 'data.db'  # SQLite база (при першому запуску переносяться data.json/projects.json)
+PROJECT_SAVE_MAX_DELAY = 2.0  # Максимальна затримка фонового запису змін (секунди)
+
+# Прийом оновлень Telegram: webhook замість long polling
+TELEGRAM_WEBHOOK_URL = os.getenv('TELEGRAM_WEBHOOK_URL', '')  # Публічний HTTPS URL webhook; порожньо - long polling
+TELEGRAM_WEBHOOK_LISTEN = os.getenv('TELEGRAM_WEBHOOK_LISTEN', '127.0.0.1')  # Адреса локального сервера (за reverse proxy)
+TELEGRAM_WEBHOOK_PORT = int(os.getenv('TELEGRAM_WEBHOOK_PORT', '8443'))  # Порт локального сервера
+TELEGRAM_WEBHOOK_SECRET = os.getenv('TELEGRAM_WEBHOOK_SECRET', '')  # Секрет X-Telegram-Bot-Api-Secret-Token; порожньо - випадковий
+
 # Повідомлення
 MESSAGES = {
     'welcome': 'Привіт! Я телеграм бот з базовою безпекою.',
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+class CursorStore:
+    """Збереження курсорів моніторів: знімок + журнал інкрементальних змін"""
+
+    def __init__(self, data_file: str = "monitor_cursors.json", compact_threshold: int = 500):
+        self.data_file = data_file
+        self.journal_file = f"{data_file}.journal"
+        self.compact_threshold = compact_threshold
+        self.logger = logging.getLogger(__name__)
+        self.cursors: Dict[str, Dict] = {}  # key -> {'id': ..., 'updated_at': ...}
+        self._journal_entries = 0
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """Завантажити знімок і застосувати журнал"""
+        try:
+            if os.path.exists(self.data_file):
+                with open(self.data_file, 'r', encoding='utf-8') as f:
+                    self.cursors = json.load(f).get('cursors', {})
+
+            if os.path.exists(self.journal_file):
+                with open(self.journal_file, 'rb') as f:
+                    raw = f.read()
+                complete = raw[:raw.rfind(b'\n') + 1]
+                if len(complete) < len(raw):
+                    # Обірваний останній запис після аварійного завершення - відрізаємо,
+                    # інакше наступний допис склеїться з ним в один нечитабельний рядок
+                    with open(self.journal_file, 'r+b') as f:
+                        f.truncate(len(complete))
+                    self.logger.warning(f"Відкинуто обірваний запис журналу курсорів ({len(raw) - len(complete)} байт)")
+                for line in complete.decode('utf-8').splitlines():
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._apply(entry)
+                    self._journal_entries += 1
+
+            self.logger.info(f"Завантажено {len(self.cursors)} курсорів моніторингу")
+        except Exception as e:
+            self.logger.error(f"Помилка завантаження курсорів: {e}")
+            self.cursors = {}
+
+    def _apply(self, entry: Dict) -> None:
+        """Застосувати запис журналу"""
+        if entry.get('v') is None:
+            self.cursors.pop(entry['k'], None)
+        else:
+            self.cursors[entry['k']] = {'id': entry['v'], 'updated_at': entry.get('t', 0)}
+
+    def get(self, key: str) -> Optional[str]:
+        """Отримати курсор"""
+        cursor = self.cursors.get(key)
+        return cursor['id'] if cursor else None
+
+    def get_updated_at(self, key: str) -> Optional[float]:
+        """Час останнього оновлення курсора (unix)"""
+        cursor = self.cursors.get(key)
+        return cursor['updated_at'] if cursor else None
+
+    def set(self, key: str, value: Optional[str]) -> bool:
+        """Зберегти курсор дописом у журнал"""
+        with self._lock:
+            current = self.cursors.get(key)
+            if value is not None and current and current['id'] == value:
+                return True
+            if value is None and current is None:
+                return True
+
+            entry = {'k': key, 'v': value, 't': time.time()}
+            try:
+                with open(self.journal_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self._apply(entry)
+                self._journal_entries += 1
+            except Exception as e:
+                self.logger.error(f"Помилка запису курсора {key}: {e}")
+                return False
+
+            if self._journal_entries >= self.compact_threshold:
+                self._compact()
+            return True
+
+    def delete(self, key: str) -> bool:
+        """Видалити курсор"""
+        return self.set(key, None)
+
+    def compact(self) -> bool:
+        """Переписати знімок і очистити журнал"""
+        with self._lock:
+            return self._compact()
+
+    def _compact(self) -> bool:
+        """Атомарно записати знімок (викликається під блокуванням)"""
+        try:
+            tmp_file = f"{self.data_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'cursors': self.cursors, 'compacted_at': time.time()}, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.data_file)
+            # Журнал вже врахований у знімку
+            open(self.journal_file, 'w', encoding='utf-8').close()
+            self._journal_entries = 0
+            self.logger.debug(f"Курсори ущільнено: {len(self.cursors)} записів")
+            return True
+        except Exception as e:
+            self.logger.error(f"Помилка ущільнення курсорів: {e}")
+            return False
@@ -0,0 +1,205 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+
+class DeliveryOutbox:
+    """Надійна черга пересилань (SQLite WAL): подія записується один раз, доставка підтверджується пакетами"""
+
+    def __init__(self, db_file: str = "delivery_outbox.db", ack_batch_size: int = 50, ack_flush_interval: float = 2.0):
+        self.db_file = db_file
+        self.ack_batch_size = ack_batch_size
+        self.ack_flush_interval = ack_flush_interval
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._pending_acks: List[int] = []
+        self._ack_listeners: List[Callable[[List[Tuple[str, str, int]]], None]] = []
+        self._last_flush = time.monotonic()
+        self.stats = {'appended': 0, 'acked': 0, 'failed': 0, 'ack_flushes': 0}
+
+        self.db = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS events (
+                forward_key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                text TEXT NOT NULL,
+                images TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS deliveries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                forward_key TEXT NOT NULL REFERENCES events(forward_key),
+                channel TEXT NOT NULL,
+                user_id INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL,
+                UNIQUE (forward_key, channel)
+            );
+            CREATE INDEX IF NOT EXISTS deliveries_status ON deliveries(status);
+        """)
+
+    def append(self, forward_key: str, source: str, text: str, images: List[str],
+               targets: List[Tuple[str, int]]) -> List[Tuple[int, str, int]]:
+        """Записати подію і її доставки однією транзакцією.
+
+        Повертає (id, канал, user_id) лише для нових доставок - подія, яка вже
+        є в outbox для цього каналу, повторно не ставиться в чергу.
+        """
+        now = time.time()
+        created = []
+        try:
+            with self._lock:
+                self.db.execute("BEGIN")
+                try:
+                    self.db.execute(
+                        "INSERT OR IGNORE INTO events (forward_key, source, text, images, created_at) VALUES (?, ?, ?, ?, ?)",
+                        (forward_key, source, text, json.dumps(images), now)
+                    )
+                    for channel, user_id in targets:
+                        cursor = self.db.execute(
+                            "INSERT OR IGNORE INTO deliveries (forward_key, channel, user_id, created_at) VALUES (?, ?, ?, ?)",
+                            (forward_key, channel, user_id, now)
+                        )
+                        if cursor.rowcount:
+                            created.append((cursor.lastrowid, channel, user_id))
+                    self.db.execute("COMMIT")
+                except Exception:
+                    self.db.execute("ROLLBACK")
+                    raise
+            self.stats['appended'] += len(created)
+        except Exception as e:
+            self.logger.error(f"Помилка запису в outbox: {e}")
+        return created
+
+    def add_ack_listener(self, callback: Callable[[List[Tuple[str, str, int]]], None]) -> None:
+        """Підписатися на записані пакети підтверджень: список (forward_key, канал, user_id)"""
+        self._ack_listeners.append(callback)
+
+    def ack(self, delivery_id: int) -> None:
+        """Позначити доставку виконаною (запис - пакетом)"""
+        # Якщо процес впаде до flush(), доставка повториться після перезапуску (at-least-once)
+        with self._lock:
+            self._pending_acks.append(delivery_id)
+            due = (len(self._pending_acks) >= self.ack_batch_size
+                   or time.monotonic() - self._last_flush >= self.ack_flush_interval)
+        if due:
+            self.flush()
+
+    def fail(self, delivery_id: int, error: str) -> None:
+        """Позначити доставку невдалою (не відновлюється після перезапуску)"""
+        try:
+            with self._lock:
+                self.db.execute(
+                    "UPDATE deliveries SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+                    (error[:500], time.time(), delivery_id)
+                )
+            self.stats['failed'] += 1
+        except Exception as e:
+            self.logger.error(f"Помилка запису невдалої доставки {delivery_id}: {e}")
+
+    def flush(self) -> int:
+        """Записати накопичені підтвердження однією транзакцією"""
+        with self._lock:
+            acks, self._pending_acks = self._pending_acks, []
+            self._last_flush = time.monotonic()
+            if not acks:
+                return 0
+            try:
+                now = time.time()
+                self.db.execute("BEGIN")
+                self.db.executemany(
+                    "UPDATE deliveries SET status = 'done', updated_at = ? WHERE id = ?",
+                    [(now, delivery_id) for delivery_id in acks]
+                )
+                # Цілі підтверджених доставок - для підписників (журнал відправлених)
+                delivered = []
+                if self._ack_listeners:
+                    for start in range(0, len(acks), 500):
+                        chunk = acks[start:start + 500]
+                        delivered.extend(self.db.execute(
+                            f"SELECT forward_key, channel, user_id FROM deliveries WHERE id IN ({','.join('?' * len(chunk))})",
+                            chunk
+                        ).fetchall())
+                self.db.execute("COMMIT")
+            except Exception as e:
+                self.db.execute("ROLLBACK")
+                # Повернемо підтвердження в буфер - спробуємо наступного разу
+                self._pending_acks = acks + self._pending_acks
+                self.logger.error(f"Помилка запису підтверджень outbox: {e}")
+                return 0
+        self.stats['acked'] += len(acks)
+        self.stats['ack_flushes'] += 1
+        for callback in self._ack_listeners:
+            try:
+                callback(delivered)
+            except Exception as e:
+                self.logger.error(f"Помилка обробки підтверджень outbox: {e}")
+        return len(acks)
+
+    def pending(self) -> List[Dict]:
+        """Недоставлені події з цільовими каналами (для відновлення після перезапуску)"""
+        try:
+            with self._lock:
+                rows = self.db.execute("""
+                    SELECT d.id, d.channel, d.user_id, e.forward_key, e.source, e.text, e.images
+                    FROM deliveries d JOIN events e ON e.forward_key = d.forward_key
+                    WHERE d.status = 'pending'
+                    ORDER BY d.id
+                """).fetchall()
+        except Exception as e:
+            self.logger.error(f"Помилка читання outbox: {e}")
+            return []
+
+        events: Dict[str, Dict] = {}
+        for delivery_id, channel, user_id, forward_key, source, text, images in rows:
+            event = events.setdefault(forward_key, {
+                'forward_key': forward_key, 'source': source, 'text': text,
+                'images': json.loads(images), 'deliveries': []
+            })
+            event['deliveries'].append((delivery_id, channel, user_id))
+        return list(events.values())
+
+    def prune(self, max_age_hours: float = 72) -> int:
+        """Видалити завершені доставки і події, старші за max_age_hours"""
+        cutoff = time.time() - max_age_hours * 3600
+        try:
+            with self._lock:
+                self.db.execute("BEGIN")
+                try:
+                    removed = self.db.execute(
+                        "DELETE FROM deliveries WHERE status != 'pending' AND created_at < ?", (cutoff,)
+                    ).rowcount
+                    self.db.execute(
+                        "DELETE FROM events WHERE created_at < ? AND forward_key NOT IN (SELECT forward_key FROM deliveries)",
+                        (cutoff,)
+                    )
+                    self.db.execute("COMMIT")
+                except Exception:
+                    self.db.execute("ROLLBACK")
+                    raise
+            if removed:
+                self.logger.info(f"🧹 Outbox: видалено {removed} старих доставок")
+            return removed
+        except Exception as e:
+            self.logger.error(f"Помилка очищення outbox: {e}")
+            return 0
+
+    def get_stats(self) -> Dict:
+        """Статистика outbox"""
+        with self._lock:
+            counts = dict(self.db.execute("SELECT status, COUNT(*) FROM deliveries GROUP BY status").fetchall())
+            pending_acks = len(self._pending_acks)
+        return {**self.stats, 'pending_acks': pending_acks, 'by_status': counts}
+
+    def close(self) -> None:
+        """Записати підтвердження і закрити базу"""
+        self.flush()
+        with self._lock:
+            self.db.close()
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+import random
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+import aiohttp
+
+# Опкоди Discord Gateway
+OP_DISPATCH = 0
+OP_HEARTBEAT = 1
+OP_IDENTIFY = 2
+OP_RECONNECT = 7
+OP_INVALID_SESSION = 9
+OP_HELLO = 10
+OP_HEARTBEAT_ACK = 11
+OP_GUILD_SUBSCRIBE = 14
+
+# GUILDS | GUILD_MESSAGES | MESSAGE_CONTENT
+DEFAULT_INTENTS = (1 << 0) | (1 << 9) | (1 << 15)
+
+DEFAULT_GATEWAY_URL = "wss://gateway.discord.gg/?v=9&encoding=json"
+
+
+class DiscordGateway:
+    """Клієнт Discord Gateway (websocket) для отримання MESSAGE_CREATE в реальному часі"""
+
+    def __init__(self, authorization_token: str, gateway_url: str = DEFAULT_GATEWAY_URL,
+                 intents: int = DEFAULT_INTENTS):
+        self.authorization = authorization_token
+        self.gateway_url = gateway_url
+        self.intents = intents
+        self.logger = logging.getLogger(__name__)
+        self.sequence: Optional[int] = None
+        self.session_id: Optional[str] = None
+        self.connected = False
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._heartbeat_acked = True
+        self.stats = {'connections': 0, 'dispatches': 0, 'messages': 0, 'heartbeats': 0}
+
+    async def run(self, session: aiohttp.ClientSession, guild_ids: Iterable[str],
+                  on_message: Callable[[Dict], Awaitable[None]]) -> str:
+        """Підключитися і слухати події до розриву з'єднання; повертає причину розриву"""
+        heartbeat_task = None
+        try:
+            async with session.ws_connect(self.gateway_url, heartbeat=None, autoping=True) as ws:
+                self._ws = ws
+                self.stats['connections'] += 1
+
+                hello = await ws.receive_json(timeout=30)
+                if hello.get('op') != OP_HELLO:
+                    return f"unexpected first opcode {hello.get('op')}"
+                interval = hello['d']['heartbeat_interval'] / 1000
+                self._heartbeat_acked = True
+                heartbeat_task = asyncio.create_task(self._heartbeat_loop(interval))
+
+                await self._identify()
+
+                async for raw in ws:
+                    if raw.type != aiohttp.WSMsgType.TEXT:
+                        if raw.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+                        continue
+
+                    payload = json.loads(raw.data)
+                    op = payload.get('op')
+                    if payload.get('s') is not None:
+                        self.sequence = payload['s']
+
+                    if op == OP_DISPATCH:
+                        self.stats['dispatches'] += 1
+                        event = payload.get('t')
+                        data = payload.get('d') or {}
+                        if event == 'READY':
+                            self.session_id = data.get('session_id')
+                            self.connected = True
+                            self.logger.info("🔌 Discord Gateway: READY")
+                            await self._subscribe_guilds(guild_ids)
+                        elif event == 'MESSAGE_CREATE':
+                            self.stats['messages'] += 1
+                            await on_message(data)
+                    elif op == OP_HEARTBEAT:
+                        await self._send_heartbeat()
+                    elif op == OP_HEARTBEAT_ACK:
+                        self._heartbeat_acked = True
+                    elif op == OP_RECONNECT:
+                        return "reconnect requested"
+                    elif op == OP_INVALID_SESSION:
+                        self.session_id = None
+                        return "invalid session"
+
+                return f"closed ({ws.close_code})"
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Помилка Discord Gateway: {e}")
+            return f"error: {e}"
+        finally:
+            self.connected = False
+            self._ws = None
+            if heartbeat_task:
+                heartbeat_task.cancel()
+
+    async def _identify(self) -> None:
+        """Відправити Identify"""
+        await self._ws.send_json({
+            'op': OP_IDENTIFY,
+            'd': {
+                'token': self.authorization,
+                'intents': self.intents,
+                'properties': {'os': 'linux', 'browser': 'stulerDS', 'device': 'stulerDS'},
+            }
+        })
+
+    async def _subscribe_guilds(self, guild_ids: Iterable[str]) -> None:
+        """Підписатися на події серверів з каналами моніторингу"""
+        for guild_id in sorted(set(g for g in guild_ids if g)):
+            await self._ws.send_json({
+                'op': OP_GUILD_SUBSCRIBE,
+                'd': {'guild_id': guild_id, 'typing': False, 'activities': False, 'threads': True}
+            })
+            self.logger.info(f"📡 Discord Gateway: підписка на сервер {guild_id}")
+
+    async def _send_heartbeat(self) -> None:
+        """Відправити heartbeat з останнім sequence"""
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.send_json({'op': OP_HEARTBEAT, 'd': self.sequence})
+            self.stats['heartbeats'] += 1
+
+    async def _heartbeat_loop(self, interval: float) -> None:
+        """Цикл heartbeat; закриває з'єднання якщо не отримано ACK"""
+        try:
+            await asyncio.sleep(interval * random.random())
+            while self._ws is not None and not self._ws.closed:
+                if not self._heartbeat_acked:
+                    self.logger.warning("💔 Discord Gateway: немає heartbeat ACK, перепідключення")
+                    await self._ws.close()
+                    return
+                self._heartbeat_acked = False
+                await self._send_heartbeat()
+                await asyncio.sleep(interval)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Помилка heartbeat Discord Gateway: {e}")
+
+    def get_stats(self) -> Dict:
+        """Отримати статистику gateway"""
+        return {**self.stats, 'connected': self.connected}
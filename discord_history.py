@@ -0,0 +1,142 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional
+
+import http_client
+from adaptive_scheduler import parse_datetime
+
+MESSAGES_ROUTE = "GET /channels/{channel_id}/messages"
+TELEGRAM_TEXT_LIMIT = 4000  # Запас до ліміту Telegram (4096)
+
+
+class DiscordHistory:
+    """Історія Discord каналу: пагінація через before=, потокові частини для Telegram, TTL кеш сторінок"""
+
+    def __init__(self, authorization: Optional[str], page_size: int = 100, cache_ttl: float = 120,
+                 max_channels: int = 100, rate_limiter=None, api_base: str = "https://discord.com/api/v9"):
+        self.authorization = authorization
+        self.page_size = min(max(1, page_size), 100)  # Discord віддає максимум 100 за запит
+        self.cache_ttl = cache_ttl
+        self.max_channels = max_channels
+        self.rate_limiter = rate_limiter  # DiscordRateLimiter монітора (спільний бюджет запитів)
+        self.api_base = api_base.rstrip('/')
+        self.logger = logging.getLogger(__name__)
+        # channel_id -> {'messages': [новіші першими], 'fetched_at': ..., 'exhausted': bool}
+        self.cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self.stats = {'api_calls': 0, 'cache_hits': 0, 'cache_misses': 0}
+
+    def _cached(self, channel_id: str) -> Dict:
+        """Запис кешу каналу; застарілий запис скидається"""
+        entry = self.cache.get(channel_id)
+        if entry is None or time.monotonic() - entry['fetched_at'] > self.cache_ttl:
+            entry = {'messages': [], 'fetched_at': time.monotonic(), 'exhausted': False}
+            self.cache[channel_id] = entry
+            while len(self.cache) > self.max_channels:
+                self.cache.popitem(last=False)
+        self.cache.move_to_end(channel_id)
+        return entry
+
+    def invalidate(self, channel_id: Optional[str] = None) -> None:
+        """Скинути кеш каналу (або всіх каналів)"""
+        if channel_id is None:
+            self.cache.clear()
+        else:
+            self.cache.pop(channel_id, None)
+
+    async def fetch_page(self, channel_id: str, before: Optional[str] = None, max_retries: int = 3) -> Optional[List[Dict]]:
+        """Одна сторінка повідомлень (новіші першими); None - помилка запиту"""
+        if not self.authorization or not channel_id:
+            return None
+
+        url = f"{self.api_base}/channels/{channel_id}/messages?limit={self.page_size}"
+        if before:
+            url += f"&before={before}"
+        headers = {
+            'Authorization': self.authorization,
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        try:
+            for attempt in range(max_retries + 1):
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire(MESSAGES_ROUTE, channel_id)
+                self.stats['api_calls'] += 1
+                async with http_client.get_session().get(url, headers=headers) as response:
+                    if self.rate_limiter:
+                        self.rate_limiter.update(MESSAGES_ROUTE, channel_id, response.headers, response.status)
+                    if response.status == 429 and self.rate_limiter:
+                        # Наступний acquire сам дочекається скидання ліміту
+                        continue
+                    if response.status == 200:
+                        return await response.json()
+                    self.logger.error(f"Помилка отримання повідомлень: {response.status}")
+                    return None
+            self.logger.warning(f"Канал {channel_id}: вичерпано спроби після rate limit")
+            return None
+        except Exception as e:
+            self.logger.error(f"Помилка отримання історії Discord: {e}")
+            return None
+
+    async def iter_pages(self, channel_id: str, count: int) -> AsyncIterator[List[Dict]]:
+        """Видавати повідомлення частинами (новіші першими): спершу з кешу, далі сторінками з before="""
+        entry = self._cached(channel_id)
+        cached = entry['messages'][:count]
+        if cached:
+            self.stats['cache_hits'] += 1
+            yield cached
+        sent = len(cached)
+
+        while sent < count and not entry['exhausted']:
+            self.stats['cache_misses'] += 1
+            before = entry['messages'][-1]['id'] if entry['messages'] else None
+            page = await self.fetch_page(channel_id, before)
+            if page is None:
+                return
+            if len(page) < self.page_size:
+                entry['exhausted'] = True
+            if self.cache.get(channel_id) is entry:
+                entry['messages'].extend(page)
+            page = page[:count - sent]
+            if not page:
+                return
+            sent += len(page)
+            yield page
+
+    @staticmethod
+    def render_message(index: int, message: Dict) -> str:
+        """Рядок історії для одного повідомлення"""
+        author = message.get('author', {}).get('username', 'Unknown')
+        content = message.get('content', '')
+        dt = parse_datetime(message.get('timestamp', ''))
+        time_str = dt.strftime('%d.%m.%Y %H:%M') if dt else 'Unknown time'
+
+        # Обмежуємо довжину повідомлення
+        if len(content) > 200:
+            content = content[:200] + "..."
+
+        text = f"**{index}.** 👤 {author} | 🕒 {time_str}\n"
+        if content:
+            text += f"💬 {content}\n"
+        return text + "─" * 30 + "\n"
+
+    async def stream_chunks(self, channel_id: str, count: int, channel_name: str,
+                            max_length: int = TELEGRAM_TEXT_LIMIT) -> AsyncIterator[str]:
+        """Готові до відправки частини тексту (розрив лише між повідомленнями), щойно вони заповнені"""
+        chunk = f"📜 **Історія каналу: {channel_name}**\n📊 Останні {count} повідомлень:\n\n"
+        has_messages = False
+        index = 0
+        async for page in self.iter_pages(channel_id, count):
+            for message in page:
+                index += 1
+                block = self.render_message(index, message)
+                if has_messages and len(chunk) + len(block) + 1 > max_length:
+                    yield chunk
+                    chunk = ""
+                chunk = f"{chunk}\n{block}" if chunk and has_messages else chunk + block
+                has_messages = True
+        if has_messages:
+            yield chunk
+
+    def get_stats(self) -> Dict:
+        """Статистика історії"""
+        return {**self.stats, 'cached_channels': len(self.cache)}
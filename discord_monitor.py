@@ -4,15 +4,44 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Set
 import json
+import random
 import re
+import time
+
+import http_client
+from discord_rate_limiter import DiscordRateLimiter
+from discord_gateway import DiscordGateway, DEFAULT_GATEWAY_URL
+from notification_templates import renderer, escape, clip, ESCAPE_DISCORD_AUTHOR, ESCAPE_DISCORD_CONTENT
+
+MESSAGES_ROUTE = "GET /channels/{channel_id}/messages"
+DISCORD_EPOCH_MS = 1420070400000
 
 class DiscordMonitor:
-    def __init__(self, authorization_token: str):
+    def __init__(self, authorization_token: str, max_concurrent_requests: int = 10,
+                 global_rate_limit: int = 50, page_size: int = 100, max_pages_per_cycle: int = 5):
         self.authorization = authorization_token
         self.session: Optional[aiohttp.ClientSession] = None
+        self.headers = {
+            'Authorization': self.authorization or '',
+            'User-Agent': 'DiscordBot (https://github.com/discord/discord-api-docs, 1.0)',
+            'Content-Type': 'application/json',
+            'X-RateLimit-Precision': 'millisecond'
+        }
         self.logger = logging.getLogger(__name__)
         self.last_message_ids: Dict[str, str] = {}  # channel_id -> last_message_id
         self.monitoring_channels: Set[str] = set()
+        self.channel_guilds: Dict[str, str] = {}  # channel_id -> guild_id
+        self.page_size = min(max(1, page_size), 100)  # Discord віддає максимум 100 за запит
+        self.max_pages_per_cycle = max(1, max_pages_per_cycle)
+        self.max_concurrent_requests = max_concurrent_requests
+        self.rate_limiter = DiscordRateLimiter(global_limit=global_rate_limit)
+        self.gateway: Optional[DiscordGateway] = None
+        self.scheduler = None  # AdaptivePollScheduler, якщо увімкнено адаптивне опитування
+        self.poll_interval = 15
+        self.cursor_store = None  # CursorStore для відновлення після перезапуску
+        self.backfill_pending: Set[str] = set()  # канали з відновленим курсором
+        self.backfill_max_items = 20
+        self.backfill_max_age_hours = 6
         
     async def __aenter__(self):
         """Async context manager entry"""
@@ -20,29 +49,14 @@ class DiscordMonitor:
             self.logger.warning("Discord authorization токен не налаштовано")
             return self
             
-        # Налаштування SSL для обходу проблем з сертифікатами
-        import ssl
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
-        self.session = aiohttp.ClientSession(
-            headers={
-                'Authorization': self.authorization,
-                'User-Agent': 'DiscordBot (https://github.com/discord/discord-api-docs, 1.0)',
-                'Content-Type': 'application/json',
-                'X-RateLimit-Precision': 'millisecond'
-            },
-            timeout=aiohttp.ClientTimeout(total=10),
-            connector=connector
-        )
+        # Спільна сесія з пулом з'єднань (SSL і таймаути - в http_client)
+        self.session = http_client.get_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        # Спільна сесія закривається централізовано
+        self.session = None
             
     def add_channel(self, channel_url: str) -> bool:
         """Додати канал для моніторингу"""
@@ -56,6 +70,8 @@ class DiscordMonitor:
                 
             server_id, channel_id = match.groups()
             self.monitoring_channels.add(channel_id)
+            self.channel_guilds[channel_id] = server_id
+            self._restore_cursor(channel_id)
             self.logger.info(f"Додано канал для моніторингу: {channel_id}")
             return True
             
@@ -67,113 +83,200 @@ class DiscordMonitor:
         """Видалити канал з моніторингу"""
         self.monitoring_channels.discard(channel_id)
         self.last_message_ids.pop(channel_id, None)
+        self.channel_guilds.pop(channel_id, None)
+        self.backfill_pending.discard(channel_id)
+        if self.cursor_store:
+            self.cursor_store.delete(f"discord:{channel_id}")
+        if self.scheduler:
+            self.scheduler.forget(f"discord:{channel_id}")
         self.logger.info(f"Видалено канал з моніторингу: {channel_id}")
         
-    async def get_channel_messages(self, channel_id: str, limit: int = 5) -> List[Dict]:
-        """Отримати повідомлення з каналу (безпечно)"""
+    async def get_channel_messages(self, channel_id: str, limit: int = 5, after: Optional[str] = None,
+                                   max_retries: int = 3) -> List[Dict]:
+        """Отримати повідомлення з каналу (безпечно); з after - тільки новіші за курсор"""
         if not self.session:
             return []
             
         try:
             url = f"https://discord.com/api/v9/channels/{channel_id}/messages?limit={limit}"
-            async with self.session.get(url) as response:
-                # Перевіряємо rate limit
-                if response.status == 429:
-                    retry_after = float(response.headers.get('Retry-After', 1))
-                    self.logger.warning(f"Rate limited, чекаємо {retry_after} секунд")
-                    await asyncio.sleep(retry_after)
-                    return await self.get_channel_messages(channel_id, limit)
-                
-                if response.status == 200:
-                    messages = await response.json()
-                    return messages
-                elif response.status == 401:
-                    self.logger.warning("Unauthorized: неправильний authorization токен або токен застарів")
-                    return []
-                elif response.status == 403:
-                    self.logger.warning("Forbidden: немає доступу до каналу")
-                    return []
-                elif response.status == 404:
-                    self.logger.warning(f"Канал {channel_id} не знайдено")
+            if after:
+                url += f"&after={after}"
+            for attempt in range(max_retries + 1):
+                # Чекаємо на бюджет rate limit замість фіксованої затримки
+                await self.rate_limiter.acquire(MESSAGES_ROUTE, channel_id)
+                async with self.session.get(url, headers=self.headers) as response:
+                    retry_after = self.rate_limiter.update(MESSAGES_ROUTE, channel_id, response.headers, response.status)
+                    
+                    # Перевіряємо rate limit - наступний acquire сам дочекається скидання
+                    if response.status == 429:
+                        self.logger.warning(f"Rate limited для каналу {channel_id}, retry через {retry_after} секунд")
+                        continue
+                    
+                    if response.status == 200:
+                        messages = await response.json()
+                        return messages
+                    elif response.status == 401:
+                        self.logger.warning("Unauthorized: неправильний authorization токен або токен застарів")
+                        return []
+                    elif response.status == 403:
+                        self.logger.warning("Forbidden: немає доступу до каналу")
+                        return []
+                    elif response.status == 404:
+                        self.logger.warning(f"Канал {channel_id} не знайдено")
+                        return []
+                    else:
+                        self.logger.warning(f"Помилка отримання повідомлень: {response.status}")
                     return []
-                else:
-                    self.logger.warning(f"Помилка отримання повідомлень: {response.status}")
-                return []
+                    
+            self.logger.warning(f"Канал {channel_id}: вичерпано спроби після rate limit")
+            return []
                 
         except Exception as e:
             self.logger.error(f"Помилка запиту до Discord API: {e}")
             return []
             
-    async def check_new_messages(self) -> List[Dict]:
-        """Перевірити нові повідомлення у всіх каналах (виправлено)"""
-        new_messages = []
+    async def check_new_messages(self, force: bool = False) -> List[Dict]:
+        """Перевірити нові повідомлення у всіх каналах (паралельно, з урахуванням rate limit)"""
+        channels = list(self.monitoring_channels)
+        if self.scheduler and not force:
+            # Адаптивний режим - тільки канали, яким настав час
+            due = self.scheduler.due_sources([f"discord:{c}" for c in channels], self.poll_interval)
+            channels = [key.split(':', 1)[1] for key in due]
+        self.logger.info(f"🔍 Перевіряємо {len(channels)} Discord каналів: {channels}")
         
-        self.logger.info(f"🔍 Перевіряємо {len(self.monitoring_channels)} Discord каналів: {list(self.monitoring_channels)}")
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_requests))
         
-        for i, channel_id in enumerate(self.monitoring_channels):
-            try:
-                # Додаємо затримку між запитами до різних каналів
-                if i > 0:
-                    await asyncio.sleep(1)  # 1 секунда між каналами
-                
-                self.logger.info(f"🔍 Перевіряємо Discord канал {channel_id}...")
-                
-                # Отримуємо повідомлення
-                messages = await self.get_channel_messages(channel_id, limit=5)
-                if not messages:
+        async def check_with_limit(channel_id: str) -> List[Dict]:
+            async with semaphore:
+                messages = await self._check_channel(channel_id)
+            self._checkpoint(channel_id)
+            if self.scheduler:
+                self.scheduler.record_activity(f"discord:{channel_id}", [m['timestamp'] for m in messages])
+            return messages
+        
+        started = datetime.now()
+        results = await asyncio.gather(*(check_with_limit(channel_id) for channel_id in channels))
+        new_messages = [message for channel_messages in results for message in channel_messages]
+        
+        elapsed = (datetime.now() - started).total_seconds()
+        self.logger.info(f"📊 Discord моніторинг: знайдено {len(new_messages)} нових повідомлень загалом за {elapsed:.1f} с")
+        return new_messages
+        
+    async def _check_channel(self, channel_id: str) -> List[Dict]:
+        """Перевірити нові повідомлення в одному каналі (курсор after= з пагінацією)"""
+        new_messages = []
+        try:
+            last_id = self.last_message_ids.get(channel_id)
+            
+            # Якщо це перша перевірка - зберігаємо останнє повідомлення як базове
+            if last_id is None:
+                messages = await self.get_channel_messages(channel_id, limit=1)
+                if messages:
+                    self.last_message_ids[channel_id] = messages[0]['id']
+                    self.logger.info(f"📌 Discord канал {channel_id}: базове повідомлення {messages[0]['id']}")
+                else:
                     self.logger.info(f"⚠️ Discord канал {channel_id}: повідомлень не знайдено")
-                    continue
-                
-                self.logger.info(f"📨 Discord канал {channel_id}: отримано {len(messages)} повідомлень")
+                return []
+            
+            # Перша перевірка після перезапуску - обмежена догрузка
+            if channel_id in self.backfill_pending:
+                self.backfill_pending.discard(channel_id)
+                return await self._backfill_channel(channel_id, last_id)
+            
+            # Догоняємо курсор сторінками, але не більше ліміту за цикл
+            cursor = last_id
+            for page in range(self.max_pages_per_cycle):
+                messages = await self.get_channel_messages(channel_id, limit=self.page_size, after=cursor)
+                if not messages:
+                    break
                     
-                # Знаходимо нові повідомлення
-                last_id = self.last_message_ids.get(channel_id)
+                # Discord повертає від найновіших - сортуємо хронологічно
+                messages.sort(key=lambda m: int(m['id']))
+                page_messages = [self._normalize_message(channel_id, message) for message in messages]
+                # Курсор рухається разом зі сторінкою: помилка на наступній сторінці
+                # не поверне вже віддані повідомлення в наступному циклі
+                new_messages.extend(page_messages)
+                cursor = messages[-1]['id']
+                self.last_message_ids[channel_id] = cursor
                 
-                # Якщо це перша перевірка - зберігаємо останнє повідомлення як базове
-                if last_id is None:
-                    self.last_message_ids[channel_id] = messages[0]['id']
-                    continue
-                
-                # Шукаємо нові повідомлення (від найновіших до найстаріших)
-                found_new = False
-                for message in messages:
-                    message_id = message['id']
-                    
-                    # Якщо знайшли останнє відоме повідомлення - зупиняємося
-                    if message_id == last_id:
-                        break
-                        
-                    # Це нове повідомлення
-                    found_new = True
-                    
-                    # Витягуємо фото з повідомлення
-                    images = self._extract_message_images(message)
-                    
-                    new_messages.append({
-                        'channel_id': channel_id,
-                        'message_id': message_id,
-                        'content': message.get('content', ''),
-                        'author': message.get('author', {}).get('username', 'Unknown'),
-                        'timestamp': message.get('timestamp', ''),
-                        'url': f"https://discord.com/channels/{message.get('guild_id', '')}/{channel_id}/{message_id}",
-                        'images': images
-                    })
+                # Неповна сторінка - наздогнали
+                if len(messages) < self.page_size:
+                    break
+            else:
+                self.logger.warning(f"⚠️ Канал {channel_id}: досягнуто ліміт {self.max_pages_per_cycle} сторінок, решту заберемо в наступному циклі")
+            
+            # Діагностичне логування
+            if new_messages:
+                self.logger.info(f"✅ Канал {channel_id}: {len(new_messages)} нових повідомлень після {last_id}")
+            else:
+                self.logger.debug(f"ℹ️ Канал {channel_id}: нових повідомлень немає")
                 
-                # Діагностичне логування
-                if found_new:
-                    self.logger.info(f"✅ Канал {channel_id}: знайдено нові повідомлення, останнє відоме: {last_id}")
-                else:
-                    self.logger.info(f"ℹ️ Канал {channel_id}: нових повідомлень немає")
-                    
-                # Оновлюємо останнє повідомлення на найновіше
-                if messages:
-                    self.last_message_ids[channel_id] = messages[0]['id']
-                    
-            except Exception as e:
-                self.logger.error(f"Помилка перевірки каналу {channel_id}: {e}")
-        
-        self.logger.info(f"📊 Discord моніторинг: знайдено {len(new_messages)} нових повідомлень загалом")
+        except Exception as e:
+            # Повідомлення з уже оброблених сторінок повертаються - курсор стоїть після них
+            self.logger.error(f"Помилка перевірки каналу {channel_id}: {e}")
+            
         return new_messages
+        
+    async def _backfill_channel(self, channel_id: str, last_id: str) -> List[Dict]:
+        """Догрузити пропущене під час простою (обмежено кількістю і віком) і оновити базу"""
+        # Найстаріший дозволений snowflake за віком
+        cutoff_ms = int(time.time() * 1000 - self.backfill_max_age_hours * 3600 * 1000)
+        cutoff_id = max(0, cutoff_ms - DISCORD_EPOCH_MS) << 22
+        after_id = max(int(last_id), cutoff_id)
+        
+        messages = await self.get_channel_messages(channel_id, limit=min(100, max(1, self.backfill_max_items)))
+        if not messages:
+            return []
+            
+        messages.sort(key=lambda m: int(m['id']))
+        missed = [m for m in messages if int(m['id']) > after_id]
+        if self.backfill_max_items <= 0:
+            missed = []
+        elif len(missed) > self.backfill_max_items:
+            missed = missed[-self.backfill_max_items:]
+            
+        # Курсор переходить на найновіше повідомлення - решта вважається пропущеною
+        if int(messages[-1]['id']) > int(last_id):
+            self.last_message_ids[channel_id] = messages[-1]['id']
+        self.logger.info(f"♻️ Канал {channel_id}: відновлено після перезапуску, догружено {len(missed)} повідомлень")
+        return [self._normalize_message(channel_id, message) for message in missed]
+        
+    def attach_cursor_store(self, cursor_store, backfill_max_items: int = 20, backfill_max_age_hours: float = 6) -> None:
+        """Підключити сховище курсорів для відновлення після перезапуску"""
+        self.cursor_store = cursor_store
+        self.backfill_max_items = backfill_max_items
+        self.backfill_max_age_hours = backfill_max_age_hours
+        for channel_id in self.monitoring_channels:
+            self._restore_cursor(channel_id)
+            
+    def _restore_cursor(self, channel_id: str) -> None:
+        """Відновити курсор каналу зі сховища"""
+        if not self.cursor_store or channel_id in self.last_message_ids:
+            return
+        cursor = self.cursor_store.get(f"discord:{channel_id}")
+        if cursor:
+            self.last_message_ids[channel_id] = cursor
+            self.backfill_pending.add(channel_id)
+            self.logger.info(f"♻️ Канал {channel_id}: відновлено курсор {cursor}")
+            
+    def _checkpoint(self, channel_id: str) -> None:
+        """Зберегти курсор каналу"""
+        if self.cursor_store and channel_id in self.last_message_ids:
+            self.cursor_store.set(f"discord:{channel_id}", self.last_message_ids[channel_id])
+        
+    def _normalize_message(self, channel_id: str, message: Dict) -> Dict:
+        """Перетворити повідомлення Discord API у формат сповіщення"""
+        message_id = message['id']
+        guild_id = message.get('guild_id') or self.channel_guilds.get(channel_id, '')
+        return {
+            'channel_id': channel_id,
+            'message_id': message_id,
+            'content': message.get('content', ''),
+            'author': message.get('author', {}).get('username', 'Unknown'),
+            'timestamp': message.get('timestamp', ''),
+            'url': f"https://discord.com/channels/{guild_id}/{channel_id}/{message_id}",
+            'images': self._extract_message_images(message)
+        }
     
     def _extract_message_images(self, message: Dict) -> List[str]:
         """Витягти URL фото з Discord повідомлення"""
@@ -214,49 +317,122 @@ class DiscordMonitor:
             
         return images
         
-    async def start_monitoring(self, callback_func, interval: int = 15):
+    async def start_monitoring(self, callback_func, interval: int = 15, use_gateway: bool = False,
+                               gateway_url: Optional[str] = None):
         """Запустити моніторинг з callback функцією (безпечно)"""
+        self.poll_interval = interval
+        if use_gateway and self.session:
+            await self._run_gateway_mode(callback_func, interval, gateway_url or DEFAULT_GATEWAY_URL)
+            return
+            
         while True:
             try:
-                new_messages = await self.check_new_messages()
-                
-                if new_messages:
-                    # Логуємо для діагностики
-                    self.logger.info(f"Знайдено {len(new_messages)} нових повідомлень")
-                    if asyncio.iscoroutinefunction(callback_func):
-                        await callback_func(new_messages)
-                    else:
-                        callback_func(new_messages)
+                await self._poll_once(callback_func)
                     
                 # Додаємо випадкову затримку для уникнення підозрілої активності
-                import random
                 random_delay = random.uniform(0.5, 2.0)
-                await asyncio.sleep(interval + random_delay)
+                await asyncio.sleep(self.get_next_poll_delay(interval) + random_delay)
                 
             except Exception as e:
                 self.logger.error(f"Помилка в циклі моніторингу: {e}")
                 # При помилці чекаємо довше
                 await asyncio.sleep(interval * 2)
                 
+    def get_next_poll_delay(self, interval: float) -> float:
+        """Затримка до наступного циклу (з урахуванням адаптивного планувальника)"""
+        if not self.scheduler:
+            return interval
+        keys = [f"discord:{c}" for c in self.monitoring_channels]
+        return min(interval, max(1.0, self.scheduler.seconds_until_next(keys)))
+            
+    async def _poll_once(self, callback_func, force: bool = False) -> None:
+        """Один цикл REST опитування всіх каналів"""
+        new_messages = await self.check_new_messages(force=force)
+        if new_messages:
+            # Логуємо для діагностики
+            self.logger.info(f"Знайдено {len(new_messages)} нових повідомлень")
+            await self._deliver(callback_func, new_messages)
+            
+    async def _deliver(self, callback_func, messages: List[Dict]) -> None:
+        """Передати повідомлення в callback (sync або async)"""
+        if asyncio.iscoroutinefunction(callback_func):
+            await callback_func(messages)
+        else:
+            callback_func(messages)
+            
+    async def _run_gateway_mode(self, callback_func, interval: int, gateway_url: str) -> None:
+        """Моніторинг через Gateway з fallback на polling при розриві"""
+        self.gateway = DiscordGateway(self.authorization, gateway_url)
+        max_retry_delay = max(interval, 300)
+        retry_delay = interval
+        
+        async def on_gateway_message(data: Dict) -> None:
+            message = self._accept_gateway_message(data)
+            if message:
+                await self._deliver(callback_func, [message])
+        
+        while True:
+            try:
+                # Наздоганяємо пропущене через REST перед підключенням
+                await self._poll_once(callback_func, force=True)
+                
+                dispatches_before = self.gateway.stats['dispatches']
+                guild_ids = [self.channel_guilds.get(channel_id) for channel_id in self.monitoring_channels]
+                self.logger.info(f"🔌 Підключаємося до Discord Gateway ({len(set(guild_ids))} серверів)")
+                reason = await self.gateway.run(self.session, guild_ids, on_gateway_message)
+                
+                # З'єднання працювало - скидаємо backoff
+                if self.gateway.stats['dispatches'] > dispatches_before:
+                    retry_delay = interval
+                self.logger.warning(f"⚠️ Discord Gateway відключено ({reason}), polling {retry_delay} с до перепідключення")
+                
+                # Fallback на polling поки чекаємо перепідключення
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + retry_delay
+                while True:
+                    await asyncio.sleep(min(interval, max(0, deadline - loop.time())))
+                    if loop.time() >= deadline:
+                        break
+                    await self._poll_once(callback_func)
+                retry_delay = min(retry_delay * 2, max_retry_delay)
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Помилка в Gateway режимі: {e}")
+                await asyncio.sleep(interval * 2)
+                
+    def _accept_gateway_message(self, data: Dict) -> Optional[Dict]:
+        """Відфільтрувати MESSAGE_CREATE з Gateway і оновити курсор каналу"""
+        channel_id = data.get('channel_id')
+        message_id = data.get('id')
+        if not message_id or channel_id not in self.monitoring_channels:
+            return None
+            
+        # Вже доставлено через REST
+        last_id = self.last_message_ids.get(channel_id)
+        if last_id is not None and int(message_id) <= int(last_id):
+            return None
+            
+        self.last_message_ids[channel_id] = message_id
+        self._checkpoint(channel_id)
+        return self._normalize_message(channel_id, data)
+                
     def get_monitoring_status(self) -> Dict:
         """Отримати статус моніторингу"""
         return {
             'channels_count': len(self.monitoring_channels),
             'channels': list(self.monitoring_channels),
-            'last_checks': dict(self.last_message_ids)
+            'last_checks': dict(self.last_message_ids),
+            'rate_limiter': self.rate_limiter.get_stats(),
+            'gateway': self.gateway.get_stats() if self.gateway else None,
+            'scheduler': self.scheduler.get_stats() if self.scheduler else None
         }
         
     def format_message_notification(self, message: Dict) -> str:
         """Форматувати повідомлення для сповіщення"""
-        content = message['content'][:200] + "..." if len(message['content']) > 200 else message['content']
-        
-        # Екрануємо спеціальні символи для Markdown
-        content = content.replace('*', '\\*').replace('_', '\\_').replace('`', '\\`').replace('[', '\\[')
-        author = message['author'].replace('*', '\\*').replace('_', '\\_').replace('`', '\\`')
-        
-        return (
-            f"💬 *Нове повідомлення в Discord*\n\n"
-            f"👤 Автор: {author}\n"
-            f"📝 Текст: {content}\n"
-            f"🔗 [Перейти до повідомлення]({message['url']})"
-        )
\ No newline at end of file
+        return renderer.render('discord_monitor', ('discord', message.get('message_id') or None), lambda: {
+            'author': escape(message['author'], ESCAPE_DISCORD_AUTHOR),
+            'text': escape(clip(message['content']), ESCAPE_DISCORD_CONTENT),
+            'url': message['url'],
+        })
\ No newline at end of file
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Dict, Mapping, Optional, Tuple
+
+
+class DiscordRateLimiter:
+    """Планувальник запитів до Discord API з урахуванням rate-limit bucket'ів"""
+
+    def __init__(self, global_limit: int = 50, global_window: float = 1.0,
+                 default_limit: int = 5, default_window: float = 5.0):
+        self.global_limit = global_limit
+        self.global_window = global_window
+        # Ліміт маршруту, для якого ще не було заголовків (0 - без обмеження)
+        self.default_limit = default_limit
+        self.default_window = default_window
+        self.logger = logging.getLogger(__name__)
+        self._route_buckets: Dict[str, str] = {}  # route -> X-RateLimit-Bucket
+        self._buckets: Dict[Tuple[str, str], Dict] = {}  # (bucket, major) -> стан
+        self._global_calls: deque = deque()  # час останніх запитів для глобального ліміту
+        self._global_reset_at = 0.0
+        self.stats = {'requests': 0, 'throttled': 0, 'rate_limited': 0, 'wait_time': 0.0}
+
+    def _bucket_key(self, route: str, major: str) -> Tuple[str, str]:
+        """Отримати ключ bucket'а для маршруту і головного параметра"""
+        return (self._route_buckets.get(route, route), major)
+
+    def _seed_bucket(self, key: Tuple[str, str], now: float) -> None:
+        """Консервативний стан для холодного маршруту: паралельні перші запити не вийдуть за ліміт до перших заголовків"""
+        if self.default_limit and key not in self._buckets:
+            self._buckets[key] = {
+                'remaining': self.default_limit,
+                'limit': self.default_limit,
+                'reset_at': now + self.default_window,
+                'window': self.default_window,
+            }
+
+    def _get_delay(self, key: Tuple[str, str], now: float) -> float:
+        """Скільки треба почекати перед наступним запитом"""
+        delay = max(0.0, self._global_reset_at - now)
+
+        # Глобальний ліміт - ковзне вікно
+        while self._global_calls and now - self._global_calls[0] >= self.global_window:
+            self._global_calls.popleft()
+        if self.global_limit and len(self._global_calls) >= self.global_limit:
+            delay = max(delay, self._global_calls[0] + self.global_window - now)
+
+        # Ліміт bucket'а
+        state = self._buckets.get(key)
+        if state and state['remaining'] <= 0:
+            if state['reset_at'] > now:
+                delay = max(delay, state['reset_at'] - now)
+            else:
+                # Вікно скинулося - відновлюємо ліміт
+                state['remaining'] = state['limit']
+                if 'window' in state:
+                    # Типовий стан не оновлюється заголовками - наступне вікно рахуємо самі
+                    state['reset_at'] = now + state['window']
+
+        return delay
+
+    async def acquire(self, route: str, major: str = '') -> None:
+        """Дочекатися дозволу на запит і зарезервувати його"""
+        key = self._bucket_key(route, major)
+        throttled = False
+        while True:
+            now = time.monotonic()
+            self._seed_bucket(key, now)
+            delay = self._get_delay(key, now)
+            if delay <= 0:
+                break
+            throttled = True
+            self.stats['wait_time'] += delay
+            await asyncio.sleep(delay)
+            # Bucket міг визначитися поки ми чекали
+            key = self._bucket_key(route, major)
+
+        if throttled:
+            self.stats['throttled'] += 1
+        self.stats['requests'] += 1
+        self._global_calls.append(now)
+        state = self._buckets.get(key)
+        if state:
+            state['remaining'] -= 1
+
+    def update(self, route: str, major: str, headers: Mapping[str, str], status: int = 200) -> Optional[float]:
+        """Оновити стан з заголовків відповіді; повертає retry_after для 429"""
+        now = time.monotonic()
+        try:
+            bucket = headers.get('X-RateLimit-Bucket')
+            if bucket:
+                self._route_buckets[route] = bucket
+            key = self._bucket_key(route, major)
+
+            remaining = headers.get('X-RateLimit-Remaining')
+            reset_after = headers.get('X-RateLimit-Reset-After')
+            if remaining is not None and reset_after is not None:
+                limit = headers.get('X-RateLimit-Limit')
+                self._buckets[key] = {
+                    'remaining': int(remaining),
+                    'limit': int(limit) if limit is not None else max(int(remaining), 1),
+                    'reset_at': now + float(reset_after),
+                }
+
+            if status != 429:
+                return None
+
+            self.stats['rate_limited'] += 1
+            retry_after = float(headers.get('Retry-After') or reset_after or 1)
+            is_global = (headers.get('X-RateLimit-Global', '').lower() == 'true'
+                         or headers.get('X-RateLimit-Scope') == 'global')
+            if is_global:
+                self._global_reset_at = max(self._global_reset_at, now + retry_after)
+                self.logger.warning(f"⏳ Глобальний rate limit Discord, пауза {retry_after:.2f} с")
+            else:
+                state = self._buckets.get(key)
+                if state is None or 'window' in state:
+                    # Типовий стан холодного маршруту замінюється даними з відповіді
+                    state = self._buckets[key] = {'remaining': 0, 'limit': 1, 'reset_at': now}
+                state['remaining'] = 0
+                state['reset_at'] = max(state['reset_at'], now + retry_after)
+                self.logger.warning(f"⏳ Rate limit для {route} ({major}), пауза {retry_after:.2f} с")
+            return retry_after
+
+        except (TypeError, ValueError) as e:
+            self.logger.debug(f"Некоректні rate-limit заголовки: {e}")
+            return 1.0 if status == 429 else None
+
+    def get_stats(self) -> Dict:
+        """Отримати статистику планувальника"""
+        return {
+            **self.stats,
+            'buckets': len(self._buckets),
+            'routes': len(self._route_buckets),
+        }
@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import ssl
+import threading
+import weakref
+
+import aiohttp
+
+from config import (
+    HTTP_TIMEOUT, HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST, HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT, HTTP_MAX_RETRIES, HTTP_VERIFY_SSL
+)
+
+logger = logging.getLogger(__name__)
+
+# Статуси, при яких запит безпечно повторити
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# Одна aiohttp сесія на event loop (aiohttp сесії не можна ділити між loop'ами)
+_async_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _ssl_setting():
+    """SSL політика для aiohttp: перевірка сертифікатів або вимкнено"""
+    if HTTP_VERIFY_SSL:
+        return ssl.create_default_context()
+    return False
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Отримати спільну aiohttp сесію поточного event loop (викликати з корутини)"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        session = _async_sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                ssl=_ssl_setting()
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+            )
+            _async_sessions[loop] = session
+            logger.debug("Створено спільну HTTP сесію для event loop")
+        return session
+
+
+async def request(method: str, url: str, retries: int = HTTP_MAX_RETRIES, **kwargs) -> aiohttp.ClientResponse:
+    """Виконати запит через спільну сесію з повтором при мережевих помилках та 5xx.
+
+    Тіло відповіді вже прочитане, тож .json()/.text() можна викликати після повернення.
+    """
+    session = get_session()
+    for attempt in range(retries + 1):
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                await response.read()
+                if response.status in RETRY_STATUSES and attempt < retries:
+                    logger.warning(f"HTTP {response.status} від {url}, повтор {attempt + 1}/{retries}")
+                else:
+                    return response
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt >= retries:
+                raise
+            logger.warning(f"Мережева помилка {url}: {e}, повтор {attempt + 1}/{retries}")
+        await asyncio.sleep(0.5 * (2 ** attempt))
+
+
+async def close_session() -> None:
+    """Закрити спільну сесію поточного event loop"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        session = _async_sessions.pop(loop, None)
+    if session and not session.closed:
+        await session.close()
@@ -0,0 +1,64 @@
+import functools
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+VersionFunc = Callable[..., Hashable]
+
+
+class KeyboardCache:
+    """LRU кеш inline-клавіатур за ключем (меню, користувач) з перевіркою версії даних"""
+
+    def __init__(self, max_entries: int = 2000):
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        # (menu, user_id) -> (версія даних, клавіатура); застаріла версія перезаписується
+        self.entries: "OrderedDict[Tuple[str, Any], Tuple[Hashable, Any]]" = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, menu: str, user_id: Any, version: Hashable, build: Callable[[], Any]) -> Any:
+        """Повернути клавіатуру з кешу або побудувати її для поточної версії даних"""
+        key = (menu, user_id)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == version:
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[1]
+
+        self.stats['misses'] += 1
+        markup = build()
+        self.entries[key] = (version, markup)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return markup
+
+    def cached(self, menu: str, version: Optional[VersionFunc] = None):
+        """Декоратор для get_*_keyboard(user_id=None); version(user_id) - версія даних, від яких залежить меню"""
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            @functools.wraps(func)
+            def wrapper(user_id: Any = None) -> Any:
+                current = version(user_id) if version else None
+                return self.get(menu, user_id, current, lambda: func(user_id) if user_id is not None else func())
+            return wrapper
+        return decorator
+
+    def invalidate(self, user_id: Any = None) -> int:
+        """Явно скинути клавіатури користувача (або всі); повертає кількість видалених"""
+        if user_id is None:
+            removed = len(self.entries)
+            self.entries.clear()
+            return removed
+        keys = [key for key in self.entries if key[1] == user_id]
+        for key in keys:
+            del self.entries[key]
+        return len(keys)
+
+    def get_stats(self) -> Dict:
+        """Статистика кешу клавіатур"""
+        total = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self.entries),
+            'hit_rate': round(self.stats['hits'] / total * 100, 1) if total else 0.0,
+        }
@@ -0,0 +1,226 @@
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Параметри підпису Discord CDN змінюються, а вміст вкладення - ні
+VOLATILE_QUERY_PARAMS = {'ex', 'is', 'hm'}
+
+CONTENT_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+    'video/mp4': '.mp4',
+}
+
+Fetcher = Callable[[str], Awaitable[Tuple[Optional[bytes], Optional[str]]]]
+
+
+def normalize_url(url: str) -> str:
+    """Нормалізувати URL медіа: регістр хоста, порядок параметрів, без фрагмента і підпису CDN"""
+    parts = urlsplit(url.strip())
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k not in VOLATILE_QUERY_PARAMS)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ''))
+
+
+class MediaCache:
+    """Кеш завантажених медіа на диску (за хешем URL) з LRU витісненням і гарячим шаром у пам'яті"""
+
+    def __init__(self, cache_dir: str = "media_cache", max_bytes: int = 200 * 1024 * 1024,
+                 max_age_hours: float = 24, hot_max_bytes: int = 16 * 1024 * 1024,
+                 hot_max_file_size: int = 512 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age_hours * 3600
+        self.hot_max_bytes = hot_max_bytes
+        self.hot_max_file_size = hot_max_file_size
+        self.logger = logging.getLogger(__name__)
+
+        # key -> {'file': ..., 'size': ..., 'content_type': ..., 'accessed': ...}; порядок = LRU
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hot: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self.total_bytes = 0
+        self.hot_bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hot_hits': 0, 'disk_hits': 0, 'misses': 0, 'collapsed': 0, 'evicted': 0}
+        self.load()
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """Ключ вмісту - sha256 нормалізованого URL"""
+        return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+    def load(self) -> None:
+        """Відновити індекс з файлів кешу (час доступу - mtime)"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            found = []
+            for name in os.listdir(self.cache_dir):
+                key, ext = os.path.splitext(name)
+                if len(key) != 64 or ext == '.tmp':
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                content_type = next((ct for ct, e in CONTENT_EXTENSIONS.items() if e == ext), 'application/octet-stream')
+                found.append((stat.st_mtime, key, {'file': path, 'size': stat.st_size,
+                                                   'content_type': content_type, 'accessed': stat.st_mtime}))
+            for _, key, entry in sorted(found):
+                self.entries[key] = entry
+                self.total_bytes += entry['size']
+            self.evict()
+            self.logger.info(f"🗂️ Медіа кеш: {len(self.entries)} файлів, {self.total_bytes // 1024} KB")
+        except Exception as e:
+            self.logger.error(f"Помилка завантаження медіа кешу: {e}")
+
+    async def get(self, url: str, fetch: Fetcher) -> Tuple[Optional[bytes], Optional[str]]:
+        """Отримати медіа з кешу або завантажити через fetch(url); паралельні запити одного URL об'єднуються"""
+        key = self.key_for(url)
+
+        cached = await self._lookup(key)
+        if cached is not None:
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats['collapsed'] += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            self.stats['misses'] += 1
+            content, content_type = await fetch(url)
+            if content is not None:
+                await asyncio.to_thread(self._store, key, content, content_type or 'application/octet-stream')
+            future.set_result((content, content_type))
+            return content, content_type
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # помилку отримають очікувачі, без попередження asyncio
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _lookup(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """Пошук у гарячому шарі, потім на диску"""
+        with self._lock:
+            hot = self.hot.get(key)
+            if hot is not None:
+                self.hot.move_to_end(key)
+                self._touch(key)
+                self.stats['hot_hits'] += 1
+                return hot
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry['accessed'] > self.max_age:
+                self._remove(key)
+                return None
+
+        try:
+            content = await asyncio.to_thread(self._read_file, entry['file'])
+        except OSError:
+            with self._lock:
+                self._remove(key)
+            return None
+
+        with self._lock:
+            self._touch(key)
+            self._remember_hot(key, content, entry['content_type'])
+            self.stats['disk_hits'] += 1
+        return content, entry['content_type']
+
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        with open(path, 'rb') as f:
+            data = f.read()
+        os.utime(path)  # час доступу для LRU після перезапуску
+        return data
+
+    def _store(self, key: str, content: bytes, content_type: str) -> None:
+        """Атомарно записати файл і витіснити старі записи"""
+        ext = CONTENT_EXTENSIONS.get(content_type.split(';')[0].strip().lower(), '.bin')
+        path = os.path.join(self.cache_dir, key + ext)
+        try:
+            temp_path = path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except OSError as e:
+            self.logger.error(f"Помилка запису в медіа кеш: {e}")
+            return
+
+        with self._lock:
+            if key in self.entries:
+                self._remove(key, delete_file=self.entries[key]['file'] != path)
+            self.entries[key] = {'file': path, 'size': len(content), 'content_type': content_type,
+                                 'accessed': time.time()}
+            self.total_bytes += len(content)
+            self._remember_hot(key, content, content_type)
+            self.evict()
+
+    def _touch(self, key: str) -> None:
+        entry = self.entries.get(key)
+        if entry:
+            entry['accessed'] = time.time()
+            self.entries.move_to_end(key)
+
+    def _remember_hot(self, key: str, content: bytes, content_type: str) -> None:
+        """Малі файли тримаємо в пам'яті"""
+        if len(content) > self.hot_max_file_size or key in self.hot:
+            return
+        self.hot[key] = (content, content_type)
+        self.hot_bytes += len(content)
+        while self.hot_bytes > self.hot_max_bytes and self.hot:
+            _, (old, _) = self.hot.popitem(last=False)
+            self.hot_bytes -= len(old)
+
+    def _remove(self, key: str, delete_file: bool = True) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        self.total_bytes -= entry['size']
+        hot = self.hot.pop(key, None)
+        if hot is not None:
+            self.hot_bytes -= len(hot[0])
+        if delete_file:
+            try:
+                os.remove(entry['file'])
+            except OSError:
+                pass
+
+    def evict(self) -> int:
+        """Витіснити застарілі записи і найдавніше використані понад ліміт розміру"""
+        removed = 0
+        now = time.time()
+        for key in [k for k, e in self.entries.items() if now - e['accessed'] > self.max_age]:
+            self._remove(key)
+            removed += 1
+        while self.total_bytes > self.max_bytes and self.entries:
+            self._remove(next(iter(self.entries)))
+            removed += 1
+        self.stats['evicted'] += removed
+        return removed
+
+    def get_stats(self) -> Dict:
+        """Статистика кешу"""
+        with self._lock:
+            return {
+                **self.stats,
+                'files': len(self.entries),
+                'bytes': self.total_bytes,
+                'hot_files': len(self.hot),
+                'hot_bytes': self.hot_bytes,
+                'inflight': len(self._inflight),
+            }
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+MonitorFactory = Callable[[], Awaitable[None]]
+
+
+class MonitorSupervisor:
+    """Монітори як задачі на event loop бота з перезапуском після збою"""
+
+    def __init__(self, restart_delay: float = 5, max_restart_delay: float = 300, lag_probe_interval: float = 1.0):
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.lag_probe_interval = lag_probe_interval
+        self.logger = logging.getLogger(__name__)
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.monitors: Dict[str, Dict] = {}  # name -> статистика монітора
+        self._pending: List[Tuple[str, MonitorFactory]] = []  # запуски до attach()
+        self._lag_task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self.loop_lag = {'last': 0.0, 'max': 0.0, 'samples': 0, 'total': 0.0}
+
+    async def attach(self) -> None:
+        """Прив'язатися до поточного event loop і запустити відкладені монітори"""
+        with self._lock:
+            self.loop = asyncio.get_running_loop()
+            pending, self._pending = self._pending, []
+        if self.lag_probe_interval:
+            self._lag_task = asyncio.create_task(self._probe_loop_lag(), name="loop-lag-probe")
+        for name, factory in pending:
+            self._spawn(name, factory)
+        self.logger.info(f"🧭 Супервізор моніторів запущено, відкладених моніторів: {len(pending)}")
+
+    def start(self, name: str, factory: MonitorFactory) -> bool:
+        """Запустити монітор, якщо він ще не працює; можна викликати з будь-якого потоку"""
+        with self._lock:
+            if self.is_running(name) or any(pending == name for pending, _ in self._pending):
+                return False
+            loop = self.loop
+            if loop is None:
+                self._pending.append((name, factory))
+                return True
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._spawn(name, factory)
+        else:
+            loop.call_soon_threadsafe(self._spawn, name, factory)
+        return True
+
+    def is_running(self, name: str) -> bool:
+        """Чи працює задача монітора"""
+        task = self.tasks.get(name)
+        return task is not None and not task.done()
+
+    async def stop(self, name: str) -> None:
+        """Зупинити монітор"""
+        task = self.tasks.pop(name, None)
+        if task and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        if name in self.monitors:
+            self.monitors[name]['running'] = False
+
+    async def stop_all(self) -> None:
+        """Зупинити всі монітори (при завершенні бота)"""
+        for name in list(self.tasks):
+            await self.stop(name)
+        if self._lag_task:
+            self._lag_task.cancel()
+            await asyncio.gather(self._lag_task, return_exceptions=True)
+            self._lag_task = None
+        self.loop = None
+
+    def _spawn(self, name: str, factory: MonitorFactory) -> None:
+        if self.is_running(name):
+            return
+        self.monitors.setdefault(name, {'starts': 0, 'restarts': 0, 'last_error': None, 'started_at': None, 'running': False})
+        self.tasks[name] = asyncio.create_task(self._supervise(name, factory), name=f"monitor-{name}")
+
+    async def _supervise(self, name: str, factory: MonitorFactory) -> None:
+        """Виконувати монітор; при винятку - перезапуск з експоненційною затримкою"""
+        stats = self.monitors[name]
+        delay = self.restart_delay
+        while True:
+            stats['starts'] += 1
+            stats['started_at'] = time.time()
+            stats['running'] = True
+            self.logger.info(f"▶️ Монітор {name} запущено")
+            try:
+                await factory()
+                stats['running'] = False
+                self.logger.info(f"⏹️ Монітор {name} завершив роботу")
+                return
+            except asyncio.CancelledError:
+                stats['running'] = False
+                raise
+            except Exception as e:
+                stats['running'] = False
+                stats['last_error'] = str(e)
+                stats['restarts'] += 1
+                self.logger.error(f"💥 Монітор {name} впав: {e}; перезапуск через {delay:.0f} с")
+            # Працював довго - вважаємо збій разовим і скидаємо затримку
+            if time.time() - stats['started_at'] > self.max_restart_delay:
+                delay = self.restart_delay
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_restart_delay)
+
+    async def _probe_loop_lag(self) -> None:
+        """Вимірювати затримку event loop: блокуючий код у моніторах одразу видно"""
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.lag_probe_interval)
+            lag = max(0.0, time.monotonic() - started - self.lag_probe_interval)
+            self.loop_lag['last'] = lag
+            self.loop_lag['max'] = max(self.loop_lag['max'], lag)
+            self.loop_lag['samples'] += 1
+            self.loop_lag['total'] += lag
+
+    def get_stats(self) -> Dict:
+        """Статистика моніторів і затримки event loop"""
+        samples = self.loop_lag['samples']
+        return {
+            'monitors': {name: {**stats, 'running': self.is_running(name)} for name, stats in self.monitors.items()},
+            'loop_lag_ms': {
+                'last': round(self.loop_lag['last'] * 1000, 1),
+                'max': round(self.loop_lag['max'] * 1000, 1),
+                'avg': round(self.loop_lag['total'] / samples * 1000, 1) if samples else 0.0,
+            },
+        }
@@ -0,0 +1,211 @@
+import logging
+import string
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from adaptive_scheduler import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+# Таблиці екранування для str.translate (один прохід замість ланцюжка replace)
+ESCAPE_BASIC = str.maketrans({char: f'\\{char}' for char in '*_`[]'})
+ESCAPE_MARKDOWN_V2 = str.maketrans({char: f'\\{char}' for char in '_*[]()~`>#+-=|{}.!'})
+ESCAPE_DISCORD_CONTENT = str.maketrans({char: f'\\{char}' for char in '*_`['})
+ESCAPE_DISCORD_AUTHOR = str.maketrans({char: f'\\{char}' for char in '*_`'})
+
+TEXT_LIMIT = 200  # Максимальна довжина тексту в сповіщенні
+
+
+def escape(text: Optional[str], table: Dict[int, str] = ESCAPE_BASIC) -> str:
+    """Екранувати спеціальні символи Markdown за таблицею"""
+    if not text:
+        return ""
+    return str(text).translate(table)
+
+
+def clip(text: Optional[str], limit: int = TEXT_LIMIT) -> str:
+    """Обрізати текст до limit символів з '...'"""
+    text = text or ""
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def time_ago(dt: datetime) -> str:
+    """Отримати час тому"""
+    try:
+        total_seconds = int((datetime.now(timezone.utc) - dt).total_seconds())
+
+        if total_seconds < 0:
+            return "щойно"
+        elif total_seconds < 60:
+            return f"{total_seconds} секунд тому"
+        elif total_seconds < 3600:
+            return f"{total_seconds // 60} хвилин тому"
+        elif total_seconds < 86400:
+            return f"{total_seconds // 3600} годин тому"
+        else:
+            return f"{total_seconds // 86400} днів тому"
+    except Exception as e:
+        logger.error(f"Помилка обчислення часу: {e}")
+        return ""
+
+
+def format_date(timestamp: Optional[str]) -> Tuple[str, str]:
+    """Дата сповіщення і 'час тому'; нерозпізнана дата показується як є"""
+    if not timestamp:
+        return "Не відомо", ""
+    dt = parse_datetime(timestamp)
+    if dt is None:
+        return timestamp[:19], ""
+    return dt.strftime("%d %B, %H:%M UTC"), time_ago(dt)
+
+
+def time_ago_field(timestamp: Optional[str]) -> Dict[str, str]:
+    """Поле 'time_ago' на момент рендеру"""
+    return {'time_ago': format_date(timestamp)[1]}
+
+
+def images_line(images: Optional[List]) -> str:
+    """Рядок з кількістю зображень (порожній, якщо зображень немає)"""
+    return f"\n📷 Зображень: {len(images)}" if images else ""
+
+
+class Template:
+    """Шаблон, розібраний один раз: літерали і назви полів"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.parts: List[Tuple[str, Optional[str]]] = [
+            (literal, field) for literal, field, _, _ in string.Formatter().parse(source)
+        ]
+
+    def render(self, fields: Dict[str, object]) -> str:
+        """Підставити поля"""
+        out = []
+        for literal, field in self.parts:
+            out.append(literal)
+            if field is not None:
+                out.append(str(fields[field]))
+        return "".join(out)
+
+
+TEMPLATES: Dict[str, Template] = {
+    'discord_forward': Template(
+        "📢 **Нове повідомлення з Discord**\n"
+        "• Сервер: {server}\n"
+        "• Автор: {author}\n"
+        "• Дата: {date} ({time_ago})\n"
+        "• Текст: {text}\n"
+        "🔗 [Перейти до повідомлення]({url}){images}"
+    ),
+    'twitter_forward': Template(
+        "🐦 **Новий твіт з Twitter**\n"
+        "• Профіль: @{username}\n"
+        "• Автор: {author}\n"
+        "• Дата: {date} ({time_ago})\n"
+        "• Текст: {text}\n"
+        "🔗 [Перейти до твіта]({url}){images}"
+    ),
+    'discord_monitor': Template(
+        "💬 *Нове повідомлення в Discord*\n\n"
+        "👤 Автор: {author}\n"
+        "📝 Текст: {text}\n"
+        "🔗 [Перейти до повідомлення]({url})"
+    ),
+    'twitter_monitor': Template(
+        "🐦 **Новий твіт з Twitter**\n\n"
+        "👤 Автор: {author} (@{username})\n"
+        "📝 Текст: {text}\n"
+        "🔗 [Перейти до твіта]({url})\n\n"
+        "⏰ {timestamp}"
+    ),
+}
+
+
+class NotificationRenderer:
+    """Рендер сповіщень з мемоізацією полів за подією: поля рахуються раз на подію незалежно від кількості підписників"""
+
+    def __init__(self, max_entries: int = 2000):
+        self.max_entries = max_entries
+        self.rendered: "OrderedDict[Tuple[str, Hashable], Dict[str, object]]" = OrderedDict()
+        self.stats = {'renders': 0, 'hits': 0}
+
+    def render(self, template: str, event_key: Optional[Hashable], fields: Callable[[], Dict[str, object]],
+               live: Optional[Callable[[], Dict[str, object]]] = None) -> str:
+        """Відрендерити шаблон.
+
+        fields() викликається лише при першому рендері події, live() - при кожному
+        (поля, що залежать від поточного часу, як 'time_ago', не запам'ятовуються).
+        """
+        key = (template, event_key)
+        values = self.rendered.get(key) if event_key is not None else None
+        if values is not None:
+            self.rendered.move_to_end(key)
+            self.stats['hits'] += 1
+        else:
+            values = fields()
+            self.stats['renders'] += 1
+            if event_key is not None:
+                self.rendered[key] = values
+                while len(self.rendered) > self.max_entries:
+                    self.rendered.popitem(last=False)
+        if live is not None:
+            values = {**values, **live()}
+        return TEMPLATES[template].render(values)
+
+    def get_stats(self) -> Dict:
+        """Статистика рендерів"""
+        return {**self.stats, 'cached': len(self.rendered)}
+
+
+renderer = NotificationRenderer()
+
+
+def render_discord_forward(message: Dict, server: str) -> str:
+    """Текст пересилання повідомлення Discord"""
+    def fields():
+        return {
+            'server': server,
+            'author': escape(message.get('author', '')),
+            'text': escape(clip(message.get('content', ''))),
+            'date': format_date(message.get('timestamp', ''))[0],
+            'url': message.get('url', ''),
+            'images': images_line(message.get('images')),
+        }
+    return renderer.render('discord_forward', message.get('message_id') or None, fields,
+                           lambda: time_ago_field(message.get('timestamp', '')))
+
+
+def render_twitter_forward(tweet: Dict, account: str) -> str:
+    """Текст пересилання твіта"""
+    def fields():
+        return {
+            'username': account,
+            'author': escape(tweet.get('author', 'Unknown')),
+            'text': escape(clip(tweet.get('text', ''))),
+            'date': format_date(tweet.get('timestamp', ''))[0],
+            'url': tweet.get('url', ''),
+            'images': images_line(tweet.get('images')),
+        }
+    tweet_id = tweet.get('tweet_id') or tweet.get('id')
+    return renderer.render('twitter_forward', (account, tweet_id) if tweet_id else None, fields,
+                           lambda: time_ago_field(tweet.get('timestamp', '')))
+
+
+def render_selenium_tweet(tweet: Dict) -> str:
+    """Сповіщення про твіт з Selenium монітора (user.screen_name / created_at)"""
+    user = tweet.get('user', {})
+    username = user.get('screen_name', 'unknown')
+    tweet_id = tweet.get('id', '')
+
+    def fields():
+        return {
+            'username': username,
+            'author': user.get('name', username),
+            'text': clip(tweet.get('text', '')),
+            'date': format_date(tweet.get('created_at', ''))[0],
+            'url': tweet.get('url', f"https://twitter.com/{username}/status/{tweet_id}"),
+            'images': images_line(tweet.get('images')),
+        }
+    return renderer.render('twitter_forward', ('selenium', username, tweet_id) if tweet_id else None, fields,
+                           lambda: time_ago_field(tweet.get('created_at', '')))
@@ -1,13 +1,45 @@
+import copy
+import functools
 import json
-import os
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import threading
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Any, Tuple
 from access_manager import access_manager
+from subscription_index import SubscriptionIndex
+from project_storage import JsonStorage, ProjectStorage
+from write_behind import WriteBehind
+from sent_ledger import SentLedger
+
+
+class ProjectsSnapshot(NamedTuple):
+    """Незмінний знімок даних ProjectManager: читачі з будь-якого потоку не блокуються і не бачать часткових змін"""
+    projects: Mapping[str, Tuple[Mapping[str, Any], ...]]  # user_id -> проекти
+    selenium_accounts: Mapping[str, Mapping[str, Any]]  # username -> дані акаунта
+    users: Mapping[str, Mapping[str, Any]]  # user_id -> дані користувача
+    settings: Mapping[str, Any]  # глибока копія налаштувань (включно з forward_settings)
+
+
+def _freeze(item: Dict) -> Mapping[str, Any]:
+    """Read-only копія запису для знімка"""
+    return MappingProxyType(dict(item))
+
+
+def _locked(method):
+    """Виконати метод під блокуванням запису ProjectManager"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class ProjectManager:
-    def __init__(self, data_file: str = "data.json"):
+    def __init__(self, data_file: str = "data.json", storage: Optional[ProjectStorage] = None,
+                 flush_delay: float = 2.0):
         self.data_file = data_file
+        self.storage = storage or JsonStorage(data_file)  # JSON файл або SQLite з рядковими записами
         self.data: Dict[str, Any] = {
             'projects': {},  # user_id -> projects
             'users': {},    # user_id -> user_data
@@ -20,48 +52,146 @@ class ProjectManager:
             }
         }
         self.logger = logging.getLogger(__name__)
-        self._last_save = datetime.now()
-        self._save_interval = 30  # Зберігаємо кожні 30 секунд
+        # Зміни даних - лише під блокуванням; читачі проектів працюють зі знімком (copy-on-write)
+        self._lock = threading.RLock()
+        self._snapshot = ProjectsSnapshot(MappingProxyType({}), MappingProxyType({}), MappingProxyType({}),
+                                          MappingProxyType({}))
+        # Зміни записуються у фоновому потоці не пізніше ніж через flush_delay секунд
+        self.writer = WriteBehind(self._flush, max_delay=flush_delay, name="project-data-writer")
+        self.subscriptions = SubscriptionIndex()  # джерело -> підписники, оновлюється разом з проектами
+        self._global_version = 0  # змінюється при зміні спільних даних (Selenium акаунти, імпорт)
+        self._user_versions: Dict[int, int] = {}  # user_id -> версія проектів/налаштувань пересилання
+        self.sent_ledger = SentLedger()  # відправлені повідомлення: (користувач, канал) -> message_id
+        self._ledger_unsaved = False  # журнал змінено без перезапису data.json
         self.load_data()
+        self.writer.start()
         
+    @_locked
     def load_data(self) -> None:
-        """Завантажити дані з файлу"""
+        """Завантажити дані зі сховища"""
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    loaded_data = json.load(f)
-                    
-                # Міграція зі старої структури (projects.json)
-                if 'projects' not in loaded_data and isinstance(loaded_data, dict):
-                    # Стара структура - весь файл це проекти
-                    self.data['projects'] = loaded_data
-                    self.logger.info("Міграція зі старої структури даних")
-                else:
-                    # Нова структура
-                    self.data.update(loaded_data)
-                    
+            loaded_data = self.storage.load()
+            if loaded_data is not None:
+                # Стара структура (projects.json) перетворюється на нову в read_json_data
+                self.data.update(loaded_data)
                 self.logger.info(f"Завантажено дані: {len(self.data['projects'])} користувачів з проектами")
             else:
+                if self.storage.incremental:
+                    self.storage.save_all(self.data)
                 self.logger.info("Створено новий файл даних")
         except Exception as e:
             self.logger.error(f"Помилка завантаження даних: {e}")
+        self._load_sent_ledger()
+        self.subscriptions.rebuild(self.data['projects'])
+        self._publish_all()
+        self._touch()
+    
+    def _publish(self, user_id_str: Optional[str] = None, selenium: bool = False,
+                 user: Optional[str] = None, settings: bool = False) -> None:
+        """Опублікувати новий знімок: копіюються лише змінені частини (проекти, користувач, Selenium акаунти, налаштування)"""
+        current = self._snapshot
+        changes = {}
+        if user_id_str is not None:
+            projects = dict(current.projects)
+            projects[user_id_str] = tuple(_freeze(project) for project in self.data['projects'].get(user_id_str, []))
+            changes['projects'] = MappingProxyType(projects)
+        if user is not None:
+            users = dict(current.users)
+            users[user] = _freeze(self.data['users'][user])
+            changes['users'] = MappingProxyType(users)
+        if selenium:
+            changes['selenium_accounts'] = MappingProxyType({
+                username: _freeze(account) for username, account in self.data.get('selenium_accounts', {}).items()
+            })
+        if settings:
+            changes['settings'] = MappingProxyType(copy.deepcopy(self.data['settings']))
+        # Заміна посилання атомарна: читач бачить або старий, або новий знімок
+        self._snapshot = current._replace(**changes)
+    
+    def _publish_all(self) -> None:
+        """Перебудувати знімок повністю (завантаження, імпорт)"""
+        self._snapshot = self._snapshot._replace(
+            projects=MappingProxyType({
+                user_id_str: tuple(_freeze(project) for project in projects)
+                for user_id_str, projects in self.data['projects'].items()
+            }),
+            users=MappingProxyType({
+                user_id_str: _freeze(user_data) for user_id_str, user_data in self.data['users'].items()
+            })
+        )
+        self._publish(selenium=True, settings=True)
+    
+    def snapshot(self) -> ProjectsSnapshot:
+        """Поточний знімок проектів (без блокування)"""
+        return self._snapshot
+    
+    def _load_sent_ledger(self) -> None:
+        """Перенести відправлені повідомлення з завантажених даних у журнал"""
+        compact = self.data.pop('sent_ledger', None)
+        legacy = self.data['settings'].pop('sent_messages', None)
+        self.sent_ledger.clear()
+        if compact:
+            self.sent_ledger.load_dict(compact)
+        if legacy:
+            # Старий формат зі списками ISO дат - наступне збереження запише компактну форму
+            self.sent_ledger.import_legacy(legacy)
+            if self.storage.incremental:
+                self.storage.save_all(self._persisted_data())
+            self.writer.mark_dirty()
+    
+    def _persisted_data(self) -> Dict[str, Any]:
+        """Дані для збереження разом з компактною формою журналу відправлених повідомлень"""
+        return {**self.data, 'sent_ledger': self.sent_ledger.to_dict()}
+    
+    def _touch(self, user_id: Optional[int] = None) -> None:
+        """Позначити зміну даних користувача (або спільних даних) для кешів UI"""
+        if user_id is None:
+            self._global_version += 1
+        else:
+            user_id = int(user_id)
+            self._user_versions[user_id] = self._user_versions.get(user_id, 0) + 1
+    
+    def data_version(self, user_id: Optional[int] = None) -> tuple:
+        """Версія даних, від яких залежать меню користувача"""
+        if user_id is None:
+            return (self._global_version,)
+        return (self._global_version, self._user_versions.get(int(user_id), 0))
             
+    @_locked
     def save_data(self, force: bool = False) -> None:
-        """Зберегти дані в файл (з кешуванням)"""
-        try:
-            now = datetime.now()
-            
-            # Зберігаємо тільки якщо пройшло достатньо часу або примусово
-            if not force and (now - self._last_save).seconds < self._save_interval:
-                return
-                
-            self.data['metadata']['last_updated'] = now.isoformat()
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
-            self._last_save = now
-        except Exception as e:
-            self.logger.error(f"Помилка збереження даних: {e}")
-            
+        """Позначити дані зміненими; запис виконає фоновий потік (force - записати одразу)"""
+        self.data['metadata']['last_updated'] = datetime.now().isoformat()
+        self.writer.mark_dirty()
+        if force:
+            self.writer.flush()
+    
+    def _flush(self) -> None:
+        """Записати поточний стан у сховище (викликається з потоку запису)"""
+        if self.storage.incremental:
+            # Рядкові зміни вже в черзі сховища - додаємо метадані і записуємо однією транзакцією
+            with self._lock:
+                metadata = dict(self.data['metadata'])
+            self.storage.save_metadata(metadata)
+            self.storage.commit()
+            return
+        # Копія під блокуванням, серіалізація і запис на диск - без нього
+        with self._lock:
+            data = copy.deepcopy(self._persisted_data())
+            self._ledger_unsaved = False
+        self.storage.save_all(data)
+    
+    def flush(self) -> bool:
+        """Записати незбережені зміни зараз"""
+        return self.writer.flush()
+            
+    def close(self) -> None:
+        """Зупинити потік запису, зберегти дані і закрити сховище"""
+        if self._ledger_unsaved:
+            self.writer.mark_dirty()
+        self.writer.stop(flush=True)
+        self.storage.close()
+            
+    @_locked
     def add_project(self, user_id: int, project_data: Dict, target_user_id: Optional[int] = None) -> bool:
         """Додати новий проект"""
         try:
@@ -82,6 +212,10 @@ class ProjectManager:
             project_data['created_by'] = user_id  # Хто створив проект
             
             self.data['projects'][user_id_str].append(project_data)
+            self.storage.save_projects(user_id_str, self.data['projects'][user_id_str])
+            self.subscriptions.add(user_id, project_data)
+            self._publish(user_id_str)
+            self._touch(user_id)
             self.save_data()
             self.logger.info(f"Додано проект для користувача {user_id}: {project_data['name']}")
             return True
@@ -89,10 +223,11 @@ class ProjectManager:
             self.logger.error(f"Помилка додавання проекту: {e}")
             return False
             
-    def get_user_projects(self, user_id: int) -> List[Dict]:
-        """Отримати проекти користувача"""
-        return self.data['projects'].get(str(user_id), [])
+    def get_user_projects(self, user_id: int) -> List[Mapping[str, Any]]:
+        """Отримати проекти користувача (read-only записи зі знімка)"""
+        return list(self._snapshot.projects.get(str(user_id), ()))
         
+    @_locked
     def delete_project(self, user_id: int, project_id: int) -> bool:
         """Видалити проект"""
         try:
@@ -102,6 +237,10 @@ class ProjectManager:
                 for i, project in enumerate(projects):
                     if project['id'] == project_id:
                         del projects[i]
+                        self.storage.save_projects(user_id_str, projects)
+                        self.subscriptions.remove(user_id, project)
+                        self._publish(user_id_str)
+                        self._touch(user_id)
                         self.save_data()
                         self.logger.info(f"Видалено проект {project_id} для користувача {user_id}")
                         return True
@@ -139,6 +278,7 @@ class ProjectManager:
         return result
     
     # Методи для роботи з користувачами
+    @_locked
     def add_user(self, user_id: int, user_data: Dict) -> bool:
         """Додати користувача"""
         try:
@@ -150,6 +290,8 @@ class ProjectManager:
                 'created_at': datetime.now().isoformat(),
                 'last_seen': datetime.now().isoformat()
             }
+            self.storage.save_user(user_id_str, self.data['users'][user_id_str])
+            self._publish(user=user_id_str)
             self.save_data()
             self.logger.info(f"Додано користувача {user_id}")
             return True
@@ -157,29 +299,35 @@ class ProjectManager:
             self.logger.error(f"Помилка додавання користувача: {e}")
             return False
     
+    @_locked
     def update_user_last_seen(self, user_id: int) -> None:
         """Оновити час останнього візиту користувача"""
         try:
             user_id_str = str(user_id)
             if user_id_str in self.data['users']:
                 self.data['users'][user_id_str]['last_seen'] = datetime.now().isoformat()
+                self.storage.save_user(user_id_str, self.data['users'][user_id_str])
+                self._publish(user=user_id_str)
                 self.save_data()
         except Exception as e:
             self.logger.error(f"Помилка оновлення користувача: {e}")
     
-    def get_user_data(self, user_id: int) -> Optional[Dict]:
-        """Отримати дані користувача"""
-        return self.data['users'].get(str(user_id))
+    def get_user_data(self, user_id: int) -> Optional[Mapping[str, Any]]:
+        """Отримати дані користувача (read-only, зі знімка)"""
+        return self._snapshot.users.get(str(user_id))
     
-    def get_all_users(self) -> Dict:
-        """Отримати всіх користувачів"""
-        return self.data['users']
+    def get_all_users(self) -> Mapping[str, Mapping[str, Any]]:
+        """Отримати всіх користувачів (read-only, зі знімка)"""
+        return self._snapshot.users
     
     # Методи для роботи з налаштуваннями
+    @_locked
     def set_setting(self, key: str, value: Any) -> bool:
         """Встановити налаштування"""
         try:
             self.data['settings'][key] = value
+            self.storage.save_setting(key, value)
+            self._publish(settings=True)
             self.save_data()
             self.logger.info(f"Встановлено налаштування {key}")
             return True
@@ -188,14 +336,15 @@ class ProjectManager:
             return False
     
     def get_setting(self, key: str, default: Any = None) -> Any:
-        """Отримати налаштування"""
-        return self.data['settings'].get(key, default)
+        """Отримати налаштування (зі знімка)"""
+        return self._snapshot.settings.get(key, default)
     
-    def get_all_settings(self) -> Dict:
-        """Отримати всі налаштування"""
-        return self.data['settings']
+    def get_all_settings(self) -> Mapping[str, Any]:
+        """Отримати всі налаштування (read-only, зі знімка)"""
+        return self._snapshot.settings
     
     # Методи для роботи з налаштуваннями пересилання
+    @_locked
     def set_forward_channel(self, user_id: int, channel_id: str) -> bool:
         """Встановити канал для пересилання сповіщень"""
         try:
@@ -208,6 +357,9 @@ class ProjectManager:
                 'enabled': True,
                 'created_at': datetime.now().isoformat()
             }
+            self.storage.save_forward_settings(user_id_str, self.data['settings']['forward_settings'][user_id_str])
+            self._publish(settings=True)
+            self._touch(user_id)
             self.save_data()
             self.logger.info(f"Встановлено канал пересилання для користувача {user_id}: {channel_id}")
             return True
@@ -218,13 +370,14 @@ class ProjectManager:
     def get_forward_channel(self, user_id: int) -> Optional[str]:
         """Отримати канал для пересилання сповіщень"""
         user_id_str = str(user_id)
-        forward_settings = self.data['settings'].get('forward_settings', {})
+        forward_settings = self._snapshot.settings.get('forward_settings', {})
         user_settings = forward_settings.get(user_id_str, {})
         
         if user_settings.get('enabled', False):
             return user_settings.get('channel_id')
         return None
     
+    @_locked
     def enable_forward(self, user_id: int) -> bool:
         """Увімкнути пересилання сповіщень"""
         try:
@@ -236,6 +389,9 @@ class ProjectManager:
                 self.data['settings']['forward_settings'][user_id_str] = {}
             
             self.data['settings']['forward_settings'][user_id_str]['enabled'] = True
+            self.storage.save_forward_settings(user_id_str, self.data['settings']['forward_settings'][user_id_str])
+            self._publish(settings=True)
+            self._touch(user_id)
             self.save_data()
             self.logger.info(f"Увімкнено пересилання для користувача {user_id}")
             return True
@@ -243,6 +399,7 @@ class ProjectManager:
             self.logger.error(f"Помилка увімкнення пересилання: {e}")
             return False
     
+    @_locked
     def disable_forward(self, user_id: int) -> bool:
         """Вимкнути пересилання сповіщень"""
         try:
@@ -254,6 +411,9 @@ class ProjectManager:
                 self.data['settings']['forward_settings'][user_id_str] = {}
             
             self.data['settings']['forward_settings'][user_id_str]['enabled'] = False
+            self.storage.save_forward_settings(user_id_str, self.data['settings']['forward_settings'][user_id_str])
+            self._publish(settings=True)
+            self._touch(user_id)
             self.save_data()
             self.logger.info(f"Вимкнено пересилання для користувача {user_id}")
             return True
@@ -264,7 +424,7 @@ class ProjectManager:
     def get_forward_status(self, user_id: int) -> Dict:
         """Отримати статус пересилання"""
         user_id_str = str(user_id)
-        forward_settings = self.data['settings'].get('forward_settings', {})
+        forward_settings = self._snapshot.settings.get('forward_settings', {})
         user_settings = forward_settings.get(user_id_str, {})
         
         return {
@@ -275,84 +435,60 @@ class ProjectManager:
     
     # Методи для відстеження повідомлень
     def add_sent_message(self, message_id: str, channel_id: str, user_id: int) -> bool:
-        """Додати ID відправленого повідомлення (оптимізовано)"""
+        """Додати ID відправленого повідомлення (останні 500 на канал)"""
+        return self.record_sent_messages([(message_id, channel_id, user_id)]) == 1
+    
+    @_locked
+    def record_sent_messages(self, entries: List[Tuple[str, str, int]]) -> int:
+        """Записати пакет відправлених повідомлень (message_id, канал, user_id) в журнал.
+
+        data.json через це не перезаписується: журнал потрапить у файл з наступним
+        збереженням даних або при закритті, дублікати до того ловить outbox.
+        """
+        recorded = 0
         try:
-            if 'sent_messages' not in self.data['settings']:
-                self.data['settings']['sent_messages'] = {}
-            
-            user_id_str = str(user_id)
-            if user_id_str not in self.data['settings']['sent_messages']:
-                self.data['settings']['sent_messages'][user_id_str] = {}
-            
-            if channel_id not in self.data['settings']['sent_messages'][user_id_str]:
-                self.data['settings']['sent_messages'][user_id_str][channel_id] = []
-            
-            # Додаємо ID повідомлення з часом
-            self.data['settings']['sent_messages'][user_id_str][channel_id].append({
-                'message_id': message_id,
-                'timestamp': datetime.now().isoformat()
-            })
-            
-            # Обмежуємо кількість збережених повідомлень (останні 500 для швидкості)
-            if len(self.data['settings']['sent_messages'][user_id_str][channel_id]) > 500:
-                self.data['settings']['sent_messages'][user_id_str][channel_id] = \
-                    self.data['settings']['sent_messages'][user_id_str][channel_id][-500:]
-            
-            # Зберігаємо тільки при необхідності
-            self.save_data()
-            return True
+            for message_id, channel_id, user_id in entries:
+                user_id_str = str(user_id)
+                bucket = self.sent_ledger.add(user_id_str, channel_id, message_id)
+                self.storage.add_sent_message(user_id_str, channel_id, message_id, bucket,
+                                              keep=self.sent_ledger.keep_per_channel)
+                recorded += 1
         except Exception as e:
             self.logger.error(f"Помилка додавання відправленого повідомлення: {e}")
-            return False
+        if recorded:
+            if self.storage.incremental:
+                self.writer.mark_dirty()  # рядки журналу, без перезапису інших даних
+            else:
+                self._ledger_unsaved = True
+        return recorded
     
     def is_message_sent(self, message_id: str, channel_id: str, user_id: int) -> bool:
         """Перевірити чи повідомлення вже було відправлено"""
-        try:
-            user_id_str = str(user_id)
-            sent_messages = self.data['settings'].get('sent_messages', {})
-            user_messages = sent_messages.get(user_id_str, {})
-            channel_messages = user_messages.get(channel_id, [])
-            
-            for msg in channel_messages:
-                if msg['message_id'] == message_id:
-                    return True
-            return False
-        except Exception as e:
-            self.logger.error(f"Помилка перевірки відправленого повідомлення: {e}")
-            return False
+        return self.sent_ledger.contains(str(user_id), channel_id, message_id)
     
+    @_locked
     def cleanup_old_messages(self, hours: int = 24) -> None:
-        """Очистити старі повідомлення (старші за вказану кількість годин)"""
+        """Очистити старі повідомлення (цілими часовими кошиками, старшими за вказану кількість годин)"""
         try:
-            cutoff_time = datetime.now() - timedelta(hours=hours)
-            
-            if 'sent_messages' not in self.data['settings']:
-                return
-            
-            for user_id_str in self.data['settings']['sent_messages']:
-                for channel_id in self.data['settings']['sent_messages'][user_id_str]:
-                    messages = self.data['settings']['sent_messages'][user_id_str][channel_id]
-                    # Фільтруємо повідомлення новіші за cutoff_time
-                    self.data['settings']['sent_messages'][user_id_str][channel_id] = [
-                        msg for msg in messages 
-                        if datetime.fromisoformat(msg['timestamp']) > cutoff_time
-                    ]
-            
-            self.save_data()
-            self.logger.info(f"Очищено старі повідомлення (старші за {hours} годин)")
+            removed, cutoff_bucket = self.sent_ledger.expire(hours * 3600)
+            self.storage.expire_sent_messages(cutoff_bucket)
+            if removed:
+                self.save_data()
+            self.logger.info(f"Очищено {removed} старих повідомлень (старші за {hours} годин)")
         except Exception as e:
             self.logger.error(f"Помилка очищення старих повідомлень: {e}")
     
     # Методи для статистики
     def get_statistics(self) -> Dict:
         """Отримати статистику"""
-        total_users = len(self.data['users'])
-        total_projects = sum(len(projects) for projects in self.data['projects'].values())
+        total_users = len(self._snapshot.users)
+        projects_snapshot = self._snapshot.projects
+        total_projects = sum(len(projects) for projects in projects_snapshot.values())
         
         discord_projects = 0
         twitter_projects = 0
         
-        for projects in self.data['projects'].values():
+        for projects in projects_snapshot.values():
             for project in projects:
                 if project.get('platform') == 'discord':
                     discord_projects += 1
@@ -364,10 +500,11 @@ class ProjectManager:
             'total_projects': total_projects,
             'discord_projects': discord_projects,
             'twitter_projects': twitter_projects,
-            'data_file_size': os.path.getsize(self.data_file) if os.path.exists(self.data_file) else 0,
+            'data_file_size': self.storage.size(),
             'last_updated': self.data['metadata']['last_updated']
         }
     
+    @_locked
     def export_data(self, export_file: Optional[str] = None) -> str:
         """Експортувати дані"""
         if not export_file:
@@ -375,13 +512,14 @@ class ProjectManager:
         
         try:
             with open(export_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
+                json.dump(self._persisted_data(), f, ensure_ascii=False, indent=2)
             self.logger.info(f"Дані експортовано в {export_file}")
             return export_file
         except Exception as e:
             self.logger.error(f"Помилка експорту: {e}")
             return ""
     
+    @_locked
     def import_data(self, import_file: str) -> bool:
         """Імпортувати дані"""
         try:
@@ -394,6 +532,13 @@ class ProjectManager:
             
             # Імпортуємо дані
             self.data.update(imported_data)
+            if 'sent_ledger' in imported_data or 'sent_messages' in imported_data.get('settings', {}):
+                self._load_sent_ledger()
+            self.subscriptions.rebuild(self.data['projects'])
+            self._publish_all()
+            self._touch()
+            if self.storage.incremental:
+                self.storage.save_all(self._persisted_data())
             self.save_data()
             
             self.logger.info(f"Дані імпортовано з {import_file}")
@@ -403,6 +548,7 @@ class ProjectManager:
             return False
     
     # Selenium Twitter Accounts Management
+    @_locked
     def add_selenium_account(self, username: str, added_by: Optional[int] = None) -> bool:
         """Додати Twitter акаунт для Selenium моніторингу"""
         try:
@@ -418,6 +564,9 @@ class ProjectManager:
             }
             
             self.data['selenium_accounts'][username] = account_data
+            self.storage.save_selenium_account(username, account_data)
+            self._publish(selenium=True)
+            self._touch()
             self.save_data(force=True)
             
             self.logger.info(f"Додано Selenium Twitter акаунт: {username}")
@@ -427,6 +576,7 @@ class ProjectManager:
             self.logger.error(f"Помилка додавання Selenium акаунта {username}: {e}")
             return False
     
+    @_locked
     def remove_selenium_account(self, username: str) -> bool:
         """Видалити Twitter акаунт з Selenium моніторингу"""
         try:
@@ -435,6 +585,9 @@ class ProjectManager:
             
             if username in self.data['selenium_accounts']:
                 del self.data['selenium_accounts'][username]
+                self.storage.delete_selenium_account(username)
+                self._publish(selenium=True)
+                self._touch()
                 self.save_data(force=True)
                 
                 self.logger.info(f"Видалено Selenium Twitter акаунт: {username}")
@@ -449,11 +602,8 @@ class ProjectManager:
     def get_selenium_accounts(self) -> List[str]:
         """Отримати список всіх активних Selenium Twitter акаунтів"""
         try:
-            if 'selenium_accounts' not in self.data:
-                return []
-            
             active_accounts = []
-            for username, account_data in self.data['selenium_accounts'].items():
+            for username, account_data in self._snapshot.selenium_accounts.items():
                 if account_data.get('is_active', True):
                     active_accounts.append(username)
             
@@ -463,6 +613,7 @@ class ProjectManager:
             self.logger.error(f"Помилка отримання Selenium акаунтів: {e}")
             return []
     
+    @_locked
     def update_selenium_account_status(self, username: str, is_active: bool = True) -> bool:
         """Оновити статус Selenium Twitter акаунта"""
         try:
@@ -470,8 +621,12 @@ class ProjectManager:
                 return False
             
             if username in self.data['selenium_accounts']:
+                if self.data['selenium_accounts'][username].get('is_active', True) != is_active:
+                    self._touch()
                 self.data['selenium_accounts'][username]['is_active'] = is_active
                 self.data['selenium_accounts'][username]['last_checked'] = datetime.now().isoformat()
+                self.storage.save_selenium_account(username, self.data['selenium_accounts'][username])
+                self._publish(selenium=True)
                 self.save_data(force=True)
                 
                 self.logger.info(f"Оновлено статус Selenium акаунта {username}: {'активний' if is_active else 'неактивний'}")
@@ -486,10 +641,7 @@ class ProjectManager:
     def get_selenium_account_info(self, username: str) -> Optional[Dict]:
         """Отримати інформацію про Selenium Twitter акаунт"""
         try:
-            if 'selenium_accounts' not in self.data:
-                return None
-            
-            return self.data['selenium_accounts'].get(username)
+            return self._snapshot.selenium_accounts.get(username)
             
         except Exception as e:
             self.logger.error(f"Помилка отримання інформації про Selenium акаунт {username}: {e}")
@@ -497,14 +649,14 @@ class ProjectManager:
     
     # Методи для адміністраторів
     
-    def get_all_projects(self, admin_user_id: int) -> Dict[int, List[Dict]]:
+    def get_all_projects(self, admin_user_id: int) -> Mapping[str, Tuple[Mapping[str, Any], ...]]:
         """Отримати всі проекти всіх користувачів (тільки для адміністраторів)"""
         try:
             if not access_manager.check_permission(admin_user_id, "can_manage_all_projects"):
                 self.logger.warning(f"Користувач {admin_user_id} намагається отримати всі проекти без дозволу")
                 return {}
             
-            return self.data['projects']
+            return self._snapshot.projects
             
         except Exception as e:
             self.logger.error(f"Помилка отримання всіх проектів: {e}")
@@ -544,7 +696,7 @@ class ProjectManager:
                 return []
             
             users_with_projects = []
-            for user_id_str, projects in self.data['projects'].items():
+            for user_id_str, projects in self._snapshot.projects.items():
                 user_id = int(user_id_str)
                 user_data = access_manager.get_user_by_telegram_id(user_id)
                 
@@ -573,16 +725,17 @@ class ProjectManager:
                 self.logger.warning(f"Користувач {admin_user_id} намагається отримати статистику без дозволу")
                 return {}
             
+            snapshot = self._snapshot
             stats = {
-                'total_users': len(self.data['projects']),
-                'total_projects': sum(len(projects) for projects in self.data['projects'].values()),
+                'total_users': len(snapshot.projects),
+                'total_projects': sum(len(projects) for projects in snapshot.projects.values()),
                 'twitter_projects': 0,
                 'discord_projects': 0,
-                'selenium_accounts': len(self.data.get('selenium_accounts', {})),
+                'selenium_accounts': len(snapshot.selenium_accounts),
                 'active_users': 0
             }
             
-            for user_id_str, projects in self.data['projects'].items():
+            for user_id_str, projects in snapshot.projects.items():
                 user_id = int(user_id_str)
                 user_data = access_manager.get_user_by_telegram_id(user_id)
                 
@@ -0,0 +1,383 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sent_ledger import SentLedger
+
+
+def read_json_data(path: str) -> Optional[Dict]:
+    """Прочитати data.json або старий projects.json (весь файл - проекти) у структуру ProjectManager"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        loaded = json.load(f)
+    if not isinstance(loaded, dict):
+        return None
+    if 'projects' not in loaded:
+        # Стара структура - весь файл це проекти
+        return {'projects': loaded}
+    return loaded
+
+
+class ProjectStorage(ABC):
+    """Сховище даних ProjectManager. Рядкові методи викликаються після кожної зміни в пам'яті, commit() - з потоку запису"""
+
+    incremental = False  # True - зміни записуються рядками, save_all потрібен лише для імпорту
+
+    @abstractmethod
+    def load(self) -> Optional[Dict]:
+        """Завантажити всі дані (None - сховище порожнє)"""
+
+    @abstractmethod
+    def save_all(self, data: Dict) -> None:
+        """Повністю перезаписати дані"""
+
+    def commit(self) -> None:
+        """Записати на диск накопичені рядкові зміни"""
+
+    def save_projects(self, user_id: str, projects: List[Dict]) -> None:
+        """Зберегти список проектів користувача"""
+
+    def save_user(self, user_id: str, user_data: Dict) -> None:
+        """Зберегти користувача"""
+
+    def save_setting(self, key: str, value: Any) -> None:
+        """Зберегти глобальне налаштування"""
+
+    def save_forward_settings(self, user_id: str, settings: Dict) -> None:
+        """Зберегти налаштування пересилання користувача"""
+
+    def add_sent_message(self, user_id: str, channel_id: str, message_id: str, bucket: int, keep: int) -> None:
+        """Додати відправлене повідомлення в кошик, залишивши останні keep для каналу"""
+
+    def expire_sent_messages(self, before_bucket: int) -> None:
+        """Видалити відправлені повідомлення з кошиків, що починаються раніше before_bucket"""
+
+    def save_selenium_account(self, username: str, account: Dict) -> None:
+        """Зберегти Selenium акаунт"""
+
+    def delete_selenium_account(self, username: str) -> None:
+        """Видалити Selenium акаунт"""
+
+    def save_metadata(self, metadata: Dict) -> None:
+        """Зберегти метадані"""
+
+    def size(self) -> int:
+        """Розмір даних на диску (байти)"""
+        return 0
+
+    def close(self) -> None:
+        """Закрити сховище"""
+
+
+class JsonStorage(ProjectStorage):
+    """Один JSON файл: кожне збереження перезаписує всі дані"""
+
+    def __init__(self, data_file: str = "data.json"):
+        self.data_file = data_file
+
+    def load(self) -> Optional[Dict]:
+        return read_json_data(self.data_file)
+
+    def save_all(self, data: Dict) -> None:
+        # Тимчасовий файл + rename: при збої лишається попередня повна версія
+        payload = json.dumps(data, ensure_ascii=False, indent=2)
+        tmp_file = f"{self.data_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.data_file)
+
+    def size(self) -> int:
+        return os.path.getsize(self.data_file) if os.path.exists(self.data_file) else 0
+
+
+class SqliteStorage(ProjectStorage):
+    """SQLite (WAL): окремі таблиці, кожна зміна - upsert одного рядка замість запису всього дерева.
+
+    Рядкові методи лише ставлять запити в чергу (без дискових операцій під
+    блокуванням ProjectManager); commit() виконує чергу однією транзакцією.
+    """
+
+    incremental = True
+
+    def __init__(self, db_file: str = "data.db"):
+        self.db_file = db_file
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()  # з'єднання з базою
+        self._pending: List[tuple] = []  # запити рядкових змін, ще не записані commit()
+        self._pending_lock = threading.Lock()
+        self.db = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS project_owners (
+                user_id TEXT PRIMARY KEY
+            );
+            CREATE TABLE IF NOT EXISTS projects (
+                user_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (user_id, position)
+            );
+            CREATE TABLE IF NOT EXISTS users (
+                user_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS forward_settings (
+                user_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sent_ledger (
+                user_id TEXT NOT NULL,
+                channel_id TEXT NOT NULL,
+                message_id TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                PRIMARY KEY (user_id, channel_id, message_id)
+            );
+            CREATE INDEX IF NOT EXISTS sent_ledger_bucket ON sent_ledger(bucket);
+            CREATE TABLE IF NOT EXISTS selenium_accounts (
+                username TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS metadata (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+
+    def _execute(self, statements: List[tuple]) -> None:
+        """Виконати запити однією транзакцією (під self._lock)"""
+        self.db.execute("BEGIN")
+        try:
+            for sql, params in statements:
+                self.db.execute(sql, params)
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+
+    def _queue(self, statements: List[tuple]) -> None:
+        """Поставити запити в чергу до наступного commit()"""
+        with self._pending_lock:
+            self._pending.extend(statements)
+
+    def commit(self) -> None:
+        # Черга забирається під блокуванням бази: save_all не може вклинитися між забором і записом
+        with self._lock:
+            with self._pending_lock:
+                statements, self._pending = self._pending, []
+            if not statements:
+                return
+            try:
+                self._execute(statements)
+            except Exception:
+                with self._pending_lock:
+                    self._pending = statements + self._pending
+                raise
+
+    def pending_count(self) -> int:
+        """Кількість запитів, що чекають на commit()"""
+        with self._pending_lock:
+            return len(self._pending)
+
+    def is_empty(self) -> bool:
+        """Чи сховище ще не містить даних (немає метаданих)"""
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM metadata").fetchone()[0] == 0
+
+    def load(self) -> Optional[Dict]:
+        if self.is_empty():
+            return None
+        with self._lock:
+            projects: Dict[str, List[Dict]] = {}
+            for user_id, data in self.db.execute("SELECT user_id, data FROM projects ORDER BY user_id, position"):
+                projects.setdefault(user_id, []).append(json.loads(data))
+            for (user_id,) in self.db.execute("SELECT user_id FROM project_owners"):
+                # Користувачі з порожнім списком проектів
+                projects.setdefault(user_id, [])
+
+            settings = {key: json.loads(value) for key, value in self.db.execute("SELECT key, value FROM settings")}
+            settings['forward_settings'] = {
+                user_id: json.loads(data) for user_id, data in self.db.execute("SELECT user_id, data FROM forward_settings")
+            }
+            sent_ledger: Dict[str, Dict[str, Dict[str, List[str]]]] = {}
+            for user_id, channel_id, message_id, bucket in self.db.execute(
+                    "SELECT user_id, channel_id, message_id, bucket FROM sent_ledger ORDER BY rowid"):
+                sent_ledger.setdefault(user_id, {}).setdefault(channel_id, {}).setdefault(str(bucket), []).append(message_id)
+
+            return {
+                'projects': projects,
+                'users': {user_id: json.loads(data) for user_id, data in self.db.execute("SELECT user_id, data FROM users")},
+                'settings': settings,
+                'selenium_accounts': {
+                    username: json.loads(data) for username, data in self.db.execute("SELECT username, data FROM selenium_accounts")
+                },
+                'metadata': {key: json.loads(value) for key, value in self.db.execute("SELECT key, value FROM metadata")},
+                'sent_ledger': sent_ledger,
+            }
+
+    def _projects_statements(self, user_id: str, projects: List[Dict]) -> List[tuple]:
+        statements = [
+            ("DELETE FROM projects WHERE user_id = ?", (user_id,)),
+            # Порожній список проектів теж має пережити перезапуск
+            ("INSERT OR IGNORE INTO project_owners (user_id) VALUES (?)", (user_id,)),
+        ]
+        statements.extend(
+            ("INSERT INTO projects (user_id, position, data) VALUES (?, ?, ?)", (user_id, position, json.dumps(project, ensure_ascii=False)))
+            for position, project in enumerate(projects)
+        )
+        return statements
+
+    def _forward_statements(self, forward_settings: Dict) -> List[tuple]:
+        statements = [("DELETE FROM forward_settings", ())]
+        statements.extend(
+            ("INSERT INTO forward_settings (user_id, data) VALUES (?, ?)", (user_id, json.dumps(settings, ensure_ascii=False)))
+            for user_id, settings in forward_settings.items()
+        )
+        return statements
+
+    def _ledger_statements(self, sent_ledger: Dict) -> List[tuple]:
+        statements = [("DELETE FROM sent_ledger", ())]
+        for user_id, channels in sent_ledger.items():
+            for channel_id, buckets in channels.items():
+                for bucket in sorted(buckets, key=int):
+                    statements.extend(
+                        ("INSERT OR REPLACE INTO sent_ledger (user_id, channel_id, message_id, bucket) VALUES (?, ?, ?, ?)",
+                         (user_id, channel_id, message_id, int(bucket)))
+                        for message_id in buckets[bucket]
+                    )
+        return statements
+
+    def save_all(self, data: Dict) -> None:
+        statements = [
+            ("DELETE FROM project_owners", ()),
+            ("DELETE FROM projects", ()),
+            ("DELETE FROM users", ()),
+            ("DELETE FROM selenium_accounts", ()),
+            ("DELETE FROM settings", ()),
+            ("DELETE FROM metadata", ()),
+        ]
+        for user_id, projects in data.get('projects', {}).items():
+            statements.extend(self._projects_statements(user_id, projects))
+        statements.extend(
+            ("INSERT INTO users (user_id, data) VALUES (?, ?)", (user_id, json.dumps(user, ensure_ascii=False)))
+            for user_id, user in data.get('users', {}).items()
+        )
+        settings = data.get('settings', {})
+        statements.extend(self._forward_statements(settings.get('forward_settings', {})))
+        statements.extend(self._ledger_statements(data.get('sent_ledger', {})))
+        statements.extend(
+            ("INSERT INTO settings (key, value) VALUES (?, ?)", (key, json.dumps(value, ensure_ascii=False)))
+            for key, value in settings.items() if key != 'forward_settings'
+        )
+        statements.extend(
+            ("INSERT INTO selenium_accounts (username, data) VALUES (?, ?)", (username, json.dumps(account, ensure_ascii=False)))
+            for username, account in data.get('selenium_accounts', {}).items()
+        )
+        statements.extend(
+            ("INSERT INTO metadata (key, value) VALUES (?, ?)", (key, json.dumps(value, ensure_ascii=False)))
+            for key, value in data.get('metadata', {}).items()
+        )
+        with self._lock:
+            # Повний перезапис уже містить усі зміни з черги
+            with self._pending_lock:
+                self._pending = []
+            self._execute(statements)
+
+    def save_projects(self, user_id: str, projects: List[Dict]) -> None:
+        self._queue(self._projects_statements(user_id, projects))
+
+    def save_user(self, user_id: str, user_data: Dict) -> None:
+        self._queue([("INSERT OR REPLACE INTO users (user_id, data) VALUES (?, ?)",
+                      (user_id, json.dumps(user_data, ensure_ascii=False)))])
+
+    def save_setting(self, key: str, value: Any) -> None:
+        if key == 'forward_settings':
+            self._queue(self._forward_statements(value))
+        else:
+            self._queue([("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                          (key, json.dumps(value, ensure_ascii=False)))])
+
+    def save_forward_settings(self, user_id: str, settings: Dict) -> None:
+        self._queue([("INSERT OR REPLACE INTO forward_settings (user_id, data) VALUES (?, ?)",
+                      (user_id, json.dumps(settings, ensure_ascii=False)))])
+
+    def add_sent_message(self, user_id: str, channel_id: str, message_id: str, bucket: int, keep: int) -> None:
+        # REPLACE видаляє старий рядок, тож повторний запис стає найновішим (більший rowid)
+        self._queue([
+            ("INSERT OR REPLACE INTO sent_ledger (user_id, channel_id, message_id, bucket) VALUES (?, ?, ?, ?)",
+             (user_id, channel_id, message_id, bucket)),
+            ("DELETE FROM sent_ledger WHERE user_id = ? AND channel_id = ? AND rowid <= "
+             "(SELECT rowid FROM sent_ledger WHERE user_id = ? AND channel_id = ? ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+             (user_id, channel_id, user_id, channel_id, keep)),
+        ])
+
+    def expire_sent_messages(self, before_bucket: int) -> None:
+        self._queue([("DELETE FROM sent_ledger WHERE bucket < ?", (before_bucket,))])
+
+    def save_selenium_account(self, username: str, account: Dict) -> None:
+        self._queue([("INSERT OR REPLACE INTO selenium_accounts (username, data) VALUES (?, ?)",
+                      (username, json.dumps(account, ensure_ascii=False)))])
+
+    def delete_selenium_account(self, username: str) -> None:
+        self._queue([("DELETE FROM selenium_accounts WHERE username = ?", (username,))])
+
+    def save_metadata(self, metadata: Dict) -> None:
+        self._queue([("INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                      (key, json.dumps(value, ensure_ascii=False))) for key, value in metadata.items()])
+
+    def migrate_from_json(self, *json_files: str) -> bool:
+        """Одноразова міграція: перший наявний JSON файл переноситься в порожню базу"""
+        if not self.is_empty():
+            return False
+        for path in json_files:
+            try:
+                data = read_json_data(path)
+            except Exception as e:
+                self.logger.error(f"Помилка читання {path} для міграції: {e}")
+                continue
+            if not data:
+                continue
+            legacy = data.get('settings', {}).pop('sent_messages', None)
+            if legacy:
+                ledger = SentLedger()
+                ledger.import_legacy(legacy)
+                data['sent_ledger'] = ledger.to_dict()
+            data.setdefault('metadata', {})['migrated_from'] = path
+            data['metadata']['migrated_at'] = datetime.now().isoformat()
+            self.save_all(data)
+            self.logger.info(f"📦 Дані перенесено з {path} в {self.db_file}")
+            return True
+        return False
+
+    def size(self) -> int:
+        # База разом з WAL
+        return sum(os.path.getsize(path) for path in (self.db_file, f"{self.db_file}-wal") if os.path.exists(path))
+
+    def close(self) -> None:
+        try:
+            self.commit()
+            with self._lock:
+                self.db.close()
+        except Exception as e:
+            self.logger.error(f"Помилка закриття бази проектів: {e}")
+
+
+def create_storage(backend: str, data_file: str = "data.json", db_file: str = "data.db") -> ProjectStorage:
+    """Створити сховище за назвою ('json' або 'sqlite'); SQLite при першому запуску переносить JSON дані"""
+    if backend == 'sqlite':
+        storage = SqliteStorage(db_file)
+        storage.migrate_from_json(data_file, "projects.json")
+        return storage
+    return JsonStorage(data_file)
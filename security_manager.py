@@ -1,82 +1,65 @@
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, Set
+from typing import Dict, List, Optional
 import logging
 
+from session_store import SessionStore
+
+SESSION_EXPIRED_TEXT = "🔒 Ваша сесія закінчилася. Введіть пароль знову для продовження роботи."
+
 class SecurityManager:
-    def __init__(self, timeout_seconds: int = 300):
-        self.timeout_seconds = timeout_seconds
-        self.user_sessions: Dict[int, datetime] = {}
-        self.authorized_users: Set[int] = set()
+    def __init__(self, timeout_seconds: int = 300, sessions: Optional[SessionStore] = None):
+        # Спільне сховище сесій (AccessManager.sessions, тайм-аут - його) або власне
+        self.sessions = sessions if sessions is not None else SessionStore(timeout_seconds)
+        self.timeout_seconds = self.sessions.timeout_seconds
         self.logger = logging.getLogger(__name__)
+        # Користувачі, чиї сесії закінчилися і ще не отримали повідомлення
+        self._expired_users: List[int] = []
+        self.sessions.add_expiry_listener(self._expired_users.extend)
         
     def authorize_user(self, user_id: int) -> None:
         """Авторизувати користувача"""
-        self.authorized_users.add(user_id)
-        self.user_sessions[user_id] = datetime.now()
+        self.sessions.start(user_id, self.timeout_seconds)
         self.logger.info(f"User {user_id} authorized")
         
     def is_user_authorized(self, user_id: int) -> bool:
         """Перевірити чи авторизований користувач"""
-        if user_id not in self.authorized_users:
-            return False
-            
-        if user_id not in self.user_sessions:
-            self.authorized_users.discard(user_id)
-            return False
-            
-        # Перевіряємо чи не закінчилася сесія
-        session_time = self.user_sessions[user_id]
-        if datetime.now() - session_time > timedelta(seconds=self.timeout_seconds):
-            self.deauthorize_user(user_id)
-            return False
-            
-        return True
+        return self.sessions.is_active(user_id)
         
     def deauthorize_user(self, user_id: int) -> None:
         """Деавторизувати користувача"""
-        self.authorized_users.discard(user_id)
-        self.user_sessions.pop(user_id, None)
+        self.sessions.end(user_id)
         self.logger.info(f"User {user_id} deauthorized")
         
     def update_user_activity(self, user_id: int) -> None:
         """Оновити активність користувача"""
-        if user_id in self.authorized_users:
-            self.user_sessions[user_id] = datetime.now()
+        self.sessions.touch(user_id)
             
     def get_session_time_left(self, user_id: int) -> int:
         """Отримати час що залишився до закінчення сесії"""
-        if user_id not in self.user_sessions:
-            return 0
-            
-        session_time = self.user_sessions[user_id]
-        time_left = self.timeout_seconds - (datetime.now() - session_time).total_seconds()
-        return max(0, int(time_left))
+        return int(self.sessions.time_left(user_id))
+        
+    async def check_expired_sessions(self, delivery_engine, timeout: float = 60) -> Dict[str, int]:
+        """Перевірити закінчені сесії і розіслати сповіщення через чергу доставки"""
+        # Сесії, що закінчилися тут або в іншому менеджері, приходять через слухача
+        self.sessions.expire()
+        expired_users = list(self._expired_users)
+        self._expired_users.clear()
+        result = {'expired': len(expired_users), 'sent': 0, 'failed': 0, 'pending': 0}
+        if not expired_users:
+            return result
         
-    def check_expired_sessions(self, bot):
-        """Перевірити закінчені сесії (синхронна версія)"""
-        expired_users = []
+        # Паралельність, ліміти швидкості і повтори після 429 - на боці TelegramDeliveryEngine
+        futures = [asyncio.wrap_future(delivery_engine.send_message(user_id, SESSION_EXPIRED_TEXT))
+                   for user_id in expired_users]
+        done, pending = await asyncio.wait(futures, timeout=timeout)
+        for future in done:
+            if future.exception() is None:
+                result['sent'] += 1
+            else:
+                result['failed'] += 1
+                self.logger.error(f"Failed to send session expired message: {future.exception()}")
+        result['pending'] = len(pending)
         
-        for user_id in list(self.authorized_users):
-            if not self.is_user_authorized(user_id):
-                expired_users.append(user_id)
-                
-        # Відправляємо повідомлення про закінчення сесії
-        for user_id in expired_users:
-            try:
-                # Використовуємо синхронний метод через requests
-                import requests
-                from config import BOT_TOKEN
-                
-                url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-                data = {
-                    'chat_id': user_id,
-                    'text': "🔒 Ваша сесія закінчилася. Введіть пароль знову для продовження роботи."
-                }
-                response = requests.post(url, data=data, timeout=10)
-                
-                if response.status_code != 200:
-                    self.logger.error(f"Failed to send session expired message to {user_id}: {response.status_code}")
-                    
-            except Exception as e:
-                self.logger.error(f"Failed to send session expired message to {user_id}: {e}")
\ No newline at end of file
+        self.logger.info(f"Session expiry notices: {result['sent']} sent, {result['failed']} failed, "
+                         f"{result['pending']} pending of {result['expired']}")
+        return result
\ No newline at end of file
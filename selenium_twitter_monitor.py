@@ -4,11 +4,13 @@ Selenium Twitter Monitor для інтеграції з ботом
 """
 
 import asyncio
+import functools
 import logging
 import time
 import json
 import os
 import urllib3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Set, List, Dict, Optional
 from selenium import webdriver
@@ -18,6 +20,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from notification_templates import render_selenium_tweet
 
 # Відключаємо попередження про SSL сертифікати
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -40,6 +43,8 @@ class SeleniumTwitterMonitor:
         self.sent_tweets = {}  # account -> set of sent tweet_ids
         self.monitoring_active = False
         self.seen_tweets_file = "seen_tweets.json"
+        # WebDriver не потокобезпечний: усі блокуючі виклики - в одному окремому потоці
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="selenium")
         
         # Створюємо папку профілю якщо не існує
         if not os.path.exists(self.profile_path):
@@ -189,9 +194,14 @@ class SeleniumTwitterMonitor:
             finally:
                 self.driver = None
     
+    async def run_blocking(self, func, *args, **kwargs):
+        """Виконати блокуючий виклик Selenium у потоці драйвера, не блокуючи event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+    
     async def __aenter__(self):
         """Асинхронний контекстний менеджер"""
-        if self._setup_driver():
+        if await self.run_blocking(self._setup_driver):
             logger.info("Selenium Twitter моніторинг ініціалізовано")
         else:
             logger.warning("Selenium Twitter моніторинг не вдалося ініціалізувати")
@@ -201,8 +211,8 @@ class SeleniumTwitterMonitor:
         """Закрити сесію"""
         if self.driver:
             # Зберігаємо seen_tweets перед закриттям
-            self.save_seen_tweets()
-            self.driver.quit()
+            await self.run_blocking(self.save_seen_tweets)
+            await self.run_blocking(self.driver.quit)
             logger.info("Selenium драйвер закрито")
             
     def add_account(self, username: str) -> bool:
@@ -236,13 +246,13 @@ class SeleniumTwitterMonitor:
             url = f"https://x.com/{clean_username}"
             
             logger.info(f"Відкриваємо профіль: {url}")
-            self.driver.get(url)
+            await self.run_blocking(self.driver.get, url)
             
             # Чекаємо завантаження сторінки
             await asyncio.sleep(5)
             
             # Отримуємо твіти
-            tweets = self._extract_tweets_from_page(clean_username)
+            tweets = await self.run_blocking(self._extract_tweets_from_page, clean_username)
             logger.info(f"Знайдено {len(tweets)} твітів для {clean_username}")
             
             # Для кожного твіта з зображеннями відкриваємо його окремо для кращого витягування фото
@@ -272,19 +282,14 @@ class SeleniumTwitterMonitor:
             logger.debug(f"Відкриваємо твіт для витягування фото: {tweet_url}")
             
             # Відкриваємо твіт в новій вкладці
-            self.driver.execute_script("window.open('');")
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            
-            # Переходимо на сторінку твіта
-            self.driver.get(tweet_url)
+            await self.run_blocking(self._open_in_new_tab, tweet_url)
             await asyncio.sleep(3)  # Чекаємо завантаження
             
             # Шукаємо зображення в відкритому твіті
-            images = self._extract_images_from_opened_tweet()
+            images = await self.run_blocking(self._extract_images_from_opened_tweet)
             
             # Закриваємо вкладку та повертаємося до основної
-            self.driver.close()
-            self.driver.switch_to.window(self.driver.window_handles[0])
+            await self.run_blocking(self._close_extra_tabs)
             
             # Додаємо зображення до твіта
             if images:
@@ -297,13 +302,23 @@ class SeleniumTwitterMonitor:
             logger.debug(f"Помилка відкриття твіта для витягування фото: {e}")
             # Повертаємося до основної вкладки якщо щось пішло не так
             try:
-                if len(self.driver.window_handles) > 1:
-                    self.driver.close()
-                    self.driver.switch_to.window(self.driver.window_handles[0])
+                await self.run_blocking(self._close_extra_tabs)
             except:
                 pass
             return tweet
     
+    def _open_in_new_tab(self, url: str) -> None:
+        """Відкрити URL в новій вкладці"""
+        self.driver.execute_script("window.open('');")
+        self.driver.switch_to.window(self.driver.window_handles[-1])
+        self.driver.get(url)
+    
+    def _close_extra_tabs(self) -> None:
+        """Закрити додаткову вкладку і повернутися до основної"""
+        if len(self.driver.window_handles) > 1:
+            self.driver.close()
+            self.driver.switch_to.window(self.driver.window_handles[0])
+    
     def _extract_images_from_opened_tweet(self) -> List[str]:
         """Витягти зображення з відкритого твіта"""
         images = []
@@ -594,7 +609,7 @@ class SeleniumTwitterMonitor:
         """Перевірити нові твіти для всіх акаунтів"""
         if not self.driver:
             logger.warning("Selenium драйвер не ініціалізовано, спробуємо ініціалізувати...")
-            if not self._setup_driver(headless=True):
+            if not await self.run_blocking(self._setup_driver, headless=True):
                 logger.error("Не вдалося ініціалізувати Selenium драйвер")
                 return []
             
@@ -648,87 +663,18 @@ class SeleniumTwitterMonitor:
         
         # Зберігаємо оброблені твіти після кожної перевірки
         if new_tweets:
-            self.save_seen_tweets()
+            await self.run_blocking(self.save_seen_tweets)
                 
         return new_tweets
     
     def format_tweet_notification(self, tweet: Dict) -> str:
         """Форматувати сповіщення про твіт"""
         try:
-            username = tweet.get('user', {}).get('screen_name', 'unknown')
-            name = tweet.get('user', {}).get('name', username)
-            tweet_id = tweet.get('id', '')
-            url = tweet.get('url', f"https://twitter.com/{username}/status/{tweet_id}")
-            created_at = tweet.get('created_at', '')
-            text = tweet.get('text', '')
-            images = tweet.get('images', [])
-            
-            # Форматуємо дату
-            try:
-                from datetime import datetime
-                if created_at:
-                    dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    formatted_date = dt.strftime("%d %B, %H:%M UTC")
-                    time_ago = self._get_time_ago(dt)
-                else:
-                    formatted_date = "Не відомо"
-                    time_ago = ""
-            except:
-                formatted_date = created_at
-                time_ago = ""
-            
-            # Обрізаємо текст якщо він занадто довгий
-            if len(text) > 200:
-                text = text[:200] + "..."
-            
-            notification = f"""🐦 **Новий твіт з Twitter**
-• Профіль: @{username}
-• Автор: {name}
-• Дата: {formatted_date} ({time_ago})
-• Текст: {text}
-🔗 [Перейти до твіта]({url})"""
-            
-            # Додаємо інформацію про зображення якщо є
-            if images:
-                notification += f"\n📷 Зображень: {len(images)}"
-            
-            return notification
-            
+            return render_selenium_tweet(tweet)
         except Exception as e:
             logger.error(f"Помилка форматування сповіщення: {e}")
             return f"🐦 Новий твіт з Twitter: {tweet.get('text', 'Помилка форматування')}"
     
-    def _get_time_ago(self, dt: datetime) -> str:
-        """Отримати час тому"""
-        try:
-            from datetime import datetime, timezone
-            now = datetime.now(timezone.utc)
-            
-            # Переконуємося що dt має timezone
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            
-            diff = now - dt
-            
-            total_seconds = int(diff.total_seconds())
-            
-            if total_seconds < 0:
-                return "щойно"
-            elif total_seconds < 60:
-                return f"{total_seconds} секунд тому"
-            elif total_seconds < 3600:
-                minutes = total_seconds // 60
-                return f"{minutes} хвилин тому"
-            elif total_seconds < 86400:
-                hours = total_seconds // 3600
-                return f"{hours} годин тому"
-            else:
-                days = total_seconds // 86400
-                return f"{days} днів тому"
-        except Exception as e:
-            logger.error(f"Помилка обчислення часу: {e}")
-            return ""
-    
     def open_manual_auth(self):
         """Відкрити браузер для ручної авторизації"""
         # Якщо драйвер відсутній або запущений у headless, переініціалізуємо видимий
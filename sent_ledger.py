@@ -0,0 +1,107 @@
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+ChannelKey = Tuple[str, str]  # (user_id, channel_id)
+
+
+class SentLedger:
+    """Журнал відправлених повідомлень: перевірка за ключем за O(1), старіння цілими часовими кошиками"""
+
+    def __init__(self, bucket_seconds: int = 900, keep_per_channel: int = 500):
+        self.bucket_seconds = bucket_seconds
+        self.keep_per_channel = keep_per_channel
+        # (user_id, channel_id) -> message_id -> початок кошика; порядок - від старіших до новіших
+        self.channels: Dict[ChannelKey, "OrderedDict[str, int]"] = {}
+        # початок кошика -> ключі, додані в цьому кошику (записи, витіснені раніше, пропускаються при старінні)
+        self.buckets: Dict[int, List[Tuple[str, str, str]]] = {}
+        self._size = 0
+
+    def bucket_start(self, timestamp: float) -> int:
+        """Початок кошика (unix time) для моменту часу"""
+        return int(timestamp // self.bucket_seconds) * self.bucket_seconds
+
+    def __len__(self) -> int:
+        return self._size
+
+    def contains(self, user_id: str, channel_id: str, message_id: str) -> bool:
+        """Чи повідомлення вже відправлялося в канал"""
+        messages = self.channels.get((user_id, channel_id))
+        return messages is not None and message_id in messages
+
+    def add(self, user_id: str, channel_id: str, message_id: str, timestamp: Optional[float] = None) -> int:
+        """Записати відправлене повідомлення; повертає початок кошика"""
+        bucket = self.bucket_start(time.time() if timestamp is None else timestamp)
+        messages = self.channels.setdefault((user_id, channel_id), OrderedDict())
+        if message_id in messages:
+            messages.move_to_end(message_id)
+        else:
+            self._size += 1
+        messages[message_id] = bucket
+        self.buckets.setdefault(bucket, []).append((user_id, channel_id, message_id))
+
+        # Обмежуємо кількість збережених повідомлень на канал
+        while len(messages) > self.keep_per_channel:
+            messages.popitem(last=False)
+            self._size -= 1
+        return bucket
+
+    def expire(self, max_age_seconds: float, now: Optional[float] = None) -> Tuple[int, int]:
+        """Видалити кошики, що повністю старші за max_age_seconds.
+
+        Повертає (кількість видалених записів, межа) - кошики з початком менше
+        межі видалено, тож сховище може видалити ті самі рядки за bucket < межа.
+        """
+        cutoff = self.bucket_start((time.time() if now is None else now) - max_age_seconds)
+        removed = 0
+        for bucket in [bucket for bucket in self.buckets if bucket < cutoff]:
+            for user_id, channel_id, message_id in self.buckets.pop(bucket):
+                messages = self.channels.get((user_id, channel_id))
+                # Запис міг бути витіснений або доданий повторно в новіший кошик
+                if messages is not None and messages.get(message_id) == bucket:
+                    del messages[message_id]
+                    removed += 1
+                    if not messages:
+                        del self.channels[(user_id, channel_id)]
+        self._size -= removed
+        return removed, cutoff
+
+    def clear(self) -> None:
+        """Очистити журнал"""
+        self.channels.clear()
+        self.buckets.clear()
+        self._size = 0
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, List[str]]]]:
+        """Компактна форма для збереження: user_id -> channel_id -> початок кошика -> [message_id]"""
+        result: Dict[str, Dict[str, Dict[str, List[str]]]] = {}
+        for (user_id, channel_id), messages in self.channels.items():
+            channel = result.setdefault(user_id, {}).setdefault(channel_id, {})
+            for message_id, bucket in messages.items():
+                channel.setdefault(str(bucket), []).append(message_id)
+        return result
+
+    def load_dict(self, data: Dict[str, Dict[str, Dict[str, List[str]]]]) -> None:
+        """Відновити журнал з компактної форми"""
+        self.clear()
+        for user_id, channels in data.items():
+            for channel_id, buckets in channels.items():
+                for bucket in sorted(buckets, key=int):
+                    for message_id in buckets[bucket]:
+                        self.add(user_id, channel_id, message_id, int(bucket))
+
+    def import_legacy(self, sent_messages: Dict[str, Dict[str, List[Dict]]]) -> None:
+        """Перенести старий формат settings.sent_messages ([{message_id, timestamp ISO}])"""
+        for user_id, channels in sent_messages.items():
+            for channel_id, messages in channels.items():
+                for message in messages:
+                    try:
+                        timestamp = datetime.fromisoformat(message['timestamp']).timestamp()
+                    except (KeyError, TypeError, ValueError):
+                        timestamp = None
+                    self.add(user_id, channel_id, str(message.get('message_id')), timestamp)
+
+    def get_stats(self) -> Dict:
+        """Статистика журналу"""
+        return {'entries': self._size, 'channels': len(self.channels), 'buckets': len(self.buckets)}
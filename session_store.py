@@ -0,0 +1,96 @@
+import heapq
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class SessionStore:
+    """Сесії користувачів: словник строків дії + min-heap для закінчення без перебору всіх сесій"""
+
+    def __init__(self, timeout_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.timeout_seconds = timeout_seconds
+        self.clock = clock
+        # user_id -> [строк дії, тайм-аут сесії]; продовження активністю лише змінює строк
+        self._sessions: Dict[int, List[float]] = {}
+        # (строк дії на момент постановки, user_id); дійсний лише запис, збережений у _queued
+        self._heap: List[Tuple[float, int]] = []
+        self._queued: Dict[int, float] = {}
+        self._listeners: List[Callable[[List[int]], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._sessions
+
+    def add_expiry_listener(self, callback: Callable[[List[int]], None]) -> None:
+        """Підписатися на список користувачів, чиї сесії закінчилися при expire()"""
+        self._listeners.append(callback)
+
+    def start(self, user_id: int, timeout_seconds: Optional[float] = None) -> None:
+        """Почати (або перезапустити) сесію користувача"""
+        timeout = self.timeout_seconds if timeout_seconds is None else timeout_seconds
+        deadline = self.clock() + timeout
+        self._sessions[user_id] = [deadline, timeout]
+        queued = self._queued.get(user_id)
+        # Запис у купі зі строком не пізніше нового вже розбудить перевірку вчасно
+        if queued is None or deadline < queued:
+            heapq.heappush(self._heap, (deadline, user_id))
+            self._queued[user_id] = deadline
+
+    def touch(self, user_id: int) -> bool:
+        """Продовжити сесію після активності (O(1): запис у купі переставляється лише при закінченні)"""
+        session = self._sessions.get(user_id)
+        if session is None:
+            return False
+        session[0] = self.clock() + session[1]
+        return True
+
+    def end(self, user_id: int) -> bool:
+        """Завершити сесію (запис у купі буде пропущено при закінченні)"""
+        return self._sessions.pop(user_id, None) is not None
+
+    def is_active(self, user_id: int) -> bool:
+        """Чи є в користувача дійсна сесія"""
+        session = self._sessions.get(user_id)
+        return session is not None and self.clock() <= session[0]
+
+    def time_left(self, user_id: int) -> float:
+        """Секунд до закінчення сесії (0 - сесії немає)"""
+        session = self._sessions.get(user_id)
+        if session is None:
+            return 0
+        return max(0.0, session[0] - self.clock())
+
+    def expire(self) -> List[int]:
+        """Завершити прострочені сесії; O(log n) на кожну прострочену або продовжену сесію"""
+        now = self.clock()
+        expired = []
+        while self._heap and self._heap[0][0] < now:
+            deadline, user_id = heapq.heappop(self._heap)
+            if self._queued.get(user_id) != deadline:
+                continue  # застарілий запис, замінений ранішим
+            del self._queued[user_id]
+            session = self._sessions.get(user_id)
+            if session is None:
+                continue
+            if session[0] >= now:
+                # Сесію продовжено після постановки в купу - ставимо з новим строком
+                heapq.heappush(self._heap, (session[0], user_id))
+                self._queued[user_id] = session[0]
+                continue
+            del self._sessions[user_id]
+            expired.append(user_id)
+        if expired:
+            for callback in self._listeners:
+                callback(expired)
+        return expired
+
+    def clear(self) -> None:
+        """Завершити всі сесії"""
+        self._sessions.clear()
+        self._heap.clear()
+        self._queued.clear()
+
+    def get_stats(self) -> Dict:
+        """Статистика сесій"""
+        return {'sessions': len(self._sessions), 'heap_entries': len(self._heap)}
@@ -0,0 +1,100 @@
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from url_utils import extract_discord_channel_id, extract_twitter_username, normalize_twitter_username
+
+
+class SubscriptionIndex:
+    """Інвертований індекс підписок: джерело -> користувачі, що його відстежують"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        # channel_id -> {user_id: [назви проектів]}; порядок = порядок додавання
+        self.discord: Dict[str, Dict[int, List[str]]] = {}
+        # username (lower) -> {user_id: [назви проектів]}
+        self.twitter: Dict[str, Dict[int, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _source(project: Dict) -> Tuple[Optional[str], str]:
+        """Платформа і ключ джерела проекту"""
+        platform = project.get('platform')
+        url = project.get('url', '') or ''
+        if platform == 'discord':
+            return platform, extract_discord_channel_id(url)
+        if platform == 'twitter':
+            return platform, normalize_twitter_username(extract_twitter_username(url))
+        return None, ''
+
+    def rebuild(self, projects: Dict[str, List[Dict]]) -> None:
+        """Перебудувати індекс з усіх проектів (user_id -> projects)"""
+        with self._lock:
+            self.discord = {}
+            self.twitter = {}
+            for user_id_str, user_projects in projects.items():
+                try:
+                    user_id = int(user_id_str)
+                except (TypeError, ValueError):
+                    continue
+                for project in user_projects:
+                    self._add(user_id, project)
+        self.logger.info(f"Індекс підписок: {len(self.discord)} Discord каналів, {len(self.twitter)} Twitter акаунтів")
+
+    def add(self, user_id: int, project: Dict) -> None:
+        """Додати проект користувача в індекс"""
+        with self._lock:
+            self._add(int(user_id), project)
+
+    def remove(self, user_id: int, project: Dict) -> None:
+        """Видалити проект користувача з індексу"""
+        platform, key = self._source(project)
+        if not key:
+            return
+        index = self.discord if platform == 'discord' else self.twitter
+        user_id = int(user_id)
+        with self._lock:
+            names = index.get(key, {}).get(user_id)
+            if not names:
+                return
+            name = project.get('name', '')
+            names.remove(name if name in names else names[0])
+            if not names:
+                del index[key][user_id]
+                if not index[key]:
+                    del index[key]
+
+    def _add(self, user_id: int, project: Dict) -> None:
+        platform, key = self._source(project)
+        if not key:
+            return
+        index = self.discord if platform == 'discord' else self.twitter
+        index.setdefault(key, {}).setdefault(user_id, []).append(project.get('name', ''))
+
+    def discord_subscribers(self, channel_id: str) -> List[int]:
+        """Користувачі, що відстежують Discord канал"""
+        with self._lock:
+            return list(self.discord.get((channel_id or '').strip(), {}))
+
+    def twitter_subscribers(self, username: str) -> List[int]:
+        """Користувачі, що відстежують Twitter акаунт"""
+        with self._lock:
+            return list(self.twitter.get(normalize_twitter_username(username), {}))
+
+    def discord_project_name(self, channel_id: str) -> Optional[str]:
+        """Назва першого проекту з цим Discord каналом"""
+        with self._lock:
+            subscribers = self.discord.get(channel_id)
+            if not subscribers:
+                return None
+            return next(iter(subscribers.values()))[0] or 'Discord'
+
+    def get_stats(self) -> Dict:
+        """Статистика індексу"""
+        with self._lock:
+            return {
+                'discord_channels': len(self.discord),
+                'twitter_accounts': len(self.twitter),
+                'subscriptions': sum(len(names) for index in (self.discord, self.twitter)
+                                     for subscribers in index.values() for names in subscribers.values()),
+            }
@@ -0,0 +1,533 @@
+import asyncio
+import concurrent.futures
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional
+
+import aiohttp
+
+import http_client
+from media_cache import normalize_url
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+# Заголовки для завантаження зображень (Twitter CDN віддає медіа тільки з Referer)
+IMAGE_DOWNLOAD_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Referer': 'https://x.com/'
+}
+
+MAX_PHOTO_SIZE = 20 * 1024 * 1024  # Telegram обмежує фото до 20MB
+MAX_MEDIA_GROUP = 10  # Telegram приймає до 10 елементів в одному альбомі
+MAX_CAPTION_LENGTH = 1024  # Максимальна довжина підпису до медіа
+FILE_ID_CACHE_SIZE = 1000  # Скільки file_id відправлених фото пам'ятати
+DOWNLOAD_FAILED = "download failed"  # Початок помилки кроку, медіа якого не завантажились
+
+
+def caption_length(text: str) -> int:
+    """Довжина тексту так, як її рахує Telegram (UTF-16 code units: емодзі - 2)"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def clip_caption(text: str, limit: int = MAX_CAPTION_LENGTH) -> str:
+    """Обрізати підпис до limit одиниць UTF-16, не розриваючи сурогатну пару"""
+    encoded = text.encode('utf-16-le')
+    if len(encoded) <= limit * 2:
+        return text
+    return encoded[:limit * 2].decode('utf-16-le', errors='ignore')
+
+
+def is_group_chat(chat_id) -> bool:
+    """Групи та канали мають від'ємні ID або @username"""
+    chat = str(chat_id)
+    return chat.startswith('-') or chat.startswith('@')
+
+
+def normalize_image_url(image_url: str) -> str:
+    """Для зображень Twitter запитуємо jpg середнього розміру"""
+    if 'pbs.twimg.com/media/' in image_url and '?' not in image_url:
+        image_url += '?format=jpg&name=medium'
+    return image_url
+
+
+class TelegramDeliveryEngine:
+    """Асинхронна черга доставки в Telegram з пулом воркерів і лімітами швидкості"""
+
+    def __init__(self, bot_token: str, workers: int = 4, global_rate: float = 30,
+                 group_interval: float = 3.0, private_interval: float = 1.0, max_retries: int = 5,
+                 api_url: str = TELEGRAM_API_URL, media_cache=None):
+        self.bot_token = bot_token
+        self.workers_count = workers
+        self.global_rate = global_rate
+        self.group_interval = group_interval
+        self.private_interval = private_interval
+        self.max_retries = max_retries
+        self.api_url = api_url
+        self.media_cache = media_cache  # MediaCache: одне завантаження на всі цільові канали
+        self.logger = logging.getLogger(__name__)
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._workers: List[asyncio.Task] = []
+        self._ready: Optional[asyncio.Queue] = None
+        self._chat_queues: Dict[str, deque] = {}  # chat_id -> черга доставок (порядок у чаті)
+        self._scheduled: set = set()  # чати, що вже в ready черзі або в роботі
+        self._next_allowed: Dict[str, float] = {}  # chat_id -> найближчий дозволений час
+        self._pending: List[Dict] = []  # доставки, додані до запуску
+        self.file_ids: "OrderedDict[str, str]" = OrderedDict()  # нормалізований URL -> file_id Telegram
+        self._lock = threading.Lock()
+        # Token bucket для глобального ліміту
+        self._tokens = float(global_rate)
+        self._refilled_at = time.monotonic()
+        self.stats = {'queued': 0, 'delivered': 0, 'failed': 0, 'retried': 0, 'rate_limited': 0, 'api_calls': 0,
+                      'file_id_reused': 0}
+
+    # ---- Публічний API ----
+
+    async def start(self) -> None:
+        """Запустити воркери на поточному event loop"""
+        if self.loop is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self._ready = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker(i), name=f"telegram-delivery-{i}")
+                         for i in range(self.workers_count)]
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for delivery in pending:
+            self._add(delivery)
+        self.logger.info(f"📮 Доставка в Telegram запущена: {self.workers_count} воркерів, {len(pending)} відкладених")
+
+    async def stop(self, timeout: float = 10) -> None:
+        """Дочекатися черги (з таймаутом) і зупинити воркери"""
+        if self.loop is None:
+            return
+        deadline = time.monotonic() + timeout
+        while self._scheduled and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self.loop = None
+        self.logger.info("📮 Доставка в Telegram зупинена")
+
+    def is_running(self) -> bool:
+        """Чи запущені воркери"""
+        return self.loop is not None and bool(self._workers)
+
+    def enqueue(self, chat_id, steps: List[Dict], on_delivered: Optional[Callable] = None) -> concurrent.futures.Future:
+        """Додати доставку з кількох кроків (текст, фото...) в чергу чату; потокобезпечно.
+
+        Кожен крок - {'method': 'sendMessage', 'data': {...}, 'media': {'photo': url}}
+        або альбом з media_steps(). Якщо перший крок не вдався і має 'fallback' -
+        відправляється fallback, інакше решта кроків не відправляється.
+        on_delivered(result) викликається після успішного першого кроку.
+        """
+        delivery = self._new_delivery(chat_id, steps, on_delivered)
+        self._submit(delivery)
+        return delivery['future']
+
+    def fan_out(self, chat_ids: List, build_steps: Callable, on_delivered: Optional[Callable] = None) -> List[concurrent.futures.Future]:
+        """Розіслати одну подію в кілька чатів; потокобезпечно.
+
+        Перший чат отримує повну відправку (build_steps(chat_id)), решта - копії через
+        copyMessage і file_id вже завантажених фото, без повторного завантаження.
+        Якщо перша доставка не вдалася - решта чатів отримують повну відправку.
+        on_delivered(chat_id, result) викликається для кожного чату.
+        """
+        chat_ids = list(chat_ids)
+        if not chat_ids:
+            return []
+
+        def bind(chat_id):
+            if on_delivered is None:
+                return None
+            return lambda result: on_delivered(chat_id, result)
+
+        primary = self._new_delivery(chat_ids[0], build_steps(chat_ids[0]), bind(chat_ids[0]))
+        followers = [(chat_id, concurrent.futures.Future()) for chat_id in chat_ids[1:]]
+
+        def on_primary_done(future: concurrent.futures.Future) -> None:
+            sent = future.exception() is None
+            for chat_id, follower in followers:
+                try:
+                    if sent:
+                        steps = [self.reuse_step(step, result, chat_id)
+                                 for step, result in zip(primary['steps'], primary['results'])]
+                    else:
+                        steps = build_steps(chat_id)
+                    self._submit(self._new_delivery(chat_id, steps, bind(chat_id), follower))
+                except Exception as e:
+                    follower.set_exception(e)
+
+        if followers:
+            primary['future'].add_done_callback(on_primary_done)
+        self._submit(primary)
+        return [primary['future']] + [follower for _, follower in followers]
+
+    def send_message(self, chat_id, text: str, on_delivered: Optional[Callable] = None, **params) -> concurrent.futures.Future:
+        """Поставити в чергу текстове повідомлення"""
+        return self.enqueue(chat_id, [self.message_step(chat_id, text, **params)], on_delivered)
+
+    @staticmethod
+    def message_step(chat_id, text: str, **params) -> Dict:
+        """Крок sendMessage"""
+        return {'method': 'sendMessage', 'data': {'chat_id': chat_id, 'text': text, **params}}
+
+    @staticmethod
+    def photo_step(chat_id, image_url: str, caption: str = "") -> Dict:
+        """Крок sendPhoto з завантаженням зображення за URL"""
+        return {
+            'method': 'sendPhoto',
+            'data': {'chat_id': chat_id, 'caption': clip_caption(caption) if caption else ''},
+            'media': {'photo': normalize_image_url(image_url)},
+        }
+
+    @classmethod
+    def media_steps(cls, chat_id, image_urls: List[str], caption: str = "") -> List[Dict]:
+        """Кроки відправки зображень альбомами sendMediaGroup по 10; підпис - на першому елементі"""
+        urls = [normalize_image_url(url) for url in image_urls]
+        steps = []
+        for start in range(0, len(urls), MAX_MEDIA_GROUP):
+            chunk = urls[start:start + MAX_MEDIA_GROUP]
+            chunk_caption = clip_caption(caption) if caption and start == 0 else ''
+            if len(chunk) == 1:
+                # Альбом має містити щонайменше 2 елементи
+                steps.append(cls.photo_step(chat_id, chunk[0], chunk_caption))
+            else:
+                steps.append({
+                    'method': 'sendMediaGroup',
+                    'data': {'chat_id': chat_id},
+                    'media_group': chunk,
+                    'caption': chunk_caption,
+                })
+        return steps
+
+    def reuse_step(self, step: Dict, result, chat_id) -> Dict:
+        """Крок для іншого чату на основі вже відправленого: copyMessage або ті самі медіа (з file_id)"""
+        if result is None or step['method'] == 'sendMediaGroup' or isinstance(result, list):
+            # Альбом копіюється повторною відправкою: file_id вже в кеші, завантаження не буде
+            reused = {**step, 'data': {**step['data'], 'chat_id': chat_id}}
+            reused.pop('fallback', None)
+            return reused
+        return {
+            'method': 'copyMessage',
+            'data': {'chat_id': chat_id, 'from_chat_id': step['data']['chat_id'], 'message_id': result['message_id']},
+        }
+
+    def get_stats(self) -> Dict:
+        """Статистика доставки"""
+        stats = {
+            **self.stats,
+            'chats_pending': len(self._scheduled),
+            'running': self.is_running(),
+        }
+        if self.media_cache:
+            stats['media_cache'] = self.media_cache.get_stats()
+        return stats
+
+    # ---- Внутрішня логіка (виконується на loop движка) ----
+
+    def _new_delivery(self, chat_id, steps: List[Dict], on_delivered: Optional[Callable],
+                      future: Optional[concurrent.futures.Future] = None) -> Dict:
+        """Створити запис доставки"""
+        return {
+            'chat_id': str(chat_id),
+            'steps': steps,
+            'index': 0,
+            'attempts': 0,
+            'result': None,
+            'results': [],  # результат кожного кроку (None - крок не вдався)
+            'future': future or concurrent.futures.Future(),
+            'on_delivered': on_delivered,
+        }
+
+    def _submit(self, delivery: Dict) -> None:
+        """Передати доставку на loop движка (або відкласти до запуску)"""
+        self.stats['queued'] += 1
+        with self._lock:
+            loop = self.loop
+            if loop is None:
+                self._pending.append(delivery)
+                return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._add(delivery)
+        else:
+            loop.call_soon_threadsafe(self._add, delivery)
+
+    def _add(self, delivery: Dict) -> None:
+        """Додати доставку в чергу чату і запланувати чат"""
+        chat_id = delivery['chat_id']
+        self._chat_queues.setdefault(chat_id, deque()).append(delivery)
+        self._schedule(chat_id)
+
+    def _schedule(self, chat_id: str) -> None:
+        """Поставити чат у ready чергу з урахуванням інтервалу чату"""
+        if chat_id in self._scheduled:
+            return
+        self._scheduled.add(chat_id)
+        delay = self._next_allowed.get(chat_id, 0) - time.monotonic()
+        if delay > 0:
+            self.loop.call_later(delay, self._ready.put_nowait, chat_id)
+        else:
+            self._ready.put_nowait(chat_id)
+
+    async def _acquire_global(self) -> None:
+        """Глобальний ліміт повідомлень на секунду"""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.global_rate, self._tokens + (now - self._refilled_at) * self.global_rate)
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.global_rate)
+
+    async def _worker(self, number: int) -> None:
+        """Воркер: бере чат, відправляє один крок, планує чат знову"""
+        while True:
+            chat_id = await self._ready.get()
+            try:
+                await self._process_chat(chat_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Помилка воркера доставки {number}: {e}")
+                self._finish_chat(chat_id)
+
+    async def _process_chat(self, chat_id: str) -> None:
+        """Відправити наступний крок першої доставки чату"""
+        queue = self._chat_queues.get(chat_id)
+        if not queue:
+            self._finish_chat(chat_id)
+            return
+
+        delivery = queue[0]
+        step = delivery['steps'][delivery['index']]
+        await self._acquire_global()
+        ok, result, retry_after = await self._call(step)
+
+        interval = self.group_interval if is_group_chat(chat_id) else self.private_interval
+        self._next_allowed[chat_id] = time.monotonic() + max(interval, retry_after or 0)
+
+        if ok:
+            self._step_done(delivery, result)
+        elif retry_after is None and step.get('media_group') and not str(result).startswith(DOWNLOAD_FAILED):
+            # Telegram відхилив альбом - відправляємо фото по одному, щоб не втратити зображення
+            self.logger.warning(f"⚠️ sendMediaGroup в {chat_id} не вдався ({result}), "
+                                f"відправляємо {len(step['media_group'])} фото окремо")
+            singles = [self.photo_step(step['data']['chat_id'], url, step.get('caption', '') if i == 0 else '')
+                       for i, url in enumerate(step['media_group'])]
+            if step.get('fallback'):
+                singles[0]['fallback'] = step['fallback']
+            delivery['steps'][delivery['index']:delivery['index'] + 1] = singles
+            delivery['attempts'] = 0
+        elif retry_after is None and step.get('fallback'):
+            # Медіа не вдалося відправити - відправляємо запасний крок (наприклад, лише текст)
+            self.logger.warning(f"⚠️ {step['method']} в {chat_id} не вдався ({result}), відправляємо fallback")
+            delivery['steps'][delivery['index']] = step['fallback']
+            delivery['attempts'] = 0
+        elif retry_after is not None and delivery['attempts'] < self.max_retries:
+            # 429 або тимчасова помилка - повторюємо той самий крок після паузи
+            delivery['attempts'] += 1
+            self.stats['retried'] += 1
+        else:
+            self._step_failed(delivery, result)
+
+        if delivery['future'].done():
+            queue.popleft()
+        self._finish_chat(chat_id)
+
+    def _step_done(self, delivery: Dict, result, failed: bool = False) -> None:
+        """Крок завершено - перейти до наступного або завершити доставку"""
+        delivery['results'].append(None if failed else result)
+        if delivery['index'] == 0:
+            delivery['result'] = result
+            if delivery['on_delivered']:
+                try:
+                    delivery['on_delivered'](result)
+                except Exception as e:
+                    self.logger.error(f"Помилка callback доставки: {e}")
+        delivery['index'] += 1
+        delivery['attempts'] = 0
+        if delivery['index'] >= len(delivery['steps']):
+            self.stats['delivered'] += 1
+            delivery['future'].set_result(delivery['result'])
+
+    def _step_failed(self, delivery: Dict, error) -> None:
+        """Крок не вдався остаточно"""
+        if delivery['index'] == 0:
+            # Основне повідомлення не відправлено - решту кроків не надсилаємо
+            self.stats['failed'] += 1
+            delivery['future'].set_exception(RuntimeError(f"Telegram delivery failed: {error}"))
+            return
+        # Додаткові кроки (фото) не критичні
+        self.logger.warning(f"⚠️ Не вдалося відправити {delivery['steps'][delivery['index']]['method']} в {delivery['chat_id']}: {error}")
+        self._step_done(delivery, delivery['result'], failed=True)
+
+    def _finish_chat(self, chat_id: str) -> None:
+        """Зняти чат з обробки і запланувати знову, якщо черга не порожня"""
+        self._scheduled.discard(chat_id)
+        if self._chat_queues.get(chat_id):
+            self._schedule(chat_id)
+        else:
+            self._chat_queues.pop(chat_id, None)
+
+    async def _call(self, step: Dict):
+        """Виконати виклик Bot API; повертає (ok, result|error, retry_after)"""
+        try:
+            method, payload, media_urls = await self._prepare(step)
+            if method is None:
+                return False, payload, None
+            url = f"{self.api_url}/bot{self.bot_token}/{method}"
+            if isinstance(payload, aiohttp.FormData):
+                response = await http_client.request('POST', url, data=payload, retries=0)
+            else:
+                response = await http_client.request('POST', url, json=payload, retries=0)
+            self.stats['api_calls'] += 1
+
+            try:
+                body = await response.json(content_type=None)
+            except Exception:
+                body = {}
+
+            if response.status == 200 and body.get('ok', True):
+                self._remember_file_ids(media_urls, body.get('result'))
+                return True, body.get('result'), None
+            if response.status == 429:
+                self.stats['rate_limited'] += 1
+                retry_after = float((body.get('parameters') or {}).get('retry_after', 1))
+                self.logger.warning(f"⏳ Telegram 429, retry_after={retry_after} с")
+                return False, body.get('description', 'Too Many Requests'), retry_after
+            if response.status >= 500:
+                return False, f"HTTP {response.status}", 1.0
+            return False, body.get('description', f"HTTP {response.status}"), None
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return False, str(e), 1.0
+
+    async def _prepare(self, step: Dict):
+        """Підготувати виклик; повертає (method, payload, media_urls) або (None, error, [])"""
+        if step.get('media_group'):
+            return await self._build_media_group(step)
+        if not step.get('media'):
+            return step['method'], step['data'], []
+
+        field, media_url = next(iter(step['media'].items()))
+        file_id = self._cached_file_id(media_url)
+        if file_id:
+            # Фото вже є на серверах Telegram - без завантаження
+            return step['method'], {**step['data'], field: file_id}, [media_url]
+
+        content, content_type = await self._download(media_url)
+        if content is None:
+            return None, f"{DOWNLOAD_FAILED}: {media_url}", []
+        payload = aiohttp.FormData()
+        for key, value in step['data'].items():
+            payload.add_field(key, str(value))
+        payload.add_field(field, content, filename=f"{field}.jpg", content_type=content_type)
+        return step['method'], payload, [media_url]
+
+    async def _build_media_group(self, step: Dict):
+        """Зібрати multipart для альбому; медіа з відомим file_id не завантажуються"""
+        items = []  # (url, file_id | (bytes, content_type))
+        for media_url in step['media_group']:
+            file_id = self._cached_file_id(media_url)
+            if file_id:
+                items.append((media_url, file_id))
+                continue
+            content, content_type = await self._download(media_url)
+            if content is not None:
+                items.append((media_url, (content, content_type)))
+        if not items:
+            return None, f"{DOWNLOAD_FAILED}: all media", []
+        if len(items) < len(step['media_group']):
+            dropped = [url for url in step['media_group'] if url not in {media_url for media_url, _ in items}]
+            self.logger.warning(f"⚠️ Альбом в {step['data']['chat_id']} без {len(dropped)} зображень, "
+                                f"що не завантажились: {', '.join(dropped)}")
+
+        payload = aiohttp.FormData()
+        for key, value in step['data'].items():
+            payload.add_field(key, str(value))
+
+        if len(items) == 1:
+            # Решта зображень не завантажилась - альбом з одного елемента неможливий
+            media_url, source = items[0]
+            if step.get('caption'):
+                payload.add_field('caption', step['caption'])
+            if isinstance(source, str):
+                payload.add_field('photo', source)
+            else:
+                payload.add_field('photo', source[0], filename="photo.jpg", content_type=source[1])
+            return 'sendPhoto', payload, [media_url]
+
+        media = []
+        for i, (media_url, source) in enumerate(items):
+            if isinstance(source, str):
+                media.append({'type': 'photo', 'media': source})
+                continue
+            name = f"photo{i}"
+            media.append({'type': 'photo', 'media': f"attach://{name}"})
+            payload.add_field(name, source[0], filename=f"{name}.jpg", content_type=source[1])
+        if step.get('caption'):
+            media[0]['caption'] = step['caption']
+        payload.add_field('media', json.dumps(media, ensure_ascii=False))
+        return 'sendMediaGroup', payload, [media_url for media_url, _ in items]
+
+    def _cached_file_id(self, media_url: str) -> Optional[str]:
+        """file_id фото, вже відправленого в Telegram"""
+        key = normalize_url(media_url)
+        file_id = self.file_ids.get(key)
+        if file_id:
+            self.file_ids.move_to_end(key)
+            self.stats['file_id_reused'] += 1
+        return file_id
+
+    def _remember_file_ids(self, media_urls: List[str], result) -> None:
+        """Запам'ятати file_id відправлених фото (найбільший розмір)"""
+        if not media_urls:
+            return
+        messages = result if isinstance(result, list) else [result]
+        for media_url, message in zip(media_urls, messages):
+            photo = message.get('photo') if isinstance(message, dict) else None
+            if photo:
+                self.file_ids[normalize_url(media_url)] = photo[-1]['file_id']
+        while len(self.file_ids) > FILE_ID_CACHE_SIZE:
+            self.file_ids.popitem(last=False)
+
+    async def _download(self, media_url: str):
+        """Отримати медіа з кешу або завантажити; повертає (bytes, content_type) або (None, None)"""
+        if self.media_cache is None:
+            return await self._fetch(media_url)
+        try:
+            return await self.media_cache.get(media_url, self._fetch)
+        except Exception as e:
+            self.logger.error(f"Помилка медіа кешу {media_url}: {e}")
+            return None, None
+
+    async def _fetch(self, media_url: str):
+        """Завантажити медіа з мережі; повертає (bytes, content_type) або (None, None)"""
+        try:
+            # Читаємо тіло всередині контексту - після звільнення з'єднання read() недоступний
+            async with http_client.get_session().get(media_url, headers=IMAGE_DOWNLOAD_HEADERS) as response:
+                if response.status != 200:
+                    self.logger.error(f"❌ Помилка завантаження зображення {media_url}: {response.status}")
+                    return None, None
+                content = await response.read()
+            if len(content) > MAX_PHOTO_SIZE:
+                self.logger.warning(f"Зображення занадто велике: {len(content)} байт")
+                return None, None
+            return content, response.headers.get('content-type', 'image/jpeg')
+        except Exception as e:
+            self.logger.error(f"Помилка завантаження зображення {media_url}: {e}")
+            return None, None
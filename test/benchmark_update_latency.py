@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк затримки "оновлення -> обробник" для long polling і webhook на локальному фейковому Bot API
+
+Використання: python test/benchmark_update_latency.py [--updates 200] [--rtt 40]
+--rtt - змодельована мережна затримка до Telegram в мілісекундах (0 - чистий локальний оверхед)
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram import Update
+from telegram.ext import Application, TypeHandler
+
+from webhook_server import SECRET_HEADER, WebhookServer
+
+TOKEN = '123456:BENCHMARK'
+
+
+def make_update(update_id: int) -> dict:
+    return {
+        'update_id': update_id,
+        'callback_query': {
+            'id': str(update_id), 'chat_instance': '1', 'data': 'main_menu',
+            'from': {'id': 42, 'is_bot': False, 'first_name': 'Bench'},
+        },
+    }
+
+
+class FakeTelegram:
+    """Фейковий Bot API: getMe, getUpdates (long poll), setWebhook/deleteWebhook"""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.pending = []
+        self.new_update = asyncio.Event()
+
+    async def handler(self, request):
+        method = request.match_info['method']
+        if method == 'getMe':
+            return web.json_response({'ok': True, 'result': {'id': 123456, 'is_bot': True, 'first_name': 'Bench',
+                                                             'username': 'bench_bot'}})
+        if method == 'getUpdates':
+            data = await request.post() if request.content_type != 'application/json' else await request.json()
+            await asyncio.sleep(self.rtt / 2)  # запит іде до Telegram
+            offset = int(data.get('offset') or 0)
+            self.pending = [u for u in self.pending if u['update_id'] >= offset]
+            if not self.pending:
+                self.new_update.clear()
+                try:
+                    await asyncio.wait_for(self.new_update.wait(), timeout=float(data.get('timeout') or 0) or 0.01)
+                except asyncio.TimeoutError:
+                    pass
+            updates, self.pending = self.pending, []
+            await asyncio.sleep(self.rtt / 2)  # відповідь іде до бота
+            return web.json_response({'ok': True, 'result': updates})
+        return web.json_response({'ok': True, 'result': True})
+
+    def push(self, update: dict) -> None:
+        self.pending.append(update)
+        self.new_update.set()
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post('/bot{token}/{method}', self.handler)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        return f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+def build_application(api_url: str, received: dict) -> Application:
+    application = Application.builder().token(TOKEN).base_url(f"{api_url}/bot").build()
+
+    async def record(update: Update, context) -> None:
+        received[update.update_id].set_result(time.perf_counter())
+
+    application.add_handler(TypeHandler(Update, record))
+    return application
+
+
+async def measure(inject, count: int, rtt: float, received: dict) -> list:
+    """Послідовно подавати оновлення у випадкові моменти і міряти час до обробника"""
+    loop = asyncio.get_running_loop()
+    latencies = []
+    for update_id in range(1, count + 1):
+        # Випадковий момент надходження: оновлення може потрапити в паузу між запитами getUpdates
+        await asyncio.sleep(random.uniform(0, max(rtt, 0.002)))
+        received[update_id] = loop.create_future()
+        started = time.perf_counter()
+        await inject(make_update(update_id))
+        latencies.append(await received[update_id] - started)
+    return latencies
+
+
+async def bench_polling(count: int, rtt: float) -> list:
+    api = FakeTelegram(rtt)
+    received = {}
+    application = build_application(await api.start(), received)
+    await application.initialize()
+    await application.start()
+    await application.updater.start_polling(poll_interval=0, timeout=10)
+
+    async def inject(update):
+        api.push(update)
+
+    try:
+        return await measure(inject, count, rtt, received)
+    finally:
+        await application.updater.stop()
+        await application.stop()
+        await application.shutdown()
+        await api.stop()
+
+
+async def bench_webhook(count: int, rtt: float) -> list:
+    api = FakeTelegram(rtt)
+    received = {}
+    application = build_application(await api.start(), received)
+    server = WebhookServer(application, port=0, path='/hook', secret_token='bench')
+    await application.initialize()
+    await server.start()
+    await application.start()
+    url = f"http://127.0.0.1:{server.port}/hook"
+
+    async with aiohttp.ClientSession() as session:
+        async def inject(update):
+            async def deliver():
+                await asyncio.sleep(rtt / 2)  # Telegram -> бот
+                async with session.post(url, json=update, headers={SECRET_HEADER: 'bench'}) as response:
+                    await response.read()
+            asyncio.create_task(deliver())
+
+        try:
+            return await measure(inject, count, rtt, received)
+        finally:
+            await server.stop()
+            await application.stop()
+            await application.shutdown()
+            await api.stop()
+
+
+def report(name: str, latencies: list) -> None:
+    ms = sorted(value * 1000 for value in latencies)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    print(f"{name:8} середня {statistics.mean(ms):7.2f} мс   p50 {statistics.median(ms):7.2f} мс   "
+          f"p95 {p95:7.2f} мс   макс {ms[-1]:7.2f} мс")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--updates', type=int, default=200)
+    parser.add_argument('--rtt', type=float, default=40, help='мережна затримка до Telegram, мс')
+    args = parser.parse_args()
+    rtt = args.rtt / 1000
+
+    print(f"📊 {args.updates} оновлень, змодельований RTT {args.rtt:.0f} мс")
+    report('polling', asyncio.run(bench_polling(args.updates, rtt)))
+    report('webhook', asyncio.run(bench_webhook(args.updates, rtt)))
+
+
+if __name__ == "__main__":
+    main()
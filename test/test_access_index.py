@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Тест індексів AccessManager і відкладеного атомарного запису access_data.json
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from access_manager import AccessManager
+
+
+def test_index_follows_mutations():
+    """Індекс і маски доступу оновлюються при кожній зміні користувачів"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = AccessManager(os.path.join(tmp, 'access.json'), flush_delay=60,
+                                backup_dir=os.path.join(tmp, 'backups'))
+
+        user_id = manager.add_user(100, 'user', 'pass1')
+        assert manager.add_user(100, 'again') == user_id
+        assert manager.get_user_by_telegram_id(100)['username'] == 'user'
+        assert manager.get_user_by_telegram_id(999) is None
+
+        # Без авторизації дозволів немає
+        assert not manager.check_permission(100, 'can_monitor_twitter')
+        assert manager.authenticate_user(100, 'pass1')
+        assert manager.check_permission(100, 'can_monitor_twitter')
+        assert not manager.check_permission(100, 'can_manage_users')
+        assert not manager.is_admin(100)
+
+        assert manager.set_permission(100, 'can_view_logs', True)
+        assert manager.check_permission(100, 'can_view_logs')
+        assert manager.set_permission(100, 'can_monitor_twitter', False)
+        assert not manager.check_permission(100, 'can_monitor_twitter')
+        assert manager.set_permission(100, 'custom_flag', True)
+        assert manager.check_permission(100, 'custom_flag')
+
+        assert manager.change_user_role(100, 'admin')
+        assert manager.is_admin(100)
+        assert manager.get_user_role(100) == 'admin'
+        assert manager.check_permission(100, 'can_manage_users')
+        assert manager.set_user_role(100, 'user')
+        assert not manager.is_admin(100)
+        assert not manager.check_permission(100, 'can_manage_users')
+
+        assert manager.delete_user(100)
+        assert manager.get_user_by_telegram_id(100) is None
+        assert not manager.is_admin(100)
+        assert not manager.delete_user(100)
+
+        manager.create_admin_user(200, 'boss', 'secret')
+        manager.add_user(300, 'plain')
+        assert manager.is_admin(200)
+        assert manager.reset_system()
+        assert len(os.listdir(os.path.join(tmp, 'backups'))) == 1
+        assert manager.is_admin(200)
+        assert manager.get_user_by_telegram_id(300) is None
+        manager.close()
+
+
+def test_writes_coalesced_and_atomic():
+    """Серія змін дає один запис, файл не змінюється до запису і відновлюється після перезапуску"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, 'access.json')
+        manager = AccessManager(data_file, flush_delay=60)
+        manager.add_user(1, 'a', 'right')
+        flushes = manager.writer.get_stats()['flushes']
+
+        for _ in range(3):
+            manager.authenticate_user(1, 'wrong')
+        for i in range(50):
+            manager.set_permission(1, 'can_view_logs', i % 2 == 0)
+        with open(data_file, encoding='utf-8') as f:
+            assert json.load(f)['users'] == {}  # ще не записано
+        assert manager.writer.dirty
+
+        assert manager.flush()
+        assert manager.writer.get_stats()['flushes'] == flushes + 1
+        assert not os.path.exists(f"{data_file}.tmp")
+        with open(data_file, encoding='utf-8') as f:
+            user = next(iter(json.load(f)['users'].values()))
+        assert user['login_attempts'] == 3
+
+        manager.set_user_role(1, 'admin')
+        manager.close()
+        restored = AccessManager(data_file)
+        assert restored.is_admin(1)
+        assert restored.get_user_by_telegram_id(1)['login_attempts'] == 3
+        restored.close()
+
+
+if __name__ == "__main__":
+    test_index_follows_mutations()
+    test_writes_coalesced_and_atomic()
+    print("✅ Всі тести пройдено")
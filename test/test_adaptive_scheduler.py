@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Тест адаптивного планувальника опитування джерел
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adaptive_scheduler import AdaptivePollScheduler
+from discord_monitor import DiscordMonitor
+
+
+def test_hot_source_speeds_up_and_cold_backs_off():
+    """Активне джерело опитується частіше, тихе - з експоненційним backoff"""
+    scheduler = AdaptivePollScheduler(base_interval=15, min_interval=5, max_interval=120, requests_per_minute=0)
+    assert scheduler.due_sources(['discord:hot', 'discord:cold'], now=0) == ['discord:hot', 'discord:cold']
+
+    # Повідомлення кожні 4 секунди
+    hot = scheduler.record_activity('discord:hot', [100, 104, 108], now=0)
+    assert hot == 5
+
+    cold = [scheduler.record_activity('discord:cold', [], now=t) for t in range(6)]
+    assert cold[0] > 15
+    assert cold == sorted(cold)
+    assert cold[-1] <= 120
+
+    # До наступного опитування тихе джерело не потрапляє в список
+    assert scheduler.due_sources(['discord:hot', 'discord:cold'], now=4) == []
+    assert scheduler.due_sources(['discord:hot', 'discord:cold'], now=6) == ['discord:hot']
+
+
+def test_global_budget_defers_sources():
+    """Глобальний бюджет обмежує кількість перевірок"""
+    scheduler = AdaptivePollScheduler(requests_per_minute=8)  # 2 токени в запасі
+    keys = [f'twitter:user{i}' for i in range(5)]
+    now = scheduler._refilled_at
+    assert len(scheduler.due_sources(keys, now=now)) == 2
+    assert scheduler.stats['deferred'] == 3
+    assert scheduler.seconds_until_next(keys, now=now) > 0
+    # Через 15 секунд бюджет поповнюється на 2 запити
+    assert len(scheduler.due_sources(keys, now=now + 15)) == 2
+
+
+def test_pinned_priority_is_fixed():
+    """Закріплений пріоритет не адаптується і обслуговується першим"""
+    scheduler = AdaptivePollScheduler(base_interval=15, min_interval=5, max_interval=300, requests_per_minute=0)
+    scheduler.load_pins({'discord:vip': 'high', 'discord:spam': 'low', 'discord:bad': 'urgent'})
+    assert scheduler.get_pins() == {'discord:vip': 'high', 'discord:spam': 'low'}
+
+    assert scheduler.due_sources(['discord:spam', 'discord:x', 'discord:vip'], now=0) == ['discord:vip', 'discord:x', 'discord:spam']
+    assert scheduler.record_activity('discord:vip', [], now=0) == 5
+    assert scheduler.record_activity('discord:spam', [1, 2, 3], now=0) == 300
+
+    assert scheduler.unpin('discord:spam')
+    assert scheduler.record_activity('discord:spam', [], now=0) == 22.5
+
+
+def test_discord_monitor_skips_sources_not_due():
+    """Монітор опитує тільки канали, яким настав час"""
+    class EmptySession:
+        def __init__(self):
+            self.urls = []
+
+        def get(self, url, **kwargs):
+            self.urls.append(url)
+
+            class _Response:
+                status = 200
+                headers = {}
+
+                async def json(self):
+                    return []
+
+                async def __aenter__(self):
+                    return self
+
+                async def __aexit__(self, *args):
+                    return False
+
+            return _Response()
+
+    monitor = DiscordMonitor('token', global_rate_limit=0)
+    monitor.scheduler = AdaptivePollScheduler(requests_per_minute=0)
+    monitor.session = EmptySession()
+    for channel_id in ('1', '2'):
+        monitor.add_channel(f'https://discord.com/channels/9/{channel_id}')
+        monitor.last_message_ids[channel_id] = '100'
+
+    asyncio.run(monitor.check_new_messages())
+    assert len(monitor.session.urls) == 2
+    asyncio.run(monitor.check_new_messages())
+    assert len(monitor.session.urls) == 2
+    asyncio.run(monitor.check_new_messages(force=True))
+    assert len(monitor.session.urls) == 4
+    assert 1.0 <= monitor.get_next_poll_delay(15) <= 15
+
+
+if __name__ == "__main__":
+    test_hot_source_speeds_up_and_cold_backs_off()
+    test_global_budget_defers_sources()
+    test_pinned_priority_is_fixed()
+    test_discord_monitor_skips_sources_not_due()
+    print("✅ Всі тести пройдено")
@@ -135,6 +135,7 @@ def test_project_manager():
             print("❌ Проект не додано до користувача")
         
         # Очищуємо тестовий файл
+        project_manager.close()
         try:
             os.remove("test_data.json")
             print("✅ Тестовий файл очищено")
@@ -196,6 +197,7 @@ def test_isolation():
             print("✅ Звичайний користувач не може отримати всі проекти")
         
         # Очищуємо тестовий файл
+        project_manager.close()
         try:
             os.remove("test_isolation.json")
             print("✅ Тестовий файл очищено")
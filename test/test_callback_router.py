@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Тест табличного маршрутизатора callback кнопок
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from callback_router import CallbackRouter
+
+
+class FakeQuery:
+    def __init__(self, data):
+        self.data = data
+        self.answered = 0
+
+    async def answer(self):
+        self.answered += 1
+
+
+def _update(data, user_id=42):
+    return SimpleNamespace(callback_query=FakeQuery(data), effective_user=SimpleNamespace(id=user_id))
+
+
+def test_exact_prefix_and_fallback():
+    """Точний збіг має пріоритет, довший префікс перемагає коротший"""
+    router = CallbackRouter()
+    calls = []
+
+    @router.route("admin_panel", "admin_menu")
+    async def panel(update, context, query, user_id, data):
+        calls.append(('panel', data))
+
+    @router.prefix("admin_")
+    async def admin(update, context, query, user_id, data):
+        calls.append(('admin', data))
+
+    @router.prefix("admin_user_")
+    async def admin_user(update, context, query, user_id, data):
+        calls.append(('admin_user', data[len("admin_user_"):]))
+
+    @router.fallback
+    async def unknown(update, context, query, user_id, data):
+        calls.append(('unknown', data))
+
+    async def run():
+        for data in ("admin_menu", "admin_user_7", "admin_other", "nothing", None):
+            update = _update(data)
+            assert await router.dispatch(update, None)
+            assert update.callback_query.answered == 1
+
+    asyncio.run(run())
+    assert calls == [('panel', 'admin_menu'), ('admin_user', '7'), ('admin', 'admin_other'),
+                     ('unknown', 'nothing'), ('unknown', None)]
+    try:
+        router.route("admin_panel")(panel)
+        assert False, "дублікат маршруту має бути помилкою"
+    except ValueError:
+        pass
+
+
+def test_middleware_and_timing():
+    """Middleware зупиняє обробку; на маршруті можна перевизначити middleware; час фіксується"""
+    router = CallbackRouter(slow_threshold=0.01)
+    seen = []
+    timings = []
+
+    async def only_authorized(update, context, query, user_id):
+        seen.append(user_id)
+        return user_id == 1
+
+    router.use(only_authorized)
+    router.add_timing_hook(lambda route, elapsed: timings.append(route))
+
+    @router.route("slow")
+    async def slow(update, context, query, user_id, data):
+        await asyncio.sleep(0.02)
+
+    @router.route("public", middleware=[])
+    async def public(update, context, query, user_id, data):
+        pass
+
+    async def run():
+        results = [
+            await router.dispatch(_update("slow", user_id=1), None),
+            await router.dispatch(_update("slow", user_id=2), None),
+            await router.dispatch(_update("public", user_id=2), None),
+        ]
+        return results
+
+    assert asyncio.run(run()) == [True, False, True]
+    assert seen == [1, 2]
+    assert timings == ["slow", "public"]
+    stats = router.get_stats()
+    assert stats[0]['route'] == 'slow' and stats[0]['calls'] == 1
+    assert stats[0]['avg_ms'] >= 20
+
+
+if __name__ == "__main__":
+    test_exact_prefix_and_fallback()
+    test_middleware_and_timing()
+    print("✅ Всі тести пройдено")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Тест збереження курсорів і обмеженої догрузки після перезапуску
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cursor_store import CursorStore
+from discord_monitor import DiscordMonitor, DISCORD_EPOCH_MS
+from twitter_monitor import TwitterMonitor
+
+
+def _snowflake(seconds_ago: float, seq: int = 0) -> str:
+    ms = int(time.time() * 1000 - seconds_ago * 1000)
+    return str(((ms - DISCORD_EPOCH_MS) << 22) + seq)
+
+
+def test_journal_replay_and_compaction():
+    """Курсори переживають перезапуск, журнал ущільнюється у знімок"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cursors.json')
+        store = CursorStore(path, compact_threshold=3)
+        store.set('discord:1', '100')
+        store.set('discord:1', '100')  # без змін - без запису
+        store.set('discord:2', '200')
+        assert os.path.getsize(store.journal_file) > 0
+
+        store.set('twitter:user', '300')  # третій запис - ущільнення
+        assert os.path.getsize(store.journal_file) == 0
+        store.delete('discord:2')
+        store.set('discord:1', '101')
+
+        # Обірваний запис в кінці журналу ігнорується
+        with open(store.journal_file, 'a', encoding='utf-8') as f:
+            f.write('{"k": "discord:9", "v"')
+
+        restored = CursorStore(path)
+        assert restored.get('discord:1') == '101'
+        assert restored.get('discord:2') is None
+        assert restored.get('twitter:user') == '300'
+        assert restored.get_updated_at('discord:1') > 0
+
+        # Обрізаний хвіст не склеюється з наступним записом
+        restored.set('discord:3', '300')
+        assert CursorStore(path).get('discord:3') == '300'
+
+
+def test_discord_backfill_is_bounded():
+    """Після перезапуску догружаються лише свіжі пропущені повідомлення"""
+    old_cursor = _snowflake(3 * 3600)
+    stale = _snowflake(2 * 3600)       # старше за ліміт віку
+    fresh = [_snowflake(600 - i, i) for i in range(5)]
+
+    class HistorySession:
+        def __init__(self):
+            self.urls = []
+
+        def get(self, url, **kwargs):
+            self.urls.append(url)
+
+            class _Response:
+                status = 200
+                headers = {}
+
+                async def json(self):
+                    ids = [stale] + fresh
+                    return [{'id': i, 'content': i, 'author': {'username': 'u'}} for i in reversed(ids)]
+
+                async def __aenter__(self):
+                    return self
+
+                async def __aexit__(self, *args):
+                    return False
+
+            return _Response()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CursorStore(os.path.join(tmp, 'cursors.json'))
+        store.set('discord:777', old_cursor)
+
+        monitor = DiscordMonitor('token', global_rate_limit=0)
+        monitor.attach_cursor_store(store, backfill_max_items=3, backfill_max_age_hours=1)
+        monitor.add_channel('https://discord.com/channels/1/777')
+        assert monitor.last_message_ids['777'] == old_cursor
+        monitor.session = HistorySession()
+
+        messages = asyncio.run(monitor.check_new_messages())
+        assert [m['message_id'] for m in messages] == fresh[-3:]
+        assert 'after=' not in monitor.session.urls[0]
+        assert monitor.last_message_ids['777'] == fresh[-1]
+        assert store.get('discord:777') == fresh[-1]
+        assert not monitor.backfill_pending
+
+
+def test_twitter_cursor_restore_and_limit():
+    """Twitter курсор відновлюється, догрузка обмежена віком і кількістю"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CursorStore(os.path.join(tmp, 'cursors.json'))
+        store.set('twitter:someuser', '42')
+
+        monitor = TwitterMonitor()
+        monitor.attach_cursor_store(store, backfill_max_items=2, backfill_max_age_hours=1)
+        monitor.monitoring_accounts.add('SomeUser')
+        monitor._restore_cursor('SomeUser')
+        assert monitor.last_tweet_ids['SomeUser'] == '42'
+        assert 'SomeUser' in monitor.backfill_pending
+
+        now = datetime.now(timezone.utc)
+        tweets = [{'tweet_id': str(i), 'timestamp': (now - timedelta(minutes=m)).isoformat()}
+                  for i, m in enumerate([1, 2, 3, 120])]
+        new_tweets = [{'tweet_id': 'other'}] + tweets
+        monitor._limit_backfill('SomeUser', new_tweets, 1)
+        assert [t['tweet_id'] for t in new_tweets] == ['other', '0', '1']
+
+        monitor.last_tweet_ids['SomeUser'] = '43'
+        monitor._checkpoint('SomeUser')
+        assert store.get('twitter:someuser') == '43'
+
+
+if __name__ == "__main__":
+    test_journal_replay_and_compaction()
+    test_discord_backfill_is_bounded()
+    test_twitter_cursor_restore_and_limit()
+    print("✅ Всі тести пройдено")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Тест надійної черги пересилань (outbox) з пакетними підтвердженнями
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delivery_outbox import DeliveryOutbox
+from project_manager import ProjectManager
+
+
+def test_pending_deliveries_survive_restart():
+    """Недоставлені пересилання відновлюються після перезапуску, дублі не записуються"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'outbox.db')
+        outbox = DeliveryOutbox(path, ack_batch_size=2, ack_flush_interval=3600)
+        created = outbox.append('msg_1', 'Discord', 'hello', ['https://x/a.png'], [('@chan', 1), ('-100', 2)])
+        assert [(channel, user_id) for _, channel, user_id in created] == [('@chan', 1), ('-100', 2)]
+        # Та сама подія вже в outbox - повторно не ставиться
+        assert outbox.append('msg_1', 'Discord', 'hello', [], [('@chan', 1)]) == []
+        other = outbox.append('msg_2', 'Twitter', 'tweet', [], [('@chan', 1)])
+
+        outbox.ack(created[0][0])
+        assert outbox.get_stats()['pending_acks'] == 1
+        outbox.ack(other[0][0])  # пакет заповнено - один запис
+        assert outbox.get_stats()['ack_flushes'] == 1
+        outbox.db.close()  # аварійне завершення без close()
+
+        restored = DeliveryOutbox(path)
+        pending = restored.pending()
+        assert len(pending) == 1
+        assert pending[0]['forward_key'] == 'msg_1'
+        assert pending[0]['images'] == ['https://x/a.png']
+        assert [channel for _, channel, _ in pending[0]['deliveries']] == ['-100']
+
+        restored.fail(pending[0]['deliveries'][0][0], 'chat not found')
+        assert restored.pending() == []
+        assert restored.get_stats()['by_status'] == {'done': 2, 'failed': 1}
+        restored.close()
+
+
+def test_prune_keeps_pending():
+    """Очищення видаляє старі завершені доставки, але не недоставлені"""
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = DeliveryOutbox(os.path.join(tmp, 'outbox.db'), ack_flush_interval=0)
+        done = outbox.append('old_done', 'Discord', 'a', [], [('@c', 1)])
+        outbox.append('old_pending', 'Discord', 'b', [], [('@c', 1)])
+        outbox.ack(done[0][0])
+        outbox.db.execute("UPDATE deliveries SET created_at = ?", (time.time() - 7200,))
+        outbox.db.execute("UPDATE events SET created_at = ?", (time.time() - 7200,))
+
+        assert outbox.prune(max_age_hours=1) == 1
+        assert [event['forward_key'] for event in outbox.pending()] == ['old_pending']
+        # Після очищення подію можна записати знову
+        assert len(outbox.append('old_done', 'Discord', 'a', [], [('@c', 1)])) == 1
+        outbox.close()
+
+
+def test_acks_feed_sent_ledger_without_rewriting_data():
+    """Пакет підтверджень оновлює журнал відправлених одним викликом, data.json пишеться лише при закритті"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, 'data.json')
+        manager = ProjectManager(data_file, flush_delay=60)
+        outbox = DeliveryOutbox(os.path.join(tmp, 'outbox.db'), ack_batch_size=3, ack_flush_interval=3600)
+        batches = []
+        outbox.add_ack_listener(batches.append)
+        outbox.add_ack_listener(manager.record_sent_messages)
+
+        created = outbox.append('msg_1', 'Discord', 'hello', [], [('@chan', 1), ('-100', 2), ('@other', 1)])
+        flushes = manager.writer.get_stats()['flushes']
+        for delivery_id, _, _ in created[:2]:
+            outbox.ack(delivery_id)
+        assert batches == [] and not manager.is_message_sent('msg_1', '@chan', 1)
+        outbox.ack(created[2][0])
+
+        assert batches == [[('msg_1', '@chan', 1), ('msg_1', '-100', 2), ('msg_1', '@other', 1)]]
+        assert manager.is_message_sent('msg_1', '-100', 2)
+        assert not manager.is_message_sent('msg_1', '-100', 1)
+        assert not manager.writer.dirty
+        assert manager.writer.get_stats()['flushes'] == flushes
+
+        outbox.close()
+        manager.close()
+        restored = ProjectManager(data_file)
+        assert restored.is_message_sent('msg_1', '@other', 1)
+        restored.close()
+
+
+if __name__ == "__main__":
+    test_pending_deliveries_survive_restart()
+    test_prune_keeps_pending()
+    test_acks_feed_sent_ledger_without_rewriting_data()
+    print("✅ Всі тести пройдено")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Тест інкрементального отримання Discord повідомлень через after= курсор
+"""
+
+import asyncio
+import os
+import sys
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from discord_monitor import DiscordMonitor
+
+
+class FakeResponse:
+    """Фейкова відповідь aiohttp"""
+
+    def __init__(self, payload):
+        self.status = 200
+        self.headers = {}
+        self._payload = payload
+
+    async def json(self):
+        return self._payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeChannelSession:
+    """Фейковий Discord API з історією повідомлень каналу"""
+
+    def __init__(self, message_ids):
+        self.message_ids = sorted(message_ids)
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        query = parse_qs(urlparse(url).query)
+        limit = int(query['limit'][0])
+        after = query.get('after', [None])[0]
+        self.requests.append((limit, after))
+
+        if after is None:
+            selected = self.message_ids[-limit:]
+        else:
+            selected = [m for m in self.message_ids if m > int(after)][:limit]
+        # Discord повертає від найновіших до найстаріших
+        payload = [{'id': str(m), 'content': f'msg {m}', 'author': {'username': 'u'}} for m in reversed(selected)]
+        return FakeResponse(payload)
+
+
+def _make_monitor(session, **kwargs):
+    monitor = DiscordMonitor('token', global_rate_limit=0, **kwargs)
+    monitor.add_channel('https://discord.com/channels/555/777')
+    monitor.session = session
+    return monitor
+
+
+def test_baseline_then_idle_channel():
+    """Перша перевірка бере одне повідомлення, тихий канал - один дешевий запит"""
+    session = FakeChannelSession(range(1000, 1010))
+    monitor = _make_monitor(session)
+
+    assert asyncio.run(monitor.check_new_messages()) == []
+    assert monitor.last_message_ids['777'] == '1009'
+    assert session.requests == [(1, None)]
+
+    assert asyncio.run(monitor.check_new_messages()) == []
+    assert session.requests[-1] == (100, '1009')
+    assert len(session.requests) == 2
+
+
+def test_burst_is_delivered_completely_and_in_order():
+    """Сплеск повідомлень догружається сторінками у хронологічному порядку"""
+    session = FakeChannelSession(range(1000, 1001))
+    monitor = _make_monitor(session, page_size=100, max_pages_per_cycle=5)
+    asyncio.run(monitor.check_new_messages())
+
+    session.message_ids.extend(range(1001, 1251))
+    messages = asyncio.run(monitor.check_new_messages())
+
+    ids = [int(m['message_id']) for m in messages]
+    assert ids == list(range(1001, 1251))
+    assert monitor.last_message_ids['777'] == '1250'
+    assert messages[0]['url'] == 'https://discord.com/channels/555/777/1001'
+    # 250 повідомлень = 3 сторінки
+    assert len(session.requests) == 1 + 3
+
+
+def test_page_cap_resumes_next_cycle():
+    """Ліміт сторінок за цикл не втрачає повідомлення"""
+    session = FakeChannelSession(range(1000, 1001))
+    monitor = _make_monitor(session, page_size=10, max_pages_per_cycle=2)
+    asyncio.run(monitor.check_new_messages())
+
+    session.message_ids.extend(range(1001, 1031))
+    first = asyncio.run(monitor.check_new_messages())
+    second = asyncio.run(monitor.check_new_messages())
+
+    assert len(first) == 20
+    ids = [int(m['message_id']) for m in first + second]
+    assert ids == list(range(1001, 1031))
+
+
+def test_failed_page_keeps_delivered_pages():
+    """Помилка посеред пагінації: віддані сторінки не повторюються, решта береться наступного циклу"""
+    session = FakeChannelSession(range(1000, 1001))
+    monitor = _make_monitor(session, page_size=10, max_pages_per_cycle=5)
+    asyncio.run(monitor.check_new_messages())
+    session.message_ids.extend(range(1001, 1031))
+
+    fetch = monitor.get_channel_messages
+    calls = []
+
+    async def flaky_fetch(*args, **kwargs):
+        calls.append(kwargs.get('after'))
+        if len(calls) == 2:
+            raise RuntimeError("connection reset")
+        return await fetch(*args, **kwargs)
+
+    monitor.get_channel_messages = flaky_fetch
+    first = asyncio.run(monitor.check_new_messages())
+    assert [int(m['message_id']) for m in first] == list(range(1001, 1011))
+    assert monitor.last_message_ids['777'] == '1010'
+
+    second = asyncio.run(monitor.check_new_messages())
+    assert [int(m['message_id']) for m in second] == list(range(1011, 1031))
+
+
+if __name__ == "__main__":
+    test_baseline_then_idle_channel()
+    test_burst_is_delivered_completely_and_in_order()
+    test_page_cap_resumes_next_cycle()
+    test_failed_page_keeps_delivered_pages()
+    print("✅ Всі тести пройдено")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Тест Discord Gateway режиму на локальному фейковому gateway сервері
+"""
+
+import asyncio
+import os
+import sys
+
+import aiohttp
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from discord_gateway import DiscordGateway, OP_GUILD_SUBSCRIBE, OP_IDENTIFY
+from discord_monitor import DiscordMonitor
+
+
+class FakeGateway:
+    """Фейковий Discord Gateway: Hello -> READY -> MESSAGE_CREATE -> Reconnect"""
+
+    def __init__(self, events):
+        self.events = events
+        self.received = []
+        self.connections = 0
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+
+        await ws.send_json({'op': 10, 'd': {'heartbeat_interval': 45000}})
+        identify = await ws.receive_json()
+        self.received.append(identify)
+        await ws.send_json({'op': 0, 's': 1, 't': 'READY', 'd': {'session_id': 'abc'}})
+
+        # Чекаємо підписку на сервер
+        subscribe = await ws.receive_json()
+        self.received.append(subscribe)
+
+        for seq, event in enumerate(self.events, start=2):
+            await ws.send_json({'op': 0, 's': seq, 't': 'MESSAGE_CREATE', 'd': event})
+        await ws.send_json({'op': 7, 'd': None})
+        await ws.close()
+        return ws
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/gateway', self.handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/gateway"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+class HybridSession:
+    """Websocket через реальну aiohttp сесію, REST - фейковий (порожні відповіді)"""
+
+    def __init__(self, session):
+        self.session = session
+        self.rest_calls = 0
+
+    def ws_connect(self, *args, **kwargs):
+        return self.session.ws_connect(*args, **kwargs)
+
+    def get(self, url, **kwargs):
+        outer = self
+
+        class _Response:
+            status = 200
+            headers = {}
+
+            async def json(self):
+                return []
+
+            async def __aenter__(self):
+                outer.rest_calls += 1
+                return self
+
+            async def __aexit__(self, *args):
+                return False
+
+        return _Response()
+
+
+def _message(message_id, channel_id, guild_id='555'):
+    return {
+        'id': message_id, 'channel_id': channel_id, 'guild_id': guild_id,
+        'content': f'hello {message_id}', 'author': {'username': 'tester'},
+        'timestamp': '2024-01-01T00:00:00+00:00', 'attachments': [], 'embeds': [],
+    }
+
+
+def test_gateway_dispatches_message_create():
+    """Gateway виконує Identify, підписку і передає MESSAGE_CREATE"""
+    async def run():
+        fake = FakeGateway([_message('2001', '777')])
+        url = await fake.start()
+        received = []
+
+        async def on_message(data):
+            received.append(data)
+
+        try:
+            gateway = DiscordGateway('token', url)
+            async with aiohttp.ClientSession() as session:
+                reason = await gateway.run(session, ['555', '555', None], on_message)
+        finally:
+            await fake.stop()
+        return fake, gateway, received, reason
+
+    fake, gateway, received, reason = asyncio.run(run())
+    assert reason == "reconnect requested"
+    assert fake.received[0]['op'] == OP_IDENTIFY
+    assert fake.received[0]['d']['token'] == 'token'
+    assert fake.received[1] == {'op': OP_GUILD_SUBSCRIBE, 'd': {'guild_id': '555', 'typing': False, 'activities': False, 'threads': True}}
+    assert [m['id'] for m in received] == ['2001']
+    assert gateway.sequence == 2
+
+
+def test_monitor_gateway_mode_with_fallback():
+    """Монітор фільтрує канали, оновлює курсор і перепідключається після розриву"""
+    async def run():
+        fake = FakeGateway([
+            _message('2001', '777'),
+            _message('2002', '888'),  # не моніториться
+            _message('1500', '777'),  # старіше курсора - вже доставлено
+        ])
+        url = await fake.start()
+        delivered = []
+
+        monitor = DiscordMonitor('token', global_rate_limit=0)
+        monitor.add_channel('https://discord.com/channels/555/777')
+        monitor.last_message_ids['777'] = '2000'
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                monitor.session = HybridSession(session)
+                task = asyncio.create_task(monitor.start_monitoring(delivered.extend, interval=0.05,
+                                                                    use_gateway=True, gateway_url=url))
+                for _ in range(100):
+                    if fake.connections >= 2 and monitor.session.rest_calls >= 2:
+                        break
+                    await asyncio.sleep(0.05)
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        finally:
+            await fake.stop()
+        return fake, monitor, delivered
+
+    fake, monitor, delivered = asyncio.run(run())
+    # Повідомлення з кожного підключення доставлено один раз
+    assert delivered[0]['message_id'] == '2001'
+    assert delivered[0]['url'] == 'https://discord.com/channels/555/777/2001'
+    assert all(m['channel_id'] == '777' for m in delivered)
+    assert len([m for m in delivered if m['message_id'] == '2001']) == 1
+    assert monitor.last_message_ids['777'] == '2001'
+    # Після розриву - REST polling і повторне підключення
+    assert fake.connections >= 2
+    assert monitor.session.rest_calls >= 2
+
+
+if __name__ == "__main__":
+    test_gateway_dispatches_message_create()
+    test_monitor_gateway_mode_with_fallback()
+    print("✅ Всі тести пройдено")
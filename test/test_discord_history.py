@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Тест історії Discord: пагінація before=, потокові частини і TTL кеш
+"""
+
+import asyncio
+import os
+import sys
+
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client
+from discord_history import DiscordHistory
+
+# 250 повідомлень, id 1000..1249; API віддає новіші першими
+MESSAGES = [
+    {'id': str(1000 + i), 'content': f"message {i} " + 'x' * 150, 'timestamp': '2024-05-01T10:00:00+00:00',
+     'author': {'username': f'user{i}'}}
+    for i in range(250)
+]
+
+
+class FakeDiscord:
+    def __init__(self):
+        self.requests = []
+
+    async def handler(self, request):
+        limit = int(request.query['limit'])
+        before = request.query.get('before')
+        self.requests.append(before)
+        newest_first = list(reversed(MESSAGES))
+        if before:
+            newest_first = [m for m in newest_first if int(m['id']) < int(before)]
+        return web.json_response(newest_first[:limit])
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/channels/{channel_id}/messages', self.handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        return f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+def test_paging_streaming_and_cache():
+    """Сторінки через before=, частини не перевищують ліміт, повторний перегляд - без запитів"""
+    async def run():
+        api = FakeDiscord()
+        history = DiscordHistory('token', page_size=100, cache_ttl=60, api_base=await api.start())
+        try:
+            chunks = [chunk async for chunk in history.stream_chunks('42', 150, 'Test', max_length=1000)]
+            requests_after_first = list(api.requests)
+            again = [chunk async for chunk in history.stream_chunks('42', 20, 'Test', max_length=1000)]
+            requests_after_second = list(api.requests)
+            everything = [chunk async for chunk in history.stream_chunks('42', 300, 'Test')]
+        finally:
+            await api.runner.cleanup()
+            await http_client.close_session()
+        return chunks, again, everything, requests_after_first, requests_after_second, api.requests, history
+
+    chunks, again, everything, first, second, requests, history = asyncio.run(run())
+    assert first == [None, '1150']
+    assert second == first  # другий перегляд повністю з кешу
+    assert requests == [None, '1150', '1050']  # третя сторінка неповна - кінець каналу
+
+    assert chunks[0].startswith("📜 **Історія каналу: Test**\n📊 Останні 150 повідомлень:\n\n**1.** 👤 user249")
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    text = "\n".join(chunks)
+    assert "**150.** 👤 user100" in text and "**151.**" not in text
+    assert "01.05.2024 10:00" in text
+    assert "**20.** 👤 user230" in "".join(again) and "**21.**" not in "".join(again)
+    assert "**250.** 👤 user0" in "".join(everything)
+    assert history.get_stats()['api_calls'] == 3
+
+
+def test_no_access_yields_nothing():
+    """Без токена або з некоректним каналом частин немає"""
+    async def run():
+        return [chunk async for chunk in DiscordHistory(None).stream_chunks('42', 5, 'Test')]
+
+    assert asyncio.run(run()) == []
+
+
+if __name__ == "__main__":
+    test_paging_streaming_and_cache()
+    test_no_access_yields_nothing()
+    print("✅ Всі тести пройдено")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Тест паралельного опитування Discord з rate-limit планувальником
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from discord_rate_limiter import DiscordRateLimiter
+from discord_monitor import DiscordMonitor
+
+
+class FakeResponse:
+    """Фейкова відповідь aiohttp"""
+
+    def __init__(self, status, headers, payload):
+        self.status = status
+        self.headers = headers
+        self._payload = payload
+
+    async def json(self):
+        return self._payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeDiscordSession:
+    """Фейкова сесія, що імітує Discord API з затримкою"""
+
+    def __init__(self, delay=0.05, rate_limit_first=None):
+        self.delay = delay
+        self.rate_limit_first = set(rate_limit_first or [])
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        session = self
+        channel_id = url.split('/channels/')[1].split('/')[0]
+
+        class _Request:
+            async def __aenter__(self):
+                session.calls += 1
+                session.in_flight += 1
+                session.max_in_flight = max(session.max_in_flight, session.in_flight)
+                await asyncio.sleep(session.delay)
+                session.in_flight -= 1
+                if channel_id in session.rate_limit_first:
+                    session.rate_limit_first.discard(channel_id)
+                    return FakeResponse(429, {'Retry-After': '0.05', 'X-RateLimit-Bucket': 'msgs'}, {})
+                headers = {
+                    'X-RateLimit-Bucket': 'msgs',
+                    'X-RateLimit-Limit': '5',
+                    'X-RateLimit-Remaining': '4',
+                    'X-RateLimit-Reset-After': '1',
+                }
+                return FakeResponse(200, headers, [{'id': f'{channel_id}1', 'content': 'hi', 'author': {'username': 'u'}}])
+
+            async def __aexit__(self, *args):
+                return False
+
+        return _Request()
+
+
+def test_bucket_exhaustion_delays_next_request():
+    """Вичерпаний bucket змушує чекати до скидання"""
+    async def run():
+        limiter = DiscordRateLimiter(global_limit=0)
+        limiter.update('GET /x', '1', {
+            'X-RateLimit-Bucket': 'abc',
+            'X-RateLimit-Limit': '1',
+            'X-RateLimit-Remaining': '0',
+            'X-RateLimit-Reset-After': '0.2',
+        })
+        started = time.monotonic()
+        await limiter.acquire('GET /x', '1')
+        waited = time.monotonic() - started
+
+        # Інший головний параметр має окремий bucket
+        started = time.monotonic()
+        await limiter.acquire('GET /x', '2')
+        other = time.monotonic() - started
+        return waited, other, limiter.get_stats()
+
+    waited, other, stats = asyncio.run(run())
+    assert waited >= 0.15
+    assert other < 0.05
+    assert stats['throttled'] == 1
+
+
+def test_cold_route_uses_conservative_default():
+    """До перших заголовків маршрут обмежений типовим лімітом, потім - лімітом з заголовків"""
+    async def run():
+        limiter = DiscordRateLimiter(global_limit=0, default_limit=2, default_window=0.2)
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire('GET /cold', '1') for _ in range(3)))
+        cold_wait = time.monotonic() - started
+
+        limiter.update('GET /cold', '1', {
+            'X-RateLimit-Bucket': 'warm',
+            'X-RateLimit-Limit': '10',
+            'X-RateLimit-Remaining': '10',
+            'X-RateLimit-Reset-After': '1',
+        })
+        started = time.monotonic()
+        for _ in range(5):
+            await limiter.acquire('GET /cold', '1')
+        warm_wait = time.monotonic() - started
+        return cold_wait, warm_wait, limiter.get_stats()
+
+    cold_wait, warm_wait, stats = asyncio.run(run())
+    assert cold_wait >= 0.15
+    assert warm_wait < 0.05
+    assert stats['throttled'] == 1
+
+
+def test_global_limit_and_global_429():
+    """Глобальний ліміт і глобальний 429 блокують усі маршрути"""
+    async def run():
+        limiter = DiscordRateLimiter(global_limit=3, global_window=0.2)
+        started = time.monotonic()
+        for i in range(4):
+            await limiter.acquire('GET /x', str(i))
+        window_wait = time.monotonic() - started
+
+        retry = limiter.update('GET /y', '9', {'Retry-After': '0.15', 'X-RateLimit-Global': 'true'}, 429)
+        started = time.monotonic()
+        await limiter.acquire('GET /z', '7')
+        global_wait = time.monotonic() - started
+        return window_wait, retry, global_wait
+
+    window_wait, retry, global_wait = asyncio.run(run())
+    assert window_wait >= 0.15
+    assert retry == 0.15
+    assert global_wait >= 0.1
+
+
+def test_check_new_messages_polls_concurrently():
+    """Цикл опитування масштабується з бюджетом, а не з кількістю каналів"""
+    async def run():
+        monitor = DiscordMonitor('token', max_concurrent_requests=10, global_rate_limit=0)
+        monitor.session = FakeDiscordSession(delay=0.05, rate_limit_first={'105'})
+        for i in range(20):
+            monitor.monitoring_channels.add(str(100 + i))
+            monitor.last_message_ids[str(100 + i)] = '0'
+
+        started = time.monotonic()
+        messages = await monitor.check_new_messages()
+        elapsed = time.monotonic() - started
+        return monitor, messages, elapsed
+
+    monitor, messages, elapsed = asyncio.run(run())
+    assert len(messages) == 20
+    # Послідовно з sleep(1) це зайняло б ~20 секунд
+    assert elapsed < 1.0
+    assert 1 < monitor.session.max_in_flight <= 10
+    # Канал з 429 повторено один раз
+    assert monitor.session.calls == 21
+    assert monitor.last_message_ids['105'] == '1051'
+
+
+if __name__ == "__main__":
+    test_bucket_exhaustion_delays_next_request()
+    test_cold_route_uses_conservative_default()
+    test_global_limit_and_global_429()
+    test_check_new_messages_polls_concurrently()
+    print("✅ Всі тести пройдено")
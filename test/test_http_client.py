@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Тест спільного HTTP клієнта з пулом з'єднань
+"""
+
+import asyncio
+import os
+import sys
+
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client
+
+
+def test_async_session_is_shared_and_keeps_alive():
+    """Одна сесія на event loop, з'єднання перевикористовується, 5xx повторюється"""
+    async def run():
+        peers = []
+        failures = {'left': 1}
+
+        async def handler(request):
+            peers.append(request.transport.get_extra_info('peername')[1])
+            if request.path == '/flaky' and failures['left']:
+                failures['left'] -= 1
+                return web.Response(status=503)
+            return web.json_response({'ok': True})
+
+        app = web.Application()
+        app.router.add_get('/{name}', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        base = f"http://127.0.0.1:{port}"
+
+        try:
+            session = http_client.get_session()
+            assert http_client.get_session() is session
+
+            for _ in range(3):
+                async with session.get(f"{base}/ping") as response:
+                    assert (await response.json()) == {'ok': True}
+
+            response = await http_client.request('GET', f"{base}/flaky")
+            assert response.status == 200
+            assert (await response.json()) == {'ok': True}
+        finally:
+            await http_client.close_session()
+            await runner.cleanup()
+
+        assert session.closed
+        return peers
+
+    peers = asyncio.run(run())
+    assert len(peers) == 5
+    # Keep-alive: всі запити через одне TCP з'єднання
+    assert len(set(peers)) == 1
+
+
+if __name__ == "__main__":
+    test_async_session_is_shared_and_keeps_alive()
+    print("✅ Всі тести пройдено")
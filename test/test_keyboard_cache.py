@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Тест кешу inline-клавіатур з інвалідацією за версією даних
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyboard_cache import KeyboardCache
+from project_manager import ProjectManager
+
+
+def test_cached_until_data_version_changes():
+    """Клавіатура будується повторно лише після зміни проектів користувача"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ProjectManager(os.path.join(tmp, 'data.json'))
+        cache = KeyboardCache()
+        builds = []
+
+        @cache.cached("projects", manager.data_version)
+        def projects_keyboard(user_id):
+            builds.append(user_id)
+            return [p['name'] for p in manager.get_user_projects(user_id)]
+
+        @cache.cached("help")
+        def help_keyboard():
+            builds.append('help')
+            return ['help']
+
+        assert projects_keyboard(1) == []
+        assert projects_keyboard(1) == []
+        assert help_keyboard() == help_keyboard()
+        assert builds == [1, 'help']
+
+        manager.add_project(1, {'name': 'Alpha', 'platform': 'twitter', 'url': 'alpha'})
+        # Зміна даних іншого користувача не скидає кеш
+        manager.add_project(2, {'name': 'Beta', 'platform': 'twitter', 'url': 'beta'})
+        assert projects_keyboard(1) == ['Alpha']
+        assert projects_keyboard(1) == ['Alpha']
+        assert builds == [1, 'help', 1]
+
+        manager.enable_forward(1)
+        projects_keyboard(1)
+        # Спільні дані (Selenium акаунти) скидають кеш усіх користувачів
+        manager.add_selenium_account('someone')
+        projects_keyboard(1)
+        assert builds == [1, 'help', 1, 1, 1]
+
+        stats = cache.get_stats()
+        assert stats['hits'] == 3 and stats['misses'] == 5
+
+
+def test_lru_limit_and_invalidate():
+    """Кеш обмежений за кількістю записів і підтримує явне скидання"""
+    cache = KeyboardCache(max_entries=2)
+    for user_id in (1, 2, 3):
+        cache.get("menu", user_id, 0, lambda: object())
+    assert [key[1] for key in cache.entries] == [2, 3]
+    assert cache.invalidate(3) == 1
+    assert cache.invalidate() == 1
+    assert not cache.entries
+
+
+if __name__ == "__main__":
+    test_cached_until_data_version_changes()
+    test_lru_limit_and_invalidate()
+    print("✅ Всі тести пройдено")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Тест кешу медіа: ключі за URL, об'єднання завантажень, LRU витіснення
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from media_cache import MediaCache, normalize_url
+
+
+class CountingFetcher:
+    """Фейкове завантаження з лічильником викликів"""
+
+    def __init__(self, size=100, delay=0.05):
+        self.size = size
+        self.delay = delay
+        self.calls = []
+
+    async def __call__(self, url):
+        self.calls.append(url)
+        await asyncio.sleep(self.delay)
+        if 'missing' in url:
+            return None, None
+        return url.encode()[-1:] * self.size, 'image/jpeg'
+
+
+def test_url_normalization():
+    """Підпис Discord CDN і порядок параметрів не впливають на ключ"""
+    a = 'https://CDN.discordapp.com/attachments/1/2/img.png?ex=1&is=2&hm=abc&size=large#x'
+    b = 'https://cdn.discordapp.com/attachments/1/2/img.png?size=large&hm=def&ex=3'
+    assert normalize_url(a) == 'https://cdn.discordapp.com/attachments/1/2/img.png?size=large'
+    assert MediaCache.key_for(a) == MediaCache.key_for(b)
+    assert MediaCache.key_for(a) != MediaCache.key_for('https://cdn.discordapp.com/attachments/1/2/other.png')
+
+
+def test_concurrent_requests_collapse_into_one_download():
+    """Розсилка в багато каналів - одне завантаження, далі гарячий шар і диск"""
+    with tempfile.TemporaryDirectory() as tmp:
+        fetch = CountingFetcher()
+
+        async def run():
+            cache = MediaCache(tmp)
+            results = await asyncio.gather(*[cache.get('https://pbs.twimg.com/media/a.jpg', fetch) for _ in range(5)])
+            again = await cache.get('https://pbs.twimg.com/media/a.jpg', fetch)
+            missing = await asyncio.gather(cache.get('https://x/missing', fetch), cache.get('https://x/missing', fetch))
+            return cache, results, again, missing
+
+        cache, results, again, missing = asyncio.run(run())
+        assert fetch.calls.count('https://pbs.twimg.com/media/a.jpg') == 1
+        assert all(r == results[0] for r in results) and again == results[0]
+        assert results[0][1] == 'image/jpeg' and len(results[0][0]) == 100
+        stats = cache.get_stats()
+        assert stats['collapsed'] == 5 and stats['hot_hits'] == 1 and stats['files'] == 1
+        # Невдале завантаження не кешується
+        assert missing == [(None, None), (None, None)]
+        assert fetch.calls.count('https://x/missing') == 1
+
+        # Після перезапуску - з диска, без мережі
+        restored = MediaCache(tmp)
+        content, content_type = asyncio.run(restored.get('https://pbs.twimg.com/media/a.jpg', fetch))
+        assert content == results[0][0] and content_type == 'image/jpeg'
+        assert restored.get_stats()['disk_hits'] == 1
+        assert len(fetch.calls) == 2
+
+
+def test_lru_and_age_eviction():
+    """Понад ліміт витісняється найдавніше використане, застаріле - за віком"""
+    with tempfile.TemporaryDirectory() as tmp:
+        fetch = CountingFetcher(size=100, delay=0)
+        cache = MediaCache(tmp, max_bytes=250, hot_max_file_size=50)
+
+        async def run():
+            await cache.get('https://x/1', fetch)
+            await cache.get('https://x/2', fetch)
+            await cache.get('https://x/1', fetch)  # 1 стає свіжішим за 2
+            await cache.get('https://x/3', fetch)
+
+        asyncio.run(run())
+        keys = set(cache.entries)
+        assert keys == {MediaCache.key_for('https://x/1'), MediaCache.key_for('https://x/3')}
+        assert len(os.listdir(tmp)) == 2
+        assert cache.get_stats()['hot_files'] == 0  # файли більші за поріг гарячого шару
+
+        cache.max_age = 60
+        cache.entries[MediaCache.key_for('https://x/1')]['accessed'] = time.time() - 120
+        assert cache.evict() == 1
+        assert set(cache.entries) == {MediaCache.key_for('https://x/3')}
+        assert cache.total_bytes == 100
+
+
+if __name__ == "__main__":
+    test_url_normalization()
+    test_concurrent_requests_collapse_into_one_download()
+    test_lru_and_age_eviction()
+    print("✅ Всі тести пройдено")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Тест супервізора моніторів на одному event loop
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor_supervisor import MonitorSupervisor
+
+
+def test_crashed_monitor_is_restarted():
+    """Монітор, що впав, перезапускається; дублікат не стартує"""
+    async def run():
+        supervisor = MonitorSupervisor(restart_delay=0.01, max_restart_delay=0.05, lag_probe_interval=0)
+        runs = []
+
+        async def flaky():
+            runs.append(time.monotonic())
+            if len(runs) < 3:
+                raise RuntimeError(f"crash {len(runs)}")
+            await asyncio.sleep(10)
+
+        # До attach() запуск відкладається
+        assert supervisor.start('flaky', flaky)
+        assert not supervisor.start('flaky', flaky)
+        await supervisor.attach()
+        await asyncio.sleep(0.2)
+        running = supervisor.is_running('flaky')
+        assert not supervisor.start('flaky', flaky)
+        stats = supervisor.get_stats()
+        await supervisor.stop_all()
+        return runs, running, stats, supervisor
+
+    runs, running, stats, supervisor = asyncio.run(run())
+    assert len(runs) == 3
+    assert running
+    assert stats['monitors']['flaky']['restarts'] == 2
+    assert stats['monitors']['flaky']['last_error'] == 'crash 2'
+    assert not supervisor.is_running('flaky')
+
+
+def test_start_from_other_thread_and_finished_monitor():
+    """Запуск з іншого потоку потрапляє на loop; завершений монітор не перезапускається"""
+    async def run():
+        supervisor = MonitorSupervisor(lag_probe_interval=0)
+        await supervisor.attach()
+        loops = []
+
+        async def once():
+            loops.append(asyncio.get_running_loop())
+
+        thread = threading.Thread(target=supervisor.start, args=('once', once))
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0.05)
+        stats = supervisor.get_stats()
+        await supervisor.stop_all()
+        return asyncio.get_running_loop(), loops, stats
+
+    loop, loops, stats = asyncio.run(run())
+    assert loops == [loop]
+    assert stats['monitors']['once']['starts'] == 1
+    assert not stats['monitors']['once']['running']
+
+
+def test_loop_lag_probe_detects_blocking_code():
+    """Блокуючий виклик на loop видно у статистиці затримки"""
+    async def run():
+        supervisor = MonitorSupervisor(lag_probe_interval=0.02)
+        await supervisor.attach()
+        await asyncio.sleep(0.05)
+        time.sleep(0.15)  # блокуючий код
+        await asyncio.sleep(0.05)
+        stats = supervisor.get_stats()
+        await supervisor.stop_all()
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats['loop_lag_ms']['max'] >= 100
+
+
+if __name__ == "__main__":
+    test_crashed_monitor_is_restarted()
+    test_start_from_other_thread_and_finished_monitor()
+    test_loop_lag_probe_detects_blocking_code()
+    print("✅ Всі тести пройдено")
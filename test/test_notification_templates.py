@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Тест шаблонів сповіщень: екранування за один прохід і один рендер на подію
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import notification_templates
+from adaptive_scheduler import parse_datetime, parse_timestamp
+from notification_templates import (ESCAPE_BASIC, ESCAPE_MARKDOWN_V2, NotificationRenderer, escape,
+                                    format_date, render_discord_forward, render_selenium_tweet)
+
+
+def test_escape_matches_replace_chains():
+    """str.translate дає той самий результат, що й старі ланцюжки replace"""
+    text = "a_b*c`d[e]f(g)~h>i#j+k-l=m|n{o}p.q!r\\s"
+    chain = text
+    for char in ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']:
+        chain = chain.replace(char, f'\\{char}')
+    assert escape(text, ESCAPE_MARKDOWN_V2) == chain
+    assert escape("*_`[]", ESCAPE_BASIC) == "\\*\\_\\`\\[\\]"
+    assert escape(None) == ""
+
+
+def test_discord_forward_rendered_once_per_event():
+    """Подія рендериться один раз; поля не перераховуються для повторних викликів"""
+    notification_templates.renderer = NotificationRenderer()
+    message = {
+        'message_id': '555', 'author': 'user_name', 'content': 'x' * 250,
+        'timestamp': '2024-01-02T03:04:05+00:00', 'url': 'https://discord.com/channels/1/2/555',
+        'images': ['a.png', 'b.png'],
+    }
+    first = render_discord_forward(message, 'Server')
+    message['content'] = 'changed'
+    assert render_discord_forward(message, 'Server') == first
+    assert notification_templates.renderer.get_stats() == {'renders': 1, 'hits': 1, 'cached': 1}
+
+    lines = first.split('\n')
+    assert lines[0] == "📢 **Нове повідомлення з Discord**"
+    assert lines[2] == "• Автор: user\\_name"
+    assert lines[3].startswith("• Дата: 02 January, 03:04 UTC (")
+    assert lines[4] == "• Текст: " + 'x' * 200 + "..."
+    assert lines[-1] == "📷 Зображень: 2"
+
+
+def test_time_ago_not_memoised():
+    """'час тому' рахується при кожному рендері, решта полів - з пам'яті"""
+    notification_templates.renderer = NotificationRenderer()
+    timestamp = (datetime.now(timezone.utc) - timedelta(minutes=5)).isoformat()
+    message = {'message_id': '777', 'author': 'a', 'content': 'hi', 'timestamp': timestamp}
+    assert "(5 хвилин тому)" in render_discord_forward(message, 'Server')
+
+    # Та сама подія пізніше: дата і текст з пам'яті, час тому - новий
+    message['content'] = 'changed'
+    message['timestamp'] = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
+    text = render_discord_forward(message, 'Server')
+    assert "(2 годин тому)" in text and "• Текст: hi" in text
+    assert notification_templates.renderer.get_stats()['renders'] == 1
+
+
+def test_single_cached_parser():
+    """Шаблони, історія і планувальник розбирають дати одним кешованим парсером"""
+    assert notification_templates.parse_datetime is parse_datetime
+    twitter = parse_datetime('Wed Oct 10 20:19:24 +0000 2018')
+    assert twitter == datetime(2018, 10, 10, 20, 19, 24, tzinfo=timezone.utc)
+    assert parse_timestamp('Wed Oct 10 20:19:24 +0000 2018') == twitter.timestamp()
+    assert parse_datetime('2024-01-02T03:04:05') == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert parse_datetime('2024-01-02T03:04:05Z') is parse_datetime('2024-01-02T03:04:05Z')
+    assert parse_datetime('nope') is None and parse_timestamp(None) is None and parse_timestamp(5) == 5.0
+
+    notification_templates.renderer = NotificationRenderer()
+    text = render_selenium_tweet({'id': '1', 'user': {'screen_name': 'x'}, 'text': 't',
+                                  'created_at': 'Wed Oct 10 20:19:24 +0000 2018'})
+    assert "• Дата: 10 October, 20:19 UTC (" in text
+
+
+def test_format_date_fallbacks():
+    """Порожня або нерозпізнана дата"""
+    assert format_date('') == ("Не відомо", "")
+    assert format_date('not a date at all, really') == ("not a date at all, ", "")
+
+
+if __name__ == "__main__":
+    test_escape_matches_replace_chains()
+    test_discord_forward_rendered_once_per_event()
+    test_time_ago_not_memoised()
+    test_single_cached_parser()
+    test_format_date_fallbacks()
+    print("✅ Всі тести пройдено")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Тест потокобезпечного ProjectManager: блокування запису і незмінні знімки для читачів
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_manager import ProjectManager
+
+
+def test_snapshot_is_immutable_and_isolated():
+    """Знімок не змінюється після запису і не дозволяє змінювати дані"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ProjectManager(os.path.join(tmp, 'data.json'))
+        manager.add_project(1, {'name': 'A', 'platform': 'twitter', 'url': 'a'})
+        manager.add_selenium_account('sel')
+        before = manager.snapshot()
+
+        manager.add_project(2, {'name': 'B', 'platform': 'twitter', 'url': 'b'})
+        manager.remove_selenium_account('sel')
+        assert list(before.projects) == ['1'] and 'sel' in before.selenium_accounts
+        assert sorted(manager.snapshot().projects) == ['1', '2']
+        assert manager.get_selenium_accounts() == []
+        # Незмінені користувачі не копіюються
+        assert manager.snapshot().projects['1'] is before.projects['1']
+
+        project = manager.get_user_projects(1)[0]
+        assert project['name'] == 'A'
+        for target, key in ((project, 'name'), (before.projects, '3')):
+            try:
+                target[key] = 'X'
+                assert False, "знімок має бути read-only"
+            except TypeError:
+                pass
+        manager.close()
+
+
+def test_users_and_settings_served_from_snapshot():
+    """Дані користувачів і налаштування читаються зі знімка, а не з живих даних"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ProjectManager(os.path.join(tmp, 'data.json'))
+        manager.add_user(1, {'first_name': 'A', 'username': 'a'})
+        manager.set_forward_channel(1, '@chan')
+        manager.set_setting('poll_priorities', {'twitter:a': 1})
+        users = manager.get_all_users()
+        settings = manager.get_all_settings()
+
+        manager.add_user(2, {'first_name': 'B', 'username': 'b'})
+        manager.disable_forward(1)
+        assert list(users) == ['1'] and sorted(manager.get_all_users()) == ['1', '2']
+        assert settings['forward_settings']['1']['enabled']
+        assert manager.get_forward_channel(1) is None
+        assert manager.get_forward_status(1)['channel_id'] == '@chan'
+        assert manager.get_user_data(2)['username'] == 'b'
+
+        # Зміна отриманого значення не зачіпає дані менеджера
+        manager.get_setting('poll_priorities')['twitter:a'] = 5
+        assert manager.data['settings']['poll_priorities'] == {'twitter:a': 1}
+        try:
+            manager.get_user_data(1)['username'] = 'x'
+            assert False, "дані користувача мають бути read-only"
+        except TypeError:
+            pass
+        manager.close()
+
+
+def test_concurrent_readers_see_consistent_state():
+    """Читачі в потоках під час додавання/видалення не падають і не бачать часткових змін"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ProjectManager(os.path.join(tmp, 'data.json'), flush_delay=0.01)
+        stop = threading.Event()
+        errors = []
+
+        def reader():
+            while not stop.is_set():
+                try:
+                    for user_id, projects in manager.snapshot().projects.items():
+                        for project in projects:
+                            # Проект у знімку завжди повний
+                            assert project['platform'] in ('twitter', 'discord') and project['created_at']
+                    manager.get_statistics()
+                    manager.get_selenium_accounts()
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        readers = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in readers:
+            thread.start()
+
+        for i in range(300):
+            user_id = i % 7
+            manager.add_project(user_id, {'name': f'T{i}', 'platform': 'twitter', 'url': f't{i}'})
+            manager.add_selenium_account(f'sel{i % 5}')
+            if i % 3 == 0:
+                manager.delete_project(user_id, manager.get_user_projects(user_id)[0]['id'])
+
+        stop.set()
+        for thread in readers:
+            thread.join()
+        assert not errors, errors
+        assert sum(len(projects) for projects in manager.snapshot().projects.values()) == 200
+        assert manager.flush()
+        manager.close()
+
+
+if __name__ == "__main__":
+    test_snapshot_is_immutable_and_isolated()
+    test_users_and_settings_served_from_snapshot()
+    test_concurrent_readers_see_consistent_state()
+    print("✅ Всі тести пройдено")
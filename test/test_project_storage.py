@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Тест SQLite сховища ProjectManager: міграція з JSON і рядкові записи
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_manager import ProjectManager
+from project_storage import SqliteStorage, create_storage
+
+
+def test_migration_from_json():
+    """Дані з data.json переносяться один раз, старий projects.json теж підтримується"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, 'data.json')
+        db_file = os.path.join(tmp, 'data.db')
+        with open(data_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'projects': {'1': [{'id': 1, 'name': 'Проект', 'platform': 'twitter', 'url': 'acc'}], '2': []},
+                'users': {'1': {'id': 1, 'username': 'u'}},
+                'settings': {
+                    'forward_settings': {'1': {'channel_id': '@chan', 'enabled': True}},
+                    'sent_messages': {'1': {'@chan': [{'message_id': 'm1', 'timestamp': '2025-01-01T10:00:00'}]}},
+                    'poll_priorities': {'twitter:acc': 1},
+                },
+                'selenium_accounts': {'acc': {'username': 'acc', 'is_active': True}},
+                'metadata': {'version': '1.0'},
+            }, f)
+
+        manager = ProjectManager(data_file, storage=create_storage('sqlite', data_file, db_file))
+        assert manager.get_user_projects(1)[0]['name'] == 'Проект'
+        assert manager.data['projects']['2'] == []
+        assert manager.get_forward_channel(1) == '@chan'
+        assert manager.is_message_sent('m1', '@chan', 1)
+        assert 'sent_messages' not in manager.data['settings']
+        assert manager.get_setting('poll_priorities') == {'twitter:acc': 1}
+        assert manager.get_selenium_accounts() == ['acc']
+        assert manager.subscriptions.twitter_subscribers('acc') == [1]
+        manager.close()
+
+        # Повторний запуск не перезаписує базу старим JSON
+        with open(data_file, 'w', encoding='utf-8') as f:
+            json.dump({'projects': {}}, f)
+        storage = create_storage('sqlite', data_file, db_file)
+        assert storage.load()['projects']['1'][0]['name'] == 'Проект'
+        storage.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, 'projects.json')
+        with open(legacy, 'w', encoding='utf-8') as f:
+            json.dump({'5': [{'id': 1, 'name': 'Old', 'platform': 'discord', 'url': 'x'}]}, f)
+        storage = SqliteStorage(os.path.join(tmp, 'data.db'))
+        assert storage.migrate_from_json(os.path.join(tmp, 'data.json'), legacy)
+        assert storage.load()['projects']['5'][0]['name'] == 'Old'
+        storage.close()
+
+
+def test_changes_written_per_row():
+    """Зміни записуються рядками з черги потоком запису, без повного збереження; API ProjectManager той самий"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'data.db')
+        manager = ProjectManager(os.path.join(tmp, 'data.json'), storage=SqliteStorage(db_file), flush_delay=60)
+
+        assert manager.add_project(7, {'name': 'A', 'platform': 'twitter', 'url': 'a'})
+        assert manager.add_project(7, {'name': 'B', 'platform': 'discord', 'url': 'b'})
+        assert manager.delete_project(7, 1)
+        manager.add_user(7, {'first_name': 'Test', 'username': 'test'})
+        manager.set_forward_channel(7, '@out')
+        manager.disable_forward(7)
+        # Мутатори не пишуть на диск - запити чекають у черзі сховища
+        assert manager.storage.pending_count() > 0
+        assert manager.storage.db.execute("SELECT COUNT(*) FROM projects").fetchone()[0] == 0
+        manager.add_selenium_account('sel', added_by=7)
+        manager.add_selenium_account('gone')
+        manager.remove_selenium_account('gone')
+        manager.set_setting('poll_priorities', {'discord:1': 2})
+        for i in range(505):
+            manager.add_sent_message(f'm{i}', '@out', 7)
+        old = manager.sent_ledger.add('7', '@old', 'x', time.time() - 48 * 3600)
+        manager.storage.add_sent_message('7', '@old', 'x', old, keep=500)
+        manager.cleanup_old_messages(hours=24)
+        assert manager.flush()
+        assert manager.storage.pending_count() == 0
+        manager.add_project(7, {'name': 'Lost', 'platform': 'twitter', 'url': 'c'})
+        manager.writer.stop(flush=False)
+        manager.storage.db.close()  # аварійне завершення без close()
+
+        restored = ProjectManager(os.path.join(tmp, 'data.json'), storage=SqliteStorage(db_file))
+        assert [p['name'] for p in restored.get_user_projects(7)] == ['B']
+        assert restored.get_user_data(7)['username'] == 'test'
+        assert restored.get_forward_status(7)['channel_id'] == '@out'
+        assert restored.get_forward_channel(7) is None
+        assert restored.get_selenium_accounts() == ['sel']
+        assert restored.get_setting('poll_priorities') == {'discord:1': 2}
+        assert restored.is_message_sent('m504', '@out', 7)
+        assert not restored.is_message_sent('m4', '@out', 7)  # витіснено лімітом 500
+        assert not restored.is_message_sent('x', '@old', 7)
+        assert len(restored.sent_ledger) == 500
+        assert restored.sent_ledger.to_dict() == manager.sent_ledger.to_dict()
+        # Зміна після останнього запису втрачена, решта збігається
+        assert restored.data['projects']['7'] == manager.data['projects']['7'][:1]
+        restored.close()
+
+
+if __name__ == "__main__":
+    test_migration_from_json()
+    test_changes_written_per_row()
+    print("✅ Всі тести пройдено")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Тест журналу відправлених повідомлень з кошиками часу
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_manager import ProjectManager
+from sent_ledger import SentLedger
+
+
+def test_membership_and_limit():
+    """Перевірка за ключем і ліміт записів на канал"""
+    ledger = SentLedger(bucket_seconds=60, keep_per_channel=3)
+    for message_id in ('a', 'b', 'c', 'd'):
+        ledger.add('1', '@chan', message_id, 1000)
+    assert not ledger.contains('1', '@chan', 'a')  # витіснено
+    assert ledger.contains('1', '@chan', 'd')
+    assert not ledger.contains('2', '@chan', 'd')
+    ledger.add('1', '@chan', 'b', 1000)  # повторний запис стає найновішим
+    ledger.add('1', '@chan', 'e', 1000)
+    assert ledger.contains('1', '@chan', 'b') and not ledger.contains('1', '@chan', 'c')
+    assert len(ledger) == 3
+
+
+def test_bucket_expiry():
+    """Старіння видаляє лише кошики, що повністю старші за межу"""
+    ledger = SentLedger(bucket_seconds=60)
+    ledger.add('1', '@chan', 'old', 0)
+    ledger.add('1', '@chan', 'edge', 100)  # кошик 60..120
+    ledger.add('1', '@other', 'new', 200)
+    ledger.add('1', '@chan', 'moved', 10)
+    ledger.add('1', '@chan', 'moved', 190)  # повторно в новішому кошику
+
+    removed, cutoff = ledger.expire(max_age_seconds=90, now=200)  # межа 110 -> кошик 60
+    assert (removed, cutoff) == (1, 60)
+    assert not ledger.contains('1', '@chan', 'old')
+    assert ledger.contains('1', '@chan', 'edge') and ledger.contains('1', '@chan', 'moved')
+
+    removed, _ = ledger.expire(max_age_seconds=0, now=200)  # кошик 180 ще не завершився
+    assert removed == 1 and len(ledger) == 2
+    assert ledger.get_stats()['buckets'] == 1
+
+    removed, _ = ledger.expire(max_age_seconds=0, now=240)
+    assert removed == 2 and len(ledger) == 0
+    assert ledger.channels == {} and ledger.buckets == {}
+
+
+def test_compact_form_roundtrip():
+    """Компактна форма без ISO дат на кожен запис, старий формат переноситься"""
+    ledger = SentLedger(bucket_seconds=900)
+    ledger.import_legacy({'1': {'@chan': [
+        {'message_id': 'm1', 'timestamp': '2025-01-01T10:00:00'},
+        {'message_id': 'm2', 'timestamp': '2025-01-01T10:05:00'},
+    ]}})
+    compact = ledger.to_dict()
+    assert list(compact['1']['@chan'].values()) == [['m1', 'm2']]
+
+    restored = SentLedger(bucket_seconds=900)
+    restored.load_dict(json.loads(json.dumps(compact)))
+    assert restored.contains('1', '@chan', 'm2')
+    assert restored.to_dict() == compact
+
+
+def test_project_manager_json_ledger():
+    """ProjectManager переносить settings.sent_messages у компактний sent_ledger"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, 'data.json')
+        with open(data_file, 'w', encoding='utf-8') as f:
+            json.dump({'projects': {}, 'settings': {'sent_messages': {'5': {'@c': [
+                {'message_id': 'fk', 'timestamp': '2025-01-01T10:00:00'}
+            ]}}}}, f)
+        manager = ProjectManager(data_file)
+        assert manager.is_message_sent('fk', '@c', 5)
+        manager.add_sent_message('fresh', '@c', 5)
+        manager.cleanup_old_messages(hours=24)
+        assert not manager.is_message_sent('fk', '@c', 5)
+        manager.close()
+
+        with open(data_file, encoding='utf-8') as f:
+            saved = json.load(f)
+        assert 'sent_messages' not in saved['settings']
+        bucket = str(SentLedger().bucket_start(time.time()))
+        assert saved['sent_ledger'] == {'5': {'@c': {bucket: ['fresh']}}}
+
+
+if __name__ == "__main__":
+    test_membership_and_limit()
+    test_bucket_expiry()
+    test_compact_form_roundtrip()
+    test_project_manager_json_ledger()
+    print("✅ Всі тести пройдено")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Тест спільного сховища сесій: закінчення через купу, продовження активністю, спільні менеджери
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from access_manager import AccessManager
+from security_manager import SESSION_EXPIRED_TEXT, SecurityManager
+from session_store import SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_expiry_and_touch():
+    """Прострочені сесії закінчуються, продовжені активністю - ні"""
+    clock = FakeClock()
+    store = SessionStore(60, clock=clock)
+    expired_events = []
+    store.add_expiry_listener(expired_events.extend)
+
+    for user_id in range(1, 6):
+        store.start(user_id)
+    store.start(6, timeout_seconds=10)
+    assert store.is_active(1) and len(store) == 6
+
+    clock.now += 30
+    assert not store.is_active(6)
+    assert store.expire() == [6]
+    assert store.touch(2)  # 2 продовжено до 1090
+    assert not store.touch(42)
+    assert store.end(3)
+
+    clock.now += 40  # 1070
+    assert sorted(store.expire()) == [1, 4, 5]
+    assert store.is_active(2) and 2 in store
+    assert store.time_left(2) == 20
+    assert store.time_left(1) == 0
+
+    clock.now += 21
+    assert store.expire() == [2]
+    assert sorted(expired_events) == [1, 2, 4, 5, 6]
+    assert len(store) == 0
+    assert store.get_stats()['heap_entries'] == 0
+
+    # Перезапуск з коротшим тайм-аутом не чекає старого запису в купі
+    store.start(7)
+    store.start(7, timeout_seconds=5)
+    clock.now += 6
+    assert store.expire() == [7]
+
+
+def test_managers_share_sessions():
+    """AccessManager і SecurityManager бачать одну сесію, сповіщення не губляться"""
+    with tempfile.TemporaryDirectory() as tmp:
+        access = AccessManager(os.path.join(tmp, 'access.json'), flush_delay=60)
+        clock = FakeClock()
+        access.sessions.clock = clock
+        security = SecurityManager(sessions=access.sessions)
+        assert security.timeout_seconds == 30 * 60
+
+        access.add_user(10, 'u', 'pw')
+        access.add_user(20, 'v', 'pw')
+        assert access.authenticate_user(10, 'pw')
+        assert access.authenticate_user(20, 'pw')
+        assert security.is_user_authorized(10)
+        assert security.get_session_time_left(10) == 30 * 60
+
+        clock.now += 25 * 60
+        security.update_user_activity(10)
+        clock.now += 10 * 60
+        assert access.is_authorized(10)
+        assert not access.is_authorized(20)
+
+        # Закінчення в AccessManager доходить до сповіщень SecurityManager
+        access.cleanup_expired_sessions()
+        assert security._expired_users == [20]
+        assert access.get_system_statistics()['active_sessions'] == 1
+
+        security.deauthorize_user(10)
+        assert not access.is_authorized(10)
+        assert access.cleanup_inactive_sessions() == 0
+        access.close()
+
+
+class FakeDeliveryEngine:
+    """Черга доставки: 1 - помилка, 2 - не завершується, решта - відправлено"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id, text, on_delivered=None, **params):
+        future = concurrent.futures.Future()
+        self.sent.append((chat_id, text))
+        if chat_id == 1:
+            future.set_exception(RuntimeError("Forbidden: bot was blocked by the user"))
+        elif chat_id != 2:
+            future.set_result({'message_id': chat_id})
+        return future
+
+
+def test_expiry_notices_counted():
+    """Сповіщення йдуть через чергу доставки, результати рахуються за запуск"""
+    clock = FakeClock()
+    security = SecurityManager(60, sessions=SessionStore(60, clock=clock))
+    for user_id in (1, 2, 3, 4):
+        security.authorize_user(user_id)
+    engine = FakeDeliveryEngine()
+
+    assert asyncio.run(security.check_expired_sessions(engine)) == {'expired': 0, 'sent': 0, 'failed': 0, 'pending': 0}
+    clock.now += 61
+    result = asyncio.run(security.check_expired_sessions(engine, timeout=0.1))
+    assert result == {'expired': 4, 'sent': 2, 'failed': 1, 'pending': 1}
+    assert sorted(chat_id for chat_id, _ in engine.sent) == [1, 2, 3, 4]
+    assert asyncio.run(security.check_expired_sessions(engine))['expired'] == 0
+
+
+def test_access_sessions_drive_security_notices():
+    """Тайм-аут і отримувачі сповіщень SecurityManager - сесії AccessManager (session_timeout_minutes)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        access = AccessManager(os.path.join(tmp, 'access.json'), flush_delay=60)
+        clock = FakeClock()
+        access.sessions.clock = clock
+        security = SecurityManager(sessions=access.sessions)
+        assert security.timeout_seconds == access.data['settings']['session_timeout_minutes'] * 60 == 1800
+
+        access.add_user(30, 'w', 'pw')
+        assert access.authenticate_user(30, 'pw')
+        engine = FakeDeliveryEngine()
+
+        # Старий тайм-аут SecurityManager (300 секунд) більше не діє
+        clock.now += 301
+        assert asyncio.run(security.check_expired_sessions(engine))['expired'] == 0
+        assert security.is_user_authorized(30)
+
+        clock.now += 1500
+        result = asyncio.run(security.check_expired_sessions(engine))
+        assert result == {'expired': 1, 'sent': 1, 'failed': 0, 'pending': 0}
+        assert engine.sent == [(30, SESSION_EXPIRED_TEXT)]
+        assert not access.is_authorized(30)
+        access.close()
+
+
+def test_check_sessions_job_sends_notices():
+    """Колбек job queue бота чекає на розсилку сповіщень, а не лише створює корутину"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)  # файли даних бота створюються в тимчасовій теці
+        try:
+            import bot
+        finally:
+            os.chdir(cwd)
+    assert asyncio.iscoroutinefunction(bot.check_sessions)
+
+    clock = FakeClock()
+    security = SecurityManager(60, sessions=SessionStore(60, clock=clock))
+    security.authorize_user(5)
+    security.authorize_user(6)
+    engine = FakeDeliveryEngine()
+    saved = bot.security_manager, bot.delivery_engine
+    bot.security_manager, bot.delivery_engine = security, engine
+    try:
+        asyncio.run(bot.check_sessions(None))
+        assert engine.sent == []
+        clock.now += 61
+        asyncio.run(bot.check_sessions(None))
+        assert sorted(engine.sent) == [(5, SESSION_EXPIRED_TEXT), (6, SESSION_EXPIRED_TEXT)]
+    finally:
+        bot.security_manager, bot.delivery_engine = saved
+
+
+if __name__ == "__main__":
+    test_expiry_and_touch()
+    test_managers_share_sessions()
+    test_expiry_notices_counted()
+    test_access_sessions_drive_security_notices()
+    test_check_sessions_job_sends_notices()
+    print("✅ Всі тести пройдено")
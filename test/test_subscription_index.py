@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Тест інвертованого індексу підписок для маршрутизації подій
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_manager import ProjectManager
+from url_utils import extract_discord_channel_id, extract_twitter_username
+
+
+def _project(name, platform, url):
+    return {'name': name, 'platform': platform, 'url': url, 'description': ''}
+
+
+def test_url_parsing():
+    """Розбір посилань Discord і Twitter"""
+    assert extract_discord_channel_id('https://discord.com/channels/111/222') == '222'
+    assert extract_discord_channel_id('333') == '333'
+    assert extract_discord_channel_id('not a url') == ''
+    assert extract_twitter_username('https://x.com/SomeUser?s=20') == 'SomeUser'
+    assert extract_twitter_username('@other_user') == 'other_user'
+    assert extract_twitter_username('https://example.com/x') is None
+
+
+def test_index_follows_project_changes():
+    """Індекс оновлюється при додаванні/видаленні і відновлюється при завантаженні"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.json')
+        manager = ProjectManager(path)
+        manager.add_project(1, _project('Alpha', 'discord', 'https://discord.com/channels/10/777'))
+        manager.add_project(2, _project('Beta Discord', 'discord', 'https://discord.com/channels/10/777'))
+        manager.add_project(2, _project('Beta tweets', 'twitter', 'https://twitter.com/@SomeUser'))
+        manager.add_project(3, _project('Gamma', 'twitter', 'someuser'))
+        manager.add_project(3, _project('Gamma 2', 'twitter', 'https://x.com/someuser'))
+
+        index = manager.subscriptions
+        assert index.discord_subscribers('777') == [1, 2]
+        assert index.discord_subscribers('888') == []
+        assert index.twitter_subscribers('@SOMEUSER') == [2, 3]
+        assert index.discord_project_name('777') == 'Alpha'
+
+        manager.delete_project(1, 1)
+        assert index.discord_subscribers('777') == [2]
+        assert index.discord_project_name('777') == 'Beta Discord'
+        # Один з двох проектів користувача 3 видалено - підписка лишається
+        manager.delete_project(3, 1)
+        assert index.twitter_subscribers('someuser') == [2, 3]
+        manager.delete_project(3, 2)
+        assert index.twitter_subscribers('someuser') == [2]
+        assert index.get_stats() == {'discord_channels': 1, 'twitter_accounts': 1, 'subscriptions': 2}
+
+        manager.save_data(force=True)
+        with open(path, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)['projects']['2']) == 2
+        restored = ProjectManager(path)
+        assert restored.subscriptions.discord_subscribers('777') == [2]
+        assert restored.subscriptions.twitter_subscribers('SomeUser') == [2]
+
+
+if __name__ == "__main__":
+    test_url_parsing()
+    test_index_follows_project_changes()
+    print("✅ Всі тести пройдено")
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Тест асинхронної черги доставки в Telegram на фейковому Bot API
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client
+from media_cache import MediaCache
+from telegram_delivery import TelegramDeliveryEngine, MAX_CAPTION_LENGTH, caption_length, clip_caption
+
+
+class FakeBotApi:
+    """Фейковий Bot API: записує виклики, вміє відповідати 429 та помилкою"""
+
+    def __init__(self, rate_limit_texts=(), fail_texts=(), fail_chats=(), fail_methods=()):
+        self.calls = []
+        self.fail_chats = set(fail_chats)
+        self.fail_methods = set(fail_methods)
+        self.image_requests = 0
+        self.rate_limit_texts = set(rate_limit_texts)
+        self.fail_texts = set(fail_texts)
+
+    async def handler(self, request):
+        method = request.match_info['method']
+        if request.content_type == 'application/json':
+            data = await request.json()
+        else:
+            data = dict(await request.post())
+        text = data.get('text')
+        self.calls.append((method, str(data.get('chat_id')), text, time.monotonic(), data))
+
+        if text in self.rate_limit_texts:
+            self.rate_limit_texts.discard(text)
+            return web.json_response({'ok': False, 'error_code': 429, 'description': 'Too Many Requests',
+                                      'parameters': {'retry_after': 0.2}}, status=429)
+        if text in self.fail_texts or str(data.get('chat_id')) in self.fail_chats or method in self.fail_methods:
+            return web.json_response({'ok': False, 'error_code': 400, 'description': 'Bad Request: chat not found'},
+                                     status=400)
+        if method == 'sendMediaGroup':
+            media = json.loads(data['media'])
+            return web.json_response({'ok': True, 'result': [
+                {'message_id': i, 'photo': [{'file_id': f'small{i}'}, {'file_id': f'file{i}'}]} for i in range(len(media))]})
+        if method == 'sendPhoto':
+            return web.json_response({'ok': True, 'result': {'message_id': len(self.calls),
+                                                             'photo': [{'file_id': 'single'}]}})
+        return web.json_response({'ok': True, 'result': {'message_id': len(self.calls), 'text': text}})
+
+    async def image(self, request):
+        self.image_requests += 1
+        if request.match_info['name'].startswith('missing'):
+            return web.Response(status=404)
+        return web.Response(body=b'\xff\xd8' + request.match_info['name'].encode(), content_type='image/jpeg')
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post('/bottoken/{method}', self.handler)
+        app.router.add_get('/img/{name}', self.image)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+def _run_engine(api, deliveries, **engine_kwargs):
+    """Запустити движок, поставити доставки і дочекатися результатів"""
+    async def run():
+        url = await api.start()
+        engine = TelegramDeliveryEngine('token', api_url=url, **engine_kwargs)
+        try:
+            futures = deliveries(engine)
+            await engine.start()
+            results = []
+            for future in futures:
+                try:
+                    results.append(await asyncio.wait_for(asyncio.wrap_future(future), 5))
+                except RuntimeError as e:
+                    results.append(e)
+            await engine.stop()
+        finally:
+            await http_client.close_session()
+            await api.stop()
+        return engine, results
+
+    return asyncio.run(run())
+
+
+def test_per_chat_order_and_spacing():
+    """Повідомлення в чаті йдуть по черзі з інтервалом, різні чати - паралельно"""
+    api = FakeBotApi()
+    delivered = []
+
+    def deliveries(engine):
+        futures = []
+        for i in range(3):
+            futures.append(engine.send_message('-100', f'group {i}', on_delivered=delivered.append))
+            futures.append(engine.send_message('42', f'private {i}'))
+        return futures
+
+    engine, results = _run_engine(api, deliveries, workers=4, group_interval=0.15, private_interval=0.01)
+
+    group = [call for call in api.calls if call[1] == '-100']
+    assert [call[2] for call in group] == ['group 0', 'group 1', 'group 2']
+    assert all(b[3] - a[3] >= 0.12 for a, b in zip(group, group[1:]))
+    private = [call[2] for call in api.calls if call[1] == '42']
+    assert private == ['private 0', 'private 1', 'private 2']
+    # Приватні повідомлення не чекають на групу
+    assert api.calls.index(next(c for c in api.calls if c[2] == 'private 2')) < \
+        api.calls.index(next(c for c in api.calls if c[2] == 'group 2'))
+    assert [r['text'] for r in delivered] == ['group 0', 'group 1', 'group 2']
+    assert engine.get_stats()['delivered'] == 6
+
+
+def test_retry_after_and_first_step_failure():
+    """429 повторюється після retry_after; невдалий перший крок скасовує решту"""
+    api = FakeBotApi(rate_limit_texts={'limited'}, fail_texts={'broken'})
+
+    def deliveries(engine):
+        return [
+            engine.enqueue('7', [engine.message_step('7', 'limited'), engine.message_step('7', 'after limited')]),
+            engine.enqueue('8', [engine.message_step('8', 'broken'), engine.message_step('8', 'never sent')]),
+        ]
+
+    engine, results = _run_engine(api, deliveries, workers=2, private_interval=0.01)
+
+    limited = [call for call in api.calls if call[1] == '7']
+    assert [call[2] for call in limited] == ['limited', 'limited', 'after limited']
+    assert limited[1][3] - limited[0][3] >= 0.15
+    assert results[0]['text'] == 'limited'
+
+    assert isinstance(results[1], RuntimeError)
+    assert 'never sent' not in [call[2] for call in api.calls]
+    stats = engine.get_stats()
+    assert stats['rate_limited'] == 1 and stats['retried'] == 1 and stats['failed'] == 1
+
+
+def test_media_group_albums_and_fallback():
+    """Зображення йдуть альбомами по 10 з текстом у підписі; без медіа - лише текст"""
+    api = FakeBotApi()
+
+    def deliveries(engine):
+        base = engine.api_url
+        album = engine.media_steps('9', [f"{base}/img/{i}" for i in range(12)], caption='post text')
+        broken = engine.media_steps('10', [f"{base}/img/missing{i}" for i in range(2)], caption='only text')
+        broken[0]['fallback'] = engine.message_step('10', 'only text')
+        partial = engine.media_steps('11', [f"{base}/img/ok", f"{base}/img/missing"], caption='x' * 2000)
+        return [engine.enqueue('9', album), engine.enqueue('10', broken), engine.enqueue('11', partial)]
+
+    engine, results = _run_engine(api, deliveries, workers=3, private_interval=0.01)
+
+    album = [call for call in api.calls if call[1] == '9']
+    assert [call[0] for call in album] == ['sendMediaGroup', 'sendMediaGroup']
+    first, second = (json.loads(call[4]['media']) for call in album)
+    assert len(first) == 10 and len(second) == 2
+    assert first[0]['caption'] == 'post text' and first[0]['media'] == 'attach://photo0'
+    assert all('caption' not in item for item in first[1:] + second)
+    assert album[0][4]['photo9'].file.read().endswith(b'9')
+    assert isinstance(results[0], list) and len(results[0]) == 10
+
+    # Жодне зображення не завантажилось - відправлено текст
+    assert [(call[0], call[2]) for call in api.calls if call[1] == '10'] == [('sendMessage', 'only text')]
+    # Одне з двох - альбом замінюється на sendPhoto з обрізаним підписом
+    partial = [call for call in api.calls if call[1] == '11']
+    assert [call[0] for call in partial] == ['sendPhoto']
+    assert len(partial[0][4]['caption']) == MAX_CAPTION_LENGTH
+    assert engine.get_stats()['api_calls'] == 4
+
+
+def test_rejected_album_sent_photo_by_photo():
+    """Альбом, відхилений Telegram, відправляється окремими фото; підпис рахується в UTF-16"""
+    api = FakeBotApi(fail_methods={'sendMediaGroup'})
+    caption = '😀' * 600  # 1200 одиниць UTF-16 при 600 символах Python
+
+    def deliveries(engine):
+        base = engine.api_url
+        steps = engine.media_steps('12', [f"{base}/img/{i}" for i in range(3)], caption=caption)
+        return [engine.enqueue('12', steps)]
+
+    engine, results = _run_engine(api, deliveries, private_interval=0.01)
+
+    assert [call[0] for call in api.calls] == ['sendMediaGroup', 'sendPhoto', 'sendPhoto', 'sendPhoto']
+    photos = [call[4] for call in api.calls[1:]]
+    assert photos[0]['caption'] == '😀' * 512
+    assert caption_length(photos[0]['caption']) == MAX_CAPTION_LENGTH
+    assert all(not photo['caption'] for photo in photos[1:])
+    assert results[0]['message_id'] == 2
+    assert engine.get_stats()['delivered'] == 1
+
+    assert caption_length('a😀') == 3
+    assert clip_caption('a' + '😀' * 2, limit=2) == 'a'  # пара не розривається
+    assert clip_caption('short') == 'short'
+
+
+def test_fan_out_downloads_image_once():
+    """Те саме зображення в кілька каналів завантажується один раз"""
+    api = FakeBotApi()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def deliveries(engine):
+            url = f"{engine.api_url}/img/shared"
+            return [engine.enqueue(chat, [engine.photo_step(chat, url, 'pic')]) for chat in ('1', '2', '3')]
+
+        engine, results = _run_engine(api, deliveries, workers=3, private_interval=0.01,
+                                      media_cache=MediaCache(tmp))
+
+    assert [call[0] for call in api.calls] == ['sendPhoto'] * 3
+    assert api.image_requests == 1
+    assert engine.get_stats()['media_cache']['misses'] == 1
+
+
+def test_fan_out_copies_instead_of_reuploading():
+    """Перший канал - повна відправка, решта - copyMessage і file_id без завантажень"""
+    api = FakeBotApi()
+    delivered = []
+
+    def deliveries(engine):
+        images = [f"{engine.api_url}/img/{i}" for i in range(3)]
+
+        def build_steps(chat_id):
+            return [engine.message_step(chat_id, 'long text')] + engine.media_steps(chat_id, images, caption='pics')
+
+        return engine.fan_out(['-1', '-2', '-3'], build_steps, lambda chat, result: delivered.append(chat))
+
+    engine, results = _run_engine(api, deliveries, workers=3, group_interval=0.01)
+
+    primary = [call for call in api.calls if call[1] == '-1']
+    assert [call[0] for call in primary] == ['sendMessage', 'sendMediaGroup']
+    for chat in ('-2', '-3'):
+        calls = [call for call in api.calls if call[1] == chat]
+        assert [call[0] for call in calls] == ['copyMessage', 'sendMediaGroup']
+        assert calls[0][4]['from_chat_id'] == '-1' and calls[0][4]['message_id'] == 1
+        media = json.loads(calls[1][4]['media'])
+        assert [item['media'] for item in media] == ['file0', 'file1', 'file2']
+        assert media[0]['caption'] == 'pics'
+    # Зображення завантажені лише для першого каналу
+    assert api.image_requests == 3
+    assert sorted(delivered) == ['-1', '-2', '-3']
+    assert engine.get_stats()['file_id_reused'] == 6
+
+
+def test_fan_out_falls_back_when_first_target_fails():
+    """Якщо перший канал недоступний - решта отримують повну відправку"""
+    api = FakeBotApi(fail_chats={'-1'})
+
+    def deliveries(engine):
+        return engine.fan_out(['-1', '-2'], lambda chat_id: [engine.message_step(chat_id, 'hello')])
+
+    engine, results = _run_engine(api, deliveries, workers=2, group_interval=0.01)
+    assert isinstance(results[0], RuntimeError)
+    assert results[1]['text'] == 'hello'
+    assert [(call[0], call[1]) for call in api.calls] == [('sendMessage', '-1'), ('sendMessage', '-2')]
+
+
+def test_enqueue_from_another_thread():
+    """Доставки з інших потоків потрапляють на loop движка"""
+    api = FakeBotApi()
+
+    async def run():
+        url = await api.start()
+        engine = TelegramDeliveryEngine('token', api_url=url, private_interval=0.01)
+        await engine.start()
+        futures = []
+        thread = threading.Thread(target=lambda: futures.extend(
+            engine.send_message('5', f'thread {i}') for i in range(3)))
+        thread.start()
+        thread.join()
+        try:
+            results = [await asyncio.wait_for(asyncio.wrap_future(f), 5) for f in futures]
+            await engine.stop()
+        finally:
+            await http_client.close_session()
+            await api.stop()
+        return engine, results
+
+    engine, results = asyncio.run(run())
+    assert [r['text'] for r in results] == ['thread 0', 'thread 1', 'thread 2']
+    assert not engine.is_running()
+
+
+if __name__ == "__main__":
+    test_per_chat_order_and_spacing()
+    test_retry_after_and_first_step_failure()
+    test_media_group_albums_and_fallback()
+    test_rejected_album_sent_photo_by_photo()
+    test_fan_out_downloads_image_once()
+    test_fan_out_copies_instead_of_reuploading()
+    test_fan_out_falls_back_when_first_target_fails()
+    test_enqueue_from_another_thread()
+    print("✅ Всі тести пройдено")
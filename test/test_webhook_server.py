@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Тест прийому оновлень Telegram через webhook
+"""
+
+import asyncio
+import os
+import sys
+
+import aiohttp
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram.ext import Application
+
+from webhook_server import SECRET_HEADER, WebhookServer
+
+UPDATE = {
+    'update_id': 7,
+    'message': {
+        'message_id': 1, 'date': 0, 'text': '/start',
+        'chat': {'id': 42, 'type': 'private'},
+        'from': {'id': 42, 'is_bot': False, 'first_name': 'Test'},
+    },
+}
+
+
+def test_secret_checked_and_update_queued():
+    """Оновлення з правильним секретом потрапляє в update_queue, інші - відхиляються"""
+    async def run():
+        application = Application.builder().token('123:TEST').build()
+        server = WebhookServer(application, port=0, path='hook', secret_token='s3cret')
+        await server.start()
+        url = f"http://127.0.0.1:{server.port}/hook"
+        statuses = []
+        try:
+            async with aiohttp.ClientSession() as session:
+                for headers, body in (({}, UPDATE), ({SECRET_HEADER: 'wrong'}, UPDATE),
+                                      ({SECRET_HEADER: 's3cret'}, UPDATE), ({SECRET_HEADER: 's3cret'}, [1])):
+                    async with session.post(url, json=body, headers=headers) as response:
+                        statuses.append(response.status)
+        finally:
+            await server.stop()
+        update = application.update_queue.get_nowait()
+        return statuses, update, application.update_queue.qsize(), server.get_stats()
+
+    statuses, update, remaining, stats = asyncio.run(run())
+    assert statuses == [403, 403, 200, 400]
+    assert update.update_id == 7 and update.message.text == '/start'
+    assert remaining == 0
+    assert stats == {'received': 1, 'rejected': 2, 'invalid': 1}
+
+
+if __name__ == "__main__":
+    test_secret_checked_and_update_queued()
+    print("✅ Всі тести пройдено")
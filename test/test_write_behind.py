@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Тест фонового відкладеного запису даних проектів
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_manager import ProjectManager
+from write_behind import WriteBehind
+
+
+def test_coalesces_and_bounds_staleness():
+    """Багато змін - один запис у фоновому потоці не пізніше max_delay"""
+    writes = []
+    writer = WriteBehind(lambda: writes.append(threading.current_thread().name), max_delay=0.2, name="test-writer")
+    writer.start()
+    for _ in range(100):
+        writer.mark_dirty()
+    assert writes == []  # mark_dirty не пише сам
+
+    deadline = time.monotonic() + 2
+    while not writes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writes == ["test-writer"]
+    assert not writer.dirty
+    assert writer.get_stats()['max_staleness'] < 1.0
+
+    writer.mark_dirty()
+    writer.stop()  # зупинка записує незбережене
+    assert len(writes) == 2
+
+
+def test_failed_write_is_retried():
+    """Помилка запису не губить зміни"""
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("disk full")
+
+    writer = WriteBehind(flaky, max_delay=0.05)
+    writer.start()
+    writer.mark_dirty()
+    deadline = time.monotonic() + 2
+    while not writer.get_stats()['flushes'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(attempts) == 2 and not writer.dirty
+    assert writer.get_stats()['errors'] == 1
+    writer.stop()
+
+
+def test_project_manager_json_write_behind():
+    """Зміни ProjectManager потрапляють у data.json атомарно і без очікування в обробнику"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, 'data.json')
+        manager = ProjectManager(data_file, flush_delay=0.1)
+        started = time.perf_counter()
+        for i in range(20):
+            manager.add_project(1, {'name': f'P{i}', 'platform': 'twitter', 'url': f'acc{i}'})
+        assert time.perf_counter() - started < 0.5
+
+        deadline = time.monotonic() + 2
+        while not manager.writer.get_stats()['flushes'] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        with open(data_file, encoding='utf-8') as f:
+            assert len(json.load(f)['projects']['1']) == 20
+        assert not os.path.exists(f"{data_file}.tmp")
+
+        manager.set_setting('key', 'value')
+        manager.close()
+        with open(data_file, encoding='utf-8') as f:
+            assert json.load(f)['settings']['key'] == 'value'
+
+
+if __name__ == "__main__":
+    test_coalesces_and_bounds_staleness()
+    test_failed_write_is_retried()
+    test_project_manager_json_write_behind()
+    print("✅ Всі тести пройдено")
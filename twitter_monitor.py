@@ -6,12 +6,12 @@ from typing import Dict, List, Optional, Set
 import json
 import re
 import random
-import ssl
-import urllib3
+import time
 from urllib.parse import urlparse, parse_qs
 
-# Відключаємо попередження про SSL сертифікати
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+import http_client
+from adaptive_scheduler import parse_timestamp
+from notification_templates import renderer, escape, ESCAPE_MARKDOWN_V2
 
 class TwitterMonitor:
     """Моніторинг Twitter/X акаунтів через автентифіковані API запити"""
@@ -20,12 +20,20 @@ class TwitterMonitor:
         self.auth_token = auth_token
         self.csrf_token = csrf_token
         self.session = None
+        self.headers = {}
+        self.cookies = {}
         self.monitoring_accounts = set()
         self.last_tweet_ids = {}  # account -> last_tweet_id
         self.sent_tweets = {}  # account -> set of sent tweet_ids
         self.seen_tweets = {}  # account -> set of seen tweet_ids
         self.logger = logging.getLogger(__name__)
         self.seen_tweets_file = "twitter_api_seen_tweets.json"
+        self.scheduler = None  # AdaptivePollScheduler, якщо увімкнено адаптивне опитування
+        self.poll_interval = 30
+        self.cursor_store = None  # CursorStore для відновлення після перезапуску
+        self.backfill_pending: Set[str] = set()  # акаунти з відновленим курсором
+        self.backfill_max_items = 20
+        self.backfill_max_age_hours = 6
         
         # Завантажуємо збережені seen_tweets
         self.load_seen_tweets()
@@ -34,12 +42,12 @@ class TwitterMonitor:
         """Асинхронний контекстний менеджер"""
         if self.auth_token:
             # Формуємо cookies для автентифікації
-            cookies = {
+            self.cookies = {
                 'auth_token': self.auth_token,
                 'ct0': self.csrf_token or 'default_csrf_token'
             }
             
-            headers = {
+            self.headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36',
                 'Accept': '*/*',
                 'Accept-Language': 'uk,en-US;q=0.9,en;q=0.8,ru;q=0.7',
@@ -52,29 +60,17 @@ class TwitterMonitor:
                 'X-Twitter-Auth-Type': 'OAuth2Session'
             }
             
-            timeout = aiohttp.ClientTimeout(total=15)
-            
-            # Налаштування SSL для обходу проблем з сертифікатами
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            self.session = aiohttp.ClientSession(
-                headers=headers, 
-                cookies=cookies, 
-                timeout=timeout,
-                connector=connector
-            )
-            self.logger.info("Twitter моніторинг ініціалізовано з auth_token та SSL налаштуваннями")
+            # Спільна сесія з пулом з'єднань (SSL і таймаути - в http_client)
+            self.session = http_client.get_session()
+            self.logger.info("Twitter моніторинг ініціалізовано з auth_token")
         else:
             self.logger.warning("Twitter auth_token не встановлено! Twitter моніторинг буде відключено")
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Закрити сесію"""
-        if self.session:
-            await self.session.close()
+        """Відпустити сесію"""
+        # Спільна сесія закривається централізовано
+        self.session = None
             
     def add_account(self, username: str) -> bool:
         """Додати акаунт для моніторингу"""
@@ -89,6 +85,7 @@ class TwitterMonitor:
                 # Ініціалізуємо множину оброблених твітів для нового акаунта
                 if clean_username not in self.seen_tweets:
                     self.seen_tweets[clean_username] = set()
+                self._restore_cursor(clean_username)
                 self.logger.info(f"Додано акаунт для моніторингу: {clean_username}")
                 return True
         except Exception as e:
@@ -107,6 +104,9 @@ class TwitterMonitor:
                     del self.sent_tweets[clean_username]
                 if clean_username in self.seen_tweets:
                     del self.seen_tweets[clean_username]
+                self.backfill_pending.discard(clean_username)
+                if self.cursor_store:
+                    self.cursor_store.delete(self._schedule_key(clean_username))
                 # Зберігаємо зміни
                 self.save_seen_tweets()
                 self.logger.info(f"Видалено акаунт з моніторингу: {clean_username}")
@@ -179,7 +179,7 @@ class TwitterMonitor:
                     })
                 }
                 
-                async with self.session.post(url, json=params) as response:
+                async with self.session.post(url, json=params, headers=self.headers, cookies=self.cookies) as response:
                     if response.status == 200:
                         data = await response.json()
                         tweets = self._parse_api_response(data, username)
@@ -249,7 +249,7 @@ class TwitterMonitor:
                 })
             }
             
-            async with self.session.post(url, json=params) as response:
+            async with self.session.post(url, json=params, headers=self.headers, cookies=self.cookies) as response:
                 if response.status == 200:
                     data = await response.json()
                     user_data = data.get('data', {}).get('user', {}).get('result', {})
@@ -277,27 +277,20 @@ class TwitterMonitor:
     async def _get_tweets_from_html(self, username: str, limit: int = 5) -> List[Dict]:
         """Отримати твіти через HTML парсинг (fallback метод)"""
         try:
-            # Використовуємо requests для HTML запитів (синхронно)
-            import requests
-            
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
             url = f"https://x.com/{username}"
             
-            # Налаштування SSL для requests
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            response = requests.get(url, headers=headers, timeout=15, verify=False)
+            # Той самий пул з'єднань, без блокування event loop
+            response = await http_client.request('GET', url, headers=headers)
             
-            if response.status_code == 200:
-                html = response.text
+            if response.status == 200:
+                html = await response.text()
                 return self._parse_tweets_from_html(html, username)[:limit]
             else:
-                self.logger.error(f"Помилка завантаження HTML для {username}: {response.status_code}")
+                self.logger.error(f"Помилка завантаження HTML для {username}: {response.status}")
                 return []
         except Exception as e:
             self.logger.error(f"Помилка HTML парсингу для {username}: {e}")
@@ -565,7 +558,14 @@ class TwitterMonitor:
         """Перевірити нові твіти у всіх акаунтах"""
         new_tweets = []
         
-        for i, username in enumerate(self.monitoring_accounts):
+        accounts = list(self.monitoring_accounts)
+        if self.scheduler:
+            # Адаптивний режим - тільки акаунти, яким настав час
+            due = set(self.scheduler.due_sources([self._schedule_key(a) for a in accounts], self.poll_interval))
+            accounts = [a for a in accounts if self._schedule_key(a) in due]
+        
+        for i, username in enumerate(accounts):
+            found_before = len(new_tweets)
             try:
                 # Додаємо затримку між запитами до різних акаунтів
                 if i > 0:
@@ -647,6 +647,11 @@ class TwitterMonitor:
                         content_key = f"content_{content_hash}"
                         self.sent_tweets[username].add(content_key)
                     
+                # Перша перевірка після перезапуску - обмежуємо догрузку
+                if username in self.backfill_pending:
+                    self.backfill_pending.discard(username)
+                    self._limit_backfill(username, new_tweets, found_before)
+                    
                 # Діагностичне логування
                 if found_new:
                     self.logger.info(f"Акаунт {username}: знайдено нові твіти, останній відомий: {last_id}")
@@ -657,6 +662,11 @@ class TwitterMonitor:
                     
             except Exception as e:
                 self.logger.error(f"Помилка перевірки акаунта {username}: {e}")
+            finally:
+                self._checkpoint(username)
+                if self.scheduler:
+                    self.scheduler.record_activity(self._schedule_key(username),
+                                                   [t['timestamp'] for t in new_tweets[found_before:]])
         
         # Зберігаємо оброблені твіти після кожної перевірки
         if new_tweets:
@@ -664,8 +674,52 @@ class TwitterMonitor:
                 
         return new_tweets
         
+    def attach_cursor_store(self, cursor_store, backfill_max_items: int = 20, backfill_max_age_hours: float = 6) -> None:
+        """Підключити сховище курсорів для відновлення після перезапуску"""
+        self.cursor_store = cursor_store
+        self.backfill_max_items = backfill_max_items
+        self.backfill_max_age_hours = backfill_max_age_hours
+        for username in self.monitoring_accounts:
+            self._restore_cursor(username)
+        
+    def _restore_cursor(self, username: str) -> None:
+        """Відновити останній твіт акаунта зі сховища"""
+        if not self.cursor_store or username in self.last_tweet_ids:
+            return
+        cursor = self.cursor_store.get(self._schedule_key(username))
+        if cursor:
+            self.last_tweet_ids[username] = cursor
+            self.backfill_pending.add(username)
+            self.logger.info(f"♻️ Акаунт {username}: відновлено курсор {cursor}")
+        
+    def _checkpoint(self, username: str) -> None:
+        """Зберегти курсор акаунта"""
+        if self.cursor_store and username in self.last_tweet_ids:
+            self.cursor_store.set(self._schedule_key(username), self.last_tweet_ids[username])
+        
+    def _limit_backfill(self, username: str, new_tweets: List[Dict], start: int) -> None:
+        """Обмежити твіти, пропущені під час простою, за віком і кількістю"""
+        missed = new_tweets[start:]
+        cutoff = time.time() - self.backfill_max_age_hours * 3600
+        fresh = [t for t in missed if (parse_timestamp(t.get('timestamp')) or cutoff) >= cutoff]
+        new_tweets[start:] = fresh[:max(0, self.backfill_max_items)]
+        skipped = len(missed) - (len(new_tweets) - start)
+        self.logger.info(f"♻️ Акаунт {username}: догружено {len(new_tweets) - start} пропущених твітів, пропущено старих {skipped}")
+        
+    def _schedule_key(self, username: str) -> str:
+        """Ключ акаунта в адаптивному планувальнику"""
+        return f"twitter:{username.lower()}"
+        
+    def get_next_poll_delay(self, interval: float) -> float:
+        """Затримка до наступного циклу (з урахуванням адаптивного планувальника)"""
+        if not self.scheduler:
+            return interval
+        keys = [self._schedule_key(a) for a in self.monitoring_accounts]
+        return min(interval, max(1.0, self.scheduler.seconds_until_next(keys)))
+        
     async def start_monitoring(self, callback_func, interval: int = 30):
         """Запустити моніторинг з callback функцією"""
+        self.poll_interval = interval
         self.logger.info(f"Запуск моніторингу Twitter акаунтів (інтервал: {interval}с)")
         
         while True:
@@ -681,7 +735,7 @@ class TwitterMonitor:
                         
                 # Додаємо випадкову затримку для уникнення підозрілої активності
                 random_delay = random.uniform(1.0, 3.0)
-                await asyncio.sleep(interval + random_delay)
+                await asyncio.sleep(self.get_next_poll_delay(interval) + random_delay)
                 
             except Exception as e:
                 self.logger.error(f"Помилка в циклі моніторингу Twitter: {e}")
@@ -691,40 +745,22 @@ class TwitterMonitor:
     def format_tweet_notification(self, tweet: Dict) -> str:
         """Форматувати сповіщення про новий твіт"""
         try:
-            # Екрануємо спеціальні символи для Markdown
-            author = self._escape_markdown(tweet.get('author', 'Unknown'))
-            text = self._escape_markdown(tweet.get('text', '')[:200])  # Обмежуємо довжину
-            username = tweet.get('username', '')
-            
-            if len(tweet.get('text', '')) > 200:
-                text += '...'
-                
-            notification = (
-                f"🐦 **Новий твіт з Twitter**\n\n"
-                f"👤 Автор: {author} (@{username})\n"
-                f"📝 Текст: {text}\n"
-                f"🔗 [Перейти до твіта]({tweet.get('url', '')})\n\n"
-                f"⏰ {tweet.get('timestamp', 'Невідомо')[:19] if tweet.get('timestamp') else 'Невідомо'}"
-            )
-            
-            return notification
+            def fields():
+                text = tweet.get('text', '')
+                return {
+                    'author': escape(tweet.get('author', 'Unknown'), ESCAPE_MARKDOWN_V2),
+                    # Обмежуємо довжину; '...' додається після екранування
+                    'text': escape(text[:200], ESCAPE_MARKDOWN_V2) + ('...' if len(text) > 200 else ''),
+                    'username': tweet.get('username', ''),
+                    'url': tweet.get('url', ''),
+                    'timestamp': tweet.get('timestamp', '')[:19] if tweet.get('timestamp') else 'Невідомо',
+                }
+            tweet_id = tweet.get('tweet_id') or tweet.get('id')
+            return renderer.render('twitter_monitor', ('twitter', tweet_id) if tweet_id else None, fields)
             
         except Exception as e:
             self.logger.error(f"Помилка форматування сповіщення: {e}")
             return f"🐦 Новий твіт від {tweet.get('username', 'Unknown')}"
-            
-    def _escape_markdown(self, text: str) -> str:
-        """Екранувати спеціальні символи Markdown"""
-        if not text:
-            return ""
-            
-        # Список символів, які потрібно екранувати в Markdown
-        escape_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-        
-        for char in escape_chars:
-            text = text.replace(char, f'\\{char}')
-            
-        return text
     
     def save_seen_tweets(self):
         """Зберегти список оброблених твітів"""
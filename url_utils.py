@@ -0,0 +1,81 @@
+import logging
+import re
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DISCORD_CHANNEL_RE = re.compile(r'discord\.com/channels/\d+/(\d+)')
+
+
+@lru_cache(maxsize=4096)
+def extract_discord_channel_id(url: str) -> str:
+    """Витягти channel_id з Discord URL"""
+    try:
+        if not url:
+            return ""
+
+        # Спробуємо знайти channel_id в URL
+        match = DISCORD_CHANNEL_RE.search(url)
+        if match:
+            return match.group(1)
+
+        # Якщо це просто ID (тільки цифри)
+        if url.isdigit():
+            return url
+
+        logger.warning(f"Не вдалося витягти Discord channel_id з: {url}")
+        return ""
+    except Exception as e:
+        logger.error(f"Помилка витягування Discord channel_id з '{url}': {e}")
+        return ""
+
+
+@lru_cache(maxsize=4096)
+def extract_twitter_username(url: str) -> Optional[str]:
+    """Витягти username з Twitter URL або просто username"""
+    try:
+        if not url:
+            return None
+
+        url = url.strip()
+
+        # Якщо це повний URL з twitter.com або x.com
+        if 'twitter.com' in url or 'x.com' in url:
+            # Видаляємо протокол
+            url = url.replace('https://', '').replace('http://', '')
+
+            # Видаляємо www
+            if url.startswith('www.'):
+                url = url[4:]
+
+            # Витягуємо username
+            if url.startswith('twitter.com/'):
+                username = url.split('/')[1]
+            elif url.startswith('x.com/'):
+                username = url.split('/')[1]
+            else:
+                return None
+
+            # Очищаємо від зайвих символів
+            username = username.split('?')[0].split('#')[0]
+
+            return username if username else None
+
+        # Якщо це просто username (без URL)
+        elif url and not url.startswith('http') and not '/' in url:
+            # Видаляємо @ якщо є
+            username = url.replace('@', '').strip()
+            # Перевіряємо що це валідний username (тільки букви, цифри, підкреслення)
+            if username and username.replace('_', '').replace('-', '').isalnum():
+                return username
+
+        return None
+    except Exception as e:
+        logger.error(f"Помилка витягування Twitter username з '{url}': {e}")
+        return None
+
+
+def normalize_twitter_username(username: Optional[str]) -> str:
+    """Ключ Twitter акаунта: без @, нижній регістр"""
+    return (username or '').replace('@', '').strip().lower()
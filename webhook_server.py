@@ -0,0 +1,110 @@
+import asyncio
+import hmac
+import logging
+import secrets
+import signal
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from aiohttp import web
+from telegram import Update
+from telegram.ext import Application
+
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+
+class WebhookServer:
+    """Прийом оновлень Telegram через webhook: локальний aiohttp сервер -> update_queue бота"""
+
+    def __init__(self, application: Application, listen: str = '127.0.0.1', port: int = 8443,
+                 path: str = '/telegram', secret_token: Optional[str] = None):
+        self.application = application
+        self.listen = listen
+        self.port = port
+        self.path = path if path.startswith('/') else f'/{path}'
+        self.secret_token = secret_token or secrets.token_urlsafe(32)
+        self.logger = logging.getLogger(__name__)
+        self._runner: Optional[web.AppRunner] = None
+        self.stats = {'received': 0, 'rejected': 0, 'invalid': 0}
+
+    async def start(self) -> None:
+        """Запустити HTTP сервер"""
+        app = web.Application()
+        app.router.add_post(self.path, self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.listen, self.port)
+        await site.start()
+        if not self.port:
+            # Порт 0 - вільний порт від ОС (тести, бенчмарк)
+            self.port = site._server.sockets[0].getsockname()[1]
+        self.logger.info(f"🌐 Webhook сервер слухає {self.listen}:{self.port}{self.path}")
+
+    async def stop(self) -> None:
+        """Зупинити HTTP сервер"""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Перевірити секрет і передати оновлення в чергу обробки"""
+        token = request.headers.get(SECRET_HEADER, '')
+        if not hmac.compare_digest(token, self.secret_token):
+            self.stats['rejected'] += 1
+            self.logger.warning(f"🚫 Webhook запит з невірним секретом від {request.remote}")
+            return web.Response(status=403)
+
+        try:
+            update = Update.de_json(await request.json(), self.application.bot)
+        except Exception as e:
+            self.stats['invalid'] += 1
+            self.logger.error(f"Некоректне оновлення у webhook: {e}")
+            return web.Response(status=400)
+
+        self.stats['received'] += 1
+        await self.application.update_queue.put(update)
+        return web.Response()
+
+    def get_stats(self) -> Dict:
+        """Статистика webhook"""
+        return dict(self.stats)
+
+
+async def run_webhook(application: Application, webhook_url: str, listen: str = '127.0.0.1',
+                      port: int = 8443, secret_token: Optional[str] = None) -> None:
+    """Запустити бота в режимі webhook до SIGINT/SIGTERM.
+
+    post_init/post_shutdown викликаються так само, як у run_polling(). Повернення
+    до polling не потребує окремих дій: run_polling() сам видаляє webhook.
+    """
+    logger = logging.getLogger(__name__)
+    server = WebhookServer(application, listen, port, urlparse(webhook_url).path or '/telegram', secret_token)
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows: зупинка через KeyboardInterrupt
+            pass
+
+    await application.initialize()
+    try:
+        if application.post_init:
+            await application.post_init(application)
+        await server.start()
+        await application.start()
+        await application.bot.set_webhook(
+            url=webhook_url,
+            secret_token=server.secret_token,
+            allowed_updates=Update.ALL_TYPES
+        )
+        logger.info(f"🚀 Бот працює в режимі webhook: {webhook_url}")
+        await stop_event.wait()
+    finally:
+        await server.stop()
+        if application.running:
+            await application.stop()
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
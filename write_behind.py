@@ -0,0 +1,103 @@
+import atexit
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class WriteBehind:
+    """Відкладений запис у фоновому потоці: зміни позначаються брудними і зливаються пакетом не пізніше ніж за max_delay"""
+
+    def __init__(self, flush_func: Callable[[], None], max_delay: float = 2.0, name: str = "write-behind"):
+        self.flush_func = flush_func
+        self.max_delay = max_delay
+        self.name = name
+        self.logger = logging.getLogger(__name__)
+        self._dirty = False
+        self._dirty_since: Optional[float] = None
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._atexit_registered = False
+        self.stats = {'marked': 0, 'flushes': 0, 'errors': 0, 'max_staleness': 0.0}
+
+    def start(self) -> None:
+        """Запустити фоновий потік запису"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        if not self._atexit_registered:
+            # Останній запис при завершенні інтерпретатора (після SIGINT/SIGTERM теж)
+            atexit.register(self.stop)
+            self._atexit_registered = True
+
+    def stop(self, flush: bool = True) -> None:
+        """Зупинити потік; за замовчуванням спершу записати незбережені зміни"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=10)
+        self._thread = None
+        if self._atexit_registered:
+            atexit.unregister(self.stop)
+            self._atexit_registered = False
+        if flush:
+            self.flush()
+
+    def mark_dirty(self) -> None:
+        """Позначити, що є незбережені зміни (не блокує: запис зробить фоновий потік)"""
+        self.stats['marked'] += 1
+        if not self._dirty:
+            self._dirty_since = time.monotonic()
+            self._dirty = True
+            self._wakeup.set()
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def flush(self) -> bool:
+        """Записати зміни зараз (у потоці, що викликав)"""
+        with self._flush_lock:
+            if not self._dirty:
+                return True
+            # Скидаємо прапорець до запису: зміни під час запису потраплять у наступний
+            self._dirty = False
+            dirty_since = self._dirty_since
+            try:
+                self.flush_func()
+            except Exception as e:
+                self._dirty = True
+                self._dirty_since = dirty_since
+                self.stats['errors'] += 1
+                self.logger.error(f"Помилка відкладеного запису ({self.name}): {e}")
+                return False
+            self.stats['flushes'] += 1
+            if dirty_since is not None:
+                self.stats['max_staleness'] = max(self.stats['max_staleness'], time.monotonic() - dirty_since)
+            return True
+
+    def _run(self) -> None:
+        """Цикл потоку: чекати змін, зібрати зміни за max_delay, записати одним пакетом"""
+        while not self._stopping.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                break
+            if not self._dirty:
+                continue
+            # Вікно об'єднання відраховується від першої незбереженої зміни
+            delay = self.max_delay - (time.monotonic() - (self._dirty_since or time.monotonic()))
+            if delay > 0 and self._stopping.wait(delay):
+                break
+            if not self.flush():
+                # Помилка запису - повторимо через max_delay
+                self._stopping.wait(self.max_delay)
+                self._wakeup.set()
+
+    def get_stats(self) -> Dict:
+        """Статистика відкладеного запису"""
+        return {**self.stats, 'dirty': self._dirty}